@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 import threading
 import time
 import traceback
 from datetime import datetime
-from typing import Dict, List, Optional, TextIO, Callable, Any
+from collections import deque
+from typing import Deque, Dict, List, Optional, TextIO, Callable, Any
 from pathlib import Path
 import os
 import re
@@ -21,6 +25,9 @@ LEVEL_COLORS = {
 }
 RESET_COLOR = "\033[0m"
 
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 # Named log levels for configuration
 LOG_LEVELS = {
     "debug": logging.DEBUG,
@@ -31,7 +38,11 @@ LOG_LEVELS = {
 }
 
 class ConsoleLogHandler(logging.Handler):
-    """Enhanced console log handler with colored output and message buffering."""
+    """Enhanced console log handler with colored output and message buffering.
+    
+    Runs on the log writer thread behind the queue, so console I/O never
+    blocks the thread that logged the record.
+    """
     
     def __init__(
         self,
@@ -56,30 +67,11 @@ class ConsoleLogHandler(logging.Handler):
         if formatter:
             self.setFormatter(formatter)
         else:
-            default_formatter = logging.Formatter(
-                "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-                datefmt="%Y-%m-%d %H:%M:%S"
-            )
-            self.setFormatter(default_formatter)
+            self.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT))
         
-        self._buffer: List[str] = []
+        # Ring buffer: the oldest message drops out when it is full
+        self._buffer: Deque[str] = deque(maxlen=buffer_size)
         self._buffer_lock = threading.RLock()
-        
-        # Initialize debug file for persistent logging
-        self._debug_file: Optional[TextIO] = None
-        try:
-            log_dir = Path.home() / ".mmst" / "logs"
-            log_dir.mkdir(parents=True, exist_ok=True)
-            current_date = datetime.now().strftime("%Y-%m-%d")
-            log_path = log_dir / f"mmst-{current_date}.log"
-            self._debug_file = open(log_path, "a", encoding="utf-8")
-            
-            # Write startup separator
-            startup_message = f"\n{'-'*80}\nApplication started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n{'-'*80}\n"
-            self._debug_file.write(startup_message)
-            self._debug_file.flush()
-        except Exception:
-            pass  # Silently continue if we can't create the debug file
 
     def emit(self, record: logging.LogRecord) -> None:
         """Emit a log record."""
@@ -94,44 +86,169 @@ class ConsoleLogHandler(logging.Handler):
             else:
                 console_msg = msg
                 
-            # Output to console
+            # Output to console; flushed by the log writer when it goes idle
             self.stream.write(console_msg + "\n")
-            self.stream.flush()
             
             # Store in buffer with lock
             with self._buffer_lock:
                 self._buffer.append(msg)
-                if len(self._buffer) > self.buffer_size:
-                    self._buffer = self._buffer[-self.buffer_size:]
-            
-            # Also write to debug file if available
-            if self._debug_file:
-                try:
-                    self._debug_file.write(msg + "\n")
-                    self._debug_file.flush()
-                except Exception:
-                    pass  # Don't fail if debug file becomes unavailable
                 
         except Exception:
             self.handleError(record)
     
+    def flush(self) -> None:
+        """Flush the console stream."""
+        with self.lock:
+            try:
+                self.stream.flush()
+            except Exception:
+                pass
+    
     def get_buffer(self) -> List[str]:
         """Get a copy of the current log buffer."""
         with self._buffer_lock:
             return list(self._buffer)
+
+
+class BatchedFileHandler(logging.Handler):
+    """Writes the daily ``mmst-YYYY-MM-DD.log`` file in batches.
+    
+    Lines are collected in the file object's buffer and flushed at most every
+    ``flush_interval`` seconds (immediately for errors), instead of after
+    every record. A file that grows beyond ``max_bytes`` is rotated to
+    ``mmst-YYYY-MM-DD.1.log``, ``.2.log``, ... keeping ``backup_count`` parts.
+    A new file is started when the date changes.
+    """
+    
+    def __init__(
+        self,
+        log_dir: Path,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        flush_interval: float = 1.0,
+        formatter: Optional[logging.Formatter] = None
+    ):
+        """Initialize the file handler.
+        
+        Args:
+            log_dir: Directory for the log files
+            max_bytes: Size at which the current file is rotated (0 disables)
+            backup_count: Number of rotated parts kept per day
+            flush_interval: Maximum seconds a written line stays unflushed
+            formatter: Log formatter to use
+        """
+        super().__init__()
+        self.log_dir = Path(log_dir)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.setFormatter(formatter or logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT))
+        
+        self._file: Optional[TextIO] = None
+        self._date = ""
+        self._size = 0
+        self._last_flush = time.monotonic()
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self._open(datetime.now().strftime("%Y-%m-%d"))
+        
+        # Write startup separator
+        self._file.write(f"\n{'-'*80}\nApplication started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n{'-'*80}\n")
+        self._file.flush()
+    
+    @property
+    def path(self) -> Path:
+        """Path of the file currently written to."""
+        return self.log_dir / f"mmst-{self._date}.log"
+    
+    def _open(self, date: str) -> None:
+        if self._file is not None:
+            self._file.close()
+        self._date = date
+        path = self.path
+        self._file = open(path, "a", encoding="utf-8", buffering=64 * 1024)
+        self._size = path.stat().st_size
+    
+    def _rotate(self) -> None:
+        """Shift ``.N.log`` parts up by one and start an empty file."""
+        self._file.close()
+        self._file = None
+        for index in range(self.backup_count, 0, -1):
+            source = self.log_dir / f"mmst-{self._date}.{index - 1}.log" if index > 1 else self.path
+            target = self.log_dir / f"mmst-{self._date}.{index}.log"
+            if source.exists():
+                try:
+                    os.replace(source, target)
+                except OSError:
+                    pass
+        if self.backup_count <= 0:
+            self.path.unlink(missing_ok=True)
+        self._open(self._date)
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """Emit a log record."""
+        try:
+            msg = self.format(record) + "\n"
+            date = time.strftime("%Y-%m-%d", time.localtime(record.created))
+            if date != self._date:
+                self._open(date)
+            elif self.max_bytes and self._size + len(msg) > self.max_bytes and self._size:
+                self._rotate()
+            self._file.write(msg)
+            self._size += len(msg.encode("utf-8")) if not msg.isascii() else len(msg)
+            
+            now = time.monotonic()
+            if record.levelno >= logging.ERROR or now - self._last_flush >= self.flush_interval:
+                self._file.flush()
+                self._last_flush = now
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self) -> None:
+        """Write all pending lines to disk."""
+        with self.lock:
+            if self._file is not None:
+                try:
+                    self._file.flush()
+                except Exception:
+                    pass
+            self._last_flush = time.monotonic()
     
     def close(self) -> None:
         """Close the handler and release resources."""
-        if self._debug_file:
-            try:
-                shutdown_message = f"\n{'-'*80}\nApplication shutdown at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n{'-'*80}\n"
-                self._debug_file.write(shutdown_message)
-                self._debug_file.close()
-            except Exception:
-                pass
+        with self.lock:
+            if self._file is not None:
+                try:
+                    shutdown_message = f"\n{'-'*80}\nApplication shutdown at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n{'-'*80}\n"
+                    self._file.write(shutdown_message)
+                    self._file.close()
+                except Exception:
+                    pass
+                self._file = None
         super().close()
 
 
+class _BatchingQueueListener(logging.handlers.QueueListener):
+    """Queue listener that flushes its handlers whenever the queue runs dry."""
+    
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler, flush_interval: float = 1.0):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+    
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._monitor, name="log-writer", daemon=True)
+        self._thread.start()
+    
+    def dequeue(self, block: bool) -> Any:
+        while True:
+            try:
+                return self.queue.get(block, self.flush_interval)
+            except queue.Empty:
+                if not block:
+                    raise
+                for handler in self.handlers:
+                    handler.flush()
+
+
 class ConsoleLogger:
     """Main console logger manager for MMST."""
     
@@ -150,16 +267,19 @@ class ConsoleLogger:
         """Initialize the console logger.
         
         Note: This should generally not be called directly. Use get_instance() instead.
+        
+        Loggers only put records on a queue; formatting, console output and
+        file writes happen on the "log-writer" thread.
         """
         self.handler = ConsoleLogHandler()
+        self.file_handler: Optional[BatchedFileHandler] = None
         self.root_logger = logging.getLogger()
         
         # Remove any existing handlers to prevent duplicate logs
         for handler in list(self.root_logger.handlers):
             self.root_logger.removeHandler(handler)
         
-        # Add our handler
-        self.root_logger.addHandler(self.handler)
+        handlers: List[logging.Handler] = [self.handler]
         
         # Create file handler for all logs
         try:
@@ -169,27 +289,45 @@ class ConsoleLogger:
             # Rotate old logs if needed
             self._rotate_logs(log_dir)
             
-            # Create new file handler
-            current_date = datetime.now().strftime("%Y-%m-%d")
-            log_path = log_dir / f"mmst-{current_date}.log"
-            
-            file_handler = logging.FileHandler(log_path, encoding="utf-8")
-            file_formatter = logging.Formatter(
-                "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-                datefmt="%Y-%m-%d %H:%M:%S"
-            )
-            file_handler.setFormatter(file_formatter)
-            file_handler.setLevel(logging.DEBUG)  # Always log everything to file
-            self.root_logger.addHandler(file_handler)
+            self.file_handler = BatchedFileHandler(log_dir)
+            self.file_handler.setLevel(logging.DEBUG)  # Always log everything to file
+            handlers.append(self.file_handler)
         except Exception as e:
             print(f"Failed to set up file logging: {e}")
         
+        # Add the queue handler; the listener thread feeds the real handlers
+        self._queue: queue.Queue = queue.Queue()
+        self.queue_handler = logging.handlers.QueueHandler(self._queue)
+        self.root_logger.addHandler(self.queue_handler)
+        self._listener: Optional[_BatchingQueueListener] = _BatchingQueueListener(self._queue, *handlers)
+        self._listener.start()
+        atexit.register(self.shutdown)
+        
         # Set default level
         self.set_level(logging.INFO)
         
         # Track registered loggers
         self._registered_loggers: Dict[str, logging.Logger] = {}
     
+    def flush(self) -> None:
+        """Wait until all queued records are written and flush the handlers."""
+        if self._listener is None:
+            return
+        self._queue.join()
+        for handler in self._listener.handlers:
+            handler.flush()
+    
+    def shutdown(self) -> None:
+        """Write the remaining records and stop the log writer thread."""
+        listener, self._listener = self._listener, None
+        if listener is None:
+            return
+        self.root_logger.removeHandler(self.queue_handler)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.flush()
+            handler.close()
+    
     def _rotate_logs(self, log_dir: Path, max_logs: int = 30) -> None:
         """Rotate logs to prevent excessive disk usage.
         
@@ -199,7 +337,7 @@ class ConsoleLogger:
         """
         try:
             # Get list of log files
-            pattern = re.compile(r"mmst-\d{4}-\d{2}-\d{2}\.log")
+            pattern = re.compile(r"mmst-\d{4}-\d{2}-\d{2}(\.\d+)?\.log")
             log_files = [f for f in log_dir.glob("*.log") if pattern.match(f.name)]
             
             # Sort by modification time (oldest first)
@@ -290,9 +428,12 @@ class ConsoleLogger:
             Path to the current log file or None if not available
         """
         try:
-            log_dir = Path.home() / ".mmst" / "logs"
-            current_date = datetime.now().strftime("%Y-%m-%d")
-            log_path = log_dir / f"mmst-{current_date}.log"
+            if self.file_handler is not None:
+                log_path = self.file_handler.path
+            else:
+                log_dir = Path.home() / ".mmst" / "logs"
+                current_date = datetime.now().strftime("%Y-%m-%d")
+                log_path = log_dir / f"mmst-{current_date}.log"
             if log_path.exists():
                 return str(log_path)
         except Exception:
@@ -0,0 +1,369 @@
+"""Shared cache of directory listings with stat snapshots.
+
+Explorer, the FileManager ultra view and the Explorer filters all list and
+stat the same directories. :class:`DirectorySnapshotCache` lists a directory
+once with ``os.scandir``, stats every entry and keeps the result keyed by path
+and the directory's mtime, so navigating back to a folder is a dictionary
+lookup. Snapshots are LRU-bounded, can be invalidated precisely by a watchdog
+observer when available, and can be built on a worker thread that reports
+partial listings while slow mounts are still being read.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import datetime
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:  # optional dependency for change notifications
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:  # pragma: no cover - watchdog missing
+    FileSystemEventHandler = object  # type: ignore[assignment,misc]
+    Observer = None  # type: ignore[assignment]
+    WATCHDOG_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Directories modified this recently may change again within the same mtime tick
+RACY_WINDOW_NS = 2_000_000_000
+
+
+@dataclass(frozen=True)
+class EntrySnapshot:
+    """One directory entry with the stat fields the UIs need."""
+
+    name: str
+    path: Path
+    is_dir: bool
+    is_file: bool
+    size: int = 0
+    mtime: float = 0.0
+    ctime: float = 0.0
+    atime: float = 0.0
+
+    def file_times(self) -> Dict[str, datetime.datetime]:
+        """Timestamps in the format of ``FileSystemManager.get_file_times``."""
+        try:
+            return {
+                "created": datetime.datetime.fromtimestamp(self.ctime),
+                "modified": datetime.datetime.fromtimestamp(self.mtime),
+                "accessed": datetime.datetime.fromtimestamp(self.atime),
+            }
+        except (OverflowError, OSError, ValueError):
+            return {}
+
+
+@dataclass
+class DirectorySnapshot:
+    """Listing of a single directory at a given directory mtime."""
+
+    path: Path
+    mtime_ns: int
+    entries: List[EntrySnapshot] = field(default_factory=list)
+    complete: bool = False
+    scanned_at: float = field(default_factory=time.monotonic)
+    checked_at: float = field(default_factory=time.monotonic)
+    racy: bool = False
+    _by_name: Optional[Dict[str, EntrySnapshot]] = field(default=None, repr=False)
+
+    def get(self, name: str) -> Optional[EntrySnapshot]:
+        if self._by_name is None or len(self._by_name) != len(self.entries):
+            self._by_name = {entry.name: entry for entry in self.entries}
+        return self._by_name.get(name)
+
+
+def _entry_from_dirent(entry: os.DirEntry) -> EntrySnapshot:
+    try:
+        is_dir = entry.is_dir()
+        is_file = entry.is_file()
+    except OSError:
+        is_dir = is_file = False
+    try:
+        stat = entry.stat()
+    except OSError:
+        return EntrySnapshot(entry.name, Path(entry.path), is_dir, is_file)
+    return EntrySnapshot(
+        entry.name,
+        Path(entry.path),
+        is_dir,
+        is_file,
+        stat.st_size,
+        stat.st_mtime,
+        stat.st_ctime,
+        stat.st_atime,
+    )
+
+
+class _InvalidationHandler(FileSystemEventHandler):  # type: ignore[misc]
+    def __init__(self, cache: "DirectorySnapshotCache") -> None:
+        super().__init__()
+        self._cache = cache
+
+    def on_any_event(self, event) -> None:  # pragma: no cover - timing dependent
+        for attr in ("src_path", "dest_path"):
+            raw = getattr(event, attr, None)
+            if raw:
+                path = Path(os.fsdecode(raw))
+                self._cache.invalidate(path.parent)
+                if getattr(event, "is_directory", False):
+                    self._cache.invalidate(path)
+
+
+class _Scan:
+    """In-flight background listing shared by concurrent requests."""
+
+    def __init__(self) -> None:
+        self.future: concurrent.futures.Future
+        self.on_partial: List[Callable[[DirectorySnapshot], None]] = []
+        self.on_done: List[Callable[[Optional[DirectorySnapshot]], None]] = []
+
+
+class DirectorySnapshotCache:
+    """LRU cache of :class:`DirectorySnapshot` objects keyed by directory path.
+
+    A cached snapshot is served while the directory's mtime is unchanged. Files
+    modified in place do not touch the directory mtime, so without a watchdog
+    observer snapshots are additionally refreshed after ``max_age`` seconds.
+    """
+
+    def __init__(
+        self,
+        max_directories: int = 64,
+        max_age: Optional[float] = 300.0,
+        max_workers: int = 2,
+        batch_size: int = 512,
+        revalidate_interval: float = 1.0,
+    ) -> None:
+        self._max_directories = max(1, int(max_directories))
+        self._max_age = max_age
+        self._revalidate_interval = revalidate_interval
+        self._batch_size = max(1, int(batch_size))
+        self._lock = threading.RLock()
+        self._snapshots: "OrderedDict[str, DirectorySnapshot]" = OrderedDict()
+        self._scans: Dict[str, _Scan] = {}
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, int(max_workers)), thread_name_prefix="dir-snapshot"
+        )
+        self._observer = None
+        self._watches: Dict[str, object] = {}
+
+    # ------------------------------------------------------------------ lookup
+    def get(self, path: Path) -> Optional[DirectorySnapshot]:
+        """Return a valid complete snapshot of ``path`` without scanning."""
+        key = os.fspath(path)
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+        if snapshot is None or not self._is_valid(snapshot):
+            return None
+        with self._lock:
+            if key in self._snapshots:
+                self._snapshots.move_to_end(key)
+        return snapshot
+
+    def snapshot(self, path: Path) -> Optional[DirectorySnapshot]:
+        """Return a snapshot of ``path``, listing it synchronously if needed.
+
+        Returns ``None`` if the directory cannot be read.
+        """
+        cached = self.get(path)
+        if cached is not None:
+            return cached
+        return self._scan(Path(path))
+
+    def lookup(self, path: Path) -> Optional[EntrySnapshot]:
+        """Return the cached entry for ``path`` if its parent has a valid snapshot."""
+        path = Path(path)
+        snapshot = self.get(path.parent)
+        return snapshot.get(path.name) if snapshot is not None else None
+
+    def snapshot_async(
+        self,
+        path: Path,
+        on_done: Optional[Callable[[Optional[DirectorySnapshot]], None]] = None,
+        on_partial: Optional[Callable[[DirectorySnapshot], None]] = None,
+    ) -> concurrent.futures.Future:
+        """List ``path`` on a worker thread.
+
+        ``on_partial`` receives growing incomplete snapshots while the listing
+        runs and ``on_done`` the final snapshot (or ``None`` on error). Both are
+        called from the worker thread; a valid cached snapshot is delivered
+        immediately from the calling thread instead.
+        """
+        path = Path(path)
+        cached = self.get(path)
+        if cached is not None:
+            if on_done is not None:
+                on_done(cached)
+            future: concurrent.futures.Future = concurrent.futures.Future()
+            future.set_result(cached)
+            return future
+
+        key = os.fspath(path)
+        with self._lock:
+            # Callbacks are registered under the lock the worker takes to read them
+            scan = self._scans.get(key)
+            if scan is None:
+                scan = _Scan()
+                self._scans[key] = scan
+                scan.future = self._executor.submit(self._run_scan, path, scan)
+            if on_partial is not None:
+                scan.on_partial.append(on_partial)
+            if on_done is not None:
+                scan.on_done.append(on_done)
+            return scan.future
+
+    # ------------------------------------------------------------ invalidation
+    def invalidate(self, path: Path) -> None:
+        """Forget the snapshot of directory ``path``."""
+        key = os.fspath(path)
+        with self._lock:
+            self._snapshots.pop(key, None)
+            self._unwatch(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._snapshots):
+                self._unwatch(key)
+            self._snapshots.clear()
+
+    def enable_watching(self) -> bool:
+        """Invalidate cached directories on filesystem events (requires watchdog)."""
+        if not WATCHDOG_AVAILABLE:
+            return False
+        with self._lock:
+            if self._observer is not None:
+                return True
+            try:
+                observer = Observer()
+                observer.daemon = True
+                observer.start()
+            except Exception as exc:  # pragma: no cover - platform specific
+                logger.debug("Directory watching unavailable: %s", exc)
+                return False
+            self._observer = observer
+            for key in self._snapshots:
+                self._watch(key)
+        return True
+
+    @property
+    def watching(self) -> bool:
+        return self._observer is not None
+
+    def shutdown(self) -> None:
+        with self._lock:
+            observer, self._observer = self._observer, None
+            self._watches.clear()
+        if observer is not None:
+            try:
+                observer.stop()
+                observer.join(timeout=2.0)
+            except Exception:  # pragma: no cover - defensive
+                pass
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ---------------------------------------------------------------- internals
+    def _is_valid(self, snapshot: DirectorySnapshot) -> bool:
+        if snapshot.racy:
+            return False
+        now = time.monotonic()
+        if self._max_age is not None and not self.watching:
+            if now - snapshot.scanned_at > self._max_age:
+                return False
+        if now - snapshot.checked_at < self._revalidate_interval:
+            return True
+        try:
+            valid = os.stat(snapshot.path).st_mtime_ns == snapshot.mtime_ns
+        except OSError:
+            return False
+        if valid:
+            snapshot.checked_at = now
+        return valid
+
+    def _scan(
+        self, path: Path, on_partial: Optional[Callable[[DirectorySnapshot], None]] = None
+    ) -> Optional[DirectorySnapshot]:
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            snapshot = DirectorySnapshot(path=path, mtime_ns=mtime_ns)
+            with os.scandir(path) as it:
+                for entry in it:
+                    snapshot.entries.append(_entry_from_dirent(entry))
+                    if on_partial is not None and len(snapshot.entries) % self._batch_size == 0:
+                        on_partial(DirectorySnapshot(path, mtime_ns, list(snapshot.entries)))
+        except OSError as exc:
+            logger.debug("Cannot list %s: %s", path, exc)
+            return None
+        snapshot.complete = True
+        # A change within the same mtime tick as the listing would go unnoticed
+        snapshot.racy = time.time_ns() - mtime_ns < RACY_WINDOW_NS
+        self._store(snapshot)
+        return snapshot
+
+    def _run_scan(self, path: Path, scan: _Scan) -> Optional[DirectorySnapshot]:
+        def _partial(snapshot: DirectorySnapshot) -> None:
+            with self._lock:
+                callbacks = list(scan.on_partial)
+            for callback in callbacks:
+                try:
+                    callback(snapshot)
+                except Exception:  # pragma: no cover - listener errors stay local
+                    logger.exception("Partial listing callback failed for %s", path)
+
+        snapshot = self._scan(path, _partial)
+        with self._lock:
+            self._scans.pop(os.fspath(path), None)
+            callbacks = list(scan.on_done)
+        for callback in callbacks:
+            try:
+                callback(snapshot)
+            except Exception:  # pragma: no cover - listener errors stay local
+                logger.exception("Listing callback failed for %s", path)
+        return snapshot
+
+    def _store(self, snapshot: DirectorySnapshot) -> None:
+        key = os.fspath(snapshot.path)
+        with self._lock:
+            self._snapshots[key] = snapshot
+            self._snapshots.move_to_end(key)
+            self._watch(key)
+            while len(self._snapshots) > self._max_directories:
+                evicted, _ = self._snapshots.popitem(last=False)
+                self._unwatch(evicted)
+
+    def _watch(self, key: str) -> None:
+        if self._observer is None or key in self._watches:
+            return
+        try:
+            self._watches[key] = self._observer.schedule(_InvalidationHandler(self), key, recursive=False)
+        except Exception as exc:  # pragma: no cover - e.g. inotify watch limit
+            logger.debug("Cannot watch %s: %s", key, exc)
+
+    def _unwatch(self, key: str) -> None:
+        watch = self._watches.pop(key, None)
+        if watch is not None and self._observer is not None:
+            try:
+                self._observer.unschedule(watch)
+            except Exception:  # pragma: no cover - already gone
+                pass
+
+
+_shared_cache: Optional[DirectorySnapshotCache] = None
+_shared_lock = threading.Lock()
+
+
+def shared_snapshot_cache() -> DirectorySnapshotCache:
+    """Process-wide cache used by Explorer and the FileManager views."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = DirectorySnapshotCache()
+            _shared_cache.enable_watching()
+        return _shared_cache
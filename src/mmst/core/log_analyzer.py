@@ -1,17 +1,70 @@
 from __future__ import annotations
 
+import os
 import re
-from typing import Dict, List, Optional, Tuple
-from collections import Counter
-import time
-from datetime import datetime, timedelta
+import threading
+from typing import Deque, Dict, List, Optional, Tuple
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from .log_store import LogStore, from_seconds, to_seconds
+
+# Directory the console logger writes the daily ``mmst-YYYY-MM-DD.log`` files to
+LOG_DIR = Path.home() / ".mmst" / "logs"
+LOG_FILE_PATTERN = "mmst-*.log"
+
+ERROR_LEVELS = ('ERROR', 'CRITICAL')
+
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Placeholders used to group messages into patterns
+_NUMBER_RE = re.compile(r'\d+')
+_UUID_RE = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+_PATH_RE = re.compile(r'[/\\][^\s/\\]+')
+
+
+def parse_timestamp(text: str) -> datetime:
+    """Parse a ``YYYY-MM-DD HH:MM:SS`` timestamp.
+
+    Slices the fixed-width fields instead of going through ``strptime``,
+    which is several times slower.
+
+    Args:
+        text: The timestamp text
+
+    Returns:
+        The parsed datetime
+    """
+    if len(text) == 19:
+        return datetime(
+            int(text[0:4]), int(text[5:7]), int(text[8:10]),
+            int(text[11:13]), int(text[14:16]), int(text[17:19])
+        )
+    return datetime.strptime(" ".join(text.split()), _TIMESTAMP_FORMAT)
+
+
+def message_pattern(message: str) -> str:
+    """Reduce a message to its pattern by replacing numbers, UUIDs and paths.
+
+    Args:
+        message: The log message
+
+    Returns:
+        The simplified message
+    """
+    simplified = _NUMBER_RE.sub('N', message)
+    simplified = _UUID_RE.sub('UUID', simplified)
+    return _PATH_RE.sub('/PATH', simplified)
 
 
 class LogEntry:
     """Represents a parsed log entry with its components."""
-    
+
     def __init__(
-        self, 
+        self,
         timestamp: datetime,
         level: str,
         component: str,
@@ -19,7 +72,7 @@ class LogEntry:
         original_text: str
     ):
         """Initialize a log entry.
-        
+
         Args:
             timestamp: The log entry timestamp
             level: The log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -35,190 +88,338 @@ class LogEntry:
 
 
 class LogAnalyzer:
-    """Analyzes log entries for patterns, errors, and statistics."""
-    
+    """Analyzes log entries for patterns, errors, and statistics.
+
+    Every parsed line is added to a columnar :class:`~.log_store.LogStore`
+    (timestamp, level, component and message template), so the queries are
+    vectorised NumPy aggregations instead of walks over the entries.
+    """
+
     # Regular expression to parse log entries with the format:
     # 2023-04-05 12:34:56 [LEVEL] component: message
     LOG_PATTERN = re.compile(
         r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\s+\[(DEBUG|INFO|WARNING|ERROR|CRITICAL)\]\s+([^:]+):\s*(.*)'
     )
-    
+
+    # Error entries kept for get_error_entries() (None keeps all)
+    max_error_entries: Optional[int] = None
+
     def __init__(self):
         """Initialize the log analyzer."""
         self._entries: List[LogEntry] = []
-    
+        self._reset()
+
+    def _reset(self) -> None:
+        """Drop all stored entries."""
+        if hasattr(self, "_store"):
+            self._store.clear()
+        else:
+            self._store = LogStore()
+        self._errors: Deque[LogEntry] = deque(maxlen=self.max_error_entries)
+        self._last_timestamp: Tuple[str, Optional[datetime], int] = ("", None, 0)
+
+    @property
+    def store(self) -> LogStore:
+        """The columnar store holding all analyzed entries."""
+        return self._store
+
+    @property
+    def entry_count(self) -> int:
+        """Number of entries analyzed so far."""
+        return len(self._store)
+
+    def _ingest(self, line: str) -> Optional[LogEntry]:
+        """Parse one line and add it to the store.
+
+        Args:
+            line: A single log line
+
+        Returns:
+            The parsed entry, or None if the line is not a log entry
+        """
+        match = self.LOG_PATTERN.match(line)
+        if not match:
+            return None
+        timestamp_str, level, component, message = match.groups()
+        # Consecutive lines mostly share their second
+        cached_str, timestamp, seconds = self._last_timestamp
+        if timestamp_str != cached_str or timestamp is None:
+            try:
+                timestamp = parse_timestamp(timestamp_str)
+            except ValueError:
+                # If we can't parse the timestamp, skip this entry
+                return None
+            seconds = to_seconds(timestamp)
+            self._last_timestamp = (timestamp_str, timestamp, seconds)
+
+        entry = LogEntry(
+            timestamp=timestamp,
+            level=level,
+            component=component,
+            message=message,
+            original_text=line
+        )
+        self._store.append(seconds, level, component, message_pattern(message))
+        if level in ERROR_LEVELS:
+            self._errors.append(entry)
+        return entry
+
     def parse_logs(self, log_text: str) -> List[LogEntry]:
         """Parse log text into structured log entries.
-        
+
         Args:
             log_text: The log text to parse
-            
+
         Returns:
             List of parsed LogEntry objects
         """
+        self._reset()
         self._entries = []
-        
+
         for line in log_text.splitlines():
             line = line.strip()
             if not line:
                 continue
-                
-            match = self.LOG_PATTERN.match(line)
-            if match:
-                try:
-                    timestamp_str, level, component, message = match.groups()
-                    timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-                    
-                    entry = LogEntry(
-                        timestamp=timestamp,
-                        level=level,
-                        component=component,
-                        message=message,
-                        original_text=line
-                    )
-                    self._entries.append(entry)
-                except Exception:
-                    # If we can't parse the timestamp, skip this entry
-                    pass
-        
+            entry = self._ingest(line)
+            if entry is not None:
+                self._entries.append(entry)
+
         return self._entries
-    
+
     def count_by_level(self) -> Dict[str, int]:
         """Count log entries by level.
-        
+
         Returns:
             Dictionary of log levels and their counts
         """
-        return Counter(entry.level for entry in self._entries)
-    
+        return self._store.level_counts()
+
     def count_by_component(self) -> Dict[str, int]:
         """Count log entries by component.
-        
+
         Returns:
             Dictionary of components and their counts
         """
-        return Counter(entry.component for entry in self._entries)
-    
+        return self._store.component_counts()
+
     def get_error_entries(self) -> List[LogEntry]:
         """Get all error and critical entries.
-        
+
         Returns:
             List of error and critical log entries
         """
-        return [entry for entry in self._entries 
-                if entry.level in ('ERROR', 'CRITICAL')]
-    
+        return list(self._errors)
+
     def get_top_error_components(self, limit: int = 5) -> List[Tuple[str, int]]:
         """Get components with the most errors.
-        
+
         Args:
             limit: Maximum number of components to return
-            
+
         Returns:
             List of (component, error_count) tuples
         """
-        error_components = Counter()
-        for entry in self._entries:
-            if entry.level in ('ERROR', 'CRITICAL'):
-                error_components[entry.component] += 1
-        
-        return error_components.most_common(limit)
-    
+        return self._store.top_components(limit, errors_only=True)
+
     def get_time_distribution(self, interval_minutes: int = 5) -> Dict[datetime, int]:
         """Get distribution of log entries over time.
-        
+
         Args:
             interval_minutes: Size of time intervals in minutes
-            
+
         Returns:
             Dictionary mapping interval start times to entry counts
         """
-        if not self._entries:
-            return {}
-            
-        # Find min and max timestamps
-        min_time = min(entry.timestamp for entry in self._entries)
-        max_time = max(entry.timestamp for entry in self._entries)
-        
-        # Round down to nearest interval
-        interval = timedelta(minutes=interval_minutes)
-        min_time = min_time.replace(
-            minute=(min_time.minute // interval_minutes) * interval_minutes,
-            second=0,
-            microsecond=0
-        )
-        
-        # Create intervals
-        intervals = {}
-        current = min_time
-        while current <= max_time:
-            intervals[current] = 0
-            current += interval
-        
-        # Count entries in each interval
-        for entry in self._entries:
-            interval_start = entry.timestamp.replace(
-                minute=(entry.timestamp.minute // interval_minutes) * interval_minutes,
-                second=0,
-                microsecond=0
-            )
-            intervals[interval_start] += 1
-        
-        return intervals
-    
+        starts, counts = self._store.histogram(interval_minutes * 60)
+        return {from_seconds(start): int(count) for start, count in zip(starts, counts)}
+
     def get_common_patterns(self, limit: int = 10) -> List[Tuple[str, int]]:
         """Find common message patterns.
-        
+
         Args:
             limit: Maximum number of patterns to return
-            
+
         Returns:
             List of (pattern, count) tuples
         """
-        # Simplify messages by removing specific values like timestamps, IDs, paths
-        patterns = []
-        for entry in self._entries:
-            # Replace numbers, UUIDs, paths, etc. with placeholders
-            simplified = re.sub(r'\d+', 'N', entry.message)
-            simplified = re.sub(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', 'UUID', simplified)
-            simplified = re.sub(r'[/\\][^\s/\\]+', '/PATH', simplified)
-            patterns.append(simplified)
-        
-        return Counter(patterns).most_common(limit)
-    
+        return self._store.top_templates(limit)
+
     def get_error_rate(self, interval_minutes: int = 5) -> Dict[datetime, float]:
         """Calculate error rate over time.
-        
+
         Args:
             interval_minutes: Size of time intervals in minutes
-            
+
         Returns:
             Dictionary mapping interval start times to error rates
         """
-        if not self._entries:
-            return {}
-            
-        # Get time distribution for all entries
-        all_entries = self.get_time_distribution(interval_minutes)
-        
-        # Get time distribution for error entries
-        error_entries = {}
-        for entry in self._entries:
-            if entry.level in ('ERROR', 'CRITICAL'):
-                interval_start = entry.timestamp.replace(
-                    minute=(entry.timestamp.minute // interval_minutes) * interval_minutes,
-                    second=0,
-                    microsecond=0
-                )
-                error_entries[interval_start] = error_entries.get(interval_start, 0) + 1
-        
-        # Calculate error rates
-        error_rates = {}
-        for interval, count in all_entries.items():
-            if count > 0:
-                error_count = error_entries.get(interval, 0)
-                error_rates[interval] = error_count / count
-            else:
-                error_rates[interval] = 0.0
-        
-        return error_rates
\ No newline at end of file
+        starts, rates = self._store.error_rate(interval_minutes * 60)
+        return {from_seconds(start): float(rate) for start, rate in zip(starts, rates)}
+
+    def get_level_timestamps(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Dict[str, List[datetime]]:
+        """Get the minutes with activity per level, for timeline markers.
+
+        Args:
+            start: Optional earliest timestamp to include
+            end: Optional latest timestamp to include
+
+        Returns:
+            Dictionary mapping log levels to sorted minute timestamps
+        """
+        return {
+            level: [from_seconds(minute) for minute in minutes]
+            for level, minutes in self._store.level_minutes(start, end).items()
+        }
+
+    def get_heatmap(
+        self,
+        days: int = 7,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        today: Optional[datetime] = None
+    ) -> np.ndarray:
+        """Get the number of entries per hour of day for the last days.
+
+        Args:
+            days: Number of days to cover
+            start: Optional earliest timestamp to include
+            end: Optional latest timestamp to include
+            today: Day shown first (defaults to now)
+
+        Returns:
+            A (24, days) array of counts; column d is d days ago
+        """
+        return self._store.heatmap(days, today or datetime.now(), start, end)
+
+
+class IncrementalLogAnalyzer(LogAnalyzer):
+    """Log analyzer that tails the log files instead of re-parsing them.
+
+    The byte offset reached in every file is remembered, so each
+    :meth:`refresh` only reads and parses lines appended since the previous
+    call. A file that was truncated or replaced is read again from the start,
+    while a file that was only renamed (size-based rotation) is not.
+    Only the most recent error entries are kept as objects; everything else
+    lives in the columnar store.
+    """
+
+    max_error_entries = 500
+
+    # Bytes read per chunk when catching up on a large file
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, log_dir: Optional[Path] = None, pattern: str = LOG_FILE_PATTERN):
+        """Initialize the incremental analyzer.
+
+        Args:
+            log_dir: Directory containing the log files
+            pattern: Glob pattern of the log files
+        """
+        super().__init__()
+        self._log_dir = Path(log_dir) if log_dir is not None else LOG_DIR
+        self._pattern = pattern
+        # (device, inode) -> byte offset of the first unread line; keyed by
+        # inode so a size-rotated file keeps its offset under its new name
+        self._offsets: Dict[Tuple[int, int], int] = {}
+        self._lock = threading.RLock()
+
+    def parse_logs(self, log_text: str) -> List[LogEntry]:
+        """Parse log text into structured log entries.
+
+        Replaces the stored entries, so the file offsets are forgotten as well.
+
+        Args:
+            log_text: The log text to parse
+
+        Returns:
+            List of parsed LogEntry objects
+        """
+        with self._lock:
+            self._offsets.clear()
+            entries = super().parse_logs(log_text)
+            self._entries = []
+            return entries
+
+    def refresh(self) -> int:
+        """Parse the lines appended to the log files since the last call.
+
+        Returns:
+            Number of new log entries
+        """
+        with self._lock:
+            try:
+                paths = sorted(self._log_dir.glob(self._pattern))
+            except OSError:
+                return 0
+            files = []
+            for path in paths:
+                try:
+                    files.append((path, path.stat()))
+                except OSError:
+                    continue
+            seen = {(stat.st_dev, stat.st_ino) for _path, stat in files}
+            for stale in set(self._offsets) - seen:
+                del self._offsets[stale]
+            return sum(self._tail(path, stat) for path, stat in files)
+
+    def reset(self) -> None:
+        """Forget all entries and offsets; the next refresh starts over."""
+        with self._lock:
+            self._offsets.clear()
+            self._reset()
+
+    def _tail(self, path: Path, stat: os.stat_result) -> int:
+        key = (stat.st_dev, stat.st_ino)
+        offset = self._offsets.get(key, 0)
+        if stat.st_size < offset:
+            offset = 0
+        if stat.st_size == offset:
+            self._offsets[key] = offset
+            return 0
+
+        added = 0
+        try:
+            with open(path, "rb") as handle:
+                handle.seek(offset)
+                pending = b""
+                while True:
+                    chunk = handle.read(self.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    data = pending + chunk
+                    end = data.rfind(b"\n")
+                    if end < 0:
+                        pending = data
+                        continue
+                    # An incomplete last line stays unread until it is finished
+                    pending = data[end + 1:]
+                    offset += end + 1
+                    for line in data[:end].decode("utf-8", errors="replace").splitlines():
+                        line = line.strip()
+                        if line and self._ingest(line) is not None:
+                            added += 1
+        except OSError:
+            pass
+        self._offsets[key] = offset
+        return added
+
+
+_shared_analyzer: Optional[IncrementalLogAnalyzer] = None
+_shared_lock = threading.Lock()
+
+
+def shared_log_analyzer() -> IncrementalLogAnalyzer:
+    """Process-wide analyzer over the application log files.
+
+    Returns:
+        The IncrementalLogAnalyzer shared by all log widgets
+    """
+    global _shared_analyzer
+    with _shared_lock:
+        if _shared_analyzer is None:
+            _shared_analyzer = IncrementalLogAnalyzer()
+        return _shared_analyzer
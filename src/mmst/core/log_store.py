@@ -0,0 +1,269 @@
+"""Columnar in-memory storage for parsed log entries.
+
+Entries are kept as parallel NumPy columns instead of Python objects:
+timestamps as seconds since 1970-01-01 (naive local time, like the log
+files), levels as small integer codes and components and message templates
+as ids into interned string tables. Templates are computed once when a line
+is added, so aggregations never touch the message text again and each
+histogram, heatmap or error rate is a single ``np.bincount`` over a column.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+LEVEL_CODES = {level: code for code, level in enumerate(LEVELS)}
+# Levels at or above this code count as errors
+ERROR_CODE = LEVEL_CODES["ERROR"]
+
+EPOCH = datetime(1970, 1, 1)
+_EPOCH_ORDINAL = EPOCH.toordinal()
+
+
+def to_seconds(timestamp: datetime) -> int:
+    """Convert a naive datetime into seconds since :data:`EPOCH`."""
+    return (
+        (timestamp.toordinal() - _EPOCH_ORDINAL) * 86400
+        + timestamp.hour * 3600 + timestamp.minute * 60 + timestamp.second
+    )
+
+
+def from_seconds(seconds: int) -> datetime:
+    """Convert seconds since :data:`EPOCH` back into a naive datetime."""
+    return EPOCH + timedelta(seconds=int(seconds))
+
+
+class LogStore:
+    """Append-only columnar store of log entries.
+
+    Appends go to small Python lists first and are moved into the NumPy
+    columns in bulk, so adding a line stays cheap and the columns grow by
+    doubling their capacity.
+    """
+
+    # Pending rows moved into the columns at once
+    FLUSH_ROWS = 65536
+
+    def __init__(self, capacity: int = 4096):
+        """Initialize an empty store.
+
+        Args:
+            capacity: Initial number of rows allocated per column
+        """
+        self._initial_capacity = max(16, capacity)
+        self.clear()
+
+    def clear(self) -> None:
+        """Remove all entries and interned strings."""
+        capacity = self._initial_capacity
+        self._seconds = np.empty(capacity, dtype=np.int64)
+        self._levels = np.empty(capacity, dtype=np.uint8)
+        self._components = np.empty(capacity, dtype=np.int32)
+        self._templates = np.empty(capacity, dtype=np.int32)
+        self._size = 0
+        self._pending: Tuple[List[int], List[int], List[int], List[int]] = ([], [], [], [])
+        self._component_ids: Dict[str, int] = {}
+        self._component_names: List[str] = []
+        self._template_ids: Dict[str, int] = {}
+        self._template_names: List[str] = []
+
+    def __len__(self) -> int:
+        return self._size + len(self._pending[0])
+
+    # -- ingest ----------------------------------------------------------
+    @staticmethod
+    def _intern(value: str, ids: Dict[str, int], names: List[str]) -> int:
+        code = ids.get(value)
+        if code is None:
+            code = ids[value] = len(names)
+            names.append(value)
+        return code
+
+    def append(self, seconds: int, level: str, component: str, template: str) -> None:
+        """Add one entry.
+
+        Args:
+            seconds: Timestamp in seconds since :data:`EPOCH`
+            level: Log level name (one of :data:`LEVELS`)
+            component: Component or logger name
+            template: Message with variable parts replaced by placeholders
+        """
+        seconds_col, levels, components, templates = self._pending
+        seconds_col.append(seconds)
+        levels.append(LEVEL_CODES[level])
+        components.append(self._intern(component, self._component_ids, self._component_names))
+        templates.append(self._intern(template, self._template_ids, self._template_names))
+        if len(seconds_col) >= self.FLUSH_ROWS:
+            self._flush()
+
+    def _flush(self) -> None:
+        pending = self._pending
+        count = len(pending[0])
+        if not count:
+            return
+        needed = self._size + count
+        if needed > len(self._seconds):
+            capacity = len(self._seconds)
+            while capacity < needed:
+                capacity *= 2
+            for name in ("_seconds", "_levels", "_components", "_templates"):
+                column = getattr(self, name)
+                grown = np.empty(capacity, dtype=column.dtype)
+                grown[:self._size] = column[:self._size]
+                setattr(self, name, grown)
+        end = self._size + count
+        self._seconds[self._size:end] = pending[0]
+        self._levels[self._size:end] = pending[1]
+        self._components[self._size:end] = pending[2]
+        self._templates[self._size:end] = pending[3]
+        self._size = end
+        self._pending = ([], [], [], [])
+
+    # -- columns ---------------------------------------------------------
+    def columns(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return the seconds, level, component and template columns.
+
+        Args:
+            start: Optional earliest timestamp to include
+            end: Optional latest timestamp to include
+
+        Returns:
+            Views (or filtered copies) of the four columns
+        """
+        self._flush()
+        size = self._size
+        seconds = self._seconds[:size]
+        levels = self._levels[:size]
+        components = self._components[:size]
+        templates = self._templates[:size]
+        if start is None and end is None:
+            return seconds, levels, components, templates
+        mask = np.ones(size, dtype=bool)
+        if start is not None:
+            mask &= seconds >= to_seconds(start)
+        if end is not None:
+            mask &= seconds <= to_seconds(end)
+        return seconds[mask], levels[mask], components[mask], templates[mask]
+
+    # -- aggregations ----------------------------------------------------
+    def level_counts(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict[str, int]:
+        """Number of entries per level (levels without entries are omitted)."""
+        _seconds, levels, _components, _templates = self.columns(start, end)
+        counts = np.bincount(levels, minlength=len(LEVELS))
+        return {LEVELS[code]: int(count) for code, count in enumerate(counts) if count}
+
+    def component_counts(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        errors_only: bool = False,
+    ) -> Dict[str, int]:
+        """Number of entries (or error entries) per component."""
+        _seconds, levels, components, _templates = self.columns(start, end)
+        if errors_only:
+            components = components[levels >= ERROR_CODE]
+        counts = np.bincount(components, minlength=len(self._component_names))
+        return {self._component_names[code]: int(counts[code]) for code in np.flatnonzero(counts)}
+
+    def top_components(self, limit: int, errors_only: bool = False) -> List[Tuple[str, int]]:
+        """Components with the most (error) entries, most frequent first."""
+        counts = self.component_counts(errors_only=errors_only)
+        return sorted(counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def top_templates(self, limit: int) -> List[Tuple[str, int]]:
+        """Most frequent message templates, most frequent first."""
+        _seconds, _levels, _components, templates = self.columns()
+        counts = np.bincount(templates, minlength=len(self._template_names))
+        # Stable sort keeps first-seen order among equal counts
+        order = np.argsort(-counts, kind="stable")[:limit]
+        return [(self._template_names[code], int(counts[code])) for code in order if counts[code]]
+
+    def histogram(
+        self,
+        interval_seconds: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        errors_only: bool = False,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Count entries per time interval.
+
+        Intervals are aligned to multiples of ``interval_seconds`` since the
+        epoch and cover the whole range of entries, including empty ones.
+
+        Returns:
+            Interval start seconds and the matching counts
+        """
+        seconds, levels, _components, _templates = self.columns(start, end)
+        if not len(seconds):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        bins = seconds // interval_seconds
+        first = int(bins.min())
+        length = int(bins.max()) - first + 1
+        if errors_only:
+            bins = bins[levels >= ERROR_CODE]
+        counts = np.bincount(bins - first, minlength=length)
+        starts = (first + np.arange(length, dtype=np.int64)) * interval_seconds
+        return starts, counts
+
+    def error_rate(
+        self,
+        interval_seconds: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Share of error entries per time interval (0 for empty intervals)."""
+        seconds, levels, _components, _templates = self.columns(start, end)
+        if not len(seconds):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+        bins = seconds // interval_seconds
+        first = int(bins.min())
+        totals = np.bincount(bins - first)
+        errors = np.bincount(bins - first, weights=levels >= ERROR_CODE, minlength=len(totals))
+        rates = np.divide(errors, totals, out=np.zeros(len(totals)), where=totals > 0)
+        starts = (first + np.arange(len(totals), dtype=np.int64)) * interval_seconds
+        return starts, rates
+
+    def heatmap(
+        self,
+        days: int,
+        today: datetime,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> np.ndarray:
+        """Entries per hour of day and day offset.
+
+        Args:
+            days: Number of days to cover, ending with ``today``
+            today: The day shown in column 0
+            start: Optional earliest timestamp to include
+            end: Optional latest timestamp to include
+
+        Returns:
+            A ``(24, days)`` array; column ``d`` is ``d`` days before ``today``
+        """
+        day_start = to_seconds(today.replace(hour=0, minute=0, second=0, microsecond=0))
+        first = day_start - (days - 1) * 86400
+        seconds, _levels, _components, _templates = self.columns(start, end)
+        seconds = seconds[(seconds >= first) & (seconds < day_start + 86400)]
+        days_ago = (day_start + 86400 - 1 - seconds) // 86400
+        hours = (seconds % 86400) // 3600
+        counts = np.bincount(days_ago * 24 + hours, minlength=days * 24)
+        return counts.reshape(days, 24).T
+
+    def level_minutes(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Distinct minutes with entries per level, sorted (timeline markers)."""
+        seconds, levels, _components, _templates = self.columns(start, end)
+        keys = np.unique(levels.astype(np.int64) * (1 << 40) + seconds // 60)
+        codes, minutes = keys >> 40, (keys & ((1 << 40) - 1)) * 60
+        return {LEVELS[code]: minutes[codes == code] for code in np.unique(codes)}
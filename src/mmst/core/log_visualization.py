@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import math
 import re
-from typing import Dict, List, Tuple, Optional, Any, Union
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional, Any, Union
 from datetime import datetime, timedelta
 from collections import Counter, defaultdict
 
+import numpy as np
+
 from PySide6.QtCore import Qt, QPointF, QRectF, QSize  # type: ignore[import-not-found]
 from PySide6.QtGui import (  # type: ignore[import-not-found]
     QPainter, QPen, QBrush, QColor, QPainterPath, QLinearGradient,
@@ -13,9 +15,12 @@ from PySide6.QtGui import (  # type: ignore[import-not-found]
 )
 from PySide6.QtWidgets import (  # type: ignore[import-not-found]
     QWidget, QVBoxLayout, QHBoxLayout, QComboBox,
-    QLabel, QFrame, QSizePolicy
+    QLabel, QFrame, QSizePolicy, QSplitter
 )
 
+if TYPE_CHECKING:
+    from .log_analyzer import LogAnalyzer
+
 # Define colors for different log levels
 LOG_LEVEL_COLORS = {
     "DEBUG": QColor(100, 100, 255),     # Blue
@@ -92,8 +97,8 @@ class LogTimelineChart(QWidget):
             if all_timestamps:
                 start_time = min(all_timestamps)
                 end_time = max(all_timestamps)
-                # Add a small buffer
-                buffer = (end_time - start_time) * 0.05
+                # Add a small buffer (minute markers may all share one minute)
+                buffer = max((end_time - start_time) * 0.05, timedelta(minutes=1))
                 start_time -= buffer
                 end_time += buffer
                 self._time_range = (start_time, end_time)
@@ -920,26 +925,28 @@ class LogHeatmapChart(QWidget):
             timestamps: List of log timestamps
             days_to_show: Number of days to show in the heatmap
         """
-        # Group timestamps by hour and day
-        hour_counts: Dict[Tuple[int, int], int] = {}
-        
         # Get current date
         today = datetime.now().date()
         
-        # Initialize all hours with zero
-        for day in range(days_to_show):
-            for hour in range(24):
-                hour_counts[(hour, day)] = 0
-        
-        # Count logs by hour and day
-        for timestamp in timestamps:
-            days_ago = (today - timestamp.date()).days
-            if 0 <= days_ago < days_to_show:
-                hour = timestamp.hour
-                hour_counts[(hour, days_ago)] = hour_counts.get((hour, days_ago), 0) + 1
+        # Count logs by hour and day in one bincount
+        days_ago = np.array([(today - timestamp.date()).days for timestamp in timestamps], dtype=np.int64)
+        hours = np.array([timestamp.hour for timestamp in timestamps], dtype=np.int64)
+        visible = (days_ago >= 0) & (days_ago < days_to_show)
+        counts = np.bincount(days_ago[visible] * 24 + hours[visible], minlength=days_to_show * 24)
+        self.set_counts(counts.reshape(days_to_show, 24).T)
+    
+    def set_counts(self, counts: np.ndarray) -> None:
+        """Set precomputed counts, e.g. from ``LogAnalyzer.get_heatmap()``.
         
-        self._hour_counts = hour_counts
-        self._max_count = max(hour_counts.values()) if hour_counts else 1
+        Args:
+            counts: A (24, days) array; column d holds the hours of d days ago
+        """
+        self._hour_counts = {
+            (hour, day): int(counts[hour, day])
+            for hour in range(counts.shape[0])
+            for day in range(counts.shape[1])
+        }
+        self._max_count = int(counts.max()) if counts.size else 1
         
         self.update()
     
@@ -1234,4 +1241,27 @@ class LogVisualizationPanel(QWidget):
         self._level_dist_chart.set_data(level_counts)
         self._component_chart.set_data(component_counts)
         self._error_rate_chart.set_data(error_rates)
-        self._heatmap_chart.set_data(all_timestamps)
\ No newline at end of file
+        self._heatmap_chart.set_data(all_timestamps)
+    
+    def set_analyzer(
+        self,
+        analyzer: "LogAnalyzer",
+        time_range: Optional[Tuple[datetime, datetime]] = None,
+        interval_minutes: int = 5
+    ) -> None:
+        """Set data for all charts straight from an analyzer's columnar store.
+        
+        Every chart is fed by one vectorised aggregation, so redrawing does
+        not depend on the number of log lines.
+        
+        Args:
+            analyzer: The analyzer holding the parsed logs
+            time_range: Optional time range for the timeline (start, end)
+            interval_minutes: Interval size of the error rate chart
+        """
+        start, end = time_range if time_range else (None, None)
+        self._timeline_chart.set_data(analyzer.get_level_timestamps(start, end), time_range)
+        self._level_dist_chart.set_data(analyzer.count_by_level())
+        self._component_chart.set_data(analyzer.count_by_component())
+        self._error_rate_chart.set_data(analyzer.get_error_rate(interval_minutes))
+        self._heatmap_chart.set_counts(analyzer.get_heatmap(start=start, end=end))
\ No newline at end of file
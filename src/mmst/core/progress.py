@@ -7,6 +7,7 @@ tracking multiple concurrent tasks with progress bars and status messages.
 from __future__ import annotations
 
 import logging
+import threading
 from dataclasses import dataclass
 from typing import Dict, Optional
 from uuid import uuid4
@@ -224,6 +225,9 @@ class ProgressTracker(QObject):
         super().__init__()
         self._dialog: Optional[ProgressDialog] = None
         self._log = logging.getLogger("MMST.Progress")
+        # task_id -> title of running tasks; read from sampler threads
+        self._active: Dict[str, str] = {}
+        self._active_lock = threading.Lock()
     
     def set_dialog(self, dialog: ProgressDialog) -> None:
         """Connect to progress dialog."""
@@ -245,6 +249,8 @@ class ProgressTracker(QObject):
         """
         task_id = str(uuid4())
         self._log.info(f"Starting task: {title} (total={total})")
+        with self._active_lock:
+            self._active[task_id] = title
         self.task_added.emit(task_id, title, total)
         return task_id
     
@@ -270,10 +276,24 @@ class ProgressTracker(QObject):
             task_id: Task identifier
             success: Whether task completed successfully
         """
+        with self._active_lock:
+            self._active.pop(task_id, None)
         status_text = "✅ erfolgreich" if success else "❌ fehlgeschlagen"
         self._log.info(f"Task completed: {task_id[:8]}... {status_text}")
         self.task_completed.emit(task_id, success)
     
+    def active_tasks(self) -> Dict[str, str]:
+        """
+        Return the tasks that were started but not completed yet.
+        
+        Safe to call from any thread.
+        
+        Returns:
+            Mapping of task_id to task title
+        """
+        with self._active_lock:
+            return dict(self._active)
+    
     def show_dialog(self) -> None:
         """Show progress dialog."""
         if self._dialog:
@@ -0,0 +1,165 @@
+"""Streaming FLAC/Opus encoding of recordings through ffmpeg.
+
+The recording writer thread hands raw PCM to :class:`StreamingEncoder`,
+which feeds it to an ffmpeg subprocess over stdin. Nothing is buffered on
+disk: the compressed file is the only output. Writes block while ffmpeg is
+busy, which is the back-pressure - the writer stops draining and the
+recording ring buffer absorbs the delay.
+"""
+from __future__ import annotations
+
+import logging
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:  # optional dependency: tool discovery lives in the SystemTools plugin
+    from ..system_tools.tools import shared_tool_registry
+except Exception:  # pragma: no cover - SystemTools unavailable
+    shared_tool_registry = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# format -> (file extension, ffmpeg codec arguments)
+ENCODED_FORMATS: Dict[str, Tuple[str, List[str]]] = {
+    "flac": (".flac", ["-c:a", "flac", "-compression_level", "5"]),
+    "opus": (".opus", ["-c:a", "libopus", "-b:a", "160k"]),
+}
+OUTPUT_FORMATS = ("wav",) + tuple(ENCODED_FORMATS)
+
+
+class EncoderError(RuntimeError):
+    """Raised when the ffmpeg encoder fails or exits unexpectedly."""
+
+
+def output_extension(output_format: str) -> str:
+    if output_format in ENCODED_FORMATS:
+        return ENCODED_FORMATS[output_format][0]
+    return ".wav"
+
+
+def find_ffmpeg() -> Optional[str]:
+    """Return the ffmpeg executable from the shared tool registry, if any."""
+    if shared_tool_registry is None:
+        return None
+    try:
+        tool = shared_tool_registry().get("ffmpeg")
+    except Exception as exc:  # pragma: no cover - defensive
+        logger.debug("ffmpeg detection failed: %s", exc)
+        return None
+    return (tool.path or tool.command) if tool.available else None
+
+
+class StreamingEncoder:
+    """Pipe interleaved little-endian PCM into an ffmpeg encoder process."""
+
+    def __init__(
+        self,
+        output_path: Path,
+        output_format: str,
+        *,
+        sample_rate: int,
+        channels: int,
+        sample_width: int,
+        ffmpeg: str = "ffmpeg",
+    ) -> None:
+        if output_format not in ENCODED_FORMATS:
+            raise ValueError(f"Unsupported encoded format: {output_format}")
+        self.output_path = Path(output_path)
+        self.output_format = output_format
+        self.sample_rate = int(sample_rate)
+        self.channels = int(channels)
+        self.sample_width = int(sample_width)
+        self.ffmpeg = ffmpeg
+        self.bytes_written = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._stderr: Optional[Any] = None
+
+    def command(self) -> List[str]:
+        pcm_format = "s16le" if self.sample_width <= 2 else "s32le"
+        args = [
+            self.ffmpeg, "-hide_banner", "-loglevel", "error",
+            "-f", pcm_format, "-ar", str(self.sample_rate), "-ac", str(self.channels),
+            "-i", "pipe:0",
+        ]
+        args += ENCODED_FORMATS[self.output_format][1]
+        if self.output_format == "flac" and self.sample_width > 2:
+            # 24-bit captures arrive in 32-bit containers
+            args += ["-bits_per_raw_sample", "24"]
+        args += ["-y", str(self.output_path)]
+        return args
+
+    def start(self) -> None:
+        # stderr goes to a file so a chatty encoder can never block on a full pipe
+        self._stderr = tempfile.TemporaryFile()
+        try:
+            self._process = subprocess.Popen(
+                self.command(), stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._stderr
+            )
+        except OSError as exc:
+            self._stderr.close()
+            self._stderr = None
+            raise EncoderError(f"ffmpeg konnte nicht gestartet werden: {exc}") from exc
+
+    def write(self, data: Any) -> None:
+        """Send a block of PCM (bytes or a C-contiguous array); blocks while ffmpeg catches up."""
+        process = self._process
+        if process is None or process.stdin is None:
+            raise EncoderError("Encoder ist nicht gestartet")
+        view = memoryview(data).cast("B")
+        try:
+            process.stdin.write(view)
+        except (BrokenPipeError, ValueError) as exc:
+            raise EncoderError(f"ffmpeg hat die Eingabe geschlossen: {self._error_output()}") from exc
+        self.bytes_written += view.nbytes
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Finish the stream and wait for ffmpeg to write the file."""
+        process = self._process
+        if process is None:
+            return
+        try:
+            if process.stdin is not None:
+                try:
+                    process.stdin.close()
+                except BrokenPipeError:
+                    pass
+            try:
+                returncode = process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+                raise EncoderError("ffmpeg hat die Kodierung nicht rechtzeitig beendet")
+            if returncode != 0:
+                raise EncoderError(f"ffmpeg ist mit Code {returncode} beendet worden: {self._error_output()}")
+        finally:
+            self._process = None
+            if self._stderr is not None:
+                self._stderr.close()
+                self._stderr = None
+
+    def abort(self) -> None:
+        """Kill the encoder without waiting for a complete file."""
+        process = self._process
+        if process is not None:
+            process.kill()
+            if process.stdin is not None:
+                try:
+                    process.stdin.close()
+                except OSError:
+                    pass
+            process.wait()
+        self._process = None
+        if self._stderr is not None:
+            self._stderr.close()
+            self._stderr = None
+
+    def _error_output(self) -> str:
+        if self._stderr is None:
+            return ""
+        try:
+            self._stderr.seek(0)
+            return self._stderr.read().decode("utf-8", "replace").strip()[-500:]
+        except OSError:
+            return ""
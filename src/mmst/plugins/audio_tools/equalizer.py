@@ -2,7 +2,8 @@
 Real-time audio equalizer engine using scipy.signal for DSP.
 
 This module implements a 10-band parametric equalizer that can be applied
-to audio streams in real-time via sounddevice callbacks.
+to audio streams in real-time via sounddevice callbacks. The bands form a
+second-order-section cascade so each audio block costs one ``sosfilt`` call.
 """
 from __future__ import annotations
 
@@ -22,17 +23,35 @@ class BandConfig:
     q_factor: float = 1.0  # Q factor (bandwidth), typically 0.5-2.0
 
 
+@dataclass(frozen=True)
+class _Coefficients:
+    """Immutable coefficient set; replaced as a whole, never modified."""
+    gains: Tuple[float, ...]
+    sos: np.ndarray  # (bands, 6)
+    flat: bool
+
+
 class EqualizerEngine:
     """
     Real-time 10-band parametric equalizer using IIR filters.
     
-    This engine processes audio in real-time by applying a chain of
-    peaking filters (one per frequency band) with configurable gains.
+    This engine processes audio in real-time by applying a cascade of
+    peaking biquads (one second-order section per frequency band) with
+    configurable gains. All bands and channels are filtered by a single
+    ``scipy.signal.sosfilt`` call per block.
+    
+    ``process`` runs in the audio callback and never takes a lock: setters
+    publish a new immutable :class:`_Coefficients` object with a single
+    reference assignment, and the audio thread crossfades from the old to
+    the new cascade over the next block so gain changes do not click.
     """
     
     # Standard 10-band EQ frequencies (Hz)
     BANDS: Tuple[int, ...] = (31, 62, 125, 250, 500, 1000, 2000, 4000, 8000, 16000)
     
+    # Second-order section that passes the signal through unchanged
+    IDENTITY_SECTION = np.array([1.0, 0.0, 0.0, 1.0, 0.0, 0.0])
+    
     def __init__(self, sample_rate: int = 48000, channels: int = 2) -> None:
         """
         Initialize the equalizer engine.
@@ -44,33 +63,75 @@ class EqualizerEngine:
         self.sample_rate = sample_rate
         self.channels = channels
         self._enabled = False
+        # Serialises writers only; the audio thread never takes it
         self._lock = threading.Lock()
         
-        # Initialize band gains to 0 dB (flat response)
-        self._gains: List[float] = [0.0] * len(self.BANDS)
-        
-        # Pre-compute filter coefficients for each band
-        self._filters: List[Tuple[np.ndarray, np.ndarray]] = []
-        self._update_filters()
+        # Initialize band gains to 0 dB (flat response). ``_coefficients`` is
+        # the published set, ``_active`` the one the audio thread last used.
+        self._coefficients = self._make_coefficients(np.zeros(len(self.BANDS)))
+        self._active = self._coefficients
         
-        # Filter states for each channel and band (for continuity between blocks)
-        # Shape: [channels][bands][filter_order]
+        # Filter states for continuity between blocks, owned by the audio thread
+        # Shape: (bands, channels, 2)
+        self._reset_pending = False
         self._reset_states()
     
-    def _update_filters(self) -> None:
-        """Recompute IIR filter coefficients based on current gains."""
-        self._filters = []
-        for i, freq in enumerate(self.BANDS):
-            gain_db = self._gains[i]
-            if abs(gain_db) < 0.01:  # Flat response, use pass-through
-                # Identity filter: y[n] = x[n]
-                b = np.array([1.0])
-                a = np.array([1.0])
-            else:
-                # Design a peaking (parametric) EQ filter
-                # Q=1.0 gives ~1 octave bandwidth
-                b, a = self._design_peaking_filter(freq, gain_db, q=1.0)
-            self._filters.append((b, a))
+    @property
+    def _filters(self) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Per-band (b, a) coefficients of the current cascade."""
+        return [(section[:3], section[3:]) for section in self._coefficients.sos]
+    
+    def _make_coefficients(self, gains_db: np.ndarray) -> _Coefficients:
+        """Build an immutable coefficient set for the given band gains."""
+        return _Coefficients(
+            gains=tuple(gains_db.tolist()),
+            sos=self._design_sos(gains_db),
+            flat=bool(np.all(np.abs(gains_db) < 0.01)),
+        )
+    
+    def _design_sos(
+        self,
+        gains_db: np.ndarray,
+        frequencies: Optional[np.ndarray] = None,
+        q: float = 1.0
+    ) -> np.ndarray:
+        """
+        Design peaking biquads for all bands at once.
+        
+        Bands with (near) zero gain get an identity section.
+        
+        Args:
+            gains_db: Gain per band in decibels
+            frequencies: Center frequencies in Hz (default: ``BANDS``)
+            q: Q factor (bandwidth), Q=1.0 gives ~1 octave
+        
+        Returns:
+            Array of shape (bands, 6) in ``scipy.signal.sosfilt`` layout
+        """
+        if frequencies is None:
+            frequencies = np.asarray(self.BANDS, dtype=np.float64)
+        # Normalize frequency to Nyquist and clamp to a stable range
+        nyquist = self.sample_rate / 2.0
+        w0 = np.clip(frequencies / nyquist, 0.01, 0.99)
+        
+        # Convert gain from dB to linear (sqrt of power ratio)
+        A = 10 ** (gains_db / 40.0)
+        alpha = np.sin(w0 * np.pi) / (2 * q)
+        cos_term = -2 * np.cos(w0 * np.pi)
+        
+        # Boosts widen the numerator, cuts the denominator
+        num_scale = np.where(gains_db >= 0, A, 1.0 / A)
+        den_scale = np.where(gains_db >= 0, 1.0 / A, A)
+        a0 = 1 + alpha * den_scale
+        sos = np.empty((len(gains_db), 6))
+        sos[:, 0] = (1 + alpha * num_scale) / a0
+        sos[:, 1] = cos_term / a0
+        sos[:, 2] = (1 - alpha * num_scale) / a0
+        sos[:, 3] = 1.0
+        sos[:, 4] = cos_term / a0
+        sos[:, 5] = (1 - alpha * den_scale) / a0
+        sos[np.abs(gains_db) < 0.01] = self.IDENTITY_SECTION
+        return sos
     
     def _design_peaking_filter(
         self,
@@ -79,7 +140,7 @@ class EqualizerEngine:
         q: float = 1.0
     ) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Design a peaking (parametric) EQ filter using scipy.signal.
+        Design a single peaking (parametric) EQ biquad.
         
         Args:
             center_freq: Center frequency in Hz
@@ -89,54 +150,14 @@ class EqualizerEngine:
         Returns:
             Tuple of (b, a) filter coefficients
         """
-        # Normalize frequency to Nyquist
-        nyquist = self.sample_rate / 2.0
-        w0 = center_freq / nyquist
-        
-        # Clamp to valid range (avoid instability)
-        w0 = np.clip(w0, 0.01, 0.99)
-        
-        # Convert gain from dB to linear
-        A = 10 ** (gain_db / 40.0)  # sqrt of power ratio
-        
-        # Bandwidth (BW) in octaves: BW = w0 / Q
-        # For peaking filters, we use the shelf filter formula
-        # which scipy doesn't have directly, so we use iirpeak/iirnotch analog
-        
-        # Alternative: use second-order sections (SOS) design
-        # For simplicity, we'll use a biquad peaking filter formula
-        alpha = np.sin(w0 * np.pi) / (2 * q)
-        
-        if gain_db >= 0:  # Boost
-            b0 = 1 + alpha * A
-            b1 = -2 * np.cos(w0 * np.pi)
-            b2 = 1 - alpha * A
-            a0 = 1 + alpha / A
-            a1 = -2 * np.cos(w0 * np.pi)
-            a2 = 1 - alpha / A
-        else:  # Cut
-            b0 = 1 + alpha / A
-            b1 = -2 * np.cos(w0 * np.pi)
-            b2 = 1 - alpha / A
-            a0 = 1 + alpha * A
-            a1 = -2 * np.cos(w0 * np.pi)
-            a2 = 1 - alpha * A
-        
-        # Normalize by a0
-        b = np.array([b0 / a0, b1 / a0, b2 / a0])
-        a = np.array([1.0, a1 / a0, a2 / a0])
-        
-        return b, a
+        section = self._design_sos(
+            np.array([gain_db], dtype=np.float64), np.array([center_freq], dtype=np.float64), q
+        )[0]
+        return section[:3], section[3:]
     
     def _reset_states(self) -> None:
         """Reset filter states (used when starting or changing configuration)."""
-        # For each channel and band, initialize filter state to zeros
-        # State size depends on max(len(b), len(a)) - 1
-        max_order = max(3, 3)  # Biquad filters are order 2 (3 coefficients)
-        self._states = [
-            [np.zeros(max_order - 1) for _ in range(len(self.BANDS))]
-            for _ in range(self.channels)
-        ]
+        self._zi = np.zeros((len(self.BANDS), self.channels, 2))
     
     def set_gains(self, gains: List[float]) -> None:
         """
@@ -145,74 +166,90 @@ class EqualizerEngine:
         Args:
             gains: List of 10 gain values in dB (-12 to +12)
         """
+        if len(gains) != len(self.BANDS):
+            raise ValueError(f"Expected {len(self.BANDS)} gains, got {len(gains)}")
+        
+        # Clamp gains to valid range
+        clamped = np.clip(np.asarray(gains, dtype=np.float64), -12.0, 12.0)
+        coefficients = self._make_coefficients(clamped)
         with self._lock:
-            if len(gains) != len(self.BANDS):
-                raise ValueError(f"Expected {len(self.BANDS)} gains, got {len(gains)}")
-            
-            # Clamp gains to valid range
-            self._gains = [np.clip(g, -12.0, 12.0) for g in gains]
-            self._update_filters()
-            # Don't reset states to avoid clicks/pops during live adjustment
+            # Publishing is one reference assignment, atomic for the audio thread.
+            # States are kept; the switch is crossfaded in process().
+            self._coefficients = coefficients
     
     def get_gains(self) -> List[float]:
         """Get current EQ band gains."""
-        with self._lock:
-            return list(self._gains)
+        return list(self._coefficients.gains)
     
     def set_enabled(self, enabled: bool) -> None:
         """Enable or disable the equalizer."""
         with self._lock:
             if enabled and not self._enabled:
-                # Reset states when enabling to avoid discontinuities
-                self._reset_states()
+                # Reset states when enabling to avoid discontinuities; the
+                # audio thread owns the states, so it performs the reset
+                self._reset_pending = True
             self._enabled = enabled
     
     def is_enabled(self) -> bool:
         """Check if the equalizer is enabled."""
-        with self._lock:
-            return self._enabled
+        return self._enabled
     
     def process(self, audio_block: np.ndarray) -> np.ndarray:
         """
         Process an audio block through the equalizer.
         
+        Lock-free; meant to be called from a single audio thread.
+        
         Args:
             audio_block: Input audio array with shape (frames, channels)
         
         Returns:
-            Processed audio array with same shape
+            Processed float32 audio array with same shape; the input is
+            not modified
         """
-        with self._lock:
-            if not self._enabled:
-                # Pass through unmodified
-                return audio_block
-            
-            # Ensure input is float32 for processing
-            audio = audio_block.astype(np.float32)
-            
-            # Process each channel separately
-            for ch in range(min(self.channels, audio.shape[1])):
-                channel_data = audio[:, ch]
-                
-                # Apply each band filter sequentially
-                for band_idx, (b, a) in enumerate(self._filters):
-                    if len(b) == 1 and len(a) == 1:
-                        # Pass-through filter, skip
-                        continue
-                    
-                    # Apply IIR filter with state preservation
-                    filtered, self._states[ch][band_idx] = signal.lfilter(
-                        b, a, channel_data,
-                        zi=self._states[ch][band_idx]
-                    )
-                    channel_data = filtered
-                
-                audio[:, ch] = channel_data
-            
-            # Prevent clipping by soft-limiting
-            audio = np.clip(audio, -1.0, 1.0)
-            
-            return audio
+        if not self._enabled:
+            # Pass through unmodified
+            return audio_block
+        
+        if self._reset_pending:
+            self._reset_pending = False
+            self._zi.fill(0.0)
+            self._active = self._coefficients
+        
+        target = self._coefficients  # single read of the published set
+        active = self._active
+        audio = np.array(audio_block, dtype=np.float32)
+        
+        # Channels beyond the configured count pass through. Filter the
+        # channel-major view so zi keeps its (bands, channels, 2) layout.
+        used = min(self.channels, audio.shape[1])
+        block = audio[:, :used].T
+        zi = self._zi[:, :used]
+        if target is active:
+            if not active.flat:
+                audio[:, :used] = self._filter(active, block, zi).T
+        else:
+            # Run both cascades and crossfade linearly across this block
+            previous = self._filter(active, block, zi.copy())
+            current = self._filter(target, block, zi)
+            ramp = np.arange(1, block.shape[1] + 1, dtype=np.float64) / block.shape[1]
+            audio[:, :used] = (previous + (current - previous) * ramp).T
+            self._active = target
+        
+        # Prevent clipping by soft-limiting
+        np.clip(audio, -1.0, 1.0, out=audio)
+        
+        return audio
+    
+    @staticmethod
+    def _filter(coefficients: _Coefficients, block: np.ndarray, zi: np.ndarray) -> np.ndarray:
+        """Filter ``block`` (channels, frames) and store the end state in ``zi``."""
+        if coefficients.flat:
+            # Bypassed cascades start from silence when re-engaged
+            zi.fill(0.0)
+            return block
+        filtered, zi[...] = signal.sosfilt(coefficients.sos, block, axis=-1, zi=zi)
+        return filtered
 
 
 class EqualizerStream:
@@ -250,6 +287,7 @@ class EqualizerStream:
         self.engine = EqualizerEngine(sample_rate, channels)
         self._stream: Optional[object] = None  # sounddevice.Stream
         self._running = False
+        self.last_status: Optional[object] = None  # last sounddevice.CallbackFlags
     
     def start(self) -> None:
         """Start the real-time equalizer stream."""
@@ -265,11 +303,11 @@ class EqualizerStream:
         def callback(indata: np.ndarray, outdata: np.ndarray, frames: int, time, status) -> None:
             """Audio callback for processing."""
             if status:
-                print(f"Stream status: {status}")
+                # No I/O in the audio thread; the flags are kept for diagnostics
+                self.last_status = status
             
-            # Process input through equalizer
-            processed = self.engine.process(indata.copy())
-            outdata[:] = processed
+            # Process input through equalizer; process() never modifies indata
+            outdata[:] = self.engine.process(indata)
         
         self._stream = sd.Stream(
             device=(self.input_device, self.output_device),
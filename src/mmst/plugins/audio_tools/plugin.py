@@ -10,7 +10,7 @@ from functools import partial
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, cast
 
-from PySide6.QtCore import Qt, QTimer, QUrl  # type: ignore[import-not-found]
+from PySide6.QtCore import Qt, QTimer, QUrl, Signal  # type: ignore[import-not-found]
 from PySide6.QtGui import (  # type: ignore[import-not-found]
     QColor,
     QDesktopServices,
@@ -44,6 +44,8 @@ from PySide6.QtWidgets import (  # type: ignore[import-not-found]
 
 from ...core.audio import AudioDevice
 from ...core.plugin_base import BasePlugin, PluginManifest
+from .encoder import OUTPUT_FORMATS, find_ffmpeg
+from .loudness import LoudnessResult, run_loudness_batch
 from .recording import RecordingController, RecordingError
 
 try:  # pragma: no cover - optional dependency
@@ -448,8 +450,15 @@ class EqualizerPanel(QWidget):
         self._update_status_label()
 
 
+OUTPUT_FORMAT_LABELS = {
+    "wav": "WAV (unkomprimiert)",
+    "flac": "FLAC (verlustfrei)",
+    "opus": "Opus (verlustbehaftet)",
+}
+
+
 class QualityDialog(QDialog):
-    def __init__(self, parent: Optional[QWidget], quality: Dict[str, int]) -> None:
+    def __init__(self, parent: Optional[QWidget], quality: Dict[str, int], output_format: str = "wav") -> None:
         super().__init__(parent)
         self.setWindowTitle("Aufnahmequalität")
         form = QFormLayout(self)
@@ -471,6 +480,14 @@ class QualityDialog(QDialog):
         self.channels.setValue(int(quality.get("channels", 2)))
         form.addRow("Kanäle", self.channels)
 
+        self.output_format = QComboBox()
+        for fmt in OUTPUT_FORMATS:
+            self.output_format.addItem(OUTPUT_FORMAT_LABELS.get(fmt, fmt.upper()), fmt)
+        index = self.output_format.findData(output_format)
+        self.output_format.setCurrentIndex(max(index, 0))
+        self.output_format.setToolTip("FLAC und Opus werden während der Aufnahme mit ffmpeg kodiert")
+        form.addRow("Format", self.output_format)
+
         buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
         buttons.accepted.connect(self.accept)
         buttons.rejected.connect(self.reject)
@@ -483,6 +500,10 @@ class QualityDialog(QDialog):
             "channels": int(self.channels.value()),
         }
 
+    def result_format(self) -> str:
+        value = self.output_format.currentData()
+        return value if isinstance(value, str) else "wav"
+
 
 class MetadataDialog(QDialog):
     def __init__(self, parent: Optional[QWidget], metadata: Dict[str, str]) -> None:
@@ -725,6 +746,9 @@ class AudioVisualizer(QWidget):
 
 
 class RecorderPanel(QWidget):
+    # analysed, failed; emitted from the analysis thread
+    loudness_finished = Signal(int, int)
+
     def __init__(self, plugin: "AudioToolsPlugin", parent: Optional[QWidget] = None) -> None:
         super().__init__(parent)
         self._plugin = plugin
@@ -852,6 +876,12 @@ class RecorderPanel(QWidget):
         self.open_button.clicked.connect(self._open_location)
         control_row.addWidget(self.open_button)
 
+        self.loudness_button = QPushButton("Lautheit analysieren")
+        self.loudness_button.setToolTip("EBU R128 Lautheit, True Peak und RMS aller noch nicht analysierten Aufnahmen messen")
+        self.loudness_button.clicked.connect(self._analyze_loudness)
+        control_row.addWidget(self.loudness_button)
+        self.loudness_finished.connect(self._on_loudness_finished)
+
         layout.addLayout(control_row)
 
         self.visualizer = AudioVisualizer(self)
@@ -859,7 +889,7 @@ class RecorderPanel(QWidget):
         layout.addWidget(self.visualizer)
 
         self.recordings = QTreeWidget()
-        self.recordings.setHeaderLabels(["Datei", "Dauer", "Größe", "Zeitpunkt", "Titel", "Künstler"])
+        self.recordings.setHeaderLabels(["Datei", "Dauer", "Größe", "Zeitpunkt", "Titel", "Künstler", "Lautheit"])
         self.recordings.setRootIsDecorated(False)
         self.recordings.itemSelectionChanged.connect(self._on_selection_changed)
         self.recordings.itemDoubleClicked.connect(lambda *_: self._edit_metadata())
@@ -944,9 +974,10 @@ class RecorderPanel(QWidget):
             self._plugin.set_output_directory(Path(directory))
 
     def _open_quality_dialog(self) -> None:
-        dialog = QualityDialog(self, self._plugin.get_quality_settings())
+        dialog = QualityDialog(self, self._plugin.get_quality_settings(), self._plugin.get_output_format())
         if dialog.exec() == QDialog.DialogCode.Accepted:
             self._plugin.update_quality_settings(dialog.result_quality())
+            self._plugin.set_output_format(dialog.result_format())
             self._update_quality_summary()
             self._update_visualizer()
 
@@ -954,7 +985,7 @@ class RecorderPanel(QWidget):
         quality = self._plugin.get_quality_settings()
         summary = (
             f"Qualität: {quality['sample_rate']} Hz, {quality['bit_depth']}-bit, "
-            f"{quality['channels']} Kanäle"
+            f"{quality['channels']} Kanäle, {self._plugin.get_output_format().upper()}"
         )
         self.status_label.setText(summary)
 
@@ -964,6 +995,8 @@ class RecorderPanel(QWidget):
             metadata = info.get("metadata") if isinstance(info.get("metadata"), dict) else {}
             title = metadata.get("title", "") if isinstance(metadata, dict) else ""
             artist = metadata.get("artist", "") if isinstance(metadata, dict) else ""
+            loudness = info.get("loudness") if isinstance(info.get("loudness"), dict) else {}
+            lufs = loudness.get("integrated_lufs") if isinstance(loudness, dict) else None
             item = QTreeWidgetItem(
                 [
                     info.get("filename", ""),
@@ -972,6 +1005,7 @@ class RecorderPanel(QWidget):
                     info.get("timestamp", ""),
                     title,
                     artist,
+                    f"{lufs:.1f} LUFS" if isinstance(lufs, (int, float)) else "",
                 ]
             )
             identifier = info.get("path", info.get("filename", ""))
@@ -1096,6 +1130,21 @@ class RecorderPanel(QWidget):
             self._select_identifier(identifier)
             self._edit_metadata()
 
+    def _analyze_loudness(self) -> None:
+        if self._plugin.analyze_recording_loudness(self.loudness_finished.emit):
+            self.loudness_button.setEnabled(False)
+            self.status_label.setText("Lautheitsanalyse läuft …")
+        else:
+            self.status_label.setText("Alle Aufnahmen sind bereits analysiert.")
+
+    def _on_loudness_finished(self, analysed: int, failed: int) -> None:
+        self.loudness_button.setEnabled(True)
+        self._refresh_recordings()
+        message = f"Lautheit von {analysed} Aufnahmen gemessen"
+        if failed:
+            message += f", {failed} fehlgeschlagen"
+        self.status_label.setText(message)
+
     def _select_identifier(self, identifier: str) -> None:
         for row in range(self.recordings.topLevelItemCount()):
             item = self.recordings.topLevelItem(row)
@@ -1314,6 +1363,9 @@ class AudioToolsPlugin(BasePlugin):
             force_placeholder=force_placeholder,
         )
         self._current_recording_path: Optional[Path] = None
+        # Guards the recording history against the loudness analysis thread
+        self._history_lock = threading.Lock()
+        self._loudness_thread: Optional[threading.Thread] = None
         
         # EQ engines for each bus/device
         self._eq_streams: Dict[Tuple[str, str], object] = {}  # (bus, device_id) -> EqualizerStream
@@ -1497,6 +1549,18 @@ class AudioToolsPlugin(BasePlugin):
             self._recorder_state["source_mode"] = normalized
             self._persist_recorder_state()
 
+    def get_output_format(self) -> str:
+        value = self._recorder_state.get("format")
+        if isinstance(value, str) and value in OUTPUT_FORMATS:
+            return value
+        return "wav"
+
+    def set_output_format(self, output_format: str) -> None:
+        normalized = output_format if output_format in OUTPUT_FORMATS else "wav"
+        if self._recorder_state.get("format") != normalized:
+            self._recorder_state["format"] = normalized
+            self._persist_recorder_state()
+
     def _selected_devices_map(self) -> Dict[str, str]:
         mapping_any = self._recorder_state.get("selected_devices")
         if not isinstance(mapping_any, dict):
@@ -1703,7 +1767,9 @@ class AudioToolsPlugin(BasePlugin):
             raise RecordingError("Es ist kein Aufnahmegerät ausgewählt")
         output_dir = Path(self.get_output_directory())
         quality = self.get_quality_settings()
-        path = self._recording.start(output_dir, device_id, quality, mode=mode)
+        path = self._recording.start(
+            output_dir, device_id, quality, mode=mode, output_format=self.get_output_format()
+        )
         self._current_recording_path = path
         return path
 
@@ -1751,13 +1817,70 @@ class AudioToolsPlugin(BasePlugin):
             "metadata": dict(existing_metadata),
             "mode": capture_mode,
         }
-        history = self._recorder_state.setdefault("history", [])
-        history.insert(0, entry)
-        del history[50:]
-        self._persist_recorder_state()
+        with self._history_lock:
+            history = self._recorder_state.setdefault("history", [])
+            history.insert(0, entry)
+            del history[50:]
+            self._persist_recorder_state()
         self._current_recording_path = None
         return entry
 
+    def analyze_recording_loudness(self, on_finished: Optional[Any] = None) -> bool:
+        """Measure EBU R128 loudness of all recordings not analysed yet.
+
+        Runs in a background thread (files are spread over a process pool);
+        results are stored in the history entries under ``"loudness"``
+        together with the gain that normalises to -16 LUFS.
+
+        Args:
+            on_finished: Called with (analysed, failed) from the worker thread
+
+        Returns:
+            False if an analysis is already running or nothing needs analysing
+        """
+        if self._loudness_thread is not None and self._loudness_thread.is_alive():
+            return False
+        paths = [
+            Path(record["path"])
+            for record in self._history_records()
+            if not isinstance(record.get("loudness"), dict) and Path(record["path"]).exists()
+        ]
+        if not paths:
+            return False
+
+        task_id = self.services.progress.start_task("Lautheitsanalyse (Aufnahmen)", total=len(paths))
+
+        def _progress(done: int, total: int, path: Path) -> None:
+            self.services.progress.update(task_id, done, max(1, total), f"Analysiere: {path.name}")
+
+        def _run() -> None:
+            try:
+                analysed, failed = run_loudness_batch(
+                    paths, self._store_loudness, ffmpeg=find_ffmpeg(), progress=_progress
+                )
+            except Exception as exc:
+                self._logger.error("Lautheitsanalyse fehlgeschlagen: %s", exc)
+                self.services.progress.complete(task_id, success=False)
+                analysed, failed = 0, len(paths)
+            else:
+                self.services.progress.complete(task_id, success=True)
+            if on_finished is not None:
+                on_finished(analysed, failed)
+
+        self._loudness_thread = threading.Thread(target=_run, name="RecordingLoudness", daemon=True)
+        self._loudness_thread.start()
+        return True
+
+    def _store_loudness(self, path: Path, result: LoudnessResult) -> None:
+        with self._history_lock:
+            history = self._recorder_state.get("history")
+            if not isinstance(history, list):
+                return
+            for entry in history:
+                if isinstance(entry, dict) and entry.get("path") == str(path):
+                    entry["loudness"] = result.to_dict()
+            self._persist_recorder_state()
+
     def active_recording_path(self) -> Optional[Path]:
         return self._current_recording_path
 
@@ -1891,6 +2014,9 @@ class AudioToolsPlugin(BasePlugin):
     def _write_metadata_to_file(self, path: Path, metadata: Dict[str, str]) -> None:
         if not path.exists():
             return
+        if path.suffix.lower() != ".wav":
+            self._logger.debug("Metadaten für %s werden nur intern gespeichert", path.suffix)
+            return
         if WAVE is None or TIT2 is None or TPE1 is None or TALB is None or TCON is None:
             self._logger.debug("Mutagen nicht verfügbar, Metadaten werden nur intern gespeichert")
             return
@@ -4,7 +4,6 @@ import contextlib
 import datetime as _dt
 import logging
 import os
-import queue as queue_module
 import platform
 import re
 import threading
@@ -14,6 +13,9 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from .encoder import ENCODED_FORMATS, EncoderError, StreamingEncoder, find_ffmpeg, output_extension
+from .ring_buffer import SampleRingBuffer
+
 try:  # pragma: no cover - optional dependency
     import sounddevice as sd  # type: ignore[import-not-found]
 except Exception:  # pragma: no cover - missing runtime dependency
@@ -37,7 +39,7 @@ class _RecordingSession:
     quality: Dict[str, int]
     mode: str = "placeholder"
     capture_mode: str = "input"
-    queue: Optional["queue_module.Queue[bytes]"] = None
+    ring: Optional[SampleRingBuffer] = None
     stop_event: Optional[threading.Event] = None
     stream: Optional[Any] = None
     writer_thread: Optional[threading.Thread] = None
@@ -45,6 +47,10 @@ class _RecordingSession:
     bit_depth: int = 16
     frames_captured: int = 0
     uses_raw_stream: bool = True
+    dropped_frames: int = 0
+    output_format: str = "wav"
+    encoder: Optional[StreamingEncoder] = None
+    writer_error: Optional[str] = None
 
 
 class RecordingController:
@@ -54,8 +60,19 @@ class RecordingController:
     override is active) the controller captures real audio input into a WAV file. If the
     backend cannot be used it falls back to generating a silent placeholder recording to
     keep the workflow functional in test environments.
+
+    The audio callback copies each block once into a preallocated
+    :class:`SampleRingBuffer`; a writer thread drains it in batches, converts
+    float samples to PCM in preallocated buffers and writes large contiguous
+    chunks - into a WAV file or, for FLAC/Opus, straight into an ffmpeg
+    encoder process so no intermediate WAV is written.
     """
 
+    # Seconds of audio the ring can hold before the callback drops frames
+    RING_SECONDS = 10.0
+    # Seconds of audio the writer collects before converting and writing
+    WRITE_BATCH_SECONDS = 0.25
+
     def __init__(self, *, logger: Optional[logging.Logger] = None, force_placeholder: Optional[bool] = None) -> None:
         self._lock = threading.RLock()
         self._session: Optional[_RecordingSession] = None
@@ -64,6 +81,8 @@ class RecordingController:
             env_value = os.getenv("MMST_AUDIO_PLACEHOLDER")
             force_placeholder = env_value not in (None, "", "0", "false", "False")
         self._force_placeholder = bool(force_placeholder)
+        self._ffmpeg: Optional[str] = None
+        self._ffmpeg_resolved = False
 
     def is_recording(self) -> bool:
         with self._lock:
@@ -76,11 +95,14 @@ class RecordingController:
         quality: Dict[str, int],
         *,
         mode: str = "input",
+        output_format: str = "wav",
     ) -> Path:
         """Start a new recording session.
 
         Ensures only one session can run at a time, prepares the output directory and
-        selects the best available backend.
+        selects the best available backend. ``output_format`` "flac" or "opus"
+        encodes on the fly with ffmpeg; without ffmpeg (or for placeholder
+        recordings) a WAV file is written instead.
         """
         with self._lock:
             if self._session is not None:
@@ -89,28 +111,35 @@ class RecordingController:
             timestamp = _dt.datetime.now().strftime("%Y%m%d-%H%M%S")
             device_slug = re.sub(r"[^a-z0-9]+", "-", device_id.lower()).strip("-") or "device"
             base_name = f"recording-{timestamp}-{device_slug}"
-            output_path = target_dir / f"{base_name}.wav"
-            counter = 1
-            while output_path.exists():
-                output_path = target_dir / f"{base_name}-{counter:02d}.wav"
-                counter += 1
             capture_mode = mode if mode in {"input", "loopback"} else "input"
             session = _RecordingSession(
                 device_id=device_id,
                 start_time=time.time(),
-                output_path=output_path,
+                output_path=self._unique_path(target_dir, base_name, ".wav"),
                 quality=dict(quality),
                 capture_mode=capture_mode,
             )
             if not self._force_placeholder:
+                if output_format in ENCODED_FORMATS:
+                    if self._resolve_ffmpeg():
+                        session.output_format = output_format
+                        session.output_path = self._unique_path(
+                            target_dir, base_name, output_extension(output_format)
+                        )
+                    else:
+                        self._logger.warning("ffmpeg nicht gefunden, Aufnahme wird als WAV gespeichert")
                 try:
                     self._activate_sounddevice_backend(session)
                 except Exception as exc:  # pragma: no cover - best effort fallback
                     self._logger.warning("Realer Audiobackend-Start fehlgeschlagen, verwende Platzhalter: %s", exc)
                     self._cleanup_sounddevice_session(session, delete_file=True)
+                    session.output_format = "wav"
+                    session.output_path = self._unique_path(target_dir, base_name, ".wav")
                 else:
                     self._session = session
-                    return output_path
+                    return session.output_path
+
+            output_path = session.output_path
 
             self._session = session
             return output_path
@@ -134,6 +163,8 @@ class RecordingController:
             except Exception as exc:  # pragma: no cover - defensive fallback
                 self._logger.error("Aufnahme konnte nicht sauber beendet werden, schreibe Platzhalter: %s", exc)
                 self._cleanup_sounddevice_session(session, delete_file=True)
+                session.output_format = "wav"
+                session.output_path = session.output_path.with_suffix(".wav")
                 duration_seconds = max(time.time() - session.start_time, 0.1)
                 info = self._write_silent_wav(session.output_path, session.quality, duration_seconds)
         else:
@@ -142,6 +173,7 @@ class RecordingController:
 
         info["device_id"] = session.device_id
         info["duration_seconds"] = duration_seconds
+        info["format"] = session.output_format
         info["path"] = session.output_path
         info["capture_mode"] = session.capture_mode
         return info
@@ -156,6 +188,21 @@ class RecordingController:
         elif session:
             self._silent_abort(session)
 
+    @staticmethod
+    def _unique_path(target_dir: Path, base_name: str, extension: str) -> Path:
+        output_path = target_dir / f"{base_name}{extension}"
+        counter = 1
+        while output_path.exists():
+            output_path = target_dir / f"{base_name}-{counter:02d}{extension}"
+            counter += 1
+        return output_path
+
+    def _resolve_ffmpeg(self) -> Optional[str]:
+        if not self._ffmpeg_resolved:
+            self._ffmpeg = find_ffmpeg()
+            self._ffmpeg_resolved = True
+        return self._ffmpeg
+
     @staticmethod
     def _resolve_sample_format(quality: Dict[str, int]) -> tuple[int, int, str]:
         requested = int(quality.get("bit_depth", 24))
@@ -220,22 +267,16 @@ class RecordingController:
 
         session.sample_width = sample_width
         session.bit_depth = bit_depth
-        session.queue = queue_module.Queue()
         session.stop_event = threading.Event()
         session.frames_captured = 0
+        session.dropped_frames = 0
         session.uses_raw_stream = not use_float_stream
 
         def _callback(indata, frames, _time_info, status):  # pragma: no cover - interacts with hardware
-            if status:
-                self._logger.warning("Audio Callback Status: %s", status)
-            if not session.queue:
-                return
-            if session.uses_raw_stream:
-                session.queue.put(bytes(indata))
-            else:
-                chunk = self._convert_float_buffer(indata, sample_width)
-                if chunk:
-                    session.queue.put(chunk)
+            # Runs on the PortAudio thread: one copy into the ring, nothing else
+            ring = session.ring
+            if ring is not None:
+                ring.write(indata, overwrite=False)
 
         device_index = self._resolve_device_identifier(session.device_id)
         device_argument: Any = device_index if device_index is not None else session.device_id
@@ -273,47 +314,49 @@ class RecordingController:
         session.quality["sample_rate"] = sample_rate
 
         session.output_path.parent.mkdir(parents=True, exist_ok=True)
-        if session.uses_raw_stream:
-            stream = sd.RawInputStream(
-                device=device_argument,
-                samplerate=sample_rate,
-                channels=channels,
-                dtype=dtype,
-                callback=_callback,
-                blocksize=0,
-                extra_settings=extra_settings,
-            )
-        else:
-            stream = sd.InputStream(
-                device=device_argument,
-                samplerate=sample_rate,
+        stream_dtype = dtype if session.uses_raw_stream else "float32"
+        session.ring = SampleRingBuffer(
+            max(1, int(sample_rate * self.RING_SECONDS)), channels=channels, dtype=stream_dtype
+        )
+        stream = sd.InputStream(
+            device=device_argument,
+            samplerate=sample_rate,
+            channels=channels,
+            dtype=stream_dtype,
+            callback=_callback,
+            blocksize=0,
+            extra_settings=extra_settings,
+        )
+        session.stream = stream
+
+        if session.output_format in ENCODED_FORMATS:
+            session.encoder = StreamingEncoder(
+                session.output_path,
+                session.output_format,
+                sample_rate=sample_rate,
                 channels=channels,
-                dtype="float32",
-                callback=_callback,
-                blocksize=0,
-                extra_settings=extra_settings,
+                sample_width=sample_width,
+                ffmpeg=self._resolve_ffmpeg() or "ffmpeg",
             )
-        session.stream = stream
+            session.encoder.start()
 
         def _writer_loop() -> None:  # pragma: no cover - interacts with hardware
-            if not session.queue or not session.stop_event:
-                return
-            with wave.open(str(session.output_path), "wb") as wav_file:
-                wav_file.setnchannels(channels)
-                wav_file.setsampwidth(sample_width)
-                wav_file.setframerate(sample_rate)
-                while True:
-                    if session.stop_event.is_set() and session.queue.empty():
-                        break
-                    try:
-                        chunk = session.queue.get(timeout=0.25)
-                    except queue_module.Empty:
-                        continue
-                    if not chunk:
-                        continue
-                    wav_file.writeframes(chunk)
-                    frame_chunk = len(chunk) // (sample_width * channels)
-                    session.frames_captured += frame_chunk
+            encoder = session.encoder
+            try:
+                if encoder is not None:
+                    self._drain_ring(session, encoder.write, sample_rate)
+                    encoder.close()
+                    return
+                with wave.open(str(session.output_path), "wb") as wav_file:
+                    wav_file.setnchannels(channels)
+                    wav_file.setsampwidth(sample_width)
+                    wav_file.setframerate(sample_rate)
+                    self._drain_ring(session, wav_file.writeframesraw, sample_rate)
+            except (EncoderError, OSError) as exc:
+                session.writer_error = str(exc)
+                self._logger.error("Aufnahme konnte nicht geschrieben werden: %s", exc)
+                if encoder is not None:
+                    encoder.abort()
 
         session.writer_thread = threading.Thread(
             target=_writer_loop,
@@ -332,6 +375,59 @@ class RecordingController:
 
         session.mode = "sounddevice"
 
+    def _drain_ring(self, session: _RecordingSession, write: Any, sample_rate: int) -> None:
+        """Writer loop: move samples from the ring to ``write`` until stopped.
+
+        Waits for a batch of ``WRITE_BATCH_SECONDS`` (or the stop signal),
+        then hands each contiguous ring region to ``write`` - directly for
+        integer streams, after in-place PCM conversion for float streams.
+        """
+        ring = session.ring
+        stop_event = session.stop_event
+        if ring is None or stop_event is None:
+            return
+        batch_frames = max(1, int(sample_rate * self.WRITE_BATCH_SECONDS))
+        convert = ring.dtype.kind == "f"
+        pcm_dtype = "<i2" if session.sample_width <= 2 else "<i4"
+        if convert:
+            scratch = np.empty((ring.capacity, ring.channels), dtype=np.float64)
+            pcm = np.empty((ring.capacity, ring.channels), dtype=pcm_dtype)
+
+        while True:
+            stopping = stop_event.is_set()
+            if not stopping and ring.available < batch_frames:
+                stop_event.wait(self.WRITE_BATCH_SECONDS / 2)
+                continue
+            views = ring.peek()
+            if not views:
+                if stopping:
+                    break
+                continue
+            for view in views:
+                frames = view.shape[0]
+                if convert:
+                    write(self._float_to_pcm(view, session.sample_width, scratch[:frames], pcm[:frames]))
+                else:
+                    write(view)
+                ring.consume(frames)
+                session.frames_captured += frames
+        session.dropped_frames = ring.dropped_frames
+        if ring.dropped_frames:
+            self._logger.warning("Aufnahme: %d Frames verworfen (Schreiben zu langsam)", ring.dropped_frames)
+
+    @staticmethod
+    def _float_to_pcm(samples: Any, sample_width: int, scratch: Any, out: Any) -> Any:
+        """Convert float samples into the preallocated ``out`` integer array.
+
+        ``scratch`` is a float64 array of the same shape used for the
+        intermediate clip and scale; nothing else is allocated.
+        """
+        np.clip(samples, -1.0, 1.0, out=scratch)
+        scale = 32767.0 if sample_width <= 2 else 2147483647.0
+        np.multiply(scratch, scale, out=scratch)
+        np.copyto(out, scratch, casting="unsafe")
+        return out
+
     def _convert_float_buffer(self, buffer: Any, sample_width: int) -> bytes:
         """Convert a float32 numpy buffer into PCM bytes."""
         if np is None:
@@ -339,14 +435,8 @@ class RecordingController:
         array = np.asarray(buffer, dtype=np.float32)
         if array.size == 0:
             return b""
-        clipped = np.clip(array, -1.0, 1.0).astype(np.float64)
-        if sample_width <= 2:
-            scaled = clipped * 32767.0
-            pcm = np.clip(scaled, -32768, 32767).astype("<i2")
-        else:
-            scaled = clipped * 2147483647.0
-            pcm = np.clip(scaled, -2147483648, 2147483647).astype("<i4")
-        return pcm.tobytes()
+        pcm = np.empty(array.shape, dtype="<i2" if sample_width <= 2 else "<i4")
+        return self._float_to_pcm(array, sample_width, np.empty(array.shape), pcm).tobytes()
 
     def _finalize_sounddevice_session(self, session: _RecordingSession) -> Dict[str, object]:
         sample_rate = int(session.quality.get("sample_rate", 48000))
@@ -355,6 +445,8 @@ class RecordingController:
 
         self._stop_sounddevice_stream(session)
 
+        if session.writer_error:
+            raise RecordingError(session.writer_error)
         if not session.output_path.exists():
             raise RecordingError("Aufnahme-Datei wurde nicht erstellt")
 
@@ -369,6 +461,7 @@ class RecordingController:
             "channels": channels,
             "bit_depth": bit_depth,
             "duration_seconds": duration_seconds,
+            "dropped_frames": session.dropped_frames,
         }
 
     def _stop_sounddevice_stream(self, session: _RecordingSession, *, delete_file: bool = False) -> None:
@@ -379,14 +472,19 @@ class RecordingController:
                 session.stream.close()
         if session.stop_event is not None:
             session.stop_event.set()
+        if session.encoder is not None and delete_file:
+            # Discarded anyway: do not wait for the encoder to flush
+            session.encoder.abort()
         if session.writer_thread is not None:
-            session.writer_thread.join(timeout=2.0)
+            # Encoders may need a moment to flush the last frames
+            session.writer_thread.join(timeout=30.0 if session.encoder is not None else 2.0)
         if delete_file and session.output_path.exists():
             with contextlib.suppress(FileNotFoundError):
                 session.output_path.unlink()
         session.stream = None
         session.writer_thread = None
-        session.queue = None
+        session.ring = None
+        session.encoder = None
         session.stop_event = None
 
     def _cleanup_sounddevice_session(self, session: _RecordingSession, *, delete_file: bool = False) -> None:
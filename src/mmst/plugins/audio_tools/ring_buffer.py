@@ -0,0 +1,126 @@
+"""Preallocated sample ring buffer for handing audio out of PortAudio callbacks.
+
+The audio callback must not allocate, lock or block. :class:`SampleRingBuffer`
+is a single-producer/single-consumer ring over one preallocated NumPy array:
+the producer (the callback) copies each block in with at most two slice
+assignments and then publishes it by bumping a frame counter; consumers only
+read frames below that counter. Counters grow monotonically and are only
+written by their owning side, so no lock is needed under the GIL.
+
+Two consumption styles are supported: :meth:`latest` peeks at the newest
+window (visualisation, producer may overwrite), and :meth:`peek` /
+:meth:`consume` drain every frame in order (recording, producer drops
+frames instead of overwriting unread ones).
+"""
+from __future__ import annotations
+
+from typing import List, Optional
+
+import numpy as np
+
+
+class SampleRingBuffer:
+    """Fixed-size ring of ``(frames, channels)`` samples."""
+
+    def __init__(self, capacity: int, channels: int = 1, dtype: str = "float32") -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = int(capacity)
+        self.channels = max(1, int(channels))
+        self._data = np.zeros((self.capacity, self.channels), dtype=dtype)
+        self._written = 0  # total frames published by the producer
+        self._read = 0  # total frames consumed, owned by the consumer
+        self.dropped_frames = 0  # frames rejected because the ring was full
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._data.dtype
+
+    @property
+    def frames_written(self) -> int:
+        return self._written
+
+    @property
+    def available(self) -> int:
+        """Frames written but not yet consumed."""
+        return self._written - self._read
+
+    def write(self, block: np.ndarray, overwrite: bool = True) -> int:
+        """Copy ``block`` (frames[, channels]) into the ring; producer side only.
+
+        Args:
+            block: Samples to store, converted to the ring's dtype on copy
+            overwrite: If False, frames that would overwrite unconsumed data
+                are dropped and counted in :attr:`dropped_frames`; otherwise
+                blocks larger than the ring keep only their newest frames
+
+        Returns:
+            Number of frames stored
+        """
+        if block.ndim == 1:
+            block = block[:, None]
+        frames = block.shape[0]
+        limit = self.capacity if overwrite else self.capacity - (self._written - self._read)
+        if frames > limit:
+            if overwrite:
+                block = block[-limit:]
+            else:
+                self.dropped_frames += frames - limit
+                block = block[:limit]
+            frames = limit
+        if frames <= 0:
+            return 0
+        start = self._written % self.capacity
+        first = min(frames, self.capacity - start)
+        self._data[start:start + first] = block[:first]
+        if first < frames:
+            self._data[:frames - first] = block[first:]
+        # Publish only after the samples are in place
+        self._written += frames
+        return frames
+
+    def latest(self, frames: int, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """Copy the newest ``frames`` frames in chronological order.
+
+        Args:
+            frames: Number of frames to return (at most ``capacity``)
+            out: Optional ``(frames, channels)`` array to fill
+
+        Returns:
+            The filled array, or None until enough frames have been written
+        """
+        written = self._written
+        if frames > self.capacity or written < frames:
+            return None
+        if out is None:
+            out = np.empty((frames, self.channels), dtype=self._data.dtype)
+        end = written % self.capacity
+        start = end - frames
+        if start >= 0:
+            out[:] = self._data[start:end]
+        else:
+            out[:-start] = self._data[start:]
+            out[-start:] = self._data[:end]
+        return out
+
+    def peek(self, max_frames: Optional[int] = None) -> List[np.ndarray]:
+        """Return up to two views of the oldest unconsumed frames; consumer side only.
+
+        The views alias the ring and stay valid until :meth:`consume` is
+        called for them.
+        """
+        frames = self._written - self._read
+        if max_frames is not None:
+            frames = min(frames, max_frames)
+        if frames <= 0:
+            return []
+        start = self._read % self.capacity
+        first = min(frames, self.capacity - start)
+        views = [self._data[start:start + first]]
+        if first < frames:
+            views.append(self._data[:frames - first])
+        return views
+
+    def consume(self, frames: int) -> None:
+        """Release ``frames`` frames returned by :meth:`peek` to the producer."""
+        self._read += min(frames, self._written - self._read)
@@ -1,7 +1,14 @@
-"""Real-time spectrum analyzer widget using FFT visualization."""
+"""Real-time spectrum analyzer widget using FFT visualization.
+
+The PortAudio callback only copies samples into a :class:`SampleRingBuffer`;
+the widget's display timer runs :class:`SpectrumAnalyzer` on the newest
+window. The analyzer precomputes the Hann window and the FFT bin range of
+every band once per (FFT size, sample rate), so a frame costs one windowed
+``rfft`` and one ``np.add.reduceat``.
+"""
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple
 
 from PySide6.QtCore import Qt, QTimer  # type: ignore[import-not-found]
 from PySide6.QtGui import QColor, QPainter, QPen  # type: ignore[import-not-found]
@@ -20,6 +27,72 @@ try:  # pragma: no cover - optional dependency
 except Exception:  # pragma: no cover - missing runtime dependency
     sd = None  # type: ignore[assignment]
 
+from .ring_buffer import SampleRingBuffer
+
+
+class SpectrumAnalyzer:
+    """Windowed FFT band levels for a fixed set of center frequencies.
+
+    Each band spans half an octave below and above its center frequency.
+    Levels are the mean FFT magnitude of the band's bins on the same
+    ``log10(mean + 1) / 3`` scale the widget has always used, smoothed
+    exponentially between frames.
+    """
+
+    def __init__(
+        self,
+        bands: Sequence[float],
+        sample_rate: float = 48000.0,
+        fft_size: int = 2048,
+        smoothing: float = 0.7,
+    ) -> None:
+        self.bands = tuple(bands)
+        self.smoothing = smoothing
+        self.levels = np.zeros(len(self.bands))
+        self._plan_key: Optional[Tuple[int, float]] = None
+        self.configure(fft_size, sample_rate)
+
+    def configure(self, fft_size: int, sample_rate: float) -> None:
+        """Precompute window and band bin ranges (no-op if unchanged)."""
+        key = (int(fft_size), float(sample_rate))
+        if key == self._plan_key:
+            return
+        self._plan_key = key
+        self.fft_size, self.sample_rate = key
+        # Scale by the coherent gain so levels match an unwindowed FFT
+        window = np.hanning(self.fft_size)
+        self._window = window / window.mean()
+
+        freqs = np.fft.rfftfreq(self.fft_size, 1.0 / self.sample_rate)
+        centers = np.asarray(self.bands, dtype=np.float64)
+        starts = np.searchsorted(freqs, centers / np.sqrt(2.0), side="left")
+        stops = np.searchsorted(freqs, centers * np.sqrt(2.0), side="right")
+        self._counts = stops - starts
+        # reduceat over interleaved (start, stop) pairs sums each band at the
+        # even positions; the magnitude buffer has one spare slot so a stop
+        # index equal to the bin count stays valid
+        self._edges = np.column_stack([starts, stops]).ravel()
+        self._magnitude = np.zeros(len(freqs) + 1)
+        self._empty = self._counts == 0
+
+    def analyze(self, samples: np.ndarray) -> np.ndarray:
+        """Return the unsmoothed band levels (0..1) of ``fft_size`` mono samples."""
+        spectrum = np.fft.rfft(samples * self._window)
+        np.abs(spectrum, out=self._magnitude[:-1])
+        sums = np.add.reduceat(self._magnitude, self._edges)[::2]
+        means = sums / np.maximum(self._counts, 1)
+        levels = np.minimum(1.0, np.log10(means + 1.0) / 3.0)
+        levels[self._empty] = 0.0
+        return levels
+
+    def update(self, samples: np.ndarray) -> np.ndarray:
+        """Analyze ``samples`` and fold the result into :attr:`levels`."""
+        self.levels = self.smoothing * self.levels + (1.0 - self.smoothing) * self.analyze(samples)
+        return self.levels
+
+    def reset(self) -> None:
+        self.levels = np.zeros(len(self.bands))
+
 
 class SpectrumAnalyzerWidget(QWidget):
     """Real-time FFT-based spectrum analyzer visualization."""
@@ -37,9 +110,17 @@ class SpectrumAnalyzerWidget(QWidget):
         self._stream = None
         self._active = False
         self._device_id: Optional[int] = None
+        self._fft_size = 2048
+        self._ring: Optional[SampleRingBuffer] = None
+        self._window_buffer = None
+        self._analyzed_frames = 0
         
         # Visualization settings
         self._smoothing = 0.7  # Smoothing factor for visual stability
+        self._analyzer = (
+            SpectrumAnalyzer(self._bands, fft_size=self._fft_size, smoothing=self._smoothing)
+            if np is not None else None
+        )
         
         # Update timer
         self._timer = QTimer()
@@ -61,14 +142,18 @@ class SpectrumAnalyzerWidget(QWidget):
         self._active = True
         
         try:
-            # Start audio input stream
+            # Start audio input stream at the device's native rate
+            self._ring = SampleRingBuffer(self._fft_size * 4, channels=1)
+            self._window_buffer = np.empty((self._fft_size, 1), dtype=np.float32)
+            self._analyzed_frames = 0
             self._stream = sd.InputStream(
                 device=self._device_id,
                 channels=1,
-                samplerate=44100,
-                blocksize=2048,
+                blocksize=0,
                 callback=self._audio_callback
             )
+            self._analyzer.configure(self._fft_size, float(self._stream.samplerate))
+            self._analyzer.reset()
             self._stream.start()
             self._timer.start()
         except Exception:
@@ -90,6 +175,9 @@ class SpectrumAnalyzerWidget(QWidget):
                 self._stream = None
         
         # Reset magnitudes
+        self._ring = None
+        if self._analyzer is not None:
+            self._analyzer.reset()
         self._magnitudes = [0.0] * len(self._bands)
         self.update()
     
@@ -98,51 +186,30 @@ class SpectrumAnalyzerWidget(QWidget):
         return self._active
     
     def _audio_callback(self, indata, frames, time, status) -> None:  # type: ignore[no-untyped-def]
-        """Process incoming audio data with FFT analysis."""
-        if not self._active or np is None:
+        """Hand incoming samples to the display timer; no analysis here."""
+        ring = self._ring
+        if not self._active or ring is None:
             return
-        
-        try:
-            # Get mono audio data
-            audio = indata[:, 0] if indata.ndim > 1 else indata
-            
-            # Perform FFT
-            fft = np.fft.rfft(audio)
-            magnitude = np.abs(fft)
-            
-            # Sample rate and frequency bins
-            samplerate = 44100
-            freqs = np.fft.rfftfreq(len(audio), 1 / samplerate)
-            
-            # Calculate magnitude for each band
-            new_mags = []
-            for band_freq in self._bands:
-                # Find frequencies within band range (±half octave)
-                low = band_freq / 1.4142
-                high = band_freq * 1.4142
-                mask = (freqs >= low) & (freqs <= high)
-                
-                # Average magnitude in this band
-                if mask.any():
-                    avg_mag = float(np.mean(magnitude[mask]))
-                    # Normalize to 0-1 range with log scale
-                    normalized = min(1.0, np.log10(avg_mag + 1) / 3.0)
-                    new_mags.append(normalized)
-                else:
-                    new_mags.append(0.0)
-            
-            # Apply smoothing for visual stability
-            for i in range(len(self._bands)):
-                self._magnitudes[i] = (
-                    self._smoothing * self._magnitudes[i] + 
-                    (1 - self._smoothing) * new_mags[i]
-                )
-        except Exception:
-            # Ignore errors during processing
-            pass
+        ring.write(indata[:, :1] if indata.ndim > 1 else indata)
+    
+    def _analyze_latest(self) -> None:
+        """Run the FFT on the newest window if new samples arrived."""
+        ring = self._ring
+        if ring is None or self._analyzer is None:
+            return
+        written = ring.frames_written
+        if written == self._analyzed_frames:
+            return
+        window = ring.latest(self._fft_size, out=self._window_buffer)
+        if window is None:
+            return
+        self._analyzed_frames = written
+        self._magnitudes = self._analyzer.update(window[:, 0]).tolist()
     
     def _update_display(self) -> None:
-        """Trigger repaint of visualization."""
+        """Analyze the newest samples and trigger a repaint."""
+        if self._active:
+            self._analyze_latest()
         self.update()
     
     def paintEvent(self, event) -> None:  # type: ignore[no-untyped-def]
@@ -0,0 +1,226 @@
+"""Text/binary classification shared by the Explorer search and preview.
+
+Most files are classified by extension. Files with unknown extensions have
+their first kilobyte sniffed; that verdict is memoised per (path, size,
+mtime) in :class:`FileTypeCache`, optionally persisted in SQLite so repeated
+searches and previews do not open the same files again.
+"""
+from __future__ import annotations
+
+import logging
+import mimetypes
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Define binary file detection
+BINARY_EXTENSIONS = {
+    '.exe', '.dll', '.so', '.pyc', '.obj', '.bin', '.dat', '.db', '.sqlite',
+    '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.ico', '.tiff', '.webp',
+    '.mp3', '.wav', '.mp4', '.avi', '.mov', '.mkv', '.flac', '.ogg',
+    '.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz',
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx'
+}
+
+# Default supported text file extensions (can be customized)
+DEFAULT_TEXT_EXTENSIONS = {
+    '.txt', '.md', '.py', '.js', '.html', '.css', '.json', '.xml',
+    '.yml', '.yaml', '.ini', '.cfg', '.conf', '.log',
+    '.c', '.cpp', '.h', '.hpp', '.java', '.ts', '.cs', '.go',
+    '.php', '.rb', '.pl', '.sh', '.bat', '.ps1', '.sql'
+}
+
+SNIFF_BYTES = 1024
+
+
+def classify_by_name(path: Path, text_extensions=DEFAULT_TEXT_EXTENSIONS,
+                     binary_extensions=BINARY_EXTENSIONS) -> Optional[bool]:
+    """Classify a file from its name alone.
+
+    Args:
+        path: Path to the file
+        text_extensions: Extensions known to be text
+        binary_extensions: Extensions known to be binary
+
+    Returns:
+        True for text, False for binary, None if the content has to be sniffed
+    """
+    suffix = path.suffix.lower()
+    if suffix in binary_extensions:
+        return False
+    if suffix in text_extensions:
+        return True
+    mime_type, _ = mimetypes.guess_type(path.name)
+    if mime_type and mime_type.startswith('text/'):
+        return True
+    return None
+
+
+def sniff_text(data: bytes) -> bool:
+    """Decide from the first bytes of a file whether it is text.
+
+    Every byte sequence decodes as Latin-1, so only NUL bytes mark binary data.
+    """
+    return b'\x00' not in data
+
+
+class FileTypeCache:
+    """Memoised content sniffing keyed by (path, size, mtime).
+
+    Verdicts live in a bounded in-memory LRU and, once :meth:`attach` has been
+    called, in a SQLite table that survives restarts. Lookups are thread-safe
+    so search workers can classify files in parallel.
+    """
+
+    MAX_MEMORY_ENTRIES = 50_000
+    MAX_STORED_ENTRIES = 200_000
+    FLUSH_THRESHOLD = 256
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self._lock = threading.RLock()
+        self._memory: "OrderedDict[str, Tuple[int, int, bool]]" = OrderedDict()
+        self._pending: List[Tuple[str, int, int, int]] = []
+        self._conn: Optional[sqlite3.Connection] = None
+        if db_path is not None:
+            self.attach(db_path)
+
+    def attach(self, db_path: Path) -> None:
+        """Persist verdicts in ``db_path`` (no-op if a database is already attached)."""
+        with self._lock:
+            if self._conn is not None:
+                return
+            try:
+                db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(db_path), check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS sniff ("
+                    "path TEXT PRIMARY KEY, size INTEGER NOT NULL, "
+                    "mtime_ns INTEGER NOT NULL, is_text INTEGER NOT NULL)"
+                )
+                conn.commit()
+            except (OSError, sqlite3.Error) as exc:
+                logger.warning("File type cache unavailable at %s: %s", db_path, exc)
+                return
+            self._conn = conn
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def is_text(self, path: Path, stat: Optional[os.stat_result] = None) -> bool:
+        """Return whether ``path`` is text, sniffing its content at most once per version.
+
+        Args:
+            path: Path to the file
+            stat: Optional stat result to avoid another stat call
+
+        Returns:
+            True if the file looks like text
+        """
+        try:
+            stat = stat if stat is not None else os.stat(path)
+        except OSError:
+            return False
+        key = os.fspath(path)
+        size, mtime_ns = stat.st_size, stat.st_mtime_ns
+
+        cached = self._lookup(key, size, mtime_ns)
+        if cached is not None:
+            return cached
+
+        try:
+            with open(path, 'rb') as handle:
+                verdict = sniff_text(handle.read(SNIFF_BYTES))
+        except OSError:
+            return False
+        self._remember(key, size, mtime_ns, verdict)
+        return verdict
+
+    def flush(self) -> None:
+        """Write pending verdicts to the database."""
+        with self._lock:
+            if self._conn is None or not self._pending:
+                self._pending.clear()
+                return
+            rows, self._pending = self._pending, []
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO sniff(path, size, mtime_ns, is_text) VALUES (?, ?, ?, ?)", rows
+                )
+                # Replaced rows get fresh rowids, so the lowest rowids are the stalest
+                (count,) = self._conn.execute("SELECT COUNT(*) FROM sniff").fetchone()
+                excess = count - self.MAX_STORED_ENTRIES
+                if excess > 0:
+                    self._conn.execute(
+                        "DELETE FROM sniff WHERE rowid IN (SELECT rowid FROM sniff ORDER BY rowid LIMIT ?)",
+                        (excess,),
+                    )
+                self._conn.commit()
+            except sqlite3.Error as exc:
+                logger.debug("Failed to store file type verdicts: %s", exc)
+
+    def _lookup(self, key: str, size: int, mtime_ns: int) -> Optional[bool]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] == size and entry[1] == mtime_ns:
+                    self._memory.move_to_end(key)
+                    return entry[2]
+                return None
+            if self._conn is None:
+                return None
+            try:
+                row = self._conn.execute(
+                    "SELECT size, mtime_ns, is_text FROM sniff WHERE path = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+        if row is None or row[0] != size or row[1] != mtime_ns:
+            return None
+        verdict = bool(row[2])
+        with self._lock:
+            self._store_memory(key, size, mtime_ns, verdict)
+        return verdict
+
+    def _remember(self, key: str, size: int, mtime_ns: int, verdict: bool) -> None:
+        with self._lock:
+            self._store_memory(key, size, mtime_ns, verdict)
+            if self._conn is not None:
+                self._pending.append((key, size, mtime_ns, int(verdict)))
+                if len(self._pending) >= self.FLUSH_THRESHOLD:
+                    self.flush()
+
+    def _store_memory(self, key: str, size: int, mtime_ns: int, verdict: bool) -> None:
+        self._memory[key] = (size, mtime_ns, verdict)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.MAX_MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+
+_shared_cache: Optional[FileTypeCache] = None
+_shared_lock = threading.Lock()
+
+
+def shared_file_type_cache(db_path: Optional[Path] = None) -> FileTypeCache:
+    """Process-wide cache shared by the search engine and the details panel.
+
+    Args:
+        db_path: Optional database to persist verdicts in; attached on first use
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = FileTypeCache()
+    if db_path is not None:
+        _shared_cache.attach(db_path)
+    return _shared_cache
@@ -0,0 +1,118 @@
+"""Batched fuzzy filename matching for the Explorer filter.
+
+The quick filter accepts a file when the typed pattern is a substring of its
+name or when ``difflib.SequenceMatcher`` rates them as similar enough. Running
+the matcher per row on every keystroke does not scale to large directories,
+so :class:`FilenameIndex` precomputes a per-directory table of lower-cased
+names and their character counts and answers a pattern for all names at once:
+
+* substring hits come from a single ``str.find`` scan over all names joined
+  with NUL separators;
+* the ``real_quick_ratio`` and ``quick_ratio`` upper bounds of difflib are
+  evaluated vectorised with NumPy;
+* only names that survive both bounds pay for an exact ``SequenceMatcher``.
+
+The result is identical to calling the matcher on every name.
+"""
+from __future__ import annotations
+
+import difflib
+from collections import Counter
+from typing import Dict, Sequence
+
+import numpy as np
+
+# NUL cannot occur in file names, so joined names never match across entries
+_SEPARATOR = "\x00"
+_CODE_BITS = 21  # Unicode code points fit in 21 bits
+
+
+def fuzzy_match(name: str, pattern: str, threshold: float) -> bool:
+    """Match a single lower-cased ``name`` against a lower-cased ``pattern``."""
+    if not pattern or pattern in name:
+        return True
+    return difflib.SequenceMatcher(None, name, pattern).ratio() >= threshold
+
+
+class FilenameIndex:
+    """Lower-cased names of one directory prepared for batched matching."""
+
+    def __init__(self, names: Sequence[str]):
+        self.names = [name.lower() for name in names]
+        count = len(self.names)
+        self._lengths = np.fromiter((len(name) for name in self.names), dtype=np.int64, count=count)
+        self._blob = _SEPARATOR.join(self.names)
+        self._starts = np.zeros(count, dtype=np.int64)
+        if count > 1:
+            np.cumsum(self._lengths[:-1] + 1, out=self._starts[1:])
+
+        # Character multiset of every name as sorted (row, code point) pairs with counts
+        codes = np.frombuffer(self._blob.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+        rows = np.repeat(np.arange(count, dtype=np.int64), self._lengths + 1)[: len(codes)]
+        keep = codes != ord(_SEPARATOR)
+        pairs, counts = np.unique((rows[keep] << _CODE_BITS) | codes[keep], return_counts=True)
+        self._char_rows = pairs >> _CODE_BITS
+        self._char_codes = pairs & ((1 << _CODE_BITS) - 1)
+        self._char_counts = counts
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def match(self, pattern: str, threshold: float) -> np.ndarray:
+        """Return a boolean mask of the names accepted for ``pattern``.
+
+        Args:
+            pattern: Lower-cased search text
+            threshold: Minimum ``SequenceMatcher.ratio()`` for fuzzy hits
+
+        Returns:
+            Boolean array aligned with :attr:`names`
+        """
+        count = len(self.names)
+        if not pattern:
+            return np.ones(count, dtype=bool)
+        accepted = np.zeros(count, dtype=bool)
+        if not count:
+            return accepted
+
+        if _SEPARATOR not in pattern:
+            blob = self._blob
+            pos = blob.find(pattern)
+            hits = []
+            while pos != -1:
+                hits.append(pos)
+                # Continue after the end of the matching name
+                end = blob.find(_SEPARATOR, pos)
+                if end == -1:
+                    break
+                pos = blob.find(pattern, end + 1)
+            if hits:
+                accepted[np.searchsorted(self._starts, hits, side="right") - 1] = True
+
+        # Upper bounds of the ratio, computed the way difflib computes ratios
+        total = self._lengths + len(pattern)
+        candidates = ~accepted & (2.0 * np.minimum(self._lengths, len(pattern)) / total >= threshold)
+        if not candidates.any():
+            return accepted
+
+        wanted = Counter(pattern)
+        codes = np.array(sorted(ord(ch) for ch in wanted), dtype=np.int64)
+        limits = np.array([wanted[chr(code)] for code in codes], dtype=np.int64)
+        slot = np.searchsorted(codes, self._char_codes)
+        slot[slot == len(codes)] = 0
+        present = codes[slot] == self._char_codes
+        shared = np.bincount(
+            self._char_rows[present],
+            weights=np.minimum(self._char_counts[present], limits[slot[present]]),
+            minlength=count,
+        )
+        candidates &= 2.0 * shared / total >= threshold
+
+        for row in np.flatnonzero(candidates):
+            if difflib.SequenceMatcher(None, self.names[row], pattern).ratio() >= threshold:
+                accepted[row] = True
+        return accepted
+
+    def match_map(self, pattern: str, threshold: float) -> Dict[str, bool]:
+        """Like :meth:`match` but keyed by lower-cased name."""
+        return dict(zip(self.names, self.match(pattern, threshold).tolist()))
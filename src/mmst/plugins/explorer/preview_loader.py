@@ -0,0 +1,190 @@
+"""Background preview rendering for the Explorer details panel.
+
+Decoding a large photo or reading a big text file on the GUI thread stalls
+keyboard navigation through a folder. :class:`PreviewLoader` moves that work
+to a single worker thread: every selection change supersedes the previous
+request, queued requests are dropped and results that arrive for an older
+selection are discarded. Images are decoded at preview size and cached in the
+media library's thumbnail store.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+from ..media_library.thumbnails import ThumbnailStore, load_image_thumbnail
+from .file_types import classify_by_name, shared_file_type_cache
+
+try:
+    from PySide6.QtCore import QObject, Signal
+    HAS_PYSIDE6 = True
+except ImportError:  # pragma: no cover - headless operation
+    QObject = object  # type: ignore[assignment,misc]
+    Signal = None  # type: ignore[assignment]
+    HAS_PYSIDE6 = False
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".gif"}
+PREVIEW_SIZE = 320
+MAX_TEXT_BYTES = 100 * 1024
+MAX_TEXT_LINES = 500
+# Syntax highlighting runs on the GUI thread, so skip it for very large files
+HIGHLIGHT_LIMIT = 1024 * 1024
+
+
+@dataclass
+class PreviewResult:
+    """Rendered preview of one file.
+
+    ``kind`` is ``"image"``, ``"text"`` or ``"none"`` (nothing to preview,
+    e.g. a binary file) and ``error`` is set if rendering failed.
+    """
+
+    path: Path
+    generation: int
+    kind: str
+    image: Any = None
+    dimensions: Tuple[int, int] = (0, 0)
+    text: str = ""
+    truncated: bool = False
+    highlight: bool = True
+    error: str = ""
+
+
+def read_text_preview(
+    path: Path, max_bytes: int = MAX_TEXT_BYTES, max_lines: int = MAX_TEXT_LINES
+) -> Tuple[str, bool, int]:
+    """Read the head of a text file.
+
+    Files larger than ``max_bytes`` are cut to their first ``max_lines``
+    lines, reading at most ``max_bytes`` bytes.
+
+    Returns:
+        Tuple of (text, truncated, file size)
+    """
+    with path.open("rb") as handle:
+        size = path.stat().st_size
+        data = handle.read(max_bytes + 1)
+    truncated = len(data) > max_bytes
+    text = data[:max_bytes].decode("utf-8", errors="ignore")
+    if truncated:
+        text = "".join(text.splitlines(keepends=True)[:max_lines])
+    return text, truncated, size
+
+
+def render_preview(
+    path: Path,
+    kind: str,
+    generation: int = 0,
+    thumbnails: Optional[ThumbnailStore] = None,
+    max_side: int = PREVIEW_SIZE,
+    cancelled: Callable[[], bool] = lambda: False,
+) -> Optional[PreviewResult]:
+    """Render the preview of ``path``; safe to call from worker threads.
+
+    Args:
+        path: File to preview
+        kind: ``"image"``, ``"text"`` or ``"sniff"`` to classify the file first
+        generation: Request number copied into the result
+        thumbnails: Optional shared thumbnail cache for images
+        max_side: Maximum image width and height
+        cancelled: Polled between steps; rendering stops once it returns True
+
+    Returns:
+        The result, or None if the request was cancelled
+    """
+    try:
+        if kind == "sniff":
+            verdict = classify_by_name(path)
+            if verdict is None:
+                verdict = shared_file_type_cache().is_text(path)
+            kind = "text" if verdict else "none"
+            if cancelled():
+                return None
+
+        if kind == "image":
+            image, dimensions = load_image_thumbnail(path, max_side, thumbnails)
+            if image is None:
+                return PreviewResult(path, generation, kind, error="Ungültiges Bildformat")
+            return PreviewResult(path, generation, kind, image=image, dimensions=dimensions)
+
+        if kind == "text":
+            text, truncated, size = read_text_preview(path)
+            return PreviewResult(
+                path, generation, kind, text=text, truncated=truncated, highlight=size <= HIGHLIGHT_LIMIT
+            )
+    except Exception as exc:
+        return PreviewResult(path, generation, kind, error=str(exc))
+    return PreviewResult(path, generation, "none")
+
+
+class PreviewLoader(QObject):  # type: ignore[misc]
+    """Renders previews on a worker thread, newest request wins.
+
+    ``ready`` is emitted on the thread that owns the loader (the GUI thread)
+    with a :class:`PreviewResult` for the current request only.
+    """
+
+    if HAS_PYSIDE6:
+        ready = Signal(object)
+
+    def __init__(
+        self, thumbnails: Optional[ThumbnailStore] = None, max_side: int = PREVIEW_SIZE, parent=None
+    ) -> None:
+        if HAS_PYSIDE6:
+            super().__init__(parent)
+        self._thumbnails = thumbnails
+        self._max_side = max_side
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._future: Optional[concurrent.futures.Future] = None
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="explorer-preview")
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def request(self, path: Path, kind: str) -> int:
+        """Render ``path`` in the background, superseding any earlier request.
+
+        Returns:
+            The generation number the result will carry
+        """
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            if self._future is not None:
+                self._future.cancel()
+            self._future = self._executor.submit(self._run, Path(path), kind, generation)
+        return generation
+
+    def cancel(self) -> None:
+        """Drop the pending request, e.g. when the selection is cleared."""
+        with self._lock:
+            self._generation += 1
+            if self._future is not None:
+                self._future.cancel()
+                self._future = None
+
+    def is_current(self, result: PreviewResult) -> bool:
+        return result.generation == self._generation
+
+    def shutdown(self) -> None:
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, path: Path, kind: str, generation: int) -> Optional[PreviewResult]:
+        def _stale() -> bool:
+            return generation != self._generation
+
+        if _stale():
+            return None
+        result = render_preview(path, kind, generation, self._thumbnails, self._max_side, _stale)
+        if result is not None and not _stale() and HAS_PYSIDE6:
+            self.ready.emit(result)
+        return result
@@ -7,33 +7,37 @@ allowing users to search for text within files in the current directory.
 """
 
 import concurrent.futures
+import functools
 import logging
-import mimetypes
+import mmap
+import os
 import re
+import threading
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple, Union, Callable
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union, Callable
 
-# Define binary file detection
-BINARY_EXTENSIONS = {
-    '.exe', '.dll', '.so', '.pyc', '.obj', '.bin', '.dat', '.db', '.sqlite',
-    '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.ico', '.tiff', '.webp',
-    '.mp3', '.wav', '.mp4', '.avi', '.mov', '.mkv', '.flac', '.ogg',
-    '.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz',
-    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx'
-}
+from .file_types import (
+    BINARY_EXTENSIONS,
+    DEFAULT_TEXT_EXTENSIONS,
+    FileTypeCache,
+    classify_by_name,
+    shared_file_type_cache,
+)
+from .search_index import TrigramIndex, literal_trigrams, required_literals
 
 # Maximum file size for full content search (in bytes)
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
 
-# Default supported text file extensions (can be customized)
-DEFAULT_TEXT_EXTENSIONS = {
-    '.txt', '.md', '.py', '.js', '.html', '.css', '.json', '.xml',
-    '.yml', '.yaml', '.ini', '.cfg', '.conf', '.log',
-    '.c', '.cpp', '.h', '.hpp', '.java', '.ts', '.cs', '.go',
-    '.php', '.rb', '.pl', '.sh', '.bat', '.ps1', '.sql'
-}
+# Files scanned through the memory-mapped fast path may be much larger
+MAX_MMAP_FILE_SIZE = 1024 * 1024 * 1024  # 1 GB
+
+# Non-ASCII characters that case-insensitive matching folds onto ASCII letters
+_ASCII_FOLDS = {"i": ("\u0130", "\u0131"), "k": ("\u212a",), "s": ("\u017f",)}
+
+# A carriage return not followed by a newline (old Mac line endings)
+_LONE_CR = re.compile(rb"\r(?!\n)")
 
 
 class SearchMode(Enum):
@@ -65,6 +69,100 @@ class SearchResult:
         return len(self.matches)
 
 
+class CancellationToken:
+    """Thread-safe flag shared between a search and whoever may cancel it."""
+    
+    def __init__(self):
+        self._event = threading.Event()
+    
+    def cancel(self) -> None:
+        """Request cancellation."""
+        self._event.set()
+    
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation was requested."""
+        return self._event.is_set()
+
+
+def _longest_ascii_run(text: str) -> str:
+    runs = re.findall(r"[\x00-\x7f]+", text)
+    return max(runs, key=len) if runs else ""
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_prefilter(search_term: str, mode: SearchMode) -> Optional[Callable[..., int]]:
+    """Build a bytes-level finder for offsets inside lines that may match.
+    
+    The finder looks for one literal that every matching line must contain,
+    directly on the raw UTF-8 bytes. It returns ``None`` when no such literal
+    can be derived, in which case files are scanned line by line.
+    
+    Args:
+        search_term: Text or pattern being searched for
+        mode: Search mode
+        
+    Returns:
+        ``find(data, start) -> int`` returning the offset of the next hit or -1
+    """
+    if "\n" in search_term or "\r" in search_term:
+        return None
+    
+    if mode == SearchMode.CASE_SENSITIVE:
+        literals = required_literals(search_term)
+        if not literals:
+            return None
+        needle = max(literals, key=len).encode("utf-8")
+        return lambda data, start: data.find(needle, start)
+    
+    # Case-insensitive: only ASCII letters can be folded reliably on bytes,
+    # including the few non-ASCII characters that fold onto them.
+    if mode == SearchMode.PLAIN_TEXT:
+        literal = _longest_ascii_run(search_term.lower())
+    else:
+        runs = [_longest_ascii_run(literal) for literal in required_literals(search_term)]
+        literal = max(runs, key=len) if runs else ""
+    if not literal:
+        return None
+    needle = literal.lower().encode("ascii")
+    overlap = 3 * len(needle) - 1  # folded characters take up to three bytes
+    parts = []
+    for ch in literal:
+        folds = _ASCII_FOLDS.get(ch.lower())
+        escaped = re.escape(ch.encode("ascii"))
+        if folds:
+            alternatives = b"|".join(re.escape(fold.encode("utf-8")) for fold in folds)
+            parts.append(b"(?:" + escaped + b"|" + alternatives + b")")
+        else:
+            parts.append(escaped)
+    folding = re.compile(b"".join(parts), re.IGNORECASE)
+    # Lead bytes of the fold characters above; windows containing them use the regex
+    hazards = (b"\xc4", b"\xc5", b"\xe2\x84\xaa") if any(ch.lower() in _ASCII_FOLDS for ch in literal) else ()
+    
+    def _find(data, start: int) -> int:
+        # bytes.lower() only folds ASCII, which makes lower+find far faster than
+        # a case-insensitive regex; windows grow so dense hits stay cheap.
+        end_of_data = len(data)
+        window = 4096
+        while start < end_of_data:
+            stop = min(start + window, end_of_data)
+            chunk = data[start:stop]
+            if any(hazard in chunk for hazard in hazards):
+                match = folding.search(chunk)
+                hit = match.start() if match else -1
+            else:
+                hit = chunk.lower().find(needle)
+            if hit != -1:
+                return start + hit
+            if stop >= end_of_data:
+                break
+            start = stop - overlap
+            window = min(window * 4, 4 * 1024 * 1024)
+        return -1
+    
+    return _find
+
+
 class SearchEngine:
     """Engine for searching text within files.
     
@@ -72,17 +170,33 @@ class SearchEngine:
     allowing users to search for text within files in the current directory.
     """
     
-    def __init__(self, plugin_services=None):
+    def __init__(self, plugin_services=None, index_dir: Optional[Path] = None):
         """Initialize the search engine.
         
         Args:
             plugin_services: Optional services from the plugin for notifications and logging
+            index_dir: Optional directory for persistent trigram indexes; defaults to
+                ``<data_dir>/explorer/search-index`` when services are available
         """
         self._services = plugin_services
         self._logger = logging.getLogger("mmst.explorer.search")
         self._text_extensions = DEFAULT_TEXT_EXTENSIONS
         self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        # Files submitted ahead of completion while the walk is still running
+        self._max_in_flight = 16
         self._current_search = None
+        if index_dir is None and plugin_services is not None and hasattr(plugin_services, "data_dir"):
+            index_dir = Path(plugin_services.data_dir) / "explorer" / "search-index"
+        self._index_dir = index_dir
+        self._indexes: Dict[str, TrigramIndex] = {}
+        self._index_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="search-index"
+        )
+        # Sniffing verdicts are shared with the details panel and persisted when possible
+        type_db = None
+        if plugin_services is not None and hasattr(plugin_services, "data_dir"):
+            type_db = Path(plugin_services.data_dir) / "explorer" / "file-types.sqlite3"
+        self._file_types: FileTypeCache = shared_file_type_cache(type_db)
         
     def set_text_extensions(self, extensions: Set[str]) -> None:
         """Set custom text file extensions.
@@ -92,50 +206,87 @@ class SearchEngine:
         """
         self._text_extensions = extensions
     
-    def is_text_file(self, path: Path) -> bool:
+    def is_text_file(self, path: Path, stat: Optional[os.stat_result] = None) -> bool:
         """Check if a file is likely to be a text file.
         
+        Extensions decide first; unknown files are sniffed once per
+        (path, size, mtime) through the shared file type cache.
+        
         Args:
             path: Path to the file
+            stat: Optional stat result to avoid another stat call
             
         Returns:
             True if the file is likely to be a text file
         """
-        # Check extension first (fastest)
-        suffix = path.suffix.lower()
-        if suffix in BINARY_EXTENSIONS:
-            return False
-        if suffix in self._text_extensions:
-            return True
-            
-        # Try to detect using mimetypes
-        mime_type, _ = mimetypes.guess_type(str(path))
-        if mime_type and mime_type.startswith('text/'):
-            return True
-            
-        # As a last resort, check the first few bytes
-        try:
-            with open(path, 'rb') as f:
-                content = f.read(1024)
-                # Check for common binary file markers
-                if b'\x00' in content:
-                    return False
-                # Try to decode as text
-                try:
-                    content.decode('utf-8')
-                    return True
-                except UnicodeDecodeError:
-                    try:
-                        content.decode('latin-1')
-                        return True
-                    except UnicodeDecodeError:
-                        return False
-        except (IOError, PermissionError):
-            return False
-        
-        # Default to assuming text
-        return True
+        verdict = classify_by_name(path, self._text_extensions)
+        if verdict is not None:
+            return verdict
+        return self._file_types.is_text(path, stat)
     
+    @property
+    def index_available(self) -> bool:
+        """Whether persistent indexes can be created (an index directory is set)."""
+        return self._index_dir is not None
+
+    def enable_index(self, directory: Path) -> Optional[concurrent.futures.Future]:
+        """Open (or create) the trigram index for a directory and refresh it in the background.
+        
+        Args:
+            directory: Root directory to index
+            
+        Returns:
+            Future resolving to the number of (re)indexed files, or None if indexing is unavailable
+        """
+        if self._index_dir is None or not directory.is_dir():
+            return None
+        key = os.path.abspath(directory)
+        index = self._indexes.get(key)
+        if index is None:
+            try:
+                index = TrigramIndex(
+                    Path(key),
+                    self._index_dir / TrigramIndex.db_name(Path(key)),
+                    is_text=self.is_text_file,
+                )
+            except Exception as e:
+                self._logger.error(f"Cannot open search index for {directory}: {e}")
+                return None
+            self._indexes[key] = index
+        return self.refresh_index(directory)
+
+    def refresh_index(self, directory: Path) -> Optional[concurrent.futures.Future]:
+        """Schedule an incremental (mtime based) refresh of an enabled index."""
+        index = self._indexes.get(os.path.abspath(directory))
+        if index is None:
+            return None
+        self._logger.debug(f"Refreshing search index for {directory}")
+        return self._index_executor.submit(index.update)
+
+    def disable_index(self, directory: Path) -> None:
+        """Stop using the index for a directory (the index file is kept on disk)."""
+        index = self._indexes.pop(os.path.abspath(directory), None)
+        if index is not None:
+            index.close()
+
+    def _index_for(self, directory: Path) -> Optional[TrigramIndex]:
+        """Return the enabled index covering ``directory`` (itself or an ancestor)."""
+        if not self._indexes:
+            return None
+        current = Path(os.path.abspath(directory))
+        for candidate in (current, *current.parents):
+            index = self._indexes.get(str(candidate))
+            if index is not None:
+                return index
+        return None
+
+    @staticmethod
+    def _query_trigrams(search_term: str, mode: SearchMode) -> Set[int]:
+        """Trigrams every matching line must contain (empty if none can be derived)."""
+        if mode == SearchMode.PLAIN_TEXT:
+            return literal_trigrams([search_term])
+        return literal_trigrams(required_literals(search_term))
+
     def cancel_search(self) -> None:
         """Cancel any ongoing search operation."""
         if self._current_search:
@@ -149,10 +300,13 @@ class SearchEngine:
                          mode: SearchMode = SearchMode.PLAIN_TEXT,
                          max_results: int = 1000,
                          file_filter: Optional[Callable[[Path], bool]] = None,
-                         progress_callback: Optional[Callable[[int, int], None]] = None
+                         progress_callback: Optional[Callable[[int, int], None]] = None,
+                         cancel_token: Optional[CancellationToken] = None
                          ) -> List[SearchResult]:
         """Search for text within files in a directory.
         
+        Collects the results of :meth:`iter_search`.
+        
         Args:
             directory: Directory to search
             search_term: Text to search for
@@ -160,13 +314,54 @@ class SearchEngine:
             max_results: Maximum number of results to return
             file_filter: Optional function to filter files
             progress_callback: Optional callback for progress updates
+            cancel_token: Optional token to abort the search early
             
         Returns:
             List of search results
         """
+        return list(self.iter_search(
+            directory,
+            search_term,
+            mode,
+            max_results,
+            file_filter,
+            progress_callback,
+            cancel_token,
+        ))
+    
+    def iter_search(self,
+                    directory: Path,
+                    search_term: str,
+                    mode: SearchMode = SearchMode.PLAIN_TEXT,
+                    max_results: int = 1000,
+                    file_filter: Optional[Callable[[Path], bool]] = None,
+                    progress_callback: Optional[Callable[[int, int], None]] = None,
+                    cancel_token: Optional[CancellationToken] = None
+                    ) -> Iterator[SearchResult]:
+        """Stream search results as soon as they are found.
+        
+        Walking the tree and searching files are pipelined: files are submitted
+        to the worker pool while the walk is still running, with a bounded
+        number in flight, and each result is yielded as its file completes.
+        Cancelling the token (or :meth:`cancel_search`, or closing the
+        generator) stops the walk, drops queued work and interrupts files
+        being searched.
+        
+        Args:
+            directory: Directory to search
+            search_term: Text to search for
+            mode: Search mode (plain text, regex, case sensitive)
+            max_results: Maximum number of results to yield
+            file_filter: Optional function to filter files
+            progress_callback: Optional callback receiving (files_processed, files_found)
+            cancel_token: Optional token to abort the search early
+            
+        Yields:
+            SearchResult for every file with at least one match
+        """
         if not directory.is_dir():
             self._logger.error(f"Cannot search in non-directory path: {directory}")
-            return []
+            return
             
         self._logger.info(f"Searching for '{search_term}' in {directory}")
         
@@ -178,62 +373,150 @@ class SearchEngine:
                 pattern = re.compile(search_term, flags)
             except re.error as e:
                 self._logger.error(f"Invalid regex pattern: {e}")
-                return []
+                return
         
-        # Get all files recursively
-        all_files = list(self._get_all_files(directory, file_filter))
-        total_files = len(all_files)
+        token = cancel_token or CancellationToken()
+        self._current_search = token
+        
+        # Prune candidates with the trigram index when one covers this directory
+        index = self._index_for(directory)
+        index_query = None
+        if index is not None:
+            try:
+                index_query = index.query(self._query_trigrams(search_term, mode))
+            except Exception as e:
+                self._logger.warning(f"Search index lookup failed, scanning all files: {e}")
         
         if progress_callback:
-            progress_callback(0, total_files)
-            
-        # Start the search operation
-        results = []
+            progress_callback(0, 0)
+        
+        files_found = 0
         files_processed = 0
+        yielded = 0
+        in_flight: Set[concurrent.futures.Future] = set()
         
-        try:
-            # Submit search tasks to the executor
-            futures = []
-            for file_path in all_files:
-                if not self.is_text_file(file_path):
-                    files_processed += 1
-                    if progress_callback and files_processed % 10 == 0:
-                        progress_callback(files_processed, total_files)
+        def _collect(done) -> Iterator[SearchResult]:
+            nonlocal files_processed
+            for future in done:
+                files_processed += 1
+                if token.cancelled:
                     continue
-                    
-                future = self._executor.submit(
-                    self._search_file, 
-                    file_path, 
-                    search_term, 
-                    mode, 
-                    pattern
-                )
-                futures.append(future)
-                
-            # Process results as they complete
-            for future in concurrent.futures.as_completed(futures):
                 try:
                     result = future.result()
-                    files_processed += 1
-                    
-                    if progress_callback and files_processed % 10 == 0:
-                        progress_callback(files_processed, total_files)
-                        
-                    if result and result.matches:
-                        results.append(result)
-                        if len(results) >= max_results:
-                            break
+                except concurrent.futures.CancelledError:
+                    continue
                 except Exception as e:
                     self._logger.error(f"Error during search: {e}")
+                    continue
+                if result and result.matches:
+                    yield result
+        
+        try:
+            for file_path, stat in self._iter_files(directory, file_filter, token):
+                files_found += 1
+                if index_query is not None and not index_query.may_match(file_path, stat):
+                    files_processed += 1
+                    continue
+                # Only name-based checks run here; sniffing file content happens
+                # in the worker so the walk never blocks on open()
+                verdict = classify_by_name(file_path, self._text_extensions)
+                if verdict is False:
+                    files_processed += 1
+                    continue
                 
-        except Exception as e:
-            self._logger.error(f"Search operation failed: {e}")
-            
-        # Final progress update
-        if progress_callback:
-            progress_callback(total_files, total_files)
+                if verdict is None:
+                    in_flight.add(self._executor.submit(
+                        self._sniff_and_search,
+                        file_path,
+                        stat,
+                        search_term,
+                        mode,
+                        pattern,
+                        token,
+                    ))
+                else:
+                    in_flight.add(self._executor.submit(
+                        self._search_file,
+                        file_path,
+                        search_term,
+                        mode,
+                        pattern,
+                        cancel_token=token,
+                    ))
+                if len(in_flight) < self._max_in_flight:
+                    continue
+                done, in_flight = concurrent.futures.wait(
+                    in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for result in _collect(done):
+                    yield result
+                    yielded += 1
+                    if yielded >= max_results:
+                        return
+                if progress_callback:
+                    progress_callback(files_processed, files_found)
             
-        return results
+            # Walk finished: drain the remaining work as it completes
+            while in_flight and not token.cancelled:
+                done, in_flight = concurrent.futures.wait(
+                    in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for result in _collect(done):
+                    yield result
+                    yielded += 1
+                    if yielded >= max_results:
+                        return
+                if progress_callback:
+                    progress_callback(files_processed, files_found)
+        finally:
+            # Runs on completion, max_results, cancellation and generator close
+            for future in in_flight:
+                future.cancel()
+            if cancel_token is None:
+                token.cancel()  # interrupt files still being searched
+            if self._current_search is token:
+                self._current_search = None
+            if progress_callback:
+                progress_callback(files_found, files_found)
+            self._file_types.flush()
+            # Fold files that were new or modified since indexing back into the index
+            if index is not None and index_query is not None and index_query.stale:
+                self._index_executor.submit(index.update, list(index_query.stale))
+    
+    def _iter_files(
+        self,
+        directory: Path,
+        file_filter: Optional[Callable[[Path], bool]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Iterator[Tuple[Path, os.stat_result]]:
+        """Lazily walk a directory tree, yielding files with their stat results.
+        
+        Symlinked directories are not followed (matching ``Path.rglob``).
+        """
+        stack = [directory]
+        while stack:
+            if cancel_token is not None and cancel_token.cancelled:
+                return
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    subdirs = []
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append(Path(entry.path))
+                                continue
+                            if not entry.is_file():
+                                continue
+                            path = Path(entry.path)
+                            if file_filter and not file_filter(path):
+                                continue
+                            yield path, entry.stat()
+                        except OSError:
+                            continue
+                    stack.extend(reversed(subdirs))
+            except (PermissionError, OSError) as e:
+                self._logger.warning(f"Error accessing path: {e}")
     
     def _get_all_files(self, directory: Path, file_filter: Optional[Callable[[Path], bool]] = None) -> List[Path]:
         """Get all files in a directory recursively.
@@ -245,32 +528,51 @@ class SearchEngine:
         Returns:
             List of file paths
         """
-        files = []
-        try:
-            for path in directory.rglob('*'):
-                if path.is_file():
-                    if file_filter and not file_filter(path):
-                        continue
-                    files.append(path)
-        except (PermissionError, OSError) as e:
-            self._logger.warning(f"Error accessing path: {e}")
-            
-        return files
+        return [path for path, _stat in self._iter_files(directory, file_filter)]
+    
+    def _sniff_and_search(self, file_path: Path, stat: os.stat_result, search_term: str, mode: SearchMode,
+                          pattern, cancel_token: CancellationToken) -> Optional[SearchResult]:
+        """Worker task for files whose type is unknown from the name."""
+        if cancel_token.cancelled or not self._file_types.is_text(file_path, stat):
+            return None
+        return self._search_file(file_path, search_term, mode, pattern, cancel_token=cancel_token)
     
-    def _search_file(self, file_path: Path, search_term: str, mode: SearchMode, pattern=None) -> Optional[SearchResult]:
+    def _search_file(self, file_path: Path, search_term: str, mode: SearchMode, pattern=None,
+                     cancel_token: Optional[CancellationToken] = None) -> Optional[SearchResult]:
         """Search for text within a single file.
         
+        Whenever a literal can be derived from the search term, the file is
+        memory-mapped and scanned for it at the bytes level; only lines around
+        a hit are decoded and verified. Other searches read the file line by line.
+        
         Args:
             file_path: Path to the file
             search_term: Text to search for
             mode: Search mode
             pattern: Compiled regex pattern (if applicable)
+            cancel_token: Optional token checked periodically to abort long files
             
         Returns:
             SearchResult with matches or None if error/no matches
         """
-        if file_path.stat().st_size > MAX_FILE_SIZE:
-            self._logger.debug(f"Skipping large file: {file_path} ({file_path.stat().st_size} bytes)")
+        try:
+            size = file_path.stat().st_size
+        except OSError as e:
+            self._logger.debug(f"Error searching file {file_path}: {e}")
+            return None
+        
+        prefilter = _compile_prefilter(search_term, mode)
+        if prefilter is not None and 0 < size <= MAX_MMAP_FILE_SIZE:
+            try:
+                matches = self._search_mapped(file_path, search_term, mode, pattern, prefilter, cancel_token)
+            except (PermissionError, OSError, ValueError) as e:
+                self._logger.debug(f"Error searching file {file_path}: {e}")
+                return None
+            if matches is not None:
+                return SearchResult(file_path=file_path, matches=matches) if matches else None
+        
+        if size > MAX_FILE_SIZE:
+            self._logger.debug(f"Skipping large file: {file_path} ({size} bytes)")
             return None
             
         matches = []
@@ -278,32 +580,9 @@ class SearchEngine:
         try:
             with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
                 for i, line in enumerate(file, 1):
-                    if mode == SearchMode.PLAIN_TEXT:
-                        # Simple case-insensitive substring search
-                        line_lower = line.lower()
-                        search_lower = search_term.lower()
-                        start_idx = line_lower.find(search_lower)
-                        while start_idx != -1:
-                            end_idx = start_idx + len(search_term)
-                            matches.append(SearchMatch(
-                                file_path=file_path,
-                                line_number=i,
-                                line_text=line.rstrip('\n'),
-                                start_pos=start_idx,
-                                end_pos=end_idx
-                            ))
-                            # Look for next occurrence in the same line
-                            start_idx = line_lower.find(search_lower, end_idx)
-                    else:
-                        # Regex search
-                        for match in pattern.finditer(line):
-                            matches.append(SearchMatch(
-                                file_path=file_path,
-                                line_number=i,
-                                line_text=line.rstrip('\n'),
-                                start_pos=match.start(),
-                                end_pos=match.end()
-                            ))
+                    if cancel_token is not None and not i & 0x3FF and cancel_token.cancelled:
+                        return None
+                    matches.extend(self._match_line(file_path, i, line, search_term, mode, pattern))
                             
             if matches:
                 return SearchResult(file_path=file_path, matches=matches)
@@ -313,6 +592,84 @@ class SearchEngine:
             
         return None
     
+    def _search_mapped(self, file_path: Path, search_term: str, mode: SearchMode, pattern,
+                       prefilter: Callable[..., int],
+                       cancel_token: Optional[CancellationToken] = None) -> Optional[List[SearchMatch]]:
+        """Search a memory-mapped file, decoding only the lines that contain a prefilter hit.
+        
+        Line numbers and line texts are identical to reading the file in text
+        mode with universal newlines.
+        
+        Returns:
+            List of matches, or None if the file needs the line-by-line path
+            (lone carriage returns as line separators)
+        """
+        matches: List[SearchMatch] = []
+        with open(file_path, 'rb') as handle:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if data.find(b"\r") != -1 and _LONE_CR.search(data):
+                    return None
+                end_of_data = len(data)
+                line_number = 1
+                counted = 0
+                pos = prefilter(data, 0)
+                while pos != -1:
+                    if cancel_token is not None and cancel_token.cancelled:
+                        return []
+                    start = data.rfind(b"\n", 0, pos) + 1
+                    end = data.find(b"\n", pos)
+                    if end == -1:
+                        end = end_of_data
+                    line_number += data[counted:start].count(b"\n")
+                    counted = start
+                    
+                    raw = data[start:end]
+                    line = raw.decode("utf-8", "replace")
+                    if end < end_of_data:
+                        # Text mode hands out lines with a single "\n" terminator
+                        if line.endswith("\r"):
+                            line = line[:-1]
+                        line += "\n"
+                    matches.extend(self._match_line(file_path, line_number, line, search_term, mode, pattern))
+                    
+                    if end >= end_of_data:
+                        break
+                    pos = prefilter(data, end + 1)
+        return matches
+    
+    @staticmethod
+    def _match_line(file_path: Path, line_number: int, line: str, search_term: str,
+                    mode: SearchMode, pattern=None) -> List[SearchMatch]:
+        """Find all matches within a single decoded line."""
+        matches = []
+        if mode == SearchMode.PLAIN_TEXT:
+            # Simple case-insensitive substring search
+            line_lower = line.lower()
+            search_lower = search_term.lower()
+            start_idx = line_lower.find(search_lower)
+            while start_idx != -1:
+                end_idx = start_idx + len(search_term)
+                matches.append(SearchMatch(
+                    file_path=file_path,
+                    line_number=line_number,
+                    line_text=line.rstrip('\n'),
+                    start_pos=start_idx,
+                    end_pos=end_idx
+                ))
+                # Look for next occurrence in the same line
+                start_idx = line_lower.find(search_lower, end_idx)
+        else:
+            # Regex search
+            for match in pattern.finditer(line):
+                matches.append(SearchMatch(
+                    file_path=file_path,
+                    line_number=line_number,
+                    line_text=line.rstrip('\n'),
+                    start_pos=match.start(),
+                    end_pos=match.end()
+                ))
+        return matches
+    
     def get_context_lines(self, file_path: Path, line_number: int, context_lines: int = 2) -> List[Tuple[int, str]]:
         """Get lines before and after a match for context.
         
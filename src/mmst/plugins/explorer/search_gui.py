@@ -45,8 +45,9 @@ class SearchPanelUI(QWidget):
         super().__init__(parent)
         self.setObjectName("ExplorerSearchPanel")
         
-        # Create search engine
-        self.search_engine = SearchEngine()
+        # Create search engine (persistent indexes live in the plugin data dir)
+        services = getattr(getattr(parent, "_plugin", None), "services", None)
+        self.search_engine = SearchEngine(services)
         
         # Initialize UI
         self._build_ui()
@@ -59,6 +60,10 @@ class SearchPanelUI(QWidget):
         # Current directory being searched
         self.current_directory = None
         
+        # Worker of the running search; signals from older workers are ignored
+        self._worker = None
+        self._result_count = 0
+        
     def _build_ui(self):
         """Build the search panel UI components."""
         # Create main layout
@@ -98,9 +103,18 @@ class SearchPanelUI(QWidget):
         self.max_results_spin.setSingleStep(100)
         max_results_layout.addWidget(self.max_results_spin)
         
+        # Persistent trigram index for repeated searches
+        self.index_checkbox = QCheckBox("Suchindex verwenden")
+        self.index_checkbox.setToolTip(
+            "Legt im Hintergrund einen Trigramm-Index für diesen Ordner an, "
+            "damit wiederholte Suchen nur passende Dateien lesen."
+        )
+        self.index_checkbox.setEnabled(self.search_engine.index_available)
+        
         options_layout.addWidget(QLabel("Modus:"))
         options_layout.addWidget(self.mode_combo)
         options_layout.addLayout(max_results_layout)
+        options_layout.addWidget(self.index_checkbox)
         options_layout.addStretch(1)
         
         # Progress bar
@@ -165,6 +179,9 @@ class SearchPanelUI(QWidget):
             
         # Connect cancel button
         self.cancel_button.clicked.connect(self._cancel_search)
+        
+        # Connect index toggle
+        self.index_checkbox.toggled.connect(self._toggle_index)
             
         # Connect results tree selection
         self.results_tree.clicked.connect(self._handle_result_selection)
@@ -176,8 +193,25 @@ class SearchPanelUI(QWidget):
         Args:
             directory: Directory path
         """
+        if self.current_directory is not None and self.index_checkbox.isChecked():
+            self.search_engine.disable_index(self.current_directory)
         self.current_directory = directory
         self.search_button.setText(f"Suchen in {directory.name}")
+        if self.index_checkbox.isChecked():
+            self.search_engine.enable_index(directory)
+    
+    def _toggle_index(self, checked: bool):
+        """Enable or disable the trigram index for the current directory.
+        
+        Args:
+            checked: Whether indexing is enabled
+        """
+        if not self.current_directory:
+            return
+        if checked:
+            self.search_engine.enable_index(self.current_directory)
+        else:
+            self.search_engine.disable_index(self.current_directory)
     
     def _start_search(self):
         """Start a search operation based on current inputs."""
@@ -223,17 +257,26 @@ class SearchPanelUI(QWidget):
             search_mode,
             max_results
         )
-        
-        # Connect worker signals
-        worker.signals.progress.connect(self._update_progress)
-        worker.signals.finished.connect(self._search_finished)
-        worker.signals.error.connect(self._search_error)
+        self._worker = worker
+        
+        # Connect worker signals (results stream in while the search runs)
+        worker.signals.progress.connect(
+            lambda done, total: worker is self._worker and self._update_progress(done, total))
+        worker.signals.result.connect(
+            lambda result: worker is self._worker and self._add_result(result))
+        worker.signals.finished.connect(
+            lambda results: worker is self._worker and self._search_finished(results))
+        worker.signals.error.connect(
+            lambda message: worker is self._worker and self._search_error(message))
         
         # Start worker
         self.thread_pool.start(worker)
     
     def _cancel_search(self):
         """Cancel the current search operation."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
         self.search_engine.cancel_search()
         self._reset_ui_after_search()
         
@@ -253,7 +296,11 @@ class SearchPanelUI(QWidget):
         Args:
             results: List of search results
         """
-        self._populate_results(results)
+        self._worker = None
+        if self._result_count == 0:
+            self._populate_results(results)
+        else:
+            self.preview_text.setPlainText(f"{self._result_count} Dateien mit Treffern gefunden.")
         self._reset_ui_after_search()
     
     def _search_error(self, error_message):
@@ -262,6 +309,7 @@ class SearchPanelUI(QWidget):
         Args:
             error_message: Error message
         """
+        self._worker = None
         self.preview_text.setPlainText(f"Fehler bei der Suche: {error_message}")
         self._reset_ui_after_search()
     
@@ -282,6 +330,7 @@ class SearchPanelUI(QWidget):
         self.results_model.clear()
         self.results_model.setHorizontalHeaderLabels(["Datei / Treffer", "Zeile", "Inhalt"])
         self.preview_text.clear()
+        self._result_count = 0
     
     def _populate_results(self, results):
         """Populate the results tree with search results.
@@ -295,41 +344,49 @@ class SearchPanelUI(QWidget):
             self.results_model.appendRow(root_item)
             return
             
-        # Group results by file
         for result in results:
-            # Create file item
-            file_item = QStandardItem(result.file_path.name)
-            file_item.setEditable(False)
-            file_item.setData(str(result.file_path), Qt.ItemDataRole.UserRole)
+            self._add_result(result)
             
-            # Set file item font to bold
-            font = file_item.font()
-            font.setBold(True)
-            file_item.setFont(font)
+        # Update summary in preview
+        self.preview_text.setPlainText(f"{len(results)} Dateien mit Treffern gefunden.")
+    
+    def _add_result(self, result):
+        """Append a single search result to the results tree.
+        
+        Args:
+            result: Search result for one file
+        """
+        # Create file item
+        file_item = QStandardItem(result.file_path.name)
+        file_item.setEditable(False)
+        file_item.setData(str(result.file_path), Qt.ItemDataRole.UserRole)
+        
+        # Set file item font to bold
+        font = file_item.font()
+        font.setBold(True)
+        file_item.setFont(font)
+        
+        # Add child items for each match
+        for match in result.matches:
+            # Create match row
+            match_item = QStandardItem(f"Treffer {match.line_number}")
+            match_item.setEditable(False)
+            match_item.setData(match.line_number, Qt.ItemDataRole.UserRole)
             
-            # Add child items for each match
-            for match in result.matches:
-                # Create match row
-                match_item = QStandardItem(f"Treffer {match.line_number}")
-                match_item.setEditable(False)
-                match_item.setData(match.line_number, Qt.ItemDataRole.UserRole)
-                
-                # Line number item
-                line_item = QStandardItem(str(match.line_number))
-                line_item.setEditable(False)
-                
-                # Line content item
-                content_item = QStandardItem(match.line_text)
-                content_item.setEditable(False)
-                
-                # Add match items as a row to the file item
-                file_item.appendRow([match_item, line_item, content_item])
+            # Line number item
+            line_item = QStandardItem(str(match.line_number))
+            line_item.setEditable(False)
             
-            # Add file item to model
-            self.results_model.appendRow(file_item)
+            # Line content item
+            content_item = QStandardItem(match.line_text)
+            content_item.setEditable(False)
             
-        # Update summary in preview
-        self.preview_text.setPlainText(f"{len(results)} Dateien mit Treffern gefunden.")
+            # Add match items as a row to the file item
+            file_item.appendRow([match_item, line_item, content_item])
+        
+        # Add file item to model
+        self.results_model.appendRow(file_item)
+        self._result_count += 1
     
     def _handle_result_selection(self, index):
         """Handle selection of a result in the tree.
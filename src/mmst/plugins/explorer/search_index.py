@@ -0,0 +1,532 @@
+from __future__ import annotations
+
+"""Persistent trigram index for the Explorer full-text search.
+
+The index records, per file, the set of byte trigrams of its ASCII-lowercased
+content. A query extracts the trigrams every match must contain and returns
+the files that have all of them; those candidates are then verified with the
+regular line-by-line search, so the index only ever prunes, never decides.
+
+Storage is a SQLite database per indexed root:
+
+* ``files`` maps absolute paths to an id plus the size/mtime the postings
+  were computed from. Re-indexing a file assigns a fresh id, stale ids left
+  in older postings simply never match a live file again.
+* ``postings`` holds one zlib-compressed, delta-encoded ``uint32`` id list
+  per (trigram, segment). Each update batch writes a new segment; segments
+  are merged (dropping dead ids) once too many accumulate.
+
+Files that are unknown to the index, changed since they were indexed, or
+could not be indexed (binary, too large, unreadable) are always treated as
+candidates, which keeps results exact while the index is built or stale.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("mmst.explorer.search_index")
+
+# Files above this size are not indexed (they stay permanent candidates).
+MAX_INDEXED_SIZE = 32 * 1024 * 1024
+# Flush a segment after this many files or trigram entries.
+SEGMENT_MAX_FILES = 2000
+SEGMENT_MAX_ENTRIES = 8_000_000
+# Merge all segments into one once this many exist.
+MAX_SEGMENTS = 8
+
+# Non-ASCII characters whose case folding yields ASCII letters (KELVIN SIGN,
+# LATIN SMALL LETTER LONG S, dotted/dotless I). Files containing them are not
+# indexed, so ASCII-folded trigrams stay exact for ``str.lower`` and
+# ``re.IGNORECASE`` matching.
+_FOLDING_HAZARDS = tuple(ch.encode("utf-8") for ch in ("\u212a", "\u017f", "\u0130", "\u0131"))
+
+_ASCII_LOWER = np.arange(256, dtype=np.uint8)
+_ASCII_LOWER[ord("A"):ord("Z") + 1] += 32
+
+
+def file_trigrams(data: bytes) -> np.ndarray:
+    """Return the sorted unique trigram codes of ASCII-lowercased ``data``."""
+    if len(data) < 3:
+        return np.empty(0, dtype=np.uint32)
+    raw = _ASCII_LOWER[np.frombuffer(data, dtype=np.uint8)].astype(np.uint32)
+    codes = (raw[:-2] << 16) | (raw[1:-1] << 8) | raw[2:]
+    return np.unique(codes)
+
+
+def literal_trigrams(literals: Iterable[str]) -> Set[int]:
+    """Trigram codes that any text containing all ``literals`` must contain.
+
+    Only runs of ASCII characters contribute; non-ASCII characters split a
+    literal because the index folds case for ASCII only.
+    """
+    result: Set[int] = set()
+    for literal in literals:
+        for run in _ascii_runs(literal.lower()):
+            encoded = run.encode("ascii")
+            for i in range(len(encoded) - 2):
+                result.add((encoded[i] << 16) | (encoded[i + 1] << 8) | encoded[i + 2])
+    return result
+
+
+def _ascii_runs(text: str) -> Iterator[str]:
+    run: List[str] = []
+    for ch in text:
+        if ord(ch) < 128:
+            run.append(ch)
+            continue
+        if len(run) >= 3:
+            yield "".join(run)
+        run = []
+    if len(run) >= 3:
+        yield "".join(run)
+
+
+# Body of a {m}, {m,}, {,n} or {m,n} quantifier ("{}" is a literal)
+_QUANTIFIER_RE = re.compile(r"(\d+)(?:,\d*)?|,\d*")
+# One complete escape: hex/unicode/named characters, octal escapes and
+# backreferences span several characters after the backslash
+_ESCAPE_RE = re.compile(
+    r"\\(?:x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|N\{[^}]*\}"
+    r"|0[0-7]{0,2}|[1-7][0-7]{2}|\d{1,2}|.)",
+    re.DOTALL,
+)
+
+
+def required_literals(pattern: str) -> List[str]:
+    """Conservatively extract literal substrings every match of ``pattern`` contains.
+
+    Only top-level literal runs are considered; groups, classes, escapes
+    other than escaped punctuation and optional quantifiers end a run.
+    Returns an empty list when nothing can be guaranteed (alternation,
+    inline flags such as verbose mode).
+    """
+    if "(?" in pattern.replace("(?:", ""):
+        return []
+
+    literals: List[str] = []
+    run: List[str] = []
+    depth = 0
+    in_class = False
+    i = 0
+
+    def _flush() -> None:
+        if len(run) >= 3:
+            literals.append("".join(run))
+        run.clear()
+
+    while i < len(pattern):
+        ch = pattern[i]
+        if in_class:
+            if ch == "\\":
+                escape = _ESCAPE_RE.match(pattern, i)
+                i = escape.end() if escape else i + 1
+                continue
+            if ch == "]":
+                in_class = False
+            i += 1
+            continue
+        if ch == "\\":
+            escape = _ESCAPE_RE.match(pattern, i)
+            if escape is None:
+                # trailing backslash (invalid pattern)
+                break
+            nxt = escape.group()[1:]
+            if depth == 0 and not nxt.isalnum() and len(nxt) == 1:
+                run.append(nxt)
+            else:
+                # classes, anchors, character codes and backreferences
+                _flush()
+            i = escape.end()
+            continue
+        if ch == "[":
+            _flush()
+            in_class = True
+            # a leading "]" (or "^]") is a literal member of the class
+            if pattern[i + 1:i + 2] == "^":
+                i += 1
+            if pattern[i + 1:i + 2] == "]":
+                i += 1
+            i += 1
+            continue
+        if ch == "(":
+            _flush()
+            depth += 1
+        elif ch == ")":
+            depth = max(0, depth - 1)
+        elif ch == "|":
+            if depth == 0:
+                return []
+        elif ch in "?*":
+            # previous atom is optional: drop it from the run
+            if run:
+                run.pop()
+            _flush()
+        elif ch == "{":
+            close = pattern.find("}", i)
+            bounds = _QUANTIFIER_RE.fullmatch(pattern[i + 1:close]) if close > i else None
+            if bounds is None:
+                # not a quantifier (taken literally by re): give up on this run
+                run.clear()
+                i = close + 1 if close > i else i + 1
+                continue
+            if int(bounds.group(1) or 0) == 0 and run:
+                # {0,n} / {,n}: previous atom is optional
+                run.pop()
+            # {m,n} with m >= 1: previous atom occurs at least once, but the
+            # text after the quantifier is not adjacent to this run
+            _flush()
+            i = close + 1
+            continue
+        elif ch == "+":
+            _flush()
+        elif ch in ".^$":
+            _flush()
+        elif depth == 0:
+            run.append(ch)
+        i += 1
+    _flush()
+    return literals
+
+
+def _encode_ids(ids: np.ndarray) -> bytes:
+    deltas = np.diff(ids, prepend=np.uint32(0)).astype(np.uint32)
+    return zlib.compress(deltas.tobytes(), 1)
+
+
+def _decode_ids(blob: bytes) -> np.ndarray:
+    deltas = np.frombuffer(zlib.decompress(blob), dtype=np.uint32)
+    return np.cumsum(deltas, dtype=np.uint32)
+
+
+@dataclass
+class _FileEntry:
+    file_id: int
+    size: int
+    mtime_ns: int
+    indexed: bool
+
+
+class IndexQuery:
+    """Result of an index lookup used to prune files before verification."""
+
+    def __init__(self, files: Dict[str, _FileEntry], candidates: np.ndarray) -> None:
+        self._files = files
+        self._candidates = set(candidates.tolist())
+        self.stale: List[Path] = []
+
+    def may_match(self, path: Path, stat: Optional[os.stat_result] = None) -> bool:
+        """Return False only if the index proves ``path`` cannot match."""
+        entry = self._files.get(os.path.abspath(path))
+        if entry is None:
+            self.stale.append(path)
+            return True
+        if stat is None:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return True
+        if stat.st_size != entry.size or stat.st_mtime_ns != entry.mtime_ns:
+            self.stale.append(path)
+            return True
+        if not entry.indexed:
+            return True
+        return entry.file_id in self._candidates
+
+
+class TrigramIndex:
+    """On-disk trigram index for one directory tree."""
+
+    def __init__(
+        self,
+        root: Path,
+        db_path: Path,
+        is_text: Optional[Callable[[Path], bool]] = None,
+        max_file_size: int = MAX_INDEXED_SIZE,
+    ) -> None:
+        self.root = Path(os.path.abspath(root))
+        self._db_path = db_path
+        self._is_text = is_text
+        self._max_file_size = max_file_size
+        self._lock = threading.RLock()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._ensure_schema()
+        self._files = self._load_files()
+
+    @staticmethod
+    def db_name(root: Path) -> str:
+        digest = hashlib.sha1(os.path.abspath(root).encode("utf-8", "surrogatepass")).hexdigest()
+        return f"{digest[:16]}.sqlite"
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+
+    def _ensure_schema(self) -> None:
+        with self._lock:
+            self._conn.executescript(
+                """
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                path TEXT NOT NULL UNIQUE,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                indexed INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                trigram INTEGER NOT NULL,
+                segment INTEGER NOT NULL,
+                ids BLOB NOT NULL,
+                PRIMARY KEY (trigram, segment)
+            ) WITHOUT ROWID;
+                """
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO meta(key, value) VALUES ('root', ?)", (str(self.root),)
+            )
+            self._conn.commit()
+
+    def _load_files(self) -> Dict[str, _FileEntry]:
+        with self._lock:
+            rows = self._conn.execute("SELECT path, id, size, mtime_ns, indexed FROM files").fetchall()
+        return {
+            str(path): _FileEntry(int(file_id), int(size), int(mtime_ns), bool(indexed))
+            for path, file_id, size, mtime_ns, indexed in rows
+        }
+
+    @property
+    def file_count(self) -> int:
+        with self._lock:
+            return len(self._files)
+
+    # ------------------------------------------------------------------ query
+    def query(self, trigrams: Set[int]) -> Optional[IndexQuery]:
+        """Look up candidate files containing every trigram in ``trigrams``."""
+        if not trigrams:
+            return None
+        with self._lock:
+            files = dict(self._files)
+            candidates: Optional[np.ndarray] = None
+            for trigram in sorted(trigrams):
+                rows = self._conn.execute(
+                    "SELECT ids FROM postings WHERE trigram = ?", (int(trigram),)
+                ).fetchall()
+                if not rows:
+                    candidates = np.empty(0, dtype=np.uint32)
+                    break
+                ids = _decode_ids(rows[0][0])
+                for (blob,) in rows[1:]:
+                    ids = np.union1d(ids, _decode_ids(blob))
+                candidates = ids if candidates is None else np.intersect1d(candidates, ids, assume_unique=True)
+                if candidates.size == 0:
+                    break
+        if candidates is None:
+            candidates = np.empty(0, dtype=np.uint32)
+        return IndexQuery(files, candidates)
+
+    # ----------------------------------------------------------------- update
+    def update(
+        self,
+        paths: Optional[Iterable[Path]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> int:
+        """Index new or changed files and return how many were (re)indexed.
+
+        Without ``paths`` the whole root is walked and entries for vanished
+        files are dropped; with ``paths`` only those files are refreshed.
+        """
+        full_walk = paths is None
+        if full_walk:
+            source: Iterable[Tuple[Path, Optional[os.stat_result]]] = self._walk(self.root)
+        else:
+            source = ((Path(p), None) for p in paths)  # type: ignore[union-attr]
+
+        seen: Set[str] = set()
+        batch: List[Tuple[str, os.stat_result, Optional[np.ndarray]]] = []
+        batch_entries = 0
+        reindexed = 0
+        cancelled = False
+
+        for path, stat in source:
+            if cancel is not None and cancel.is_set():
+                cancelled = True
+                break
+            key = os.path.abspath(path)
+            if stat is None:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    self._forget([key])
+                    continue
+            seen.add(key)
+            with self._lock:
+                entry = self._files.get(key)
+            if entry is not None and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+                continue
+
+            codes = self._read_trigrams(path, stat)
+            batch.append((key, stat, codes))
+            batch_entries += 0 if codes is None else int(codes.size)
+            reindexed += 1
+            if len(batch) >= SEGMENT_MAX_FILES or batch_entries >= SEGMENT_MAX_ENTRIES:
+                self._flush(batch)
+                batch, batch_entries = [], 0
+
+        if batch:
+            self._flush(batch)
+        if full_walk and not cancelled:
+            with self._lock:
+                vanished = [key for key in self._files if key not in seen]
+            self._forget(vanished)
+        self._maybe_merge()
+        return reindexed
+
+    def _walk(self, root: Path) -> Iterator[Tuple[Path, os.stat_result]]:
+        stack = [str(root)]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file():
+                                yield Path(entry.path), entry.stat()
+                        except OSError:
+                            continue
+            except OSError as exc:
+                logger.debug("Cannot index %s: %s", current, exc)
+
+    def _read_trigrams(self, path: Path, stat: os.stat_result) -> Optional[np.ndarray]:
+        if stat.st_size > self._max_file_size:
+            return None
+        if self._is_text is not None:
+            try:
+                if not self._is_text(path):
+                    return None
+            except Exception:
+                return None
+        try:
+            with open(path, "rb") as handle:
+                data = handle.read()
+        except OSError:
+            return None
+        if any(hazard in data for hazard in _FOLDING_HAZARDS):
+            return None
+        return file_trigrams(data)
+
+    def _flush(self, batch: List[Tuple[str, os.stat_result, Optional[np.ndarray]]]) -> None:
+        with self._lock:
+            conn = self._conn
+            segment_row = conn.execute("SELECT COALESCE(MAX(segment), 0) + 1 FROM postings").fetchone()
+            segment = int(segment_row[0])
+            new_entries: Dict[str, _FileEntry] = {}
+            id_parts: List[np.ndarray] = []
+            code_parts: List[np.ndarray] = []
+            try:
+                for key, stat, codes in batch:
+                    conn.execute("DELETE FROM files WHERE path = ?", (key,))
+                    cur = conn.execute(
+                        "INSERT INTO files(path, size, mtime_ns, indexed) VALUES (?, ?, ?, ?)",
+                        (key, int(stat.st_size), int(stat.st_mtime_ns), 0 if codes is None else 1),
+                    )
+                    file_id = int(cur.lastrowid)
+                    new_entries[key] = _FileEntry(file_id, int(stat.st_size), int(stat.st_mtime_ns), codes is not None)
+                    if codes is not None and codes.size:
+                        code_parts.append(codes)
+                        id_parts.append(np.full(codes.size, file_id, dtype=np.uint32))
+                if code_parts:
+                    all_codes = np.concatenate(code_parts)
+                    all_ids = np.concatenate(id_parts)
+                    order = np.lexsort((all_ids, all_codes))
+                    all_codes = all_codes[order]
+                    all_ids = all_ids[order]
+                    unique_codes, starts = np.unique(all_codes, return_index=True)
+                    bounds = np.append(starts, all_codes.size).tolist()
+                    # Delta-encode every posting list in one pass; list heads keep the raw id.
+                    deltas = np.empty_like(all_ids)
+                    deltas[0] = all_ids[0]
+                    deltas[1:] = all_ids[1:] - all_ids[:-1]
+                    deltas[starts] = all_ids[starts]
+                    conn.executemany(
+                        "INSERT INTO postings(trigram, segment, ids) VALUES (?, ?, ?)",
+                        (
+                            (code, segment, zlib.compress(deltas[bounds[i]:bounds[i + 1]].tobytes(), 1))
+                            for i, code in enumerate(unique_codes.tolist())
+                        ),
+                    )
+                conn.commit()
+            except sqlite3.Error as exc:
+                conn.rollback()
+                logger.warning("Failed to write search index segment: %s", exc)
+                return
+            # Publish entries only once their postings are durable.
+            self._files.update(new_entries)
+
+    def _forget(self, keys: List[str]) -> None:
+        if not keys:
+            return
+        with self._lock:
+            self._conn.executemany("DELETE FROM files WHERE path = ?", ((key,) for key in keys))
+            self._conn.commit()
+            for key in keys:
+                self._files.pop(key, None)
+
+    def _maybe_merge(self) -> None:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(DISTINCT segment) FROM postings").fetchone()
+            if int(row[0]) <= MAX_SEGMENTS:
+                return
+            self.merge()
+
+    def merge(self) -> None:
+        """Collapse all segments into one and drop postings of dead file ids."""
+        with self._lock:
+            conn = self._conn
+            live = np.array(sorted(entry.file_id for entry in self._files.values()), dtype=np.uint32)
+            target = int(conn.execute("SELECT COALESCE(MAX(segment), 0) + 1 FROM postings").fetchone()[0])
+            merged: List[Tuple[int, int, bytes]] = []
+            current: Optional[int] = None
+            parts: List[np.ndarray] = []
+
+            def _emit() -> None:
+                if current is None or not parts:
+                    return
+                ids = np.unique(np.concatenate(parts))
+                ids = ids[np.isin(ids, live, assume_unique=True)]
+                if ids.size:
+                    merged.append((current, target, _encode_ids(ids)))
+
+            try:
+                for trigram, blob in conn.execute("SELECT trigram, ids FROM postings ORDER BY trigram"):
+                    if trigram != current:
+                        _emit()
+                        current, parts = int(trigram), []
+                    parts.append(_decode_ids(blob))
+                _emit()
+                conn.execute("DELETE FROM postings")
+                conn.executemany("INSERT INTO postings(trigram, segment, ids) VALUES (?, ?, ?)", merged)
+                conn.commit()
+            except sqlite3.Error as exc:
+                conn.rollback()
+                logger.warning("Failed to merge search index segments: %s", exc)
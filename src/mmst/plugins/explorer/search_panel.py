@@ -9,7 +9,7 @@ from pathlib import Path
 from typing import Any, Callable, List, Optional, Protocol, Union
 
 # Import local modules
-from .search_engine import SearchEngine, SearchMode, SearchResult
+from .search_engine import CancellationToken, SearchEngine, SearchMode, SearchResult
 
 # Check if PySide6 is available
 HAS_PYSIDE6 = False
@@ -56,57 +56,74 @@ else:
     QThreadPool = object
     Slot = lambda: lambda x: x  # Dummy decorator
     Signal = DummySignal  # Use our DummySignal as the Signal class in headless mode
+
+
+class SearchProgressEmitter(QObject):
+    """Signal emitter for search progress updates."""
+    progress = Signal(int, int)  # files_processed, total_files
+    result = Signal(object)      # SearchResult
+    finished = Signal(list)      # List[SearchResult]
+    error = Signal(str)          # error message
+
+
+class SearchWorker(QRunnable):
+    """Worker for running search operations in a background thread.
     
-    class SearchProgressEmitter(QObject):
-        """Signal emitter for search progress updates."""
-        progress = Signal(int, int)  # files_processed, total_files
-        result = Signal(object)      # SearchResult
-        finished = Signal(list)      # List[SearchResult]
-        error = Signal(str)          # error message
+    Results are emitted one by one through ``signals.result`` while the search
+    is still running; ``signals.finished`` carries the complete list.
+    """
     
-    class SearchWorker(QRunnable):
-        """Worker for running search operations in a background thread."""
-        
-        def __init__(
-            self, 
-            search_engine: SearchEngine, 
-            directory: Path,
-            search_term: str, 
-            mode: SearchMode, 
-            max_results: int,
-            file_filter: Optional[Callable[[Path], bool]] = None
-        ):
-            """Initialize the search worker."""
-            super().__init__()
-            self.search_engine = search_engine
-            self.directory = directory
-            self.search_term = search_term
-            self.mode = mode
-            self.max_results = max_results
-            self.file_filter = file_filter
-            self.signals = SearchProgressEmitter()
-            
-        @Slot()
-        def run(self):
-            """Run the search operation."""
-            try:
-                results = self.search_engine.search_directory(
-                    self.directory,
-                    self.search_term,
-                    self.mode,
-                    self.max_results,
-                    self.file_filter,
-                    self.progress_callback
-                )
-                self.signals.finished.emit(results)
-            except Exception as e:
-                self.signals.error.emit(str(e))
-                
-        def progress_callback(self, files_processed: int, total_files: int):
-            """Handle progress updates from the search engine."""
-            self.signals.progress.emit(files_processed, total_files)
+    def __init__(
+        self, 
+        search_engine: SearchEngine, 
+        directory: Path,
+        search_term: str, 
+        mode: SearchMode, 
+        max_results: int,
+        file_filter: Optional[Callable[[Path], bool]] = None
+    ):
+        """Initialize the search worker."""
+        super().__init__()
+        self.search_engine = search_engine
+        self.directory = directory
+        self.search_term = search_term
+        self.mode = mode
+        self.max_results = max_results
+        self.file_filter = file_filter
+        self.cancel_token = CancellationToken()
+        self.signals = SearchProgressEmitter()
+        
+    @Slot()
+    def run(self):
+        """Run the search operation."""
+        results: List[SearchResult] = []
+        try:
+            for result in self.search_engine.iter_search(
+                self.directory,
+                self.search_term,
+                self.mode,
+                self.max_results,
+                self.file_filter,
+                self.progress_callback,
+                self.cancel_token
+            ):
+                if self.cancel_token.cancelled:
+                    break
+                results.append(result)
+                self.signals.result.emit(result)
+            self.signals.finished.emit(results)
+        except Exception as e:
+            self.signals.error.emit(str(e))
     
-    # Define actual classes based on PySide6 availability
+    def cancel(self):
+        """Stop the search as soon as possible."""
+        self.cancel_token.cancel()
+            
+    def progress_callback(self, files_processed: int, total_files: int):
+        """Handle progress updates from the search engine."""
+        self.signals.progress.emit(files_processed, total_files)
+
+
 if HAS_PYSIDE6:
     # Import the search panel UI if available
     try:
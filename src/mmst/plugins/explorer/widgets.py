@@ -339,7 +339,6 @@ except ImportError:
 
 from dataclasses import dataclass
 import datetime
-import difflib
 import logging
 import os
 import platform
@@ -347,6 +346,11 @@ import shutil
 from pathlib import Path
 from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union, cast
 
+from ...core.dir_snapshots import DirectorySnapshotCache, shared_snapshot_cache
+from ..media_library.thumbnails import ThumbnailStore, image_thumbnail_store
+from .name_index import FilenameIndex, fuzzy_match
+from .preview_loader import IMAGE_EXTENSIONS, MAX_TEXT_LINES, PreviewLoader, PreviewResult
+
 # ---------------------------------------------------------------------------
 # DependencyManager - Handles optional dependencies cleanly
 # ---------------------------------------------------------------------------
@@ -573,14 +577,17 @@ class FileSystemManager:
     filesystem-related logic from the UI classes.
     """
     
-    def __init__(self, plugin_services=None):
+    def __init__(self, plugin_services=None, snapshots: Optional[DirectorySnapshotCache] = None):
         """Initialize the filesystem manager.
         
         Args:
             plugin_services: Optional services from the plugin for notifications
+            snapshots: Directory snapshot cache; defaults to the process-wide cache
+                shared with the FileManager views
         """
         self._services = plugin_services
         self._logger = logging.getLogger("mmst.explorer.filesystem")
+        self._snapshots = snapshots if snapshots is not None else shared_snapshot_cache()
     
     def get_directory_contents(self, path: Path) -> List[Path]:
         """Get the contents of a directory.
@@ -591,11 +598,20 @@ class FileSystemManager:
         Returns:
             List of Path objects for files and subdirectories
         """
-        try:
-            return sorted(list(path.iterdir()), key=lambda p: (p.is_file(), p.name.lower()))
-        except Exception as e:
-            self._logger.error(f"Error accessing directory {path}: {e}")
+        snapshot = self._snapshots.snapshot(path)
+        if snapshot is None:
+            self._logger.error(f"Error accessing directory {path}")
             return []
+        entries = sorted(snapshot.entries, key=lambda e: (e.is_file, e.name.lower()))
+        return [entry.path for entry in entries]
+    
+    def prefetch_directory(self, path: Path) -> None:
+        """List and stat a directory in the background so later lookups are cached.
+        
+        Args:
+            path: Directory that is about to be displayed
+        """
+        self._snapshots.snapshot_async(path)
             
     def get_file_size(self, path: Path) -> int:
         """Get the size of a file in bytes.
@@ -606,6 +622,9 @@ class FileSystemManager:
         Returns:
             File size in bytes or 0 if unavailable
         """
+        entry = self._snapshots.lookup(path)
+        if entry is not None:
+            return entry.size
         stats = _safe_stat(path)
         return stats.st_size if stats else 0
         
@@ -618,6 +637,9 @@ class FileSystemManager:
         Returns:
             Dictionary with created, modified, and accessed timestamps
         """
+        entry = self._snapshots.lookup(path)
+        if entry is not None:
+            return entry.file_times()
         stats = _safe_stat(path)
         result = {}
         
@@ -817,12 +839,34 @@ class BreadcrumbBar(QWidget):  # type: ignore[misc]
 
 
 class FuzzyFilterProxyModel(QSortFilterProxyModel):  # type: ignore[misc]
+    """Proxy applying the quick search text and advanced filter criteria.
+    
+    Text matching is answered from a per-directory :class:`FilenameIndex` that
+    scores all rows of a directory in one batched pass per pattern; file
+    metadata for the advanced filter is cached by path. Both caches are
+    dropped when the Explorer changes directory.
+    """
+    
     def __init__(self, parent: Optional[QWidget] = None):  # type: ignore[override]
         super().__init__(parent)
         self._pattern = ""
         self._threshold = 0.42
         self._filter_criteria = None
         self._fs_manager = None  # Will be set from ExplorerWidget
+        self._name_indexes: Dict[str, FilenameIndex] = {}  # directory -> index
+        self._text_matches: Dict[str, Dict[str, bool]] = {}  # directory -> name -> accepted
+        self._stat_cache: Dict[str, Dict[str, Any]] = {}  # file path -> metadata
+        self._root_prefix: Optional[str] = None  # only rows below this path are filtered
+    
+    def setSourceModel(self, model) -> None:  # type: ignore[override]
+        super().setSourceModel(model)
+        self.invalidate_caches()
+        data_changed = getattr(model, "dataChanged", None)
+        if data_changed is not None and hasattr(data_changed, "connect"):
+            data_changed.connect(self._on_source_data_changed)
+        file_renamed = getattr(model, "fileRenamed", None)
+        if file_renamed is not None and hasattr(file_renamed, "connect"):
+            file_renamed.connect(self._on_source_file_renamed)
     
     def set_filesystem_manager(self, fs_manager) -> None:
         """Set filesystem manager to access file metadata.
@@ -831,6 +875,7 @@ class FuzzyFilterProxyModel(QSortFilterProxyModel):  # type: ignore[misc]
             fs_manager: FileSystemManager instance
         """
         self._fs_manager = fs_manager
+        self._stat_cache.clear()
         
     def set_search_pattern(self, pattern: str) -> None:
         """Set text search pattern.
@@ -839,6 +884,7 @@ class FuzzyFilterProxyModel(QSortFilterProxyModel):  # type: ignore[misc]
             pattern: Search text
         """
         self._pattern = (pattern or "").strip().lower()
+        self._text_matches.clear()
         self.invalidateFilter()
         
     def set_filter_criteria(self, criteria) -> None:
@@ -849,6 +895,26 @@ class FuzzyFilterProxyModel(QSortFilterProxyModel):  # type: ignore[misc]
         """
         self._filter_criteria = criteria
         self.invalidateFilter()
+    
+    def set_current_directory(self, path: Path) -> None:
+        """Set the directory shown in the views and drop caches of the previous one.
+        
+        Rows outside this directory (its ancestors in the source model) are never
+        filtered out, otherwise the views' root index would disappear.
+        
+        Args:
+            path: Directory currently displayed
+        """
+        # QFileSystemModel reports paths with forward slashes on every platform
+        self._root_prefix = Path(path).as_posix().rstrip("/") + "/"
+        self.invalidate_caches()
+        self.invalidateFilter()
+    
+    def invalidate_caches(self) -> None:
+        """Drop name indexes and cached file metadata (e.g. on directory change)."""
+        self._name_indexes.clear()
+        self._text_matches.clear()
+        self._stat_cache.clear()
 
     def filterAcceptsRow(self, row: int, parent: QModelIndex) -> bool:  # type: ignore[override]
         model = self.sourceModel()
@@ -859,6 +925,9 @@ class FuzzyFilterProxyModel(QSortFilterProxyModel):  # type: ignore[misc]
         
         # Get file info
         try:
+            if self._root_prefix is not None and not model.filePath(index).startswith(self._root_prefix):
+                return True
+            
             # Skip directories from advanced filtering
             if hasattr(model, "isDir") and model.isDir(index):
                 # Only apply text filtering to directories
@@ -878,7 +947,7 @@ class FuzzyFilterProxyModel(QSortFilterProxyModel):  # type: ignore[misc]
                 
             # Apply advanced filter if criteria is set
             if self._filter_criteria:
-                return self._matches_advanced_filter(Path(file_path))
+                return self._matches_advanced_filter(Path(file_path), self._cached_file_stats(file_path))
                 
             return True
             
@@ -906,27 +975,46 @@ class FuzzyFilterProxyModel(QSortFilterProxyModel):  # type: ignore[misc]
             
         value = (candidate or "").lower()
         
-        # Fast check for substring
-        if self._pattern in value:
-            return True
-            
-        # Fuzzy matching
-        return difflib.SequenceMatcher(None, value, self._pattern).ratio() >= self._threshold
+        try:
+            parent = index.parent()
+            directory = model.filePath(parent)  # type: ignore[attr-defined]
+        except Exception:
+            directory = None
+        if not isinstance(directory, str):
+            return fuzzy_match(value, self._pattern, self._threshold)
+        
+        matches = self._text_matches.get(directory)
+        if matches is None:
+            name_index = self._name_indexes.get(directory)
+            if name_index is None:
+                names = [
+                    model.fileName(model.index(row, 0, parent))  # type: ignore[attr-defined]
+                    for row in range(model.rowCount(parent))
+                ]
+                name_index = FilenameIndex(names)
+                self._name_indexes[directory] = name_index
+            matches = name_index.match_map(self._pattern, self._threshold)
+            self._text_matches[directory] = matches
+        
+        accepted = matches.get(value)
+        if accepted is None:
+            # Row appeared after the index was built; rebuild it for the next pattern
+            accepted = fuzzy_match(value, self._pattern, self._threshold)
+            matches[value] = accepted
+            self._name_indexes.pop(directory, None)
+        return accepted
     
-    def _matches_advanced_filter(self, path: Path) -> bool:
-        """Check if file matches advanced filter criteria.
-        
-        Args:
-            path: File path
-            
-        Returns:
-            True if the file matches all filter criteria or no filter is set
-        """
-        if not self._filter_criteria or not self._fs_manager:
-            return True
-            
-        # Get file metadata for filtering
-        file_stats = {}
+    def _cached_file_stats(self, file_path: str) -> Dict[str, Any]:
+        """Return file metadata for the advanced filter, cached by path."""
+        stats = self._stat_cache.get(file_path)
+        if stats is None:
+            stats = self._collect_file_stats(Path(file_path))
+            self._stat_cache[file_path] = stats
+        return stats
+    
+    def _collect_file_stats(self, path: Path) -> Dict[str, Any]:
+        """Query size and timestamps of a file through the filesystem manager."""
+        file_stats: Dict[str, Any] = {}
         
         # File size
         try:
@@ -940,9 +1028,40 @@ class FuzzyFilterProxyModel(QSortFilterProxyModel):  # type: ignore[misc]
             file_stats.update(file_times)
         except Exception:
             pass
+        
+        return file_stats
+    
+    def _matches_advanced_filter(self, path: Path, file_stats: Optional[Dict[str, Any]] = None) -> bool:
+        """Check if file matches advanced filter criteria.
+        
+        Args:
+            path: File path
+            file_stats: Optional pre-collected metadata; queried fresh if omitted
+            
+        Returns:
+            True if the file matches all filter criteria or no filter is set
+        """
+        if not self._filter_criteria or not self._fs_manager:
+            return True
+        
+        if file_stats is None:
+            file_stats = self._collect_file_stats(path)
             
         # Apply filter criteria
         return self._filter_criteria.matches_file(path, file_stats)
+    
+    def _on_source_data_changed(self, top_left, bottom_right, roles=()) -> None:
+        """Forget cached metadata of rows the source model reports as changed."""
+        model = self.sourceModel()
+        if not model or not self._stat_cache:
+            return
+        parent = top_left.parent()
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            self._stat_cache.pop(model.filePath(model.index(row, 0, parent)), None)
+    
+    def _on_source_file_renamed(self, directory: str, old_name: str, new_name: str) -> None:
+        for name in (old_name, new_name):
+            self._stat_cache.pop(os.path.join(directory, name), None)
 
 
 # ---------------------------------------------------------------------------
@@ -965,6 +1084,9 @@ class DiskHealth:
 
 
 class DiskHealthWidget(QWidget):  # type: ignore[misc]
+    # Emitted from the SMART polling thread; refreshes the rows in the GUI thread
+    health_changed = Signal()
+
     def __init__(self, parent: Optional[QWidget] = None):  # type: ignore[override]
         super().__init__(parent)
         self.setObjectName("ExplorerDiskHealth") if hasattr(self, "setObjectName") else None
@@ -973,14 +1095,28 @@ class DiskHealthWidget(QWidget):  # type: ignore[misc]
             self._layout.setContentsMargins(8, 8, 8, 8)
             self._layout.setSpacing(6)
         self._monitor = self._resolve_monitor()
+        self._service = getattr(self._monitor, "service", None)
+        if self._service is not None and hasattr(self.health_changed, "connect"):
+            service = self._service
+            listener = lambda _snapshots: self.health_changed.emit()  # noqa: E731
+            service.add_listener(listener)
+            self.destroyed.connect(lambda *_: service.remove_listener(listener))  # type: ignore[attr-defined]
+            self.health_changed.connect(self.refresh)  # type: ignore[attr-defined]
         self._timer = QTimer(self)
         if hasattr(self._timer, "setInterval"):
             self._timer.setInterval(60_000)
-            self._timer.timeout.connect(self.refresh)  # type: ignore[attr-defined]
+            self._timer.timeout.connect(self._poll)  # type: ignore[attr-defined]
             try:
                 self._timer.start()
             except Exception:
                 pass
+        self._poll()
+
+    def _poll(self) -> None:
+        """Render cached health and let the service re-query stale disks in the background."""
+        service = self._service
+        if service is not None and service.is_available and service.is_stale:
+            service.refresh_async()
         self.refresh()
 
     def _resolve_monitor(self):
@@ -1044,12 +1180,20 @@ class DiskHealthWidget(QWidget):  # type: ignore[misc]
         monitor = self._monitor
         if monitor and getattr(monitor, "is_available", False):
             try:
-                disks = monitor.get_disks()  # Iterable of DiskInfo objects
+                statuses: Dict[int, str] = {}
+                if self._service is not None:
+                    # Never block the GUI on smartctl; the service pushes updates
+                    snapshots = self._service.cached()
+                    disks = [snapshot.info for snapshot in snapshots]
+                    statuses = {s.info.index: self._service.summary(s)["status"] for s in snapshots}
+                else:
+                    disks = monitor.get_disks()  # Iterable of DiskInfo objects
                 for entry in disks:
                     label = f"{entry.model or 'Laufwerk'} ({entry.index})"
                     total = int(entry.size_gb * 1024 ** 3)
                     free = self._free_bytes(Path(f"{entry.index}:/")) if platform.system() == "Windows" else total
-                    results.append(DiskHealth(label, total, free, getattr(entry, "status", "HEALTHY") or "HEALTHY"))
+                    status = statuses.get(entry.index) or getattr(entry, "status", "HEALTHY") or "HEALTHY"
+                    results.append(DiskHealth(label, total, free, status))
                 if results:
                     return results
             except Exception:
@@ -1104,7 +1248,16 @@ class DiskHealthWidget(QWidget):  # type: ignore[misc]
 
 
 class DetailsPanel(QWidget):  # type: ignore[misc]
-    def __init__(self, parent: Optional[QWidget] = None):  # type: ignore[override]
+    """Preview, metadata and properties of the selected file.
+
+    Image decoding and text reads run on a :class:`PreviewLoader` worker so
+    moving the selection never blocks on file I/O; the panel shows a
+    placeholder until the preview for the current selection arrives.
+    """
+
+    def __init__(
+        self, parent: Optional[QWidget] = None, thumbnails: Optional[ThumbnailStore] = None
+    ):  # type: ignore[override]
         super().__init__(parent)
         layout = QVBoxLayout(self)  # type: ignore
         if hasattr(layout, "setContentsMargins"):
@@ -1153,7 +1306,14 @@ class DetailsPanel(QWidget):  # type: ignore[misc]
         if hasattr(layout, "addWidget"):
             layout.addWidget(self._properties, 1)
 
+        self._highlighter = None
+        self._loader = PreviewLoader(thumbnails, parent=self)
+        if hasattr(self._loader, "ready"):
+            self._loader.ready.connect(self._on_preview_ready)
+
     def clear(self) -> None:
+        self._loader.cancel()
+        self._detach_highlighter()
         # Clear preview based on widget type
         if hasattr(self._preview, "setPlainText"):
             self._preview.setPlainText("Keine Auswahl")
@@ -1176,69 +1336,83 @@ class DetailsPanel(QWidget):  # type: ignore[misc]
 
     def _render_preview(self, path: Path) -> None:
         if path.is_dir():
+            self._loader.cancel()
             # Handle directory preview
-            if hasattr(self._preview, "setPlainText"):
-                self._preview.setPlainText("📁 Ordner")
-            elif hasattr(self._preview, "setText"):
-                self._preview.setText("📁 Ordner")
+            self._set_preview_text("📁 Ordner", "📁 Ordner")
             return
         suffix = path.suffix.lower()
-        try:
-            from PySide6.QtGui import QPixmap
-            image_supported = True
-        except (ImportError, TypeError):
-            image_supported = False
-            
-        if suffix in {".png", ".jpg", ".jpeg", ".bmp", ".gif"} and image_supported:
-            try:
-                pix = QPixmap(str(path))  # type: ignore
-                if hasattr(pix, "isNull") and pix.isNull():
-                    raise ValueError("invalid pixmap")
-                if hasattr(Qt, "KeepAspectRatio") and hasattr(Qt, "SmoothTransformation"):
-                    scaled = pix.scaled(320, 320, Qt.KeepAspectRatio, Qt.SmoothTransformation)  # type: ignore[attr-defined]
-                else:
-                    scaled = pix.scaled(320, 320)  # Fallback without transformation flags  # type: ignore[attr-defined]
-                # Handle based on preview widget type
-                if hasattr(self._preview, "setPixmap"):
-                    # Direct pixmap setting for QLabel
-                    self._preview.setPixmap(scaled)
-                    if hasattr(self._preview, "setText"):
-                        self._preview.setText("")
-                elif hasattr(self._preview, "setPlainText"):
-                    # For QTextEdit, display image details
-                    self._preview.setPlainText(f"🖼️ Bild: {path.name}\nGröße: {pix.width()}x{pix.height()} Pixel")
-                return
-            except Exception as e:
-                # Handle error based on widget type
-                msg = f"Fehler beim Laden des Bildes: {str(e)}"
-                if hasattr(self._preview, "setPlainText"):
-                    self._preview.setPlainText(msg)
-                elif hasattr(self._preview, "setText"):
-                    self._preview.setText(msg)
+        if suffix in IMAGE_EXTENSIONS:
+            self._request_preview(path, "image")
+            return
         # Handle different file types with appropriate preview
         if suffix in {".mp3", ".wav", ".flac"}:
-            if hasattr(self._preview, "setPlainText"):
-                self._preview.setPlainText(f"🎵 Audio-Datei: {path.name}")
-            elif hasattr(self._preview, "setText"):
-                self._preview.setText("🎵 Audio-Datei")
+            self._loader.cancel()
+            self._set_preview_text(f"🎵 Audio-Datei: {path.name}", "🎵 Audio-Datei")
         elif suffix in {".mp4", ".mkv", ".mov"}:
-            if hasattr(self._preview, "setPlainText"):
-                self._preview.setPlainText(f"🎬 Video-Datei: {path.name}")
-            elif hasattr(self._preview, "setText"):
-                self._preview.setText("🎬 Video-Datei")
+            self._loader.cancel()
+            self._set_preview_text(f"🎬 Video-Datei: {path.name}", "🎬 Video-Datei")
         elif suffix in {".pdf"}:
-            if hasattr(self._preview, "setPlainText"):
-                self._preview.setPlainText(f"📄 PDF Datei: {path.name}")
-            elif hasattr(self._preview, "setText"):
-                self._preview.setText("📄 PDF Vorschau")
+            self._loader.cancel()
+            self._set_preview_text(f"📄 PDF Datei: {path.name}", "📄 PDF Vorschau")
         elif suffix in {".txt", ".md", ".py", ".json", ".xml", ".html", ".css", ".js", ".ts", ".yml", ".yaml", ".ini", ".cfg", ".conf", ".log", ".sh", ".bat", ".ps1", ".c", ".cpp", ".h", ".hpp", ".cs", ".java"}:
-            self._render_text_preview(path)
+            self._request_preview(path, "text")
+        else:
+            # Unknown types are sniffed on the worker, sharing the search's cache
+            self._request_preview(path, "sniff")
+
+    def _request_preview(self, path: Path, kind: str) -> None:
+        self._detach_highlighter()
+        self._set_preview_text(f"⏳ Vorschau wird geladen: {path.name}", "⏳")
+        self._loader.request(path, kind)
+
+    def _on_preview_ready(self, result: PreviewResult) -> None:
+        if not self._loader.is_current(result):
+            return  # the selection has moved on
+        path = result.path
+        if result.kind == "image":
+            if result.error:
+                self._set_preview_text(f"Fehler beim Laden des Bildes: {result.error}")
+            else:
+                self._render_image_preview(result)
+        elif result.kind == "text":
+            if result.error:
+                self._set_preview_text(f"Fehler beim Laden der Datei: {result.error}")
+                if hasattr(self._metadata, "setPlainText"):
+                    self._metadata.setPlainText(f"Text-Datei: {path.name}")
+            else:
+                self._render_text_preview(path, result.text, result.truncated, not result.highlight)
         else:
             # Generic file type - display filename
-            if hasattr(self._preview, "setPlainText"):
-                self._preview.setPlainText(path.name)
-            elif hasattr(self._preview, "setText"):
-                    self._preview.setText(path.name)
+            self._set_preview_text(path.name)
+
+    def _render_image_preview(self, result: PreviewResult) -> None:
+        width, height = result.dimensions
+        caption = f"🖼️ Bild: {result.path.name}\nGröße: {width}x{height} Pixel"
+        if hasattr(self._preview, "setPixmap"):
+            # Direct pixmap setting for QLabel
+            self._preview.setPixmap(QPixmap.fromImage(result.image))
+            if hasattr(self._preview, "setText"):
+                self._preview.setText("")
+        elif hasattr(self._preview, "textCursor"):
+            # QTextEdit shows the thumbnail above the image details
+            self._preview.setPlainText("")
+            cursor = self._preview.textCursor()
+            cursor.insertImage(result.image)
+            cursor.insertText("\n" + caption)
+        else:
+            self._set_preview_text(caption)
+
+    def _set_preview_text(self, text: str, short_text: Optional[str] = None) -> None:
+        if hasattr(self._preview, "setPlainText"):
+            self._preview.setPlainText(text)
+        elif hasattr(self._preview, "setText"):
+            self._preview.setText(short_text if short_text is not None else text)
+
+    def _detach_highlighter(self) -> None:
+        # A highlighter stays attached to the shared document until removed
+        if self._highlighter is not None:
+            self._highlighter.setDocument(None)
+            self._highlighter = None
 
     def _render_metadata(self, path: Path) -> None:
         if hasattr(self._metadata, "setPlainText"):
@@ -1247,25 +1421,17 @@ class DetailsPanel(QWidget):  # type: ignore[misc]
             else:
                 self._metadata.setPlainText("Ordner")
 
-    def _render_text_preview(self, path: Path) -> None:
+    def _render_text_preview(
+        self, path: Path, content: str, truncated: bool = False, disable_highlighting: bool = False
+    ) -> None:
         """Render a preview of a text file with syntax highlighting if possible."""
         # Use QTextEdit for text previews instead of QLabel
         try:
-            # Read file content with line limitation for very large files
-            max_lines = 500
-            max_size = 100 * 1024  # 100KB
-            
-            file_size = path.stat().st_size
-            if file_size > max_size:
-                content = f"Datei ist zu groß für Vorschau (> 100KB)\nErste {max_lines} Zeilen werden angezeigt:\n\n"
-                with path.open("r", encoding="utf-8", errors="ignore") as f:
-                    content += "".join([next(f) for _ in range(max_lines) if f])
-                
-                # For very large files (> 1MB), disable syntax highlighting to maintain performance
-                disable_highlighting = file_size > 1024 * 1024
-            else:
-                content = path.read_text(encoding="utf-8", errors="ignore")
-                disable_highlighting = False            # Use syntax highlighting if available
+            if truncated:
+                content = (
+                    f"Datei ist zu groß für Vorschau (> 100KB)\nErste {MAX_TEXT_LINES} Zeilen werden angezeigt:\n\n"
+                    + content
+                )
             try:
                 # Set appropriate metadata based on file type
                 suffix = path.suffix.lower()
@@ -1315,7 +1481,7 @@ class DetailsPanel(QWidget):  # type: ignore[misc]
                     # Apply syntax highlighting if document is available and not disabled for large files
                     if hasattr(self._preview, "document") and not disable_highlighting:
                         document = self._preview.document()
-                        highlighter = CodeSyntaxHighlighter(document, language)
+                        self._highlighter = CodeSyntaxHighlighter(document, language)
                 else:
                     # Fallback to setText if setPlainText is not available
                     if hasattr(self._preview, "setText"):
@@ -2366,7 +2532,10 @@ class ExplorerWidget(QWidget):  # type: ignore[misc]
         splitter.addWidget(main_container)
 
         # Add details panel
-        self._details_panel = DetailsPanel()
+        thumbnails = None
+        if self._services is not None and hasattr(self._services, "data_dir"):
+            thumbnails = image_thumbnail_store(self._services.data_dir)
+        self._details_panel = DetailsPanel(thumbnails=thumbnails)
         splitter.addWidget(self._details_panel)
 
         # Configure splitter proportions
@@ -2896,6 +3065,9 @@ class ExplorerWidget(QWidget):  # type: ignore[misc]
         if not path.exists():
             return
         self._current_path = path
+        if hasattr(self._proxy, "set_current_directory"):
+            self._proxy.set_current_directory(path)
+        self._fs_manager.prefetch_directory(path)
         root_index = self._model.index(str(path)) if hasattr(self._model, "index") else QModelIndex()  # type: ignore[attr-defined]
         proxy_index = self._proxy.mapFromSource(root_index) if hasattr(self._proxy, "mapFromSource") else root_index
         for view in (self._grid_view, self._list_view, self._details_view):
@@ -31,7 +31,7 @@ import os
 from pathlib import Path
 from typing import Optional
 
-from PySide6.QtCore import Qt, QSize  # type: ignore[import-not-found]
+from PySide6.QtCore import Qt, QSize, Signal  # type: ignore[import-not-found]
 from PySide6.QtGui import QIcon  # type: ignore[import-not-found]
 from PySide6.QtWidgets import (  # type: ignore[import-not-found]
     QAbstractItemView,
@@ -55,6 +55,8 @@ from PySide6.QtWidgets import (  # type: ignore[import-not-found]
     QWidget,
 )
 
+from ...core.dir_snapshots import DirectorySnapshot, shared_snapshot_cache
+
 
 BG_PRIMARY = "#1e1f22"
 BG_SECONDARY = "#2b2d31"
@@ -177,6 +179,9 @@ class FileManagerUltraWidget(QWidget):
       - refresh_free_space(path?: Path)
     """
 
+    # Directory listings arrive from the snapshot cache's worker thread
+    _listing_ready = Signal(str, object, bool)  # path, DirectorySnapshot, complete
+
     def __init__(self, plugin, parent: Optional[QWidget] = None):  # type: ignore[override]
         super().__init__(parent)
         self._plugin = plugin
@@ -338,6 +343,8 @@ class FileManagerUltraWidget(QWidget):
         self._apply_styles()
         self.refresh_free_space()
         self._entries: list[dict] = []
+        self._snapshots = shared_snapshot_cache()
+        self._listing_ready.connect(self._on_listing_ready)
         self._load_directory_entries(self._current_dir)
         self.search_edit.textChanged.connect(self._apply_search_filter)
 
@@ -350,6 +357,7 @@ class FileManagerUltraWidget(QWidget):
         self._current_dir = path
         self.breadcrumb.set_path(path)
         self.refresh_free_space(path)
+        self._load_directory_entries(path)
 
     def update_selection(self, count: int, total_bytes: int) -> None:
         self.selection_label.setText(
@@ -482,30 +490,33 @@ class FileManagerUltraWidget(QWidget):
     # Directory & search helpers
     # ------------------------------------------------------------------
     def _load_directory_entries(self, path: Path) -> None:
+        # Cached listings are delivered synchronously; otherwise the listing
+        # runs in the background and partial results are shown as they arrive.
+        key = str(path)
+        self._snapshots.snapshot_async(
+            path,
+            on_done=lambda snapshot: self._listing_ready.emit(key, snapshot, True),
+            on_partial=lambda snapshot: self._listing_ready.emit(key, snapshot, False),
+        )
+
+    def _on_listing_ready(self, path: str, snapshot: Optional[DirectorySnapshot], complete: bool) -> None:
+        if path != str(self._current_dir):
+            return  # user navigated away meanwhile
+        if not complete and len(self._entries) > 2000:
+            return
         self._entries.clear()
-        try:
-            with os.scandir(path) as it:
-                for idx, entry in enumerate(it):
-                    if idx > 2000:  # safety cap for UI performance
-                        break
-                    try:
-                        stat = entry.stat()
-                        size = stat.st_size
-                        mtime = stat.st_mtime
-                    except Exception:
-                        size = 0
-                        mtime = 0
-                    kind = 'Ordner' if entry.is_dir() else (entry.name.split('.')[-1].upper() if '.' in entry.name else 'Datei')
-                    self._entries.append({
-                        'name': entry.name,
-                        'path': Path(entry.path),
-                        'size': size,
-                        'mtime': mtime,
-                        'kind': kind,
-                        'is_dir': entry.is_dir(),
-                    })
-        except Exception:
-            pass
+        for idx, entry in enumerate(snapshot.entries if snapshot is not None else ()):
+            if idx > 2000:  # safety cap for UI performance
+                break
+            kind = 'Ordner' if entry.is_dir else (entry.name.split('.')[-1].upper() if '.' in entry.name else 'Datei')
+            self._entries.append({
+                'name': entry.name,
+                'path': entry.path,
+                'size': entry.size,
+                'mtime': entry.mtime,
+                'kind': kind,
+                'is_dir': entry.is_dir,
+            })
         self._refresh_views()
 
     def _apply_search_filter(self) -> None:
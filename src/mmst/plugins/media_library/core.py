@@ -34,6 +34,11 @@ class MediaFile:
     kind: str
     rating: Optional[int] = None
     tags: Tuple[str, ...] = tuple()
+    loudness_lufs: Optional[float] = None
+    true_peak_dbtp: Optional[float] = None
+    rms_dbfs: Optional[float] = None
+    # Time of the last loudness analysis, also set when nothing was measurable
+    loudness_analyzed: Optional[float] = None
 
 
 class LibraryIndex:
@@ -94,6 +99,9 @@ class LibraryIndex:
                 cur.execute("ALTER TABLE files ADD COLUMN rating INTEGER")
             if "tags" not in existing_columns:
                 cur.execute("ALTER TABLE files ADD COLUMN tags TEXT")
+            for column in ("loudness_lufs", "true_peak_dbtp", "rms_dbfs", "loudness_analyzed"):
+                if column not in existing_columns:
+                    cur.execute(f"ALTER TABLE files ADD COLUMN {column} REAL")
             self._conn.commit()
 
     def add_source(self, path: Path) -> int:
@@ -145,7 +153,8 @@ class LibraryIndex:
             if limit is not None:
                 cur.execute(
                     """
-                SELECT f.path, f.size, f.mtime, f.kind, s.path, f.rating, f.tags
+                SELECT f.path, f.size, f.mtime, f.kind, s.path, f.rating, f.tags,
+                       f.loudness_lufs, f.true_peak_dbtp, f.rms_dbfs, f.loudness_analyzed
                 FROM files AS f
                 JOIN sources AS s ON s.id = f.source_id
                 ORDER BY f.id DESC
@@ -156,7 +165,8 @@ class LibraryIndex:
             else:
                 cur.execute(
                     """
-                SELECT f.path, f.size, f.mtime, f.kind, s.path, f.rating, f.tags
+                SELECT f.path, f.size, f.mtime, f.kind, s.path, f.rating, f.tags,
+                       f.loudness_lufs, f.true_peak_dbtp, f.rms_dbfs, f.loudness_analyzed
                 FROM files AS f
                 JOIN sources AS s ON s.id = f.source_id
                 ORDER BY f.id DESC
@@ -182,6 +192,10 @@ class LibraryIndex:
                 kind=str(row[3]),
                 rating=int(rating_value) if rating_value is not None else None,
                 tags=tags_value,
+                loudness_lufs=row[7],
+                true_peak_dbtp=row[8],
+                rms_dbfs=row[9],
+                loudness_analyzed=row[10],
             )
             source_path = Path(str(row[4]))
             results.append((media, source_path))
@@ -252,7 +266,8 @@ class LibraryIndex:
             cur = self._conn.cursor()
             cur.execute(
                 """
-            SELECT f.path, f.size, f.mtime, f.kind, s.path, f.rating, f.tags, pi.position
+            SELECT f.path, f.size, f.mtime, f.kind, s.path, f.rating, f.tags,
+                   f.loudness_lufs, f.true_peak_dbtp, f.rms_dbfs, f.loudness_analyzed, pi.position
             FROM playlist_items AS pi
             JOIN sources AS s ON s.id = pi.source_id
             JOIN files AS f ON f.source_id = pi.source_id AND f.path = pi.path
@@ -281,6 +296,10 @@ class LibraryIndex:
                 kind=str(row[3]),
                 rating=int(rating_value) if rating_value is not None else None,
                 tags=tags_value,
+                loudness_lufs=row[7],
+                true_peak_dbtp=row[8],
+                rms_dbfs=row[9],
+                loudness_analyzed=row[10],
             )
             source_path = Path(str(row[4]))
             results.append((media, source_path))
@@ -460,6 +479,55 @@ class LibraryIndex:
             self._conn.commit()
         return True
 
+    def set_loudness(
+        self,
+        file_path: Path,
+        loudness_lufs: Optional[float],
+        true_peak_dbtp: Optional[float],
+        rms_dbfs: Optional[float],
+        analyzed_at: Optional[float] = None,
+    ) -> bool:
+        """Store loudness values and mark the file as analysed.
+
+        All values may be None (silent or undecodable files); the marker
+        still keeps :meth:`list_loudness_targets` from returning the file.
+        """
+        resolved = self._resolve_source(file_path)
+        if resolved is None:
+            logger.warning("Cannot store loudness for unknown file: %s", file_path)
+            return False
+        source_id, rel_path = resolved
+        analyzed = time.time() if analyzed_at is None else analyzed_at
+        with self._lock:
+            self._conn.execute(
+                """
+            UPDATE files SET loudness_lufs=?, true_peak_dbtp=?, rms_dbfs=?, loudness_analyzed=?
+            WHERE source_id=? AND path=?
+                """,
+                (loudness_lufs, true_peak_dbtp, rms_dbfs, analyzed, source_id, rel_path),
+            )
+            self._conn.commit()
+        return True
+
+    def list_loudness_targets(self) -> List[Path]:
+        """Audio files never analysed for loudness or changed since the analysis."""
+        with self._lock:
+            start = time.perf_counter()
+            cur = self._conn.cursor()
+            cur.execute(
+                """
+            SELECT s.path, f.path
+            FROM files AS f
+            JOIN sources AS s ON s.id = f.source_id
+            WHERE f.kind = 'audio' AND (f.loudness_analyzed IS NULL OR f.loudness_analyzed < f.mtime)
+            ORDER BY f.id DESC
+                """
+            )
+            rows = cur.fetchall()
+            duration = time.perf_counter() - start
+        _record_query("list_loudness_targets", duration, len(rows))
+        return [Path(str(row[0])) / str(row[1]) for row in rows]
+
     def get_attributes(self, file_path: Path) -> Tuple[Optional[int], Tuple[str, ...]]:
         resolved = self._resolve_source(file_path)
         if resolved is None:
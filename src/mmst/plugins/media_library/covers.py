@@ -2,13 +2,22 @@
 from __future__ import annotations
 
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional, Union
 
 from PySide6.QtCore import QPointF, QRectF, QSize, Qt
 from PySide6.QtGui import QColor, QPainter, QPixmap
 
+from .thumbnails import ThumbnailStore, load_image_thumbnail
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .posters import PosterExtractor
+
 logger = logging.getLogger(__name__)
 
 try:  # pragma: no cover - optional dependency handling
@@ -133,34 +142,138 @@ def _load_audio_cover_bytes(path: Path) -> Optional[bytes]:
     return None
 
 
-def _find_sidecar_image(path: Path) -> Optional[Path]:
-    stem = path.stem
-    candidates = []
-    for ext in (".jpg", ".jpeg", ".png", ".webp", ".bmp"):
-        candidates.append(path.with_suffix(ext))
-        candidates.append(path.with_name(f"{stem}.cover{ext}"))
-        candidates.append(path.with_name(f"{stem}.poster{ext}"))
-        candidates.append(path.with_name(f"{stem}.thumb{ext}"))
-        candidates.append(path.with_name(f"{stem}.thumbnail{ext}"))
+SIDECAR_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".bmp")
+SIDECAR_VARIANTS = ("", ".cover", ".poster", ".thumb", ".thumbnail")
+# Album/folder art shared by every media file in the directory, in priority order.
+FOLDER_ART_STEMS = ("cover", "folder", "front", "album", "albumart", "poster")
 
-    for candidate in candidates:
-        try:
-            if candidate.exists():
-                return candidate
-        except OSError:
-            continue
-    return None
 
+@dataclass
+class _DirectoryListing:
+    mtime_ns: Optional[int]
+    checked_at: float
+    images: Dict[str, str]  # lower-cased file name -> actual file name
+
+
+class SidecarIndex:
+    """Memoised per-directory listing of sidecar artwork.
+
+    Each directory is listed once with ``os.scandir``; subsequent lookups for
+    files in the same folder are served from memory. Listings are revalidated
+    against the directory mtime at most every ``revalidate_interval`` seconds
+    and can be dropped explicitly (e.g. from filesystem watcher events).
+    """
+
+    def __init__(self, revalidate_interval: float = 2.0, max_directories: int = 4096) -> None:
+        self._revalidate_interval = max(0.0, float(revalidate_interval))
+        self._max_directories = max(1, int(max_directories))
+        self._listings: "OrderedDict[str, _DirectoryListing]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def find(self, path: Path) -> Optional[Path]:
+        """Return the sidecar image for ``path`` or shared folder art, if any."""
+        directory = path.parent
+        images = self._listing(directory).images
+        if not images:
+            return None
+
+        stem = path.stem.lower()
+        for ext in SIDECAR_EXTENSIONS:
+            for variant in SIDECAR_VARIANTS:
+                name = images.get(f"{stem}{variant}{ext}")
+                if name is not None:
+                    return directory / name
+
+        for folder_stem in FOLDER_ART_STEMS:
+            for ext in SIDECAR_EXTENSIONS:
+                name = images.get(f"{folder_stem}{ext}")
+                if name is not None:
+                    return directory / name
+        return None
+
+    def invalidate(self, directory: Union[Path, str]) -> None:
+        with self._lock:
+            self._listings.pop(str(directory), None)
 
-def load_cover_pixmap(path: Path, kind: str, size: QSize) -> QPixmap:
-    """Load a pixmap for the given media file and type."""
+    def clear(self) -> None:
+        with self._lock:
+            self._listings.clear()
+
+    def _listing(self, directory: Path) -> _DirectoryListing:
+        key = str(directory)
+        now = time.monotonic()
+        with self._lock:
+            listing = self._listings.get(key)
+            if listing is not None and now - listing.checked_at < self._revalidate_interval:
+                self._listings.move_to_end(key)
+                return listing
+
+        try:
+            mtime_ns: Optional[int] = os.stat(directory).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+
+        if listing is not None and listing.mtime_ns == mtime_ns:
+            listing.checked_at = now
+        else:
+            listing = _DirectoryListing(mtime_ns, now, self._scan(directory) if mtime_ns is not None else {})
+
+        with self._lock:
+            self._listings[key] = listing
+            self._listings.move_to_end(key)
+            while len(self._listings) > self._max_directories:
+                self._listings.popitem(last=False)
+        return listing
+
+    @staticmethod
+    def _scan(directory: Path) -> Dict[str, str]:
+        images: Dict[str, str] = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    lowered = entry.name.lower()
+                    if not lowered.endswith(SIDECAR_EXTENSIONS):
+                        continue
+                    try:
+                        if entry.is_file():
+                            images.setdefault(lowered, entry.name)
+                    except OSError:
+                        continue
+        except OSError as exc:
+            logger.debug("Failed to list %s for sidecar artwork: %s", directory, exc)
+        return images
+
+
+# Shared by all cover caches so watcher invalidations reach every consumer.
+SIDECAR_INDEX = SidecarIndex()
+
+
+def _find_sidecar_image(path: Path, sidecars: Optional[SidecarIndex] = None) -> Optional[Path]:
+    return (sidecars or SIDECAR_INDEX).find(path)
+
+
+def load_cover_pixmap(
+    path: Path,
+    kind: str,
+    size: QSize,
+    sidecars: Optional[SidecarIndex] = None,
+    posters: Optional["PosterExtractor"] = None,
+    thumbnails: Optional[ThumbnailStore] = None,
+) -> QPixmap:
+    """Load a pixmap for the given media file and type.
+
+    Videos without a sidecar poster use a cached extracted frame when
+    ``posters`` is given; a miss schedules background extraction and returns
+    the placeholder for now. Images are decoded at reduced size and cached in
+    ``thumbnails`` when given.
+    """
     if size.isEmpty():
         size = QSize(240, 240)
 
     if kind == "image" and path.exists():
-        pixmap = QPixmap(str(path))
-        if not pixmap.isNull():
-            return pixmap.scaled(size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        image, _ = load_image_thumbnail(path, max(size.width(), size.height()), thumbnails)
+        if image is not None:
+            return QPixmap.fromImage(image).scaled(size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
 
     if kind == "audio":
         cover_bytes = _load_audio_cover_bytes(path)
@@ -168,20 +281,25 @@ def load_cover_pixmap(path: Path, kind: str, size: QSize) -> QPixmap:
             pixmap = QPixmap()
             if pixmap.loadFromData(cover_bytes):
                 return pixmap.scaled(size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        sidecar = _find_sidecar_image(path)
+        sidecar = _find_sidecar_image(path, sidecars)
         if sidecar is not None:
             pixmap = QPixmap(str(sidecar))
             if not pixmap.isNull():
                 return pixmap.scaled(size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
 
     if kind == "video":
-        poster = _find_sidecar_image(path)
+        poster = _find_sidecar_image(path, sidecars)
         if poster is not None:
             pixmap = QPixmap(str(poster))
             if not pixmap.isNull():
                 return pixmap.scaled(size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        if posters is not None:
+            extracted = posters.request(path)
+            if extracted is not None:
+                pixmap = QPixmap(str(extracted))
+                if not pixmap.isNull():
+                    return pixmap.scaled(size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
 
-    # For videos: no embedded support yet, fall back to placeholder
     return placeholder_pixmap(kind, size)
 
 
@@ -191,10 +309,15 @@ class CoverCache:
 
     size: QSize = QSize(240, 240)
     _cache: Dict[str, QPixmap] = None  # type: ignore[assignment]
+    sidecars: Optional[SidecarIndex] = None
+    posters: Optional["PosterExtractor"] = None
+    thumbnails: Optional[ThumbnailStore] = None
 
     def __post_init__(self) -> None:
         if self._cache is None:
             self._cache = {}
+        if self.sidecars is None:
+            self.sidecars = SIDECAR_INDEX
 
     def get(self, path: Path, kind: str) -> QPixmap:
         key = str(path)
@@ -202,12 +325,28 @@ class CoverCache:
         if pixmap is not None:
             return pixmap
 
-        pixmap = load_cover_pixmap(path, kind, self.size)
+        pixmap = load_cover_pixmap(path, kind, self.size, self.sidecars, self.posters, self.thumbnails)
         self._cache[key] = pixmap
         return pixmap
 
+    def discard(self, path: Path) -> None:
+        """Drop only the cached pixmap (e.g. once a poster frame is ready)."""
+        self._cache.pop(str(path), None)
+
     def invalidate(self, path: Path) -> None:
         self._cache.pop(str(path), None)
+        self.sidecars.invalidate(path.parent)  # type: ignore[union-attr]
+        if path.suffix.lower() in SIDECAR_EXTENSIONS:
+            # Artwork may be shared by siblings (folder.jpg, <stem>.cover.jpg, ...)
+            self.invalidate_directory(path.parent)
+
+    def invalidate_directory(self, directory: Path) -> None:
+        prefix = str(directory)
+        for key in list(self._cache):
+            if str(Path(key).parent) == prefix:
+                self._cache.pop(key, None)
+        self.sidecars.invalidate(directory)  # type: ignore[union-attr]
 
     def clear(self) -> None:
-        self._cache.clear()
\ No newline at end of file
+        self._cache.clear()
+        self.sidecars.clear()  # type: ignore[union-attr]
\ No newline at end of file
@@ -56,6 +56,7 @@ class EnhancedRootWidget(QtWidgetBase):
     """
     scan_progress = Signal(str, int, int)  # type: ignore
     library_changed = Signal()  # type: ignore
+    cover_updated = Signal(str)  # type: ignore
 
     def __init__(self, plugin: Any):
         super().__init__()
@@ -167,8 +168,18 @@ class EnhancedRootWidget(QtWidgetBase):
         self.gallery = self._build_gallery_placeholder()
         self.detail_panel = self._build_detail_panel()
         self._detail_current_path = None  # type: ignore
-        self._cover_cache = CoverCache()  # type: ignore
+        # Share the plugin's poster extractor so videos get real thumbnails
+        posters = getattr(plugin, '_poster_extractor', None)
+        self._cover_cache = CoverCache(  # type: ignore
+            posters=posters, thumbnails=getattr(plugin, '_image_thumbnails', None)
+        )
         self._gallery_items_by_path = {}  # path -> QListWidgetItem
+        if posters is not None:
+            try:
+                self.cover_updated.connect(self._on_cover_updated)  # type: ignore[attr-defined]
+                posters.add_listener(lambda p: self.cover_updated.emit(str(p)))  # type: ignore[attr-defined]
+            except Exception:
+                pass
         # Filesystem watcher (lazy start if watchdog present)
         self._watcher: FileSystemWatcher | None = None  # type: ignore
         self._pending_refresh = False  # debounce flag
@@ -804,6 +815,11 @@ class EnhancedRootWidget(QtWidgetBase):
                 continue
 
     def _on_fs_event(self, kind: str, path: Path):  # pragma: no cover - callback
+        try:
+            # Drop cached pixmap + sidecar listing so new folder art is picked up
+            self._cover_cache.invalidate(Path(path))  # type: ignore[attr-defined]
+        except Exception:
+            pass
         # Debounce multiple rapid events (especially on large moves/copies)
         try:
             self._pending_refresh = True
@@ -820,6 +836,22 @@ class EnhancedRootWidget(QtWidgetBase):
             # Fallback: immediate refresh
             self._refresh_after_fs()
 
+    def _on_cover_updated(self, path_str: str):  # pragma: no cover - UI callback
+        try:
+            self._cover_cache.discard(Path(path_str))  # type: ignore[attr-defined]
+            item = self._gallery_items_by_path.get(path_str)
+            if item is None:
+                return
+            from PySide6.QtGui import QIcon  # type: ignore
+            kind = 'video'
+            for mf, root in self._entries:
+                if str((root / mf.path).resolve(False)) == path_str:
+                    kind = mf.kind
+                    break
+            item.setIcon(QIcon(self._cover_cache.get(Path(path_str), kind)))  # type: ignore[attr-defined]
+        except Exception:
+            pass
+
     def _refresh_after_fs(self):  # pragma: no cover
         try:
             # Re-read listing & rebuild UI facets
@@ -1139,6 +1139,8 @@ from .core import LibraryIndex, MediaFile, scan_source
 from .ui_helpers import BatchMetadataDialog, RatingStarBar, TagEditor
 from .covers import CoverCache, placeholder_pixmap
 from .metadata import MediaMetadata, MetadataReader
+from .posters import PosterExtractor
+from .thumbnails import ThumbnailStore, image_thumbnail_store
 from .watcher import FileSystemWatcher
 
 
@@ -1152,6 +1154,7 @@ class MediaLibraryWidget(QWidget):
     scan_failed = Signal(str)
     library_changed = Signal()
     status_message = Signal(str)
+    cover_updated = Signal(str)
 
     def __init__(self, plugin: "MediaLibraryPlugin") -> None:
         super().__init__()
@@ -1256,6 +1259,7 @@ class MediaLibraryWidget(QWidget):
         self.scan_failed.connect(self._on_failed)
         self.library_changed.connect(self._on_library_changed)
         self.status_message.connect(self._on_status_message)
+        self.cover_updated.connect(self._on_cover_updated)
 
     def _build_sources_tab(self) -> None:
         tab = QWidget()
@@ -1832,6 +1836,10 @@ class MediaLibraryWidget(QWidget):
         cover_action.triggered.connect(self._on_batch_cover_reload)
         refresh_action = self._batch_menu.addAction("Neu indizieren")
         refresh_action.triggered.connect(self._on_batch_refresh_metadata)
+        loudness_action = self._batch_menu.addAction("Lautheit analysieren (EBU R128)")
+        loudness_action.triggered.connect(self._on_batch_analyze_loudness)
+        compress_action = self._batch_menu.addAction("Bilder komprimieren…")
+        compress_action.triggered.connect(self._on_batch_compress_images)
 
     def _selected_paths(self) -> List[Path]:
         paths: Set[str] = set()
@@ -1995,6 +2003,41 @@ class MediaLibraryWidget(QWidget):
         else:
             self.status_message.emit("Keine Dateien aktualisiert.")
 
+    def _on_batch_analyze_loudness(self) -> None:
+        # Without a selection the whole library is analysed (files not measured yet)
+        paths = self._selected_paths()
+        if self._plugin.analyze_loudness(paths or None):
+            self.status_message.emit("Lautheitsanalyse läuft im Hintergrund …")
+        else:
+            self.status_message.emit("Keine Audiodateien für die Lautheitsanalyse.")
+
+    def _on_batch_compress_images(self) -> None:
+        paths = self._selected_paths()
+        if not paths:
+            self.status_message.emit("Keine Auswahl für die Bild-Komprimierung.")
+            return
+        max_kb, ok = QInputDialog.getInt(
+            self,
+            "Bilder komprimieren",
+            "Maximale Dateigröße in KB (0 = feste Qualität 85):",
+            0,
+            0,
+            100_000,
+        )
+        if not ok:
+            return
+        answer = QMessageBox.question(
+            self,
+            "Bilder komprimieren",
+            "Die ausgewählten JPEG/WebP-Bilder werden durch kleinere Versionen ersetzt. Fortfahren?",
+        )
+        if answer != QMessageBox.StandardButton.Yes:
+            return
+        if self._plugin.compress_images(paths, max_bytes=max_kb * 1024 or None):
+            self.status_message.emit("Bild-Komprimierung läuft im Hintergrund …")
+        else:
+            self.status_message.emit("Keine komprimierbaren Bilder oder ImageMagick fehlt.")
+
     # --- external player integration ------------------------------------
 
     def _trigger_external_player(self, path: Path) -> None:
@@ -3546,6 +3589,29 @@ class MediaLibraryWidget(QWidget):
         item.setData(self.ICON_READY_ROLE, True)
         self._gallery_pending_icons = max(0, self._gallery_pending_icons - 1)
 
+    def _on_cover_updated(self, path_str: str) -> None:
+        # The poster worker only signals; the stale pixmap is dropped here
+        self._plugin.discard_cover(Path(path_str))
+        index = self._gallery_index_by_path.get(path_str)
+        if index is not None and self.gallery:
+            item = self.gallery.item(index)
+            if item is not None and bool(item.data(self.ICON_READY_ROLE)):
+                self._gallery_pending_icons += 1
+                self._load_gallery_icon(item)
+        if self._selected_path is not None and str(self._selected_path) == path_str:
+            entry = self._entry_lookup.get(path_str)
+            if entry is not None:
+                media, _source = entry
+                pixmap = self._plugin.cover_pixmap(self._selected_path, media.kind)
+                if not pixmap.isNull():
+                    self.detail_cover.setPixmap(
+                        pixmap.scaled(
+                            self.detail_cover.size(),
+                            Qt.AspectRatioMode.KeepAspectRatio,
+                            Qt.TransformationMode.SmoothTransformation,
+                        )
+                    )
+
     def _on_library_changed(self) -> None:
         self._refresh_library_views()
         self._refresh_playlists(select_id=self._current_playlist_id)
@@ -4224,9 +4290,26 @@ class MediaLibraryPlugin(BasePlugin):
             self._watch_enabled = stored_watch.strip().lower() in {"1", "true", "yes", "on"}
         else:
             self._watch_enabled = bool(stored_watch)
-        self._cover_cache = CoverCache(size=QSize(192, 192))
+        covers_dir = next(iter(self.services.ensure_subdirectories("covers")))
+        self._poster_extractor = PosterExtractor(
+            ThumbnailStore(covers_dir / "posters"),
+            max_workers=self._int_config("poster_workers", 2, minimum=1),
+            niceness=self._int_config("poster_niceness", 10, minimum=0),
+            on_ready=self._on_poster_ready,
+        )
+        # Shared with the Explorer details panel
+        self._image_thumbnails = image_thumbnail_store(self.services.data_dir)
+        self._cover_cache = CoverCache(
+            size=QSize(192, 192), posters=self._poster_extractor, thumbnails=self._image_thumbnails
+        )
         self._log = logging.getLogger(__name__)
 
+    def _int_config(self, key: str, default: int, *, minimum: int) -> int:
+        try:
+            return max(minimum, int(self.config.get(key, default)))
+        except (TypeError, ValueError):
+            return default
+
     @property
     def manifest(self) -> PluginManifest:
         return self._manifest
@@ -4257,6 +4340,7 @@ class MediaLibraryPlugin(BasePlugin):
 
     def shutdown(self) -> None:
         self._stop_watching()
+        self._poster_extractor.shutdown()
         self._index.close()
         self._executor.shutdown(wait=False)
 
@@ -4298,6 +4382,16 @@ class MediaLibraryPlugin(BasePlugin):
     def cover_pixmap(self, path: Path, kind: str) -> QPixmap:
         return self._cover_cache.get(path, kind)
 
+    def _on_poster_ready(self, path: Path) -> None:
+        """Called from the poster worker pool once a video frame is cached.
+
+        Only the signal is emitted here: dropping the cached QPixmap must
+        happen on the GUI thread, in the widget's slot (:meth:`discard_cover`).
+        """
+        signal = getattr(self._widget, "cover_updated", None)
+        if signal is not None:
+            signal.emit(str(path))
+
     @property
     def watch_enabled(self) -> bool:
         return self._watch_enabled
@@ -4486,6 +4580,133 @@ class MediaLibraryPlugin(BasePlugin):
     def invalidate_cover(self, path: Path) -> None:
         self._cover_cache.invalidate(path)
 
+    def discard_cover(self, path: Path) -> None:
+        """Drop the cached pixmap of ``path``; GUI thread only."""
+        self._cover_cache.discard(path)
+
+    def analyze_loudness(self, paths: Optional[Iterable[Path]] = None) -> bool:
+        """Measure EBU R128 loudness of audio files in a background job.
+
+        Results are stored in the index (``loudness_lufs``, ``true_peak_dbtp``,
+        ``rms_dbfs``) so smart playlists can filter on them. Silent and
+        undecodable files are marked as analysed too, so they are not
+        decoded again on every run.
+
+        Args:
+            paths: Files to analyse; defaults to all audio files not analysed
+                yet or changed since their analysis
+
+        Returns:
+            False if there was nothing to analyse
+        """
+        from ...audio_tools.encoder import find_ffmpeg
+        from ...audio_tools.loudness import AUDIO_EXTENSIONS, run_loudness_batch
+
+        if paths is None:
+            targets = self._index.list_loudness_targets()
+        else:
+            targets = list(paths)
+        targets = [path for path in targets if path.suffix.lower() in AUDIO_EXTENSIONS]
+        if not targets:
+            return False
+
+        task_id = self.services.progress.start_task("Lautheitsanalyse", total=len(targets))
+
+        def _store(path: Path, result: Any) -> None:
+            self._index.set_loudness(path, result.integrated_lufs, result.true_peak_dbtp, result.rms_dbfs)
+
+        def _failed(path: Path, _error: str) -> None:
+            # Undecodable: remember the attempt until the file changes
+            self._index.set_loudness(path, None, None, None)
+
+        def _progress(done: int, total: int, path: Path) -> None:
+            self.services.progress.update(task_id, done, max(1, total), f"Analysiere: {path.name}")
+
+        future = self._executor.submit(
+            run_loudness_batch, targets, _store, ffmpeg=find_ffmpeg(), progress=_progress, on_error=_failed
+        )
+
+        def _done(f: concurrent.futures.Future) -> None:
+            try:
+                analysed, failed = f.result()
+            except Exception:
+                self.services.progress.complete(task_id, success=False)
+                self._log.exception("Lautheitsanalyse fehlgeschlagen")
+                return
+            self.services.progress.complete(task_id, success=True)
+            self._log.info("Lautheitsanalyse: %d analysiert, %d fehlgeschlagen", analysed, failed)
+            if self._widget and analysed:
+                self._widget.library_changed.emit()
+
+        future.add_done_callback(_done)
+        return True
+
+    def compress_images(self, paths: Iterable[Path], max_bytes: Optional[int] = None) -> bool:
+        """Recompress JPEG/WebP files in place in a background job.
+
+        Each image keeps its format; results that are not smaller are skipped
+        and the index is refreshed for every replaced file.
+
+        Args:
+            paths: Selected files
+            max_bytes: Size target per image; None uses quality 85
+
+        Returns:
+            False if ImageMagick is missing or no lossy images were given
+        """
+        from ...system_tools.image_batch import (
+            LOSSY_FORMATS,
+            STATUS_COMPRESSED,
+            BatchCompressionSummary,
+            ImageBatchCompressor,
+            ImageCompressionSettings,
+        )
+        from ...system_tools.tools import shared_tool_registry
+
+        by_format: Dict[str, List[Path]] = {}
+        for path in paths:
+            fmt = path.suffix.lower().lstrip(".")
+            if fmt in LOSSY_FORMATS:
+                by_format.setdefault("jpg" if fmt == "jpeg" else fmt, []).append(path)
+        tool = shared_tool_registry().get("imagemagick")
+        if not by_format or not tool.available:
+            return False
+
+        total = sum(len(group) for group in by_format.values())
+        task_id = self.services.progress.start_task("Bild-Komprimierung", total=total)
+        offset = [0]
+
+        def _progress(done: int, _total: int, result: Any) -> None:
+            self.services.progress.update(task_id, offset[0] + done, total, f"Komprimiere: {result.source.name}")
+
+        def _run() -> BatchCompressionSummary:
+            summary = BatchCompressionSummary()
+            for fmt, group in by_format.items():
+                compressor = ImageBatchCompressor(
+                    tool.path or tool.command, ImageCompressionSettings(target_format=fmt, max_bytes=max_bytes)
+                )
+                summary.results.extend(compressor.run(group, on_result=_progress).results)
+                offset[0] += len(group)
+            for result in summary.results:
+                if result.status == STATUS_COMPRESSED:
+                    self.refresh_metadata(result.source)
+            return summary
+
+        def _done(f: concurrent.futures.Future) -> None:
+            try:
+                summary = f.result()
+            except Exception:
+                self.services.progress.complete(task_id, success=False)
+                self._log.exception("Bild-Komprimierung fehlgeschlagen")
+                return
+            self.services.progress.complete(task_id, success=summary.failed == 0)
+            self._log.info("Bild-Komprimierung: %s", summary.describe())
+            if self._widget and summary.compressed:
+                self._widget.library_changed.emit()
+
+        self._executor.submit(_run).add_done_callback(_done)
+        return True
+
     def refresh_metadata(self, path: Path) -> bool:
         updated = self._index.update_file_by_path(path)
         if updated:
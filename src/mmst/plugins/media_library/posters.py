@@ -0,0 +1,251 @@
+"""Background poster-frame extraction for video files.
+
+Videos without a sidecar poster get a representative frame grabbed with the
+ffmpeg binary from the shared tool registry. Extraction runs on a small thread
+pool at reduced CPU priority and results land in the ``ThumbnailStore`` so
+they survive restarts. Callers only ever see cached posters; misses schedule
+a job and report back through listeners once the frame is on disk.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import os
+import re
+import subprocess
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Set
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage
+
+from .thumbnails import ThumbnailStore
+
+try:  # optional dependency: tool discovery lives in the SystemTools plugin
+    from ..system_tools.tools import shared_tool_registry
+except Exception:  # pragma: no cover - SystemTools unavailable
+    shared_tool_registry = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+POSTER_VARIANT = "poster"
+# Seek positions (fraction of duration) tried in order until a non-black frame is found.
+POSTER_OFFSETS = (0.10, 0.25, 0.50)
+BLACK_LUMA_THRESHOLD = 18.0
+
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d{2}):(\d{2}(?:\.\d+)?)")
+
+
+def parse_duration(output: str) -> Optional[float]:
+    """Extract the container duration in seconds from ffmpeg's banner output."""
+    match = _DURATION_RE.search(output)
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def mean_luma(data: bytes) -> Optional[float]:
+    """Return the mean luminance (0-255) of an encoded image, sampled at 16x16."""
+    image = QImage.fromData(data)
+    if image.isNull():
+        return None
+    small = image.scaled(16, 16, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.FastTransformation)
+    total = 0.0
+    for y in range(small.height()):
+        for x in range(small.width()):
+            color = small.pixelColor(x, y)
+            total += 0.2126 * color.red() + 0.7152 * color.green() + 0.0722 * color.blue()
+    pixels = small.width() * small.height()
+    return total / pixels if pixels else None
+
+
+class PosterExtractor:
+    """Extract and cache representative video frames in the background."""
+
+    def __init__(
+        self,
+        store: ThumbnailStore,
+        ffmpeg: Optional[str] = None,
+        *,
+        max_workers: int = 2,
+        niceness: int = 10,
+        size: int = 320,
+        timeout: float = 30.0,
+        on_ready: Optional[Callable[[Path], None]] = None,
+    ) -> None:
+        self._store = store
+        self._ffmpeg = ffmpeg
+        self._ffmpeg_resolved = ffmpeg is not None
+        self._niceness = max(0, int(niceness))
+        self._size = max(16, int(size))
+        self._timeout = timeout
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, int(max_workers)), thread_name_prefix="poster"
+        )
+        self._lock = threading.Lock()
+        self._pending: Set[str] = set()
+        self._failed: Set[str] = set()
+        self._listeners: List[Callable[[Path], None]] = []
+        if on_ready is not None:
+            self._listeners.append(on_ready)
+        self._closed = False
+
+    # ------------------------------------------------------------------ API
+    def add_listener(self, callback: Callable[[Path], None]) -> None:
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Path], None]) -> None:
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def cached(self, source: Path) -> Optional[Path]:
+        return self._store.lookup(source, POSTER_VARIANT)
+
+    def request(self, source: Path) -> Optional[Path]:
+        """Return a cached poster or schedule extraction and return ``None``."""
+        cached = self.cached(source)
+        if cached is not None:
+            return cached
+        key = str(source)
+        with self._lock:
+            if self._closed or key in self._pending or key in self._failed:
+                return None
+            self._pending.add(key)
+        try:
+            self._executor.submit(self._run_job, Path(source))
+        except RuntimeError:  # executor already shut down
+            with self._lock:
+                self._pending.discard(key)
+        return None
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    # ------------------------------------------------------------ extraction
+    def extract(self, source: Path) -> Optional[Path]:
+        """Synchronously extract a poster for ``source`` into the store."""
+        ffmpeg = self._resolve_ffmpeg()
+        if not ffmpeg:
+            return None
+
+        duration = self._probe_duration(ffmpeg, source)
+        offsets = [duration * fraction for fraction in POSTER_OFFSETS] if duration else [0.0]
+
+        best: Optional[bytes] = None
+        best_luma = -1.0
+        for offset in offsets:
+            frame = self._grab_frame(ffmpeg, source, offset)
+            if not frame:
+                continue
+            luma = mean_luma(frame)
+            if luma is None:
+                continue
+            if luma > best_luma:
+                best, best_luma = frame, luma
+            if luma >= BLACK_LUMA_THRESHOLD:
+                break
+
+        if best is None:
+            return None
+        return self._store.store(source, best, POSTER_VARIANT)
+
+    def _run_job(self, source: Path) -> None:
+        key = str(source)
+        try:
+            poster = self.extract(source)
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.debug("Poster extraction crashed for %s: %s", source, exc)
+            poster = None
+        with self._lock:
+            self._pending.discard(key)
+            if poster is None:
+                self._failed.add(key)
+            listeners = list(self._listeners) if poster is not None else []
+        for listener in listeners:
+            try:
+                listener(source)
+            except Exception:  # pragma: no cover - listener errors must not kill the pool
+                logger.exception("Poster listener failed for %s", source)
+
+    def _resolve_ffmpeg(self) -> Optional[str]:
+        if self._ffmpeg_resolved:
+            return self._ffmpeg
+        path: Optional[str] = None
+        if shared_tool_registry is not None:
+            try:
+                tool = shared_tool_registry().get("ffmpeg")
+                if tool.available:
+                    path = tool.path or tool.command
+            except Exception as exc:  # pragma: no cover - defensive
+                logger.debug("ffmpeg detection failed: %s", exc)
+        with self._lock:
+            self._ffmpeg = path
+            self._ffmpeg_resolved = True
+        if path is None:
+            logger.info("ffmpeg not available, video posters disabled")
+        return path
+
+    def _probe_duration(self, ffmpeg: str, source: Path) -> Optional[float]:
+        # "ffmpeg -i" without an output exits non-zero but still prints the banner.
+        result = self._run([ffmpeg, "-hide_banner", "-nostdin", "-i", str(source)])
+        if result is None:
+            return None
+        return parse_duration(result[2].decode("utf-8", "replace"))
+
+    def _grab_frame(self, ffmpeg: str, source: Path, offset: float) -> Optional[bytes]:
+        scale = f"thumbnail=12,scale={self._size}:{self._size}:force_original_aspect_ratio=decrease"
+        command = [
+            ffmpeg,
+            "-hide_banner",
+            "-loglevel", "error",
+            "-nostdin",
+            "-ss", f"{max(0.0, offset):.3f}",
+            "-i", str(source),
+            "-an", "-sn",
+            "-vf", scale,
+            "-frames:v", "1",
+            "-f", "image2pipe",
+            "-vcodec", "mjpeg",
+            "-q:v", "4",
+            "-",
+        ]
+        result = self._run(command)
+        if result is None or result[0] != 0:
+            return None
+        return result[1] or None
+
+    def _run(self, command: Sequence[str]) -> Optional[tuple[int, bytes, bytes]]:
+        kwargs = {}
+        if os.name == "nt" and self._niceness > 0:
+            kwargs["creationflags"] = getattr(subprocess, "BELOW_NORMAL_PRIORITY_CLASS", 0)
+        try:
+            process = subprocess.Popen(
+                list(command),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                **kwargs,
+            )
+        except OSError as exc:
+            logger.debug("Failed to spawn %s: %s", command[0], exc)
+            return None
+        if self._niceness > 0 and hasattr(os, "setpriority"):
+            try:
+                os.setpriority(os.PRIO_PROCESS, process.pid, self._niceness)
+            except OSError:
+                pass
+        try:
+            stdout, stderr = process.communicate(timeout=self._timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            logger.debug("ffmpeg timed out on %s", command)
+            return None
+        return process.returncode, stdout, stderr
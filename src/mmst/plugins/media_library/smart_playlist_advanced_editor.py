@@ -27,6 +27,8 @@ _RULE_FIELDS = [
     ("genre", "Genre"),
     ("tags", "Tags"),
     ("title", "Titel"),
+    ("loudness_lufs", "Lautheit (LUFS)"),
+    ("true_peak_dbtp", "True Peak (dBTP)"),
 ]
 
 # Mapping field -> plausible operators (subset / UI friendly)
@@ -40,6 +42,8 @@ _FIELD_OPS = {
     "genre": ["contains", "not_contains", "=="],
     "tags": ["has_tag", "contains", "not_contains"],
     "title": ["contains", "not_contains", "startswith", "endswith", "regex"],
+    "loudness_lufs": [">=", "<=", ">", "<", "between"],
+    "true_peak_dbtp": [">=", "<=", ">", "<", "between"],
 }
 
 
@@ -76,6 +76,10 @@ _ALLOWED_FIELDS = {
     "resolution",
     "bitrate",
     "tags",
+    # Loudness analysis (audio tools batch job)
+    "loudness_lufs",
+    "true_peak_dbtp",
+    "rms_dbfs",
     # Derived (Phase 3)
     "age_days",        # computed from now - mtime
     "filesize_mb",     # computed from size
@@ -0,0 +1,139 @@
+"""Persistent on-disk thumbnail cache for the MediaLibrary plugin.
+
+Thumbnails are keyed by source path, size and mtime so edits to the source
+file naturally produce a new entry. Files live below the plugin's
+``covers`` data directory, fanned out into two-character buckets.
+
+Downscaled images are shared with the Explorer details panel through
+:func:`image_thumbnail_store` and :func:`load_image_thumbnail`.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from PySide6.QtGui import QImage
+
+logger = logging.getLogger(__name__)
+
+
+class ThumbnailStore:
+    """Content-addressed thumbnail files on disk."""
+
+    def __init__(self, root: Path, extension: str = ".jpg") -> None:
+        self.root = Path(root)
+        self.extension = extension if extension.startswith(".") else f".{extension}"
+
+    def key(self, source: Path, variant: str = "thumb") -> Optional[str]:
+        """Return the cache key for ``source`` or ``None`` if it cannot be stat'ed."""
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return None
+        raw = f"{Path(source).resolve(strict=False)}|{stat.st_size}|{stat.st_mtime_ns}|{variant}"
+        return hashlib.sha1(raw.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def path_for_key(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{self.extension}"
+
+    def lookup(self, source: Path, variant: str = "thumb") -> Optional[Path]:
+        """Return the cached thumbnail for ``source`` if one exists."""
+        key = self.key(source, variant)
+        if key is None:
+            return None
+        target = self.path_for_key(key)
+        return target if target.is_file() else None
+
+    def store(self, source: Path, data: bytes, variant: str = "thumb") -> Optional[Path]:
+        """Atomically write ``data`` as the thumbnail for ``source``."""
+        key = self.key(source, variant)
+        if key is None or not data:
+            return None
+        target = self.path_for_key(key)
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(prefix=".tmp-", suffix=self.extension, dir=target.parent)
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(data)
+                os.replace(tmp_name, target)
+            except Exception:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                raise
+        except OSError as exc:
+            logger.debug("Failed to store thumbnail for %s: %s", source, exc)
+            return None
+        return target
+
+
+def image_thumbnail_store(data_dir: Path) -> ThumbnailStore:
+    """Store for downscaled images shared by the media library and Explorer."""
+    return ThumbnailStore(Path(data_dir) / "covers" / "images")
+
+
+def load_image_thumbnail(
+    source: Path, max_side: int, store: Optional[ThumbnailStore] = None
+) -> Tuple[Optional["QImage"], Tuple[int, int]]:
+    """Decode ``source`` with at most ``max_side`` pixels on its longer edge.
+
+    The reader is asked for the reduced size up front, so JPEG decoders skip
+    most of the work for large photos. Downscaled results are cached in
+    ``store``. Returns a ``QImage``, which unlike ``QPixmap`` may be created
+    on worker threads.
+
+    Args:
+        source: Image file to decode
+        max_side: Maximum width and height of the result
+        store: Optional thumbnail cache
+
+    Returns:
+        Tuple of the image (``None`` if it cannot be decoded) and the
+        original (width, height), (0, 0) if unknown
+    """
+    from PySide6.QtCore import QBuffer, QIODevice, Qt
+    from PySide6.QtGui import QImage, QImageReader
+
+    reader = QImageReader(str(source))
+    reader.setAutoTransform(True)
+    original = reader.size()
+    dimensions = (original.width(), original.height()) if original.isValid() else (0, 0)
+
+    variant = f"image-{max_side}"
+    if store is not None:
+        cached = store.lookup(source, variant)
+        if cached is not None:
+            image = QImage(str(cached))
+            if not image.isNull():
+                return image, dimensions
+
+    downscaled = original.isValid() and max(dimensions) > max_side
+    if downscaled:
+        reader.setScaledSize(original.scaled(max_side, max_side, Qt.AspectRatioMode.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        logger.debug("Cannot decode %s: %s", source, reader.errorString())
+        return None, dimensions
+    if not original.isValid():
+        dimensions = (image.width(), image.height())
+    if max(image.width(), image.height()) > max_side:
+        # Formats without header sizes cannot be decoded at reduced resolution
+        image = image.scaled(
+            max_side, max_side, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
+        )
+        downscaled = True
+
+    # Small images decode faster than a cache lookup, and JPEG drops alpha
+    if store is not None and downscaled and not image.hasAlphaChannel():
+        buffer = QBuffer()
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        if image.save(buffer, "JPG", 85):
+            store.store(source, bytes(buffer.data()), variant)
+    return image, dimensions
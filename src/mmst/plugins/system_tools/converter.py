@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import re
 import subprocess
+import threading
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Deque, Optional
+
+_DURATION_PATTERN = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
 
 
 @dataclass
@@ -16,6 +21,66 @@ class ConversionJob:
     command_path: Optional[Path] = None
 
 
+@dataclass
+class ConversionProgress:
+    """Progress of a running ffmpeg conversion.
+
+    ``percent`` is None while the input duration is unknown; ``speed`` is
+    the encoding speed as a multiple of real time.
+    """
+
+    seconds: float = 0.0
+    percent: Optional[float] = None
+    speed: Optional[float] = None
+    finished: bool = False
+
+
+class FfmpegProgressParser:
+    """Parse the ``key=value`` stream of ``ffmpeg -progress pipe:1``.
+
+    ffmpeg writes one block of keys per update, terminated by a
+    ``progress=continue`` (or ``progress=end``) line; :meth:`feed` returns a
+    :class:`ConversionProgress` whenever a block completes.
+    """
+
+    def __init__(self, duration: Optional[float] = None) -> None:
+        self.duration = duration
+        self._seconds = 0.0
+        self._speed: Optional[float] = None
+
+    def feed(self, line: str) -> Optional[ConversionProgress]:
+        key, _, value = line.strip().partition("=")
+        if key in {"out_time_us", "out_time_ms"}:
+            # Both keys carry microseconds (out_time_ms is a historic misnomer)
+            try:
+                self._seconds = max(0.0, int(value) / 1_000_000)
+            except ValueError:
+                pass
+        elif key == "speed":
+            try:
+                self._speed = float(value.rstrip("x"))
+            except ValueError:
+                self._speed = None
+        elif key == "progress":
+            finished = value == "end"
+            percent = None
+            if finished:
+                percent = 100.0
+            elif self.duration:
+                percent = min(100.0, 100.0 * self._seconds / self.duration)
+            return ConversionProgress(self._seconds, percent, self._speed, finished)
+        return None
+
+
+def parse_duration(text: str) -> Optional[float]:
+    """Extract the input duration from ffmpeg's stderr banner."""
+    match = _DURATION_PATTERN.search(text)
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
 @dataclass
 class ConversionResult:
     success: bool
@@ -35,8 +100,20 @@ class FileConverter:
         self,
         job: ConversionJob,
         progress: Optional[Callable[[str], None]] = None,
+        *,
+        on_progress: Optional[Callable[[ConversionProgress], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
     ) -> ConversionResult:
-        """Convert a file from one format to another."""
+        """Convert a file from one format to another.
+
+        Args:
+            job: Conversion to run
+            progress: Receives human readable status messages
+            on_progress: Receives percentage/speed updates (ffmpeg only); when
+                given, or with ``cancel_event``, ffmpeg output is streamed
+                instead of waited for
+            cancel_event: Set to abort the running conversion
+        """
         if not job.source.exists():
             return ConversionResult(
                 success=False,
@@ -46,6 +123,8 @@ class FileConverter:
             )
 
         if job.tool == "ffmpeg":
+            if on_progress is not None or cancel_event is not None:
+                return self._convert_ffmpeg_streaming(job, progress, on_progress, cancel_event)
             return self._convert_ffmpeg(job, progress)
         elif job.tool == "imagemagick":
             return self._convert_imagemagick(job, progress)
@@ -126,6 +205,91 @@ class FileConverter:
                 message=f"Fehler: {exc}",
             )
 
+    def _convert_ffmpeg_streaming(
+        self,
+        job: ConversionJob,
+        progress: Optional[Callable[[str], None]],
+        on_progress: Optional[Callable[[ConversionProgress], None]],
+        cancel_event: Optional[threading.Event],
+    ) -> ConversionResult:
+        """Convert with ffmpeg while streaming ``-progress`` updates."""
+        job.target.parent.mkdir(parents=True, exist_ok=True)
+        command = str(job.command_path) if job.command_path else "ffmpeg"
+        cmd = [
+            command, "-hide_banner", "-nostdin", "-nostats",
+            "-progress", "pipe:1",
+            "-i", str(job.source),
+            "-y", str(job.target),
+        ]
+        if progress:
+            progress(f"Starte ffmpeg: {job.source.name} → {job.target.name}")
+
+        def _failed(message: str) -> ConversionResult:
+            return ConversionResult(success=False, source=job.source, target=job.target, message=message)
+
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                errors="replace",
+                bufsize=1,
+            )
+        except OSError as exc:
+            return _failed(f"Fehler: {exc}")
+
+        parser = FfmpegProgressParser()
+        stderr_tail: Deque[str] = deque(maxlen=20)
+
+        def _read_stderr() -> None:
+            # Drained on its own thread so ffmpeg never blocks on a full pipe;
+            # the banner carries the input duration needed for percentages
+            assert process.stderr is not None
+            for line in process.stderr:
+                if parser.duration is None:
+                    parser.duration = parse_duration(line)
+                stderr_tail.append(line.rstrip())
+
+        helpers = [threading.Thread(target=_read_stderr, name="ffmpeg-stderr", daemon=True)]
+        if cancel_event is not None:
+            # Terminate promptly even while ffmpeg is silent (e.g. probing)
+            def _watch() -> None:
+                while process.poll() is None:
+                    if cancel_event.wait(0.2):
+                        process.terminate()
+                        return
+
+            helpers.append(threading.Thread(target=_watch, name="ffmpeg-cancel", daemon=True))
+        for helper in helpers:
+            helper.start()
+
+        assert process.stdout is not None
+        for line in process.stdout:
+            update = parser.feed(line)
+            if update is not None and on_progress:
+                on_progress(update)
+        returncode = process.wait()
+        for helper in helpers:
+            helper.join(timeout=1.0)
+
+        # A job ffmpeg finished just before "Abbrechen" was pressed is kept
+        if returncode != 0 and cancel_event is not None and cancel_event.is_set():
+            job.target.unlink(missing_ok=True)
+            return _failed("Abgebrochen")
+        if returncode != 0:
+            return _failed(f"ffmpeg-Fehler: {' '.join(stderr_tail)[-200:]}")
+        if not job.target.exists():
+            return _failed("Ausgabedatei wurde nicht erstellt")
+        return ConversionResult(
+            success=True,
+            source=job.source,
+            target=job.target,
+            message="Konvertierung erfolgreich",
+            output_size=int(job.target.stat().st_size),
+        )
+
     def _convert_imagemagick(
         self,
         job: ConversionJob,
@@ -0,0 +1,432 @@
+"""Cached S.M.A.R.T. polling through ``smartctl --json``.
+
+One :class:`DiskHealthService` per process keeps the last snapshot of every
+disk for a configurable TTL. A refresh runs ``smartctl --scan-open`` once
+and then a single ``smartctl -i -H -A`` per device, all devices in
+parallel, so a refresh costs about one smartctl round regardless of the
+number of disks. Raw attribute values go into :class:`SmartHistory`, a
+change-only time series used to detect growing error counters. Listeners
+are notified whenever a refresh changes anything.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import json
+import logging
+import shutil
+import sqlite3
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Counters that should never grow on a healthy disk
+# (reallocated, reported uncorrectable, pending, offline uncorrectable)
+ERROR_COUNTER_IDS = (5, 187, 197, 198)
+
+# Window used for trend detection
+TREND_WINDOW_SECONDS = 30 * 24 * 3600
+
+
+@dataclass
+class SmartSnapshot:
+    """Parsed ``smartctl --json`` output of one device."""
+
+    device: str
+    device_type: str
+    info: "DiskInfo"
+    attributes: List["SmartAttribute"] = field(default_factory=list)
+    temperature: Optional[int] = None
+    passed: Optional[bool] = None
+    timestamp: float = 0.0
+
+    @property
+    def key(self) -> str:
+        """Stable identity for the history (serial, else device path)."""
+        serial = self.info.serial
+        return serial if serial and serial != "N/A" else self.device
+
+    def fingerprint(self) -> Tuple[Any, ...]:
+        return (
+            self.device,
+            self.passed,
+            self.temperature,
+            tuple((attr.id, attr.current, attr.raw_value, attr.status) for attr in self.attributes),
+        )
+
+
+def _raw_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_smart_json(device: str, device_type: str, data: Dict[str, Any], index: int) -> Optional[SmartSnapshot]:
+    """Build a :class:`SmartSnapshot` from ``smartctl -i -H -A --json``.
+
+    Returns:
+        None if smartctl could not identify the device (e.g. no permission)
+    """
+    from .disk_monitor import DiskInfo, SmartAttribute
+
+    model = data.get("model_name") or data.get("model_family") or data.get("scsi_model_name")
+    if not model:
+        return None
+    capacity = (data.get("user_capacity") or {}).get("bytes") or data.get("nvme_total_capacity") or 0
+    smart_status = data.get("smart_status") or {}
+    passed = smart_status.get("passed") if isinstance(smart_status.get("passed"), bool) else None
+    protocol = (data.get("device") or {}).get("protocol") or device_type
+
+    attributes: List[SmartAttribute] = []
+    for row in (data.get("ata_smart_attributes") or {}).get("table", []):
+        try:
+            current = int(row.get("value", 0))
+            threshold = int(row.get("thresh", 0))
+            raw = row.get("raw") or {}
+            status = "CRITICAL" if current < threshold or row.get("when_failed") else "OK"
+            attributes.append(SmartAttribute(
+                id=int(row["id"]),
+                name=str(row.get("name", "")),
+                current=current,
+                worst=int(row.get("worst", current)),
+                threshold=threshold,
+                raw_value=str(raw.get("string", raw.get("value", ""))).strip(),
+                status=status,
+            ))
+        except (KeyError, TypeError, ValueError):
+            continue
+
+    nvme_log = data.get("nvme_smart_health_information_log") or {}
+    for position, (name, value) in enumerate(nvme_log.items(), start=1):
+        number = _raw_int(value)
+        if number is None:
+            continue
+        status = "OK"
+        if name == "critical_warning" and number:
+            status = "CRITICAL"
+        elif name == "media_errors" and number:
+            status = "WARNING"
+        # NVMe has no attribute ids; numbers above 255 keep them apart from ATA ids
+        attributes.append(SmartAttribute(
+            id=1000 + position, name=name, current=number, worst=number, threshold=0,
+            raw_value=str(number), status=status,
+        ))
+
+    temperature = _raw_int((data.get("temperature") or {}).get("current"))
+    info = DiskInfo(
+        index=index,
+        model=str(model),
+        serial=str(data.get("serial_number") or "N/A"),
+        size_gb=round(int(capacity) / 1e9, 1),
+        interface=device,
+        status="PASSED" if passed else ("FAILED" if passed is False else "Unknown"),
+    )
+    return SmartSnapshot(
+        device=device,
+        device_type=str(protocol),
+        info=info,
+        attributes=attributes,
+        temperature=temperature,
+        passed=passed,
+        timestamp=time.time(),
+    )
+
+
+class SmartHistory:
+    """Change-only time series of raw S.M.A.R.T. values.
+
+    A value is stored only when it differs from the previous one for the same
+    disk and attribute, so years of polling stay a few rows per attribute.
+
+    Args:
+        db_path: SQLite file; None keeps the history in memory
+    """
+
+    def __init__(self, db_path: Optional[Path] = None) -> None:
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path) if db_path else ":memory:", check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS smart_history ("
+            " disk TEXT NOT NULL, attr_id INTEGER NOT NULL, ts REAL NOT NULL, raw INTEGER NOT NULL,"
+            " PRIMARY KEY (disk, attr_id, ts)) WITHOUT ROWID"
+        )
+        self._conn.commit()
+        self._last: Dict[Tuple[str, int], int] = {}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def record(self, snapshot: SmartSnapshot) -> int:
+        """Store changed raw values of ``snapshot``; returns the rows written."""
+        rows = []
+        with self._lock:
+            for attr in snapshot.attributes:
+                raw = _raw_int(attr.raw_value.split()[0]) if attr.raw_value else None
+                if raw is None:
+                    continue
+                key = (snapshot.key, attr.id)
+                last = self._last.get(key)
+                if last is None:
+                    found = self._conn.execute(
+                        "SELECT raw FROM smart_history WHERE disk = ? AND attr_id = ? ORDER BY ts DESC LIMIT 1",
+                        key,
+                    ).fetchone()
+                    last = found[0] if found else None
+                if last != raw:
+                    rows.append((snapshot.key, attr.id, snapshot.timestamp, raw))
+                self._last[key] = raw
+            if rows:
+                self._conn.executemany("INSERT OR REPLACE INTO smart_history VALUES (?, ?, ?, ?)", rows)
+                self._conn.commit()
+        return len(rows)
+
+    def series(self, disk: str, attr_id: int) -> List[Tuple[float, int]]:
+        with self._lock:
+            return [
+                (ts, raw)
+                for ts, raw in self._conn.execute(
+                    "SELECT ts, raw FROM smart_history WHERE disk = ? AND attr_id = ? ORDER BY ts", (disk, attr_id)
+                )
+            ]
+
+    def increase(self, disk: str, attr_id: int, since: float) -> int:
+        """Growth of an attribute since ``since`` (0 when flat or unknown)."""
+        points = self.series(disk, attr_id)
+        if not points:
+            return 0
+        baseline = points[0][1]
+        for ts, raw in points:
+            if ts > since:
+                break
+            baseline = raw
+        return max(0, points[-1][1] - baseline)
+
+
+Listener = Callable[[List[SmartSnapshot]], None]
+
+
+class DiskHealthService:
+    """Persistent, cached S.M.A.R.T. state of all disks.
+
+    Args:
+        smartctl: smartctl executable
+        ttl_seconds: Age after which :meth:`refresh` queries the disks again
+        max_workers: Devices queried concurrently
+    """
+
+    def __init__(
+        self,
+        smartctl: str = "smartctl",
+        *,
+        ttl_seconds: float = 900.0,
+        max_workers: int = 8,
+        history: Optional[SmartHistory] = None,
+        timeout: float = 30.0,
+    ) -> None:
+        self._smartctl = smartctl
+        self._ttl = ttl_seconds
+        self._max_workers = max(1, max_workers)
+        self._timeout = timeout
+        self._history = history or SmartHistory()
+        self._history_path: Optional[Path] = None
+        self._snapshots: List[SmartSnapshot] = []
+        self._refreshed_at = 0.0
+        self._available: Optional[bool] = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._async_running = False
+        self._listeners: List[Listener] = []
+
+    # -- state -----------------------------------------------------------
+    @property
+    def is_available(self) -> bool:
+        if self._available is None:
+            self._available = shutil.which(self._smartctl) is not None
+        return self._available
+
+    @property
+    def history(self) -> SmartHistory:
+        return self._history
+
+    def attach_history(self, db_path: Path) -> None:
+        """Persist the attribute history in ``db_path`` (keeps the in-memory one on error)."""
+        if self._history_path == db_path:
+            return
+        try:
+            history = SmartHistory(db_path)
+        except sqlite3.Error as exc:
+            logger.warning("SMART history %s unavailable: %s", db_path, exc)
+            return
+        with self._lock:
+            previous, self._history = self._history, history
+            self._history_path = db_path
+        previous.close()
+
+    def cached(self) -> List[SmartSnapshot]:
+        """Last known snapshots without querying any disk."""
+        with self._lock:
+            return list(self._snapshots)
+
+    @property
+    def is_stale(self) -> bool:
+        return not self._refreshed_at or time.monotonic() - self._refreshed_at > self._ttl
+
+    def add_listener(self, callback: Listener) -> None:
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Listener) -> None:
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    # -- polling ---------------------------------------------------------
+    def refresh(self, force: bool = False) -> List[SmartSnapshot]:
+        """Return fresh snapshots, querying the disks only when the cache expired.
+
+        Concurrent callers share one smartctl round.
+        """
+        if not self.is_available:
+            return []
+        with self._refresh_lock:
+            if not force and not self.is_stale:
+                return self.cached()
+            snapshots = self._poll()
+            with self._lock:
+                changed = [s.fingerprint() for s in snapshots] != [s.fingerprint() for s in self._snapshots]
+                self._snapshots = snapshots
+                self._refreshed_at = time.monotonic()
+                listeners = list(self._listeners)
+                history = self._history
+            for snapshot in snapshots:
+                history.record(snapshot)
+        if changed:
+            for callback in listeners:
+                try:
+                    callback(snapshots)
+                except Exception:  # pragma: no cover - listener errors must not stop polling
+                    logger.exception("Disk health listener failed")
+        return snapshots
+
+    def refresh_async(self, force: bool = False) -> None:
+        """Run :meth:`refresh` on a background thread; listeners get the result."""
+        with self._lock:
+            if self._async_running:
+                return
+            self._async_running = True
+
+        def _run() -> None:
+            try:
+                self.refresh(force)
+            except Exception:  # pragma: no cover - defensive
+                logger.exception("Disk health refresh failed")
+            finally:
+                with self._lock:
+                    self._async_running = False
+
+        threading.Thread(target=_run, name="disk-health", daemon=True).start()
+
+    def _poll(self) -> List[SmartSnapshot]:
+        scan = self._run_json(["--scan-open"])
+        devices: List[Tuple[str, str]] = []
+        for entry in (scan or {}).get("devices", []):
+            name = entry.get("name")
+            if name:
+                devices.append((str(name), str(entry.get("type") or "")))
+        if not devices:
+            return []
+
+        def _query(item: Tuple[int, Tuple[str, str]]) -> Optional[SmartSnapshot]:
+            index, (device, device_type) = item
+            args = ["-i", "-H", "-A"] + (["-d", device_type] if device_type else []) + [device]
+            data = self._run_json(args)
+            return parse_smart_json(device, device_type, data, index) if data else None
+
+        workers = min(self._max_workers, len(devices))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="smartctl") as pool:
+            results = list(pool.map(_query, enumerate(devices)))
+        snapshots = [snapshot for snapshot in results if snapshot is not None]
+        # Indices follow the scan order of the devices that answered
+        for position, snapshot in enumerate(snapshots):
+            snapshot.info.index = position
+        return snapshots
+
+    def _run_json(self, args: Sequence[str]) -> Optional[Dict[str, Any]]:
+        try:
+            completed = subprocess.run(
+                [self._smartctl, "--json"] + list(args), capture_output=True, text=True, timeout=self._timeout
+            )
+        except (OSError, subprocess.SubprocessError) as exc:
+            logger.debug("smartctl %s failed: %s", " ".join(args), exc)
+            return None
+        # smartctl's exit status is a bit mask; bits 0/1 mean the command
+        # itself failed, the others report disk conditions in valid JSON
+        if completed.returncode & 0b11:
+            logger.debug("smartctl %s exit status %d", " ".join(args), completed.returncode)
+            return None
+        try:
+            data = json.loads(completed.stdout)
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+
+    # -- evaluation ------------------------------------------------------
+    def summary(self, snapshot: SmartSnapshot, now: Optional[float] = None) -> Dict[str, Any]:
+        """Health summary in the format of ``DiskMonitorBase.get_health_summary``.
+
+        Error counters that grew within :data:`TREND_WINDOW_SECONDS` are
+        reported as warnings even while the drive still passes its
+        self-assessment.
+        """
+        warnings: List[str] = []
+        critical: List[str] = []
+        for attr in snapshot.attributes:
+            if attr.status == "CRITICAL":
+                critical.append(f"{attr.name}: {attr.raw_value}")
+            elif attr.status == "WARNING":
+                warnings.append(f"{attr.name}: {attr.raw_value}")
+        since = (now or time.time()) - TREND_WINDOW_SECONDS
+        for attr in snapshot.attributes:
+            if attr.id in ERROR_COUNTER_IDS:
+                growth = self._history.increase(snapshot.key, attr.id, since)
+                if growth:
+                    warnings.append(f"{attr.name}: +{growth} in 30 Tagen")
+        if snapshot.passed is False:
+            critical.append("SMART-Selbsttest: FAILED")
+        status = "CRITICAL" if critical else ("WARNING" if warnings else "HEALTHY")
+        return {
+            "status": status,
+            "warnings": warnings,
+            "critical": critical,
+            "temperature": snapshot.temperature,
+            "attributes_count": len(snapshot.attributes),
+        }
+
+
+_shared_service: Optional[DiskHealthService] = None
+_shared_lock = threading.Lock()
+
+
+def shared_disk_health_service(history_path: Optional[Path] = None) -> DiskHealthService:
+    """Process-wide service shared by the disk monitor, the plugin and Explorer.
+
+    Args:
+        history_path: Optional SQLite file for the attribute history
+    """
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = DiskHealthService()
+    if history_path is not None:
+        _shared_service.attach_history(history_path)
+    return _shared_service
+
+
+def snapshots_by_index(snapshots: Iterable[SmartSnapshot]) -> Dict[int, SmartSnapshot]:
+    return {snapshot.info.index: snapshot for snapshot in snapshots}
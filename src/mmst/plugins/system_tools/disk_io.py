@@ -0,0 +1,388 @@
+"""Live disk I/O metrics from ``/proc/diskstats`` (Linux).
+
+:class:`DiskIOSampler` reads the kernel's cumulative block device counters
+at a configurable rate and turns the deltas between two reads into IOPS,
+throughput, utilisation, average queue depth and latency per device. The
+counters of all devices are read into one NumPy array, so a sample costs
+a single file read and a few vector operations. Results go into a
+fixed-size ring buffer that backs the sparklines of the disk monitor.
+
+Each sample is also attributed to the jobs that are running at that moment
+(backups, duplicate scans, ... as reported by the progress tracker), which
+shows whether a job is limited by the disk or by something else.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PROC_DISKSTATS = Path("/proc/diskstats")
+SYS_BLOCK = Path("/sys/block")
+
+# Metrics stored per sample and device, in ring buffer column order
+METRICS = ("iops", "read_bps", "write_bps", "utilization", "queue_depth", "latency_ms")
+
+# Virtual devices that only add noise to the display
+_IGNORED_PREFIXES = ("loop", "ram", "zram", "sr", "fd")
+
+# Columns of the first eleven counters (identical in /proc/diskstats and /sys/block/*/stat)
+_READS, _READ_SECTORS, _READ_MS = 0, 2, 3
+_WRITES, _WRITE_SECTORS, _WRITE_MS = 4, 6, 7
+_IO_MS, _WEIGHTED_MS = 9, 10
+_COUNTERS = 11
+_SECTOR_BYTES = 512
+
+# Mean utilisation of the busiest disk above which a job counts as disk-bound
+DISK_BOUND_UTILIZATION = 0.8
+
+Listener = Callable[[Dict[str, Dict[str, float]]], None]
+JobSource = Callable[[], Dict[str, str]]
+
+
+def read_diskstats(
+    proc_path: Path = PROC_DISKSTATS,
+    sys_block: Path = SYS_BLOCK,
+) -> Tuple[List[str], np.ndarray]:
+    """Read the cumulative I/O counters of all whole-disk devices.
+
+    Partitions are skipped when ``sys_block`` lists the disks; without it
+    every device in ``proc_path`` is returned. Falls back to the per-device
+    ``/sys/block/<dev>/stat`` files when ``proc_path`` is unreadable.
+
+    Returns:
+        Device names and a ``(devices, 11)`` float array of counters
+    """
+    disks: Optional[set] = None
+    try:
+        disks = {entry.name for entry in sys_block.iterdir()}
+    except OSError:
+        pass
+
+    names: List[str] = []
+    rows: List[List[float]] = []
+    try:
+        lines = proc_path.read_text().splitlines()
+    except OSError:
+        lines = []
+        for name in sorted(disks or ()):
+            try:
+                fields = (sys_block / name / "stat").read_text().split()
+            except OSError:
+                continue
+            lines.append(" ".join(["0", "0", name, *fields]))
+
+    for line in lines:
+        fields = line.split()
+        if len(fields) < 3 + _COUNTERS:
+            continue
+        name = fields[2]
+        if name.startswith(_IGNORED_PREFIXES) or (disks is not None and name not in disks):
+            continue
+        try:
+            rows.append([float(value) for value in fields[3:3 + _COUNTERS]])
+        except ValueError:
+            continue
+        names.append(name)
+    counters = np.array(rows, dtype=np.float64).reshape(len(rows), _COUNTERS)
+    return names, counters
+
+
+def compute_metrics(previous: np.ndarray, current: np.ndarray, elapsed: float) -> np.ndarray:
+    """Turn two counter reads ``elapsed`` seconds apart into :data:`METRICS` rows.
+
+    Counters that went backwards (wrap-around, device reset) count as zero.
+    """
+    delta = np.clip(current - previous, 0.0, None)
+    elapsed = max(elapsed, 1e-6)
+    ios = delta[:, _READS] + delta[:, _WRITES]
+    busy_ms = delta[:, _READ_MS] + delta[:, _WRITE_MS]
+    metrics = np.empty((current.shape[0], len(METRICS)), dtype=np.float64)
+    metrics[:, 0] = ios / elapsed
+    metrics[:, 1] = delta[:, _READ_SECTORS] * _SECTOR_BYTES / elapsed
+    metrics[:, 2] = delta[:, _WRITE_SECTORS] * _SECTOR_BYTES / elapsed
+    metrics[:, 3] = np.clip(delta[:, _IO_MS] / (elapsed * 1000.0), 0.0, 1.0)
+    metrics[:, 4] = delta[:, _WEIGHTED_MS] / (elapsed * 1000.0)
+    metrics[:, 5] = np.divide(busy_ms, ios, out=np.zeros_like(ios), where=ios > 0)
+    return metrics
+
+
+@dataclass
+class JobIOStats:
+    """Disk activity observed while one job was running."""
+
+    task_id: str
+    title: str
+    started: float
+    samples: int = 0
+    utilization_sum: float = 0.0
+    peak_utilization: float = 0.0
+    bytes_transferred: float = 0.0
+    seconds: float = 0.0
+    running: bool = True
+    devices: Counter = field(default_factory=Counter)
+
+    @property
+    def mean_utilization(self) -> float:
+        return self.utilization_sum / self.samples if self.samples else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Average bytes per second across all disks."""
+        return self.bytes_transferred / self.seconds if self.seconds else 0.0
+
+    @property
+    def busiest_device(self) -> Optional[str]:
+        return self.devices.most_common(1)[0][0] if self.devices else None
+
+    @property
+    def disk_bound(self) -> bool:
+        return self.samples > 0 and self.mean_utilization >= DISK_BOUND_UTILIZATION
+
+    def describe(self) -> str:
+        device = f" ({self.busiest_device})" if self.busiest_device else ""
+        verdict = "I/O-gebunden" if self.disk_bound else "nicht durch die Disk begrenzt"
+        return (
+            f"{self.title}: Ø {self.mean_utilization * 100:.0f} % Auslastung{device}, "
+            f"{format_rate(self.throughput)} – {verdict}"
+        )
+
+
+def format_rate(bytes_per_second: float) -> str:
+    value = float(bytes_per_second)
+    for unit in ("B/s", "KB/s", "MB/s"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B/s" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB/s"
+
+
+class DiskIOSampler:
+    """Samples block device counters into a fixed-size ring buffer.
+
+    Args:
+        interval: Seconds between samples of the background thread
+        capacity: Samples kept per device (the sparkline width)
+        job_source: Returns ``{task_id: title}`` of the jobs running right now
+        max_jobs: Finished jobs kept for :meth:`job_report`
+    """
+
+    def __init__(
+        self,
+        interval: float = 1.0,
+        capacity: int = 120,
+        *,
+        job_source: Optional[JobSource] = None,
+        max_jobs: int = 20,
+        proc_path: Path = PROC_DISKSTATS,
+        sys_block: Path = SYS_BLOCK,
+    ) -> None:
+        self._interval = max(0.05, float(interval))
+        self._capacity = max(2, int(capacity))
+        self._job_source = job_source
+        self._max_jobs = max(1, max_jobs)
+        self._proc_path = proc_path
+        self._sys_block = sys_block
+        self._lock = threading.Lock()
+        self._listeners: List[Listener] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._jobs: "OrderedDict[str, JobIOStats]" = OrderedDict()
+        self._reset([])
+
+    def _reset(self, devices: Sequence[str]) -> None:
+        self._devices = list(devices)
+        self._index = {name: i for i, name in enumerate(self._devices)}
+        self._values = np.zeros((self._capacity, len(self._devices), len(METRICS)), dtype=np.float64)
+        self._times = np.zeros(self._capacity, dtype=np.float64)
+        self._head = 0
+        self._count = 0
+        self._previous: Optional[np.ndarray] = None
+        self._previous_time = 0.0
+
+    # -- state -----------------------------------------------------------
+    @property
+    def is_available(self) -> bool:
+        return self._proc_path.exists() or self._sys_block.exists()
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    def set_interval(self, interval: float) -> None:
+        """Change the sampling rate; applies from the next sample on."""
+        self._interval = max(0.05, float(interval))
+
+    def set_job_source(self, job_source: Optional[JobSource]) -> None:
+        self._job_source = job_source
+
+    @property
+    def devices(self) -> List[str]:
+        with self._lock:
+            return list(self._devices)
+
+    def add_listener(self, callback: Listener) -> None:
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Listener) -> None:
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    # -- sampling --------------------------------------------------------
+    def sample(self, now: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """Read the counters once and store the rates since the previous read.
+
+        The first read (and the first read after the set of devices changed)
+        only primes the counters and returns an empty dict.
+        """
+        now = time.monotonic() if now is None else now
+        devices, counters = read_diskstats(self._proc_path, self._sys_block)
+        jobs = self._running_jobs()
+        with self._lock:
+            if devices != self._devices:
+                self._reset(devices)
+            previous, elapsed = self._previous, now - self._previous_time
+            self._previous, self._previous_time = counters, now
+            if previous is None or elapsed <= 0:
+                return {}
+            metrics = compute_metrics(previous, counters, elapsed)
+            self._values[self._head] = metrics
+            self._times[self._head] = now
+            self._head = (self._head + 1) % self._capacity
+            self._count = min(self._count + 1, self._capacity)
+            self._attribute(jobs, metrics, elapsed)
+            latest = self._as_dict(metrics)
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback(latest)
+            except Exception:  # pragma: no cover - listener errors must not stop sampling
+                logger.exception("Disk I/O listener failed")
+        return latest
+
+    def _running_jobs(self) -> Dict[str, str]:
+        if self._job_source is None:
+            return {}
+        try:
+            return dict(self._job_source())
+        except Exception:  # pragma: no cover - defensive
+            logger.exception("Job source failed")
+            return {}
+
+    def _attribute(self, jobs: Dict[str, str], metrics: np.ndarray, elapsed: float) -> None:
+        for task_id, stats in self._jobs.items():
+            if task_id not in jobs:
+                stats.running = False
+        if not jobs or not len(metrics):
+            return
+        busiest = int(np.argmax(metrics[:, 3]))
+        utilization = float(metrics[busiest, 3])
+        transferred = float(metrics[:, 1].sum() + metrics[:, 2].sum()) * elapsed
+        for task_id, title in jobs.items():
+            stats = self._jobs.get(task_id)
+            if stats is None:
+                stats = self._jobs[task_id] = JobIOStats(task_id, title, started=self._previous_time - elapsed)
+            stats.samples += 1
+            stats.utilization_sum += utilization
+            stats.peak_utilization = max(stats.peak_utilization, utilization)
+            stats.bytes_transferred += transferred
+            stats.seconds += elapsed
+            stats.devices[self._devices[busiest]] += 1
+        while len(self._jobs) > self._max_jobs:
+            oldest = next((key for key, value in self._jobs.items() if not value.running), None)
+            if oldest is None:
+                break
+            del self._jobs[oldest]
+
+    def _as_dict(self, metrics: np.ndarray) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {metric: float(metrics[row, column]) for column, metric in enumerate(METRICS)}
+            for name, row in self._index.items()
+        }
+
+    # -- queries ---------------------------------------------------------
+    def series(self, device: str, *metrics: str) -> np.ndarray:
+        """Stored values of ``metrics`` for ``device``, oldest first.
+
+        All columns are read under one lock, so they always have the same
+        length even while the sampler thread appends.
+
+        Returns:
+            A 1-D array for a single metric, otherwise one row per metric
+        """
+        columns = [METRICS.index(metric) for metric in metrics]
+        with self._lock:
+            row = self._index.get(device)
+            if row is None or not self._count:
+                values = np.zeros((len(columns), 0), dtype=np.float64)
+            else:
+                order = (self._head - self._count + np.arange(self._count)) % self._capacity
+                values = self._values[order[:, None], row, columns].T.copy()
+        return values[0] if len(columns) == 1 else values
+
+    def latest(self, device: str) -> Dict[str, float]:
+        """Most recent metrics of ``device`` (empty before the second read)."""
+        with self._lock:
+            row = self._index.get(device)
+            if row is None or not self._count:
+                return {}
+            return {
+                metric: float(self._values[(self._head - 1) % self._capacity, row, column])
+                for column, metric in enumerate(METRICS)
+            }
+
+    def job_report(self) -> List[JobIOStats]:
+        """Disk activity of the running and recently finished jobs, oldest first."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    # -- background sampling ---------------------------------------------
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Sample every :attr:`interval` seconds on a daemon thread."""
+        if self.running or not self.is_available:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="disk-io-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.sample()
+            except Exception:  # pragma: no cover - defensive
+                logger.exception("Disk I/O sample failed")
+            if self._stop.wait(self._interval):
+                return
+
+
+_shared_sampler: Optional[DiskIOSampler] = None
+_shared_lock = threading.Lock()
+
+
+def shared_disk_io_sampler() -> DiskIOSampler:
+    """Process-wide sampler shared by the plugin and the disk monitor widget."""
+    global _shared_sampler
+    with _shared_lock:
+        if _shared_sampler is None:
+            _shared_sampler = DiskIOSampler()
+        return _shared_sampler
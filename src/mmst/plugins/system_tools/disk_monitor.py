@@ -6,7 +6,9 @@ key metrics like temperature, reallocated sectors, power-on hours, etc.
 
 Note: WMIC is deprecated since Windows 10 version 21H1 and Windows Server 21H1, 
 and is being replaced by PowerShell for WMI. This module supports both methods
-with a preference for PowerShell when available.
+with a preference for PowerShell when available. On Linux the data comes
+from the cached ``smartctl --json`` service in :mod:`.disk_health`; live
+throughput and latency come from :mod:`.disk_io`.
 """
 from __future__ import annotations
 
@@ -21,11 +23,16 @@ from PySide6.QtWidgets import (
     QTableWidget, QTableWidgetItem, QGroupBox, QComboBox,
     QTextEdit, QHeaderView, QMessageBox
 )
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QColor
+from PySide6.QtCore import Qt, Signal, QPointF
+from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+
+import numpy as np
 
 import platform
 
+from .disk_health import DiskHealthService, SmartSnapshot, shared_disk_health_service, snapshots_by_index
+from .disk_io import DiskIOSampler, format_rate, shared_disk_io_sampler
+
 
 class DiskMonitorBase:
     """Base class for platform-specific disk monitoring."""
@@ -367,156 +374,44 @@ class DiskMonitorWindows(DiskMonitorBase):
     
 
 class DiskMonitorLinux(DiskMonitorBase):
-    """Backend for retrieving disk health information on Linux using smartctl."""
+    """Backend for retrieving disk health information on Linux using smartctl.
+
+    All queries are answered from the shared :class:`DiskHealthService`, so
+    instances are cheap and never poll the disks more often than its TTL.
+    """
     
-    def __init__(self):
-        self._available = self._check_availability()
+    def __init__(self, service: Optional[DiskHealthService] = None):
+        self._service = service or shared_disk_health_service()
         self._disks: List[DiskInfo] = []
-    
-    def _check_availability(self) -> bool:
-        """Check if smartctl is available."""
-        try:
-            result = subprocess.run(
-                ["smartctl", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
+
+    @property
+    def service(self) -> DiskHealthService:
+        return self._service
             
     @property
     def is_available(self) -> bool:
-        return self._available
+        return self._service.is_available
 
     def get_disks(self) -> List[DiskInfo]:
         if not self.is_available:
             return []
-        
-        if self._disks:
-            return self._disks
-
-        disks = []
-        try:
-            # First, scan for devices
-            scan_result = subprocess.run(
-                ["smartctl", "--scan-open"],
-                capture_output=True, text=True, timeout=10
-            )
-            if scan_result.returncode != 0:
-                return []
+        self._disks = [snapshot.info for snapshot in self._service.refresh()]
+        return self._disks
 
-            for i, line in enumerate(scan_result.stdout.strip().split('\n')):
-                if not line.strip() or line.startswith("#"):
-                    continue
-                
-                parts = line.split("#")
-                device_path = parts[0].strip().split(" ")[0] # Get the device path like /dev/sda
-
-                # Then, get detailed info for each device
-                info_result = subprocess.run(
-                    ["smartctl", "-i", device_path],
-                    capture_output=True, text=True, timeout=5
-                )
-                
-                if info_result.returncode != 0:
-                    continue
-
-                model = "Unknown Model"
-                serial = "N/A"
-                size_gb = 0.0
-                status = "Unknown"
-
-                for info_line in info_result.stdout.split('\n'):
-                    if "Device Model:" in info_line:
-                        model = info_line.split(":", 1)[1].strip()
-                    elif "Serial Number:" in info_line:
-                        serial = info_line.split(":", 1)[1].strip()
-                    elif "User Capacity:" in info_line:
-                        size_str = info_line.split("[", 1)[1].split("]")[0]
-                        if "GB" in size_str:
-                            size_gb = float(size_str.replace("GB", "").strip())
-                        elif "TB" in size_str:
-                            size_gb = float(size_str.replace("TB", "").strip()) * 1000
-                    elif "SMART overall-health self-assessment test result:" in info_line:
-                        status = info_line.split(":", 1)[1].strip()
-
-
-                disks.append(DiskInfo(
-                    index=i,
-                    model=model,
-                    serial=serial,
-                    size_gb=size_gb,
-                    interface=device_path,
-                    status=status
-                ))
-            
-            self._disks = disks
-        except Exception:
-            return []
-            
-        return disks
+    def _snapshot(self, disk_index: int) -> Optional[SmartSnapshot]:
+        return snapshots_by_index(self._service.cached()).get(disk_index)
 
     def get_smart_attributes(self, disk_index: int) -> List[SmartAttribute]:
-        if not self.is_available or not self._disks or disk_index >= len(self._disks):
-            return []
-
-        device_path = self._disks[disk_index].interface
-        attributes = []
-        try:
-            result = subprocess.run(
-                ["smartctl", "-A", device_path],
-                capture_output=True, text=True, timeout=10
-            )
-            if result.returncode != 0:
-                return []
-
-            lines = result.stdout.split('\n')
-            attr_section = False
-            for line in lines:
-                if line.startswith("ID#"):
-                    attr_section = True
-                    continue
-                if not attr_section or not line.strip():
-                    continue
-
-                parts = line.split()
-                if len(parts) < 10:
-                    continue
-                
-                try:
-                    attr_id = int(parts[0])
-                    attr_name = parts[1]
-                    current = int(parts[3])
-                    worst = int(parts[4])
-                    thresh = int(parts[5])
-                    raw_value = parts[9]
-                    
-                    # Simple status check
-                    status = "OK"
-                    if current < thresh:
-                        status = "CRITICAL"
-
-                    attributes.append(SmartAttribute(
-                        id=attr_id,
-                        name=attr_name,
-                        current=current,
-                        worst=worst,
-                        threshold=thresh,
-                        raw_value=raw_value,
-                        status=status
-                    ))
-                except (ValueError, IndexError):
-                    continue
-        except Exception:
-            return []
-        
-        return attributes
+        snapshot = self._snapshot(disk_index)
+        return list(snapshot.attributes) if snapshot else []
 
     def get_disk_temperature(self, disk_index: int) -> Optional[int]:
-        attributes = self.get_smart_attributes(disk_index)
-        for attr in attributes:
+        snapshot = self._snapshot(disk_index)
+        if snapshot is None:
+            return None
+        if snapshot.temperature is not None:
+            return snapshot.temperature
+        for attr in snapshot.attributes:
             if attr.id == 194 or "Temperature" in attr.name:
                 try:
                     # Raw value can be complex, e.g., "35 (Min/Max 20/50)"
@@ -526,6 +421,12 @@ class DiskMonitorLinux(DiskMonitorBase):
                     continue
         return None
 
+    def get_health_summary(self, disk_index: int) -> Dict[str, Any]:
+        snapshot = self._snapshot(disk_index)
+        if snapshot is None:
+            return super().get_health_summary(disk_index)
+        return self._service.summary(snapshot)
+
 
 def DiskMonitor() -> DiskMonitorBase:
     """Factory function to return the appropriate disk monitor for the platform."""
@@ -545,15 +446,51 @@ def DiskMonitor() -> DiskMonitorBase:
         return DiskMonitorUnsupported()
 
 
+class SparklineWidget(QWidget):
+    """Minimal line chart of the most recent values of one metric."""
+    
+    def __init__(self, color: str, ceiling: Optional[float] = None, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self._color = QColor(color)
+        self._ceiling = ceiling
+        self._values = np.zeros(0, dtype=np.float64)
+        self.setMinimumSize(160, 28)
+    
+    def set_values(self, values: np.ndarray) -> None:
+        self._values = values
+        self.update()
+    
+    def paintEvent(self, event):  # noqa: N802 - Qt override
+        if len(self._values) < 2:
+            return
+        top = self._ceiling or float(self._values.max()) or 1.0
+        width, height = self.width() - 1, self.height() - 1
+        xs = np.linspace(0, width, len(self._values))
+        ys = height - np.clip(self._values / top, 0.0, 1.0) * height
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(self._color, 1.5))
+        painter.drawPolyline(QPolygonF([QPointF(x, y) for x, y in zip(xs, ys)]))
+        painter.end()
+
+
 class DiskMonitorWidget(QWidget):
     """Widget for displaying disk health information."""
     
     refresh_requested = Signal()
+    # Emitted from the polling thread when the disk health service has news
+    health_updated = Signal()
+    # Emitted from the sampler thread after every disk I/O sample
+    io_sampled = Signal()
     
-    def __init__(self, parent: Optional[QWidget] = None):
+    def __init__(self, parent: Optional[QWidget] = None, sampler: Optional[DiskIOSampler] = None):
         super().__init__(parent)
         self._monitor = DiskMonitor()
         self._current_disk: Optional[DiskInfo] = None
+        self._service: Optional[DiskHealthService] = getattr(self._monitor, "service", None)
+        if sampler is None and platform.system() == "Linux":
+            sampler = shared_disk_io_sampler()
+        self._sampler: Optional[DiskIOSampler] = sampler
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(8, 8, 8, 8)
@@ -613,6 +550,9 @@ class DiskMonitorWidget(QWidget):
         
         layout.addWidget(summary_group)
         
+        if self._sampler is not None:
+            layout.addWidget(self._create_io_group())
+        
         # S.M.A.R.T. attributes table
         attributes_group = QGroupBox("S.M.A.R.T. Attribute")
         attributes_layout = QVBoxLayout(attributes_group)
@@ -647,24 +587,139 @@ class DiskMonitorWidget(QWidget):
         
         layout.addWidget(info_group)
         
-        # Initial refresh
-        self._refresh()
+        if self._service is not None:
+            service = self._service
+            listener = lambda _snapshots: self.health_updated.emit()  # noqa: E731
+            service.add_listener(listener)
+            self.destroyed.connect(lambda *_: service.remove_listener(listener))
+            self.health_updated.connect(self._populate)
+            # Show what is cached right away; smartctl runs in the background
+            self._populate()
+            if self._monitor.is_available:
+                service.refresh_async()
+        else:
+            # Initial refresh
+            self._refresh()
+        
+        if self._sampler is not None:
+            sampler = self._sampler
+            io_listener = lambda _metrics: self.io_sampled.emit()  # noqa: E731
+            sampler.add_listener(io_listener)
+            self.destroyed.connect(lambda *_: sampler.remove_listener(io_listener))
+            self.io_sampled.connect(self._update_io)
+            self._update_io()
+    
+    def _create_io_group(self) -> QGroupBox:
+        """Live I/O sparklines of one block device plus the job correlation."""
+        group = QGroupBox("Live-I/O")
+        io_layout = QVBoxLayout(group)
+        
+        device_layout = QHBoxLayout()
+        device_layout.addWidget(QLabel("Gerät:"))
+        self.io_device_combo = QComboBox()
+        self.io_device_combo.currentIndexChanged.connect(lambda _index: self._update_io())
+        device_layout.addWidget(self.io_device_combo, stretch=1)
+        io_layout.addLayout(device_layout)
+        
+        self._sparklines: Dict[str, SparklineWidget] = {}
+        self._io_labels: Dict[str, QLabel] = {}
+        for key, title, color, ceiling in (
+            ("iops", "IOPS", "#1f77b4", None),
+            ("throughput", "Durchsatz", "#2ca02c", None),
+            ("utilization", "Auslastung", "#d62728", 1.0),
+            ("queue_depth", "Queue-Tiefe", "#ff7f0e", None),
+        ):
+            row = QHBoxLayout()
+            name_label = QLabel(title)
+            name_label.setMinimumWidth(90)
+            row.addWidget(name_label)
+            self._sparklines[key] = SparklineWidget(color, ceiling)
+            row.addWidget(self._sparklines[key], stretch=1)
+            self._io_labels[key] = QLabel("--")
+            self._io_labels[key].setMinimumWidth(90)
+            row.addWidget(self._io_labels[key])
+            io_layout.addLayout(row)
+        
+        self.io_jobs_label = QLabel("Keine laufenden Jobs")
+        self.io_jobs_label.setWordWrap(True)
+        io_layout.addWidget(self.io_jobs_label)
+        return group
+    
+    def _update_io(self):
+        """Redraw the sparklines from the sampler's ring buffer."""
+        if self._sampler is None:
+            return
+        sampler = self._sampler
+        devices = sampler.devices
+        if devices != [self.io_device_combo.itemText(i) for i in range(self.io_device_combo.count())]:
+            selected = self.io_device_combo.currentText()
+            self.io_device_combo.blockSignals(True)
+            self.io_device_combo.clear()
+            self.io_device_combo.addItems(devices)
+            if selected in devices:
+                self.io_device_combo.setCurrentText(selected)
+            self.io_device_combo.blockSignals(False)
+        
+        device = self.io_device_combo.currentText()
+        if device:
+            # One call: the columns must come from the same samples
+            iops, read_bps, write_bps, utilization, queue_depth = sampler.series(
+                device, "iops", "read_bps", "write_bps", "utilization", "queue_depth"
+            )
+            self._sparklines["iops"].set_values(iops)
+            self._sparklines["throughput"].set_values(read_bps + write_bps)
+            self._sparklines["utilization"].set_values(utilization)
+            self._sparklines["queue_depth"].set_values(queue_depth)
+            latest = sampler.latest(device)
+            if latest:
+                self._io_labels["iops"].setText(f"{latest['iops']:.0f}")
+                self._io_labels["throughput"].setText(format_rate(latest["read_bps"] + latest["write_bps"]))
+                self._io_labels["utilization"].setText(f"{latest['utilization'] * 100:.0f} %")
+                self._io_labels["queue_depth"].setText(
+                    f"{latest['queue_depth']:.1f} ({latest['latency_ms']:.1f} ms)"
+                )
+        
+        jobs = sampler.job_report()
+        if jobs:
+            lines = [("⏳ " if job.running else "✔ ") + job.describe() for job in jobs[-5:]]
+            self.io_jobs_label.setText("\n".join(lines))
+        elif not sampler.running:
+            self.io_jobs_label.setText("Live-I/O pausiert")
+        else:
+            self.io_jobs_label.setText("Keine laufenden Jobs")
     
     def _refresh(self):
         """Refresh disk list and data."""
+        if self._service is not None:
+            if self._monitor.is_available:
+                self._service.refresh_async(force=True)
+            return
         self.disk_combo.clear()
         
         if not self._monitor.is_available:
             return
         
-        disks = self._monitor.get_disks()
-        
+        self._fill_disks(self._monitor.get_disks())
+
+    def _populate(self):
+        """Show the disk health service's cached snapshots, keeping the selection."""
+        if self._service is None:
+            return
+        self._fill_disks([snapshot.info for snapshot in self._service.cached()])
+
+    def _fill_disks(self, disks: List[DiskInfo]):
+        selected = self.disk_combo.currentIndex()
+        self.disk_combo.blockSignals(True)
+        self.disk_combo.clear()
         for disk in disks:
             display_text = f"Disk {disk.index}: {disk.model} ({disk.size_gb:.1f} GB)"
             self.disk_combo.addItem(display_text, disk)
+        self.disk_combo.blockSignals(False)
         
         if disks:
-            self._on_disk_changed(0)
+            index = selected if 0 <= selected < len(disks) else 0
+            self.disk_combo.setCurrentIndex(index)
+            self._on_disk_changed(index)
     
     def _on_disk_changed(self, index: int):
         """Handle disk selection change."""
@@ -0,0 +1,430 @@
+"""Batch image compression with ImageMagick.
+
+Images are compressed on a worker pool (one ImageMagick process per worker).
+Besides a fixed quality, each image can be compressed to a target: the
+largest quality that still fits ``max_bytes`` and/or the smallest quality
+whose SSIM against the original stays above ``min_ssim``. Both are found by
+bisecting the quality range, so an image needs only a handful of encoder
+runs. Results that would not be smaller than the original are skipped.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .tools import infer_format
+
+logger = logging.getLogger(__name__)
+
+# Status values of :class:`ImageCompressionResult`
+STATUS_COMPRESSED = "compressed"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+# Formats where ``-quality`` trades size for fidelity; for PNG it only picks
+# the zlib level, so a size/SSIM search makes no sense there
+LOSSY_FORMATS = {"jpg", "jpeg", "webp"}
+
+_FLOAT_PATTERN = re.compile(r"[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?")
+
+
+class _Cancelled(Exception):
+    """Raised inside a quality search when the batch was cancelled."""
+
+
+@dataclass
+class ImageCompressionSettings:
+    """What a batch should produce.
+
+    Attributes:
+        target_format: Output format (jpg, png, webp)
+        quality: Quality used when no target is given
+        max_bytes: Largest acceptable output size
+        min_ssim: Smallest acceptable SSIM against the original (0..1)
+        min_quality: Lower bound of the quality search
+        max_quality: Upper bound of the quality search
+        max_probes: Encoder runs allowed per search
+    """
+
+    target_format: str = "jpg"
+    quality: int = 85
+    max_bytes: Optional[int] = None
+    min_ssim: Optional[float] = None
+    min_quality: int = 30
+    max_quality: int = 95
+    max_probes: int = 7
+
+    @property
+    def searches(self) -> bool:
+        return self.target_format in LOSSY_FORMATS and (self.max_bytes is not None or self.min_ssim is not None)
+
+
+@dataclass
+class ImageCompressionResult:
+    source: Path
+    target: Optional[Path]
+    status: str
+    original_size: int = 0
+    compressed_size: int = 0
+    quality: Optional[int] = None
+    ssim: Optional[float] = None
+    encodes: int = 0
+    message: str = ""
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_size - self.compressed_size if self.status == STATUS_COMPRESSED else 0
+
+
+@dataclass
+class BatchCompressionSummary:
+    """Aggregate result of a batch; ``results`` are in input order."""
+
+    results: List[ImageCompressionResult] = field(default_factory=list)
+
+    def _count(self, status: str) -> int:
+        return sum(1 for result in self.results if result.status == status)
+
+    @property
+    def compressed(self) -> int:
+        return self._count(STATUS_COMPRESSED)
+
+    @property
+    def skipped(self) -> int:
+        return self._count(STATUS_SKIPPED)
+
+    @property
+    def failed(self) -> int:
+        return self._count(STATUS_FAILED)
+
+    @property
+    def cancelled(self) -> int:
+        return self._count(STATUS_CANCELLED)
+
+    @property
+    def bytes_before(self) -> int:
+        return sum(result.original_size for result in self.results if result.status == STATUS_COMPRESSED)
+
+    @property
+    def bytes_after(self) -> int:
+        return sum(result.compressed_size for result in self.results if result.status == STATUS_COMPRESSED)
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    @property
+    def saved_percent(self) -> float:
+        return 100.0 * self.saved_bytes / self.bytes_before if self.bytes_before else 0.0
+
+    def describe(self) -> str:
+        text = (
+            f"{self.compressed} komprimiert, {self.skipped} übersprungen, {self.failed} fehlgeschlagen – "
+            f"{self.saved_bytes / (1024 * 1024):.1f} MB gespart ({self.saved_percent:.1f}%)"
+        )
+        if self.cancelled:
+            text += f", {self.cancelled} abgebrochen"
+        return text
+
+
+def collect_images(paths: Iterable[Path]) -> List[Path]:
+    """Expand folders (recursively) into the image files they contain."""
+    images: List[Path] = []
+    seen = set()
+    for path in paths:
+        candidates = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+        for candidate in candidates:
+            if infer_format(candidate) == "image" and candidate not in seen:
+                seen.add(candidate)
+                images.append(candidate)
+    return images
+
+
+def parse_ssim(output: str) -> Optional[float]:
+    """Read the SSIM printed by ``compare -metric SSIM``.
+
+    Newer ImageMagick versions print ``absolute (normalized)``; the
+    normalized value is used then.
+    """
+    text = output.strip()
+    match = re.search(r"\(([^)]*)\)", text)
+    if match:
+        text = match.group(1)
+    number = _FLOAT_PATTERN.search(text)
+    return float(number.group(0)) if number else None
+
+
+def bisect_quality(
+    accept: Callable[[int], bool], low: int, high: int, max_probes: int, prefer_high: bool
+) -> Optional[int]:
+    """Find the boundary quality of a monotonic acceptance test.
+
+    Args:
+        accept: Test for one quality; must be monotonic over ``low..high``
+        prefer_high: Return the highest accepted quality (acceptance falls
+            with quality, e.g. a size limit) instead of the lowest (acceptance
+            rises with quality, e.g. an SSIM floor)
+
+    Returns:
+        The best accepted quality found within ``max_probes`` tests, or None
+    """
+    best: Optional[int] = None
+    probes = 0
+    while low <= high and probes < max_probes:
+        middle = (low + high + (1 if prefer_high else 0)) // 2
+        probes += 1
+        if accept(middle):
+            best = middle
+            if prefer_high:
+                low = middle + 1
+            else:
+                high = middle - 1
+        elif prefer_high:
+            high = middle - 1
+        else:
+            low = middle + 1
+    return best
+
+
+def same_format(path: Path, fmt: str) -> bool:
+    """Whether ``path`` already has the image format ``fmt`` (jpeg == jpg)."""
+    suffix = path.suffix.lower().lstrip(".")
+    aliases = {"jpeg": "jpg"}
+    return aliases.get(suffix, suffix) == aliases.get(fmt, fmt)
+
+
+class ImageBatchCompressor:
+    """Compress many images in parallel with one ImageMagick executable.
+
+    Args:
+        magick: Path of ``magick`` (ImageMagick 7) or ``convert`` (6)
+        settings: Format, quality and optional size/SSIM targets
+        max_workers: Concurrent ImageMagick processes (default: CPU count)
+        cancel_event: Set to stop; images not started yet are reported as
+            cancelled
+    """
+
+    def __init__(
+        self,
+        magick: str,
+        settings: ImageCompressionSettings,
+        *,
+        max_workers: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+        timeout: float = 120.0,
+    ) -> None:
+        self._magick = magick
+        self._settings = settings
+        self._max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self._cancel = cancel_event or threading.Event()
+        self._timeout = timeout
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def run(
+        self,
+        sources: Sequence[Path],
+        *,
+        output_dir: Optional[Path] = None,
+        base_dir: Optional[Path] = None,
+        on_result: Optional[Callable[[int, int, ImageCompressionResult], None]] = None,
+    ) -> BatchCompressionSummary:
+        """Compress ``sources`` and block until done.
+
+        Args:
+            output_dir: Folder for the results, mirroring the layout below
+                ``base_dir``; without it images are replaced in place (when
+                the format changes the result is written next to the
+                original, which is then deleted)
+            on_result: ``(done, total, result)`` after each image, called
+                from worker threads
+        """
+        total = len(sources)
+        results: List[Optional[ImageCompressionResult]] = [None] * total
+        done = [0]
+        done_lock = threading.Lock()
+
+        def _job(index: int, source: Path) -> None:
+            result = self.compress(
+                source, self._target_path(source, output_dir, base_dir), replace_source=output_dir is None
+            )
+            results[index] = result
+            with done_lock:
+                done[0] += 1
+                count = done[0]
+            if on_result is not None:
+                on_result(count, total, result)
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix="image-compress"
+        ) as pool:
+            futures = [pool.submit(_job, index, source) for index, source in enumerate(sources)]
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+
+        return BatchCompressionSummary(results=[result for result in results if result is not None])
+
+    def _target_path(self, source: Path, output_dir: Optional[Path], base_dir: Optional[Path]) -> Path:
+        fmt = self._settings.target_format
+        name = source.name if same_format(source, fmt) else f"{source.stem}.{fmt}"
+        if output_dir is None:
+            return source.with_name(name)
+        relative = Path()
+        if base_dir is not None:
+            try:
+                relative = source.parent.relative_to(base_dir)
+            except ValueError:
+                pass
+        return output_dir / relative / name
+
+    def compress(self, source: Path, target: Path, *, replace_source: bool = False) -> ImageCompressionResult:
+        """Compress one image into ``target``, unless that would not save space.
+
+        Args:
+            replace_source: Delete ``source`` once a different ``target`` was
+                written (in-place batches that change the format)
+        """
+        if self._cancel.is_set():
+            return ImageCompressionResult(source, None, STATUS_CANCELLED, message="Abgebrochen")
+        try:
+            original_size = source.stat().st_size
+        except OSError as exc:
+            return ImageCompressionResult(source, None, STATUS_FAILED, message=str(exc))
+        if target != source and target.exists():
+            return ImageCompressionResult(
+                source, target, STATUS_SKIPPED, original_size, message="Ziel existiert bereits"
+            )
+
+        with tempfile.TemporaryDirectory(prefix="mmst-compress-") as workdir:
+            candidates: Dict[int, Tuple[Path, int]] = {}
+            try:
+                quality, ssim = self._choose_quality(source, Path(workdir), candidates)
+            except _Cancelled:
+                return ImageCompressionResult(
+                    source, None, STATUS_CANCELLED, original_size, encodes=len(candidates), message="Abgebrochen"
+                )
+            except (OSError, subprocess.SubprocessError, RuntimeError) as exc:
+                return ImageCompressionResult(
+                    source, None, STATUS_FAILED, original_size, encodes=len(candidates), message=str(exc)
+                )
+            if self._cancel.is_set():
+                return ImageCompressionResult(source, None, STATUS_CANCELLED, original_size, message="Abgebrochen")
+            encoded, size = candidates[quality]
+            result = ImageCompressionResult(
+                source, target, STATUS_SKIPPED, original_size, size, quality, ssim, len(candidates)
+            )
+            if size >= original_size:
+                result.message = "Nicht kleiner als das Original"
+                return result
+            try:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.move(str(encoded), str(target))
+            except OSError as exc:
+                result.status = STATUS_FAILED
+                result.message = str(exc)
+                return result
+        result.status = STATUS_COMPRESSED
+        result.message = f"Qualität {quality}"
+        if replace_source and target != source:
+            try:
+                source.unlink()
+            except OSError as exc:
+                logger.warning("Original %s nicht gelöscht: %s", source, exc)
+                result.message += f", Original nicht gelöscht: {exc}"
+        return result
+
+    def _choose_quality(
+        self, source: Path, workdir: Path, candidates: Dict[int, Tuple[Path, int]]
+    ) -> Tuple[int, Optional[float]]:
+        settings = self._settings
+        ssim_values: Dict[int, Optional[float]] = {}
+
+        def encoded_size(quality: int) -> int:
+            if quality not in candidates:
+                if self._cancel.is_set():
+                    raise _Cancelled()
+                output = workdir / f"q{quality}.{settings.target_format}"
+                self._encode(source, output, quality)
+                candidates[quality] = (output, output.stat().st_size)
+            return candidates[quality][1]
+
+        def ssim_of(quality: int) -> Optional[float]:
+            encoded_size(quality)
+            if quality not in ssim_values:
+                ssim_values[quality] = self._ssim(source, candidates[quality][0])
+            return ssim_values[quality]
+
+        if not settings.searches:
+            encoded_size(settings.quality)
+            return settings.quality, None
+
+        low, high = settings.min_quality, settings.max_quality
+        quality = high
+        if settings.min_ssim is not None:
+            min_ssim = settings.min_ssim
+
+            def good_enough(q: int) -> bool:
+                value = ssim_of(q)
+                return value is not None and value >= min_ssim
+
+            found = bisect_quality(good_enough, low, high, settings.max_probes, prefer_high=False)
+            quality = found if found is not None else high
+        if settings.max_bytes is not None:
+            max_bytes = settings.max_bytes
+            # With an SSIM result only lower qualities can help; it is encoded already
+            if settings.min_ssim is None or encoded_size(quality) > max_bytes:
+                upper = high if settings.min_ssim is None else quality - 1
+                found = bisect_quality(
+                    lambda q: encoded_size(q) <= max_bytes, low, upper, settings.max_probes, prefer_high=True
+                )
+                quality = found if found is not None else low
+        encoded_size(quality)
+        return quality, ssim_values.get(quality)
+
+    def _encode(self, source: Path, target: Path, quality: int) -> None:
+        command = [self._magick, str(source), "-quality", str(quality)]
+        if self._settings.target_format in {"jpg", "jpeg"}:
+            command.extend(["-sampling-factor", "4:2:0"])
+        elif self._settings.target_format == "webp":
+            command.extend(["-define", "webp:method=6"])
+        command.append(str(target))
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=self._timeout)
+        if completed.returncode != 0 or not target.exists():
+            raise RuntimeError(completed.stderr.strip() or f"ImageMagick Fehlercode {completed.returncode}")
+
+    def _compare_command(self) -> Optional[List[str]]:
+        executable = Path(self._magick)
+        if executable.stem.lower() == "magick":
+            return [self._magick, "compare"]
+        sibling = executable.with_name("compare" + executable.suffix)
+        if sibling.exists():
+            return [str(sibling)]
+        found = shutil.which("compare")
+        return [found] if found else None
+
+    def _ssim(self, reference: Path, candidate: Path) -> Optional[float]:
+        command = self._compare_command()
+        if command is None:
+            return None
+        completed = subprocess.run(
+            command + ["-metric", "SSIM", str(reference), str(candidate), "null:"],
+            capture_output=True,
+            text=True,
+            timeout=self._timeout,
+        )
+        # compare exits with 1 when the images differ; 2 is an error
+        if completed.returncode > 1:
+            logger.debug("SSIM comparison failed for %s: %s", reference, completed.stderr.strip())
+            return None
+        return parse_ssim(completed.stderr or completed.stdout)
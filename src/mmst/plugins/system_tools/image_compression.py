@@ -19,6 +19,7 @@ from PySide6.QtGui import QPixmap, QDragEnterEvent, QDropEvent  # type: ignore[i
 from PySide6.QtWidgets import (  # type: ignore[import-not-found]
     QApplication,
     QComboBox,
+    QDoubleSpinBox,
     QFileDialog,
     QFormLayout,
     QGroupBox,
@@ -27,17 +28,32 @@ from PySide6.QtWidgets import (  # type: ignore[import-not-found]
     QListWidget,
     QListWidgetItem,
     QMessageBox,
+    QProgressBar,
     QPushButton,
     QScrollArea,
     QSlider,
+    QSpinBox,
     QSplitter,
     QVBoxLayout,
     QWidget,
 )
 
+from .image_batch import (
+    BatchCompressionSummary,
+    ImageCompressionResult,
+    ImageCompressionSettings,
+    collect_images,
+    same_format,
+)
+
 if TYPE_CHECKING:
     from .plugin import SystemToolsPlugin
 
+# Batch modes: fixed quality or a per-image quality search
+BATCH_MODE_QUALITY = "Feste Qualität"
+BATCH_MODE_SIZE = "Max. Dateigröße"
+BATCH_MODE_SSIM = "Min. SSIM"
+
 
 class ImagePreviewWidget(QWidget):
     """Widget to display image preview with label."""
@@ -128,6 +144,8 @@ class DataCompressionWidget(QWidget):
     compression_started = Signal()
     compression_progress = Signal(str)  # message
     compression_finished = Signal(bool, str)  # success, message
+    batch_progress = Signal(int, int)  # done, total
+    batch_finished = Signal(str)  # summary text
     
     def _detect_available_compression_tools(self) -> Dict[str, bool]:
         """Detect available compression tools and return a dictionary of tool names and availability."""
@@ -306,12 +324,161 @@ class DataCompressionWidget(QWidget):
         action_row.addStretch()
         layout.addLayout(action_row)
         
+        layout.addWidget(self._build_batch_group())
+
         # Hint label
         hint_label = QLabel("💡 Tipp: Sie können Bilder per Drag & Drop hinzufügen")
         hint_label.setStyleSheet("color: #666; font-style: italic; font-size: 11px;")
         hint_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(hint_label)
     
+    def _build_batch_group(self) -> QGroupBox:
+        """Controls for compressing whole folders on a worker pool."""
+        self._batch_source: Optional[Path] = None
+        self._batch_output: Optional[Path] = None
+
+        group = QGroupBox("Batch-Komprimierung (Bilder)")
+        form = QFormLayout(group)
+
+        source_row = QHBoxLayout()
+        self.batch_source_label = QLabel("Kein Ordner ausgewählt")
+        source_row.addWidget(self.batch_source_label, stretch=1)
+        source_button = QPushButton("📁 Ordner wählen")
+        source_button.clicked.connect(self._pick_batch_source)
+        source_row.addWidget(source_button)
+        form.addRow("Quellordner:", source_row)
+
+        output_row = QHBoxLayout()
+        self.batch_output_label = QLabel("Originale ersetzen")
+        output_row.addWidget(self.batch_output_label, stretch=1)
+        output_button = QPushButton("📂 Zielordner")
+        output_button.clicked.connect(self._pick_batch_output)
+        output_row.addWidget(output_button)
+        form.addRow("Ausgabe:", output_row)
+
+        mode_row = QHBoxLayout()
+        self.batch_mode_combo = QComboBox()
+        self.batch_mode_combo.addItems([BATCH_MODE_QUALITY, BATCH_MODE_SIZE, BATCH_MODE_SSIM])
+        self.batch_mode_combo.currentTextChanged.connect(self._on_batch_mode_changed)
+        mode_row.addWidget(self.batch_mode_combo)
+        self.batch_size_spin = QSpinBox()
+        self.batch_size_spin.setRange(10, 100_000)
+        self.batch_size_spin.setValue(500)
+        self.batch_size_spin.setSuffix(" KB")
+        mode_row.addWidget(self.batch_size_spin)
+        self.batch_ssim_spin = QDoubleSpinBox()
+        self.batch_ssim_spin.setRange(0.5, 0.999)
+        self.batch_ssim_spin.setDecimals(3)
+        self.batch_ssim_spin.setSingleStep(0.005)
+        self.batch_ssim_spin.setValue(0.95)
+        mode_row.addWidget(self.batch_ssim_spin)
+        form.addRow("Ziel:", mode_row)
+
+        action_row = QHBoxLayout()
+        self.batch_start_button = QPushButton("▶️ Batch starten")
+        self.batch_start_button.clicked.connect(self._start_batch)
+        self.batch_start_button.setEnabled(False)
+        action_row.addWidget(self.batch_start_button)
+        self.batch_cancel_button = QPushButton("⏹️ Abbrechen")
+        self.batch_cancel_button.clicked.connect(self._plugin.cancel_batch_image_compression)
+        self.batch_cancel_button.setEnabled(False)
+        action_row.addWidget(self.batch_cancel_button)
+        self.batch_progress_bar = QProgressBar()
+        action_row.addWidget(self.batch_progress_bar, stretch=1)
+        form.addRow(action_row)
+
+        self.batch_summary_label = QLabel("")
+        self.batch_summary_label.setWordWrap(True)
+        form.addRow(self.batch_summary_label)
+
+        self.batch_progress.connect(self._on_batch_progress)
+        self.batch_finished.connect(self._on_batch_finished)
+        self._on_batch_mode_changed(self.batch_mode_combo.currentText())
+        return group
+
+    def _on_batch_mode_changed(self, mode: str) -> None:
+        self.batch_size_spin.setVisible(mode == BATCH_MODE_SIZE)
+        self.batch_ssim_spin.setVisible(mode == BATCH_MODE_SSIM)
+
+    def _pick_batch_source(self) -> None:
+        folder = QFileDialog.getExistingDirectory(self, "Ordner mit Bildern wählen")
+        if folder:
+            self._batch_source = Path(folder)
+            self.batch_source_label.setText(folder)
+            self.batch_start_button.setEnabled(True)
+
+    def _pick_batch_output(self) -> None:
+        folder = QFileDialog.getExistingDirectory(self, "Zielordner wählen")
+        self._batch_output = Path(folder) if folder else None
+        self.batch_output_label.setText(folder or "Originale ersetzen")
+
+    def batch_settings(self) -> ImageCompressionSettings:
+        """Settings for a batch run from the current controls."""
+        mode = self.batch_mode_combo.currentText()
+        return ImageCompressionSettings(
+            target_format=self.format_combo.currentText(),
+            quality=self.quality_slider.value(),
+            max_bytes=self.batch_size_spin.value() * 1024 if mode == BATCH_MODE_SIZE else None,
+            min_ssim=self.batch_ssim_spin.value() if mode == BATCH_MODE_SSIM else None,
+        )
+
+    def _start_batch(self) -> None:
+        if self._batch_source is None:
+            return
+        sources = collect_images([self._batch_source])
+        if not sources:
+            QMessageBox.information(self, "Batch-Komprimierung", "Keine Bilder im gewählten Ordner gefunden.")
+            return
+        if self._batch_output is None:
+            answer = QMessageBox.question(
+                self, "Originale ersetzen", self.replace_confirmation(sources)
+            )
+            if answer != QMessageBox.StandardButton.Yes:
+                return
+
+        def on_result(done: int, total: int, _result: ImageCompressionResult) -> None:
+            self.batch_progress.emit(done, total)
+
+        def on_finished(summary: Optional[BatchCompressionSummary]) -> None:
+            self.batch_finished.emit(summary.describe() if summary else "Batch-Komprimierung fehlgeschlagen.")
+
+        started = self._plugin.run_batch_image_compression(
+            sources,
+            self.batch_settings(),
+            output_dir=self._batch_output,
+            base_dir=self._batch_source,
+            on_result=on_result,
+            on_finished=on_finished,
+        )
+        if not started:
+            QMessageBox.warning(
+                self, "Batch-Komprimierung", "Batch konnte nicht gestartet werden (ImageMagick fehlt oder läuft bereits)."
+            )
+            return
+        self.batch_progress_bar.setRange(0, len(sources))
+        self.batch_progress_bar.setValue(0)
+        self.batch_summary_label.setText(f"{len(sources)} Bilder werden komprimiert …")
+        self.batch_start_button.setEnabled(False)
+        self.batch_cancel_button.setEnabled(True)
+
+    def replace_confirmation(self, sources: List[Path]) -> str:
+        """Confirmation text for an in-place batch over ``sources``."""
+        fmt = self.format_combo.currentText()
+        converted = sum(1 for source in sources if not same_format(source, fmt))
+        text = f"{len(sources)} Bilder werden durch die komprimierten Versionen ersetzt."
+        if converted:
+            text += f" {converted} davon im Format .{fmt}, ihre Originale werden gelöscht."
+        return text + " Fortfahren?"
+
+    def _on_batch_progress(self, done: int, total: int) -> None:
+        self.batch_progress_bar.setRange(0, total)
+        self.batch_progress_bar.setValue(done)
+
+    def _on_batch_finished(self, text: str) -> None:
+        self.batch_summary_label.setText(text)
+        self.batch_start_button.setEnabled(self._batch_source is not None)
+        self.batch_cancel_button.setEnabled(False)
+
     def set_enabled(self, enabled: bool) -> None:
         """Enable or disable the widget."""
         self.setEnabled(enabled)
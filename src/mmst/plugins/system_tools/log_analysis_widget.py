@@ -13,7 +13,7 @@ from PySide6.QtWidgets import (  # type: ignore[import-not-found]
 )
 
 from mmst.core.console_logger import ConsoleLogger
-from mmst.core.log_analyzer import LogAnalyzer, LogEntry
+from mmst.core.log_analyzer import LogEntry, shared_log_analyzer
 from .console_widget import ConsoleWidget
 
 # Try to import visualization components
@@ -41,8 +41,8 @@ class LogVisualizationTab(QWidget):
         self._logger = ConsoleLogger.get_instance()
         self._app_logger = self._logger.get_logger("MMST.LogVisualization")
         
-        # Initialize log analyzer
-        self._analyzer = LogAnalyzer()
+        # Shared analyzer that tails the log files
+        self._analyzer = shared_log_analyzer()
         
         # Initialize charts
         self._timeline_chart = None
@@ -260,16 +260,11 @@ class LogVisualizationTab(QWidget):
         # Get time range
         start_time, end_time = self._get_time_range()
         
-        # Get logs and parse
-        logs = self._logger.get_buffer()
-        log_text = "\n".join(logs)
-        entries = self._analyzer.parse_logs(log_text)
+        # Parse only the lines appended to the log files since the last refresh
+        self._analyzer.refresh()
+        entry_count = sum(self._analyzer.store.level_counts(start_time, end_time).values())
         
-        # Filter entries by time range
-        entries = [entry for entry in entries 
-                  if start_time <= entry.timestamp <= end_time]
-        
-        if not entries:
+        if not entry_count:
             self._status_label.setText("No log entries in selected time range")
             
             # Update charts with empty data
@@ -286,12 +281,8 @@ class LogVisualizationTab(QWidget):
             
             return
         
-        # Prepare data for timeline chart
-        level_timestamps: Dict[str, List[datetime]] = {}
-        for entry in entries:
-            if entry.level not in level_timestamps:
-                level_timestamps[entry.level] = []
-            level_timestamps[entry.level].append(entry.timestamp)
+        # Prepare data for timeline chart (one marker per minute with activity)
+        level_timestamps = self._analyzer.get_level_timestamps(start_time, end_time)
         
         # Prepare data for level distribution chart
         level_counts = self._analyzer.count_by_level()
@@ -311,9 +302,6 @@ class LogVisualizationTab(QWidget):
             
         error_rates = self._analyzer.get_error_rate(interval_minutes)
         
-        # Prepare data for heatmap
-        all_timestamps = [entry.timestamp for entry in entries]
-        
         # Update charts
         if self._timeline_chart:
             self._timeline_chart.set_data(level_timestamps, (start_time, end_time))
@@ -324,11 +312,11 @@ class LogVisualizationTab(QWidget):
         if self._error_rate_chart:
             self._error_rate_chart.set_data(error_rates)
         if self._heatmap_chart:
-            self._heatmap_chart.set_data(all_timestamps)
+            self._heatmap_chart.set_counts(self._analyzer.get_heatmap(start=start_time, end=end_time))
         
         # Update status
         self._status_label.setText(
-            f"Showing {len(entries)} log entries from "
+            f"Showing {entry_count} log entries from "
             f"{start_time.strftime('%Y-%m-%d %H:%M')} to "
             f"{end_time.strftime('%Y-%m-%d %H:%M')}"
         )
@@ -359,8 +347,8 @@ class LogAnalysisWidget(QWidget):
         self._logger = ConsoleLogger.get_instance()
         self._app_logger = self._logger.get_logger("MMST.LogAnalysis")
         
-        # Initialize log analyzer
-        self._analyzer = LogAnalyzer()
+        # Shared analyzer that tails the log files
+        self._analyzer = shared_log_analyzer()
         
         # Set up UI
         self._setup_ui()
@@ -481,13 +469,9 @@ class LogAnalysisWidget(QWidget):
         """Refresh the log analysis."""
         self._status_label.setText("Analyzing logs...")
         
-        # Get all log entries
-        logs = self._logger.get_buffer()
-        log_text = "\n".join(logs)
-        
-        # Parse logs
-        entries = self._analyzer.parse_logs(log_text)
-        if not entries:
+        # Parse only the lines appended to the log files since the last refresh
+        self._analyzer.refresh()
+        if not self._analyzer.entry_count:
             self._status_label.setText("No log entries found")
             return
             
@@ -529,8 +513,8 @@ class LogAnalysisWidget(QWidget):
             self._patterns_table.setItem(i, 1, QTableWidgetItem(str(count)))
         
         # Update status
-        entry_count = len(entries)
-        error_count = len(error_entries)
+        entry_count = self._analyzer.entry_count
+        error_count = sum(count for level, count in level_counts.items() if level in ("ERROR", "CRITICAL"))
         self._status_label.setText(f"Analyzed {entry_count} log entries, found {error_count} errors/critical issues")
     
     def set_enabled(self, enabled: bool) -> None:
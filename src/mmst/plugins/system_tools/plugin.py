@@ -11,6 +11,7 @@ import shutil
 import glob
 import json
 import tempfile
+import threading
 import webbrowser
 from datetime import datetime
 
@@ -18,7 +19,7 @@ from mmst.core.console_logger import ConsoleLogger
 from .console_widget import ConsoleWidget
 from .log_analysis_widget import LogAnalysisWidget
 from .notification_center_widget import NotificationCenterWidget
-from PySide6.QtCore import Qt, Signal, QTimer
+from PySide6.QtCore import QObject, Qt, Signal, QTimer
 from PySide6.QtWidgets import (
     QComboBox,
     QFileDialog,
@@ -39,17 +40,23 @@ from PySide6.QtWidgets import (
 )
 
 from ...core.plugin_base import BasePlugin, PluginManifest
-from .converter import ConversionJob, ConversionResult, FileConverter
+from .converter import ConversionJob, ConversionProgress, ConversionResult, FileConverter
+from .image_batch import BatchCompressionSummary, ImageBatchCompressor, ImageCompressionResult, ImageCompressionSettings
 from .image_compression import DataCompressionWidget
-from .disk_monitor import DiskMonitorWidget, DiskMonitor
-from .temp_cleaner import TempCleaner, ScanResult
-from .tools import CONVERSION_FORMATS, Tool, ToolDetector, get_supported_formats, infer_format
+from .disk_health import shared_disk_health_service
+from .disk_io import shared_disk_io_sampler
+from .disk_monitor import DiskMonitorBase, DiskMonitorWidget, DiskMonitor
+from .scheduler import STATUS_DONE, STATUS_RUNNING, ConversionScheduler, summarize
+from .temp_cleaner import TempCategoryResult, TempCleaner, ScanResult
+from .tools import CONVERSION_FORMATS, Tool, get_supported_formats, infer_format, shared_tool_registry
 
 
 class ConverterWidget(QWidget):
     conversion_started = Signal()
     conversion_progress = Signal(str)
     conversion_finished = Signal(bool, str)
+    # Emitted from the tool probe thread; queued into the GUI thread
+    tools_detected = Signal()
 
     def __init__(self, plugin: "SystemToolsPlugin") -> None:
         super().__init__()
@@ -66,6 +73,10 @@ class ConverterWidget(QWidget):
             label = QLabel("Prüfe...")
             self.tool_labels[tool_name] = label
             status_layout.addRow(tool_name.capitalize(), label)
+        refresh_tools_button = QPushButton("🔄 Erneut prüfen")
+        refresh_tools_button.clicked.connect(self._plugin.refresh_tools)
+        status_layout.addRow("", refresh_tools_button)
+        self.tools_detected.connect(self.refresh_tools)
         layout.addWidget(status_group)
 
         # Conversion controls
@@ -292,11 +303,15 @@ class ConverterWidget(QWidget):
 
     def refresh_tools(self) -> None:
         tools = self._plugin.detect_tools()
+        probing = not self._plugin.tools_ready
         for name, tool in tools.items():
             label = self.tool_labels.get(name)
             if label:
                 if tool.available:
-                    version = tool.version if tool.version else "unbekannt"
+                    if tool.version:
+                        version = tool.version
+                    else:
+                        version = "Version wird geprüft..." if probing else "unbekannt"
                     label.setText(f"✓ Verfügbar ({version})")
                     label.setStyleSheet("color: green;")
                 else:
@@ -374,6 +389,7 @@ class BatchQueueWidget(QWidget):
     
     queue_started = Signal()
     queue_item_progress = Signal(int, str)  # index, message
+    queue_item_percent = Signal(int, float, str)  # index, percent, speed
     queue_finished = Signal(int, int)  # succeeded, failed
     
     def __init__(self, plugin: "SystemToolsPlugin") -> None:
@@ -381,6 +397,7 @@ class BatchQueueWidget(QWidget):
         self._plugin = plugin
         self._queue_jobs: List[ConversionJob] = []
         self._processing = False
+        self._completed = 0
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -435,6 +452,11 @@ class BatchQueueWidget(QWidget):
         self.process_button.clicked.connect(self._start_processing)
         self.process_button.setEnabled(False)
         process_layout.addWidget(self.process_button)
+
+        self.cancel_button = QPushButton("⏹️ Abbrechen")
+        self.cancel_button.clicked.connect(self._cancel_processing)
+        self.cancel_button.setVisible(False)
+        process_layout.addWidget(self.cancel_button)
         
         # Progress
         self.batch_progress = QProgressBar()
@@ -456,6 +478,7 @@ class BatchQueueWidget(QWidget):
         
         # Signals
         self.queue_item_progress.connect(self._on_item_progress)
+        self.queue_item_percent.connect(self._on_item_percent)
         self.queue_finished.connect(self._on_queue_finished)
         
         self._populate_formats()
@@ -565,6 +588,14 @@ class BatchQueueWidget(QWidget):
         self.batch_progress.setVisible(True)
         self.batch_progress.setRange(0, len(self._queue_jobs))
         self.batch_progress.setValue(0)
+        self._completed = 0
+        self.cancel_button.setVisible(True)
+        self.cancel_button.setEnabled(True)
+        for row in range(self.queue_list.count()):
+            item = self.queue_list.item(row)
+            if item and 0 <= row < len(self._queue_jobs):
+                job = self._queue_jobs[row]
+                item.setText(f"⏳ {job.source.name} → {job.target.name}")
         
         self.batch_log.clear()
         self.batch_log.appendPlainText(f"🚀 Starte Verarbeitung von {len(self._queue_jobs)} Datei(en)...\n")
@@ -572,25 +603,45 @@ class BatchQueueWidget(QWidget):
         # Start processing in plugin
         self._plugin.run_batch_queue(self._queue_jobs.copy())
     
+    def _cancel_processing(self) -> None:
+        self.cancel_button.setEnabled(False)
+        self.batch_status_label.setText("Breche ab …")
+        self._plugin.cancel_batch_queue()
+
+    def _item_label(self, index: int, icon: str, suffix: str = "") -> str:
+        job = self._queue_jobs[index]
+        return f"{icon} {job.source.name} → {job.target.name}{suffix}"
+
     def _on_item_progress(self, index: int, message: str) -> None:
         """Update progress for a specific queue item."""
         self.batch_log.appendPlainText(message)
-        self.batch_progress.setValue(index + 1)
-        self.batch_status_label.setText(f"Verarbeite {index + 1}/{len(self._queue_jobs)}...")
+        # Jobs finish out of order, so count completions instead of using the index
+        if message.startswith(("✅", "❌")):
+            self._completed += 1
+            self.batch_progress.setValue(self._completed)
+        self.batch_status_label.setText(f"Abgeschlossen {self._completed}/{len(self._queue_jobs)}")
         
         # Update list item icon
-        if index < self.queue_list.count():
+        if index < self.queue_list.count() and index < len(self._queue_jobs):
             item = self.queue_list.item(index)
             if item:
-                text = item.text()
-                if "✅" in message or "Erfolg" in message:
-                    item.setText(text.replace("⏳", "✅"))
-                elif "❌" in message or "Fehler" in message:
-                    item.setText(text.replace("⏳", "❌"))
+                if message.startswith("✅"):
+                    item.setText(self._item_label(index, "✅"))
+                elif message.startswith("❌"):
+                    item.setText(self._item_label(index, "❌"))
+
+    def _on_item_percent(self, index: int, percent: float, speed: str) -> None:
+        """Show ffmpeg progress of a running item in the queue list."""
+        if index < self.queue_list.count() and index < len(self._queue_jobs):
+            item = self.queue_list.item(index)
+            if item and not item.text().startswith(("✅", "❌")):
+                details = f"{percent:.0f} %" + (f", {speed}" if speed else "")
+                item.setText(self._item_label(index, "⏳", f" ({details})"))
     
     def _on_queue_finished(self, succeeded: int, failed: int) -> None:
         """Called when batch processing is complete."""
         self._processing = False
+        self.cancel_button.setVisible(False)
         self.process_button.setEnabled(True)
         self.add_files_button.setEnabled(True)
         self.clear_button.setEnabled(True)
@@ -614,6 +665,12 @@ class BatchQueueWidget(QWidget):
         self.setEnabled(enabled)
 
 
+class _TempScanRelay(QObject):
+    """Carries per-category scan results from the scan threads to the GUI."""
+
+    category_scanned = Signal(object)
+
+
 class SystemToolsPlugin(BasePlugin):
     IDENTIFIER = "mmst.system_tools"
 
@@ -643,9 +700,13 @@ class SystemToolsPlugin(BasePlugin):
 
         self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
         self._active = False
-        self._detector = ToolDetector()
+        self._tools = shared_tool_registry()
         self._converter = FileConverter()
+        self._batch_scheduler: Optional[ConversionScheduler] = None
+        self._image_batch: Optional[ImageBatchCompressor] = None
         self._disk_monitor_timer: Optional[QTimer] = None
+        self._disk_monitor: Optional[DiskMonitorBase] = None
+        self._io_sampler = shared_disk_io_sampler()
 
     @property
     def manifest(self) -> PluginManifest:
@@ -673,7 +734,7 @@ class SystemToolsPlugin(BasePlugin):
             self._widget.addTab(self._compression_widget, "� Daten-Komprimierung")
             
             # Create disk monitor tab
-            self._disk_monitor_widget = DiskMonitorWidget()
+            self._disk_monitor_widget = DiskMonitorWidget(sampler=self._io_sampler)
             self._disk_monitor_widget.set_enabled(self._active)
             self._widget.addTab(self._disk_monitor_widget, "💾 Disk Monitor")
 
@@ -701,8 +762,22 @@ class SystemToolsPlugin(BasePlugin):
         
         return self._widget
 
+    def initialize(self) -> None:
+        cache_dir = self.services.ensure_subdirectories("system_tools")[0]
+        self._tools = shared_tool_registry(cache_dir / "tools.json")
+        # Attribute history for SMART trend detection
+        shared_disk_health_service(cache_dir / "disk_health.db")
+        cfg = self.services.get_plugin_config(self.IDENTIFIER) or {}
+        self._io_sampler.set_interval(float(cfg.get("disk_io_interval", 1.0)))
+        # Attribute /proc/diskstats samples to running backups, scans, ...
+        self._io_sampler.set_job_source(self.services.progress.active_tasks)
+        self._tools.add_listener(self._on_tools_detected)
+        # Version probes (``ffmpeg -version`` etc.) run once in the background
+        self._tools.start()
+
     def start(self) -> None:
         self._active = True
+        self._tools.start()
         if self._converter_widget:
             self._converter_widget.set_enabled(True)
         if self._batch_widget:
@@ -719,6 +794,8 @@ class SystemToolsPlugin(BasePlugin):
             self._log_analysis_widget.setEnabled(True)
         
         self._start_monitoring()
+        if platform.system() == "Linux":
+            self._io_sampler.start()
 
     def stop(self) -> None:
         self._active = False
@@ -738,12 +815,15 @@ class SystemToolsPlugin(BasePlugin):
             self._log_analysis_widget.setEnabled(False)
             
         self._stop_monitoring()
+        self._io_sampler.stop()
         # Persist temp cleaner state
         self._persist_temp_cleaner_state()
 
     def shutdown(self) -> None:
+        self._tools.remove_listener(self._on_tools_detected)
         self._executor.shutdown(wait=False)
         self._stop_monitoring()
+        self._io_sampler.stop()
 
     def _start_monitoring(self):
         """Start the background disk monitoring timer."""
@@ -763,7 +843,10 @@ class SystemToolsPlugin(BasePlugin):
 
     def _check_disk_health(self):
         """Periodically check disk health and send notifications on issues."""
-        monitor = DiskMonitor()
+        # One monitor for the plugin's lifetime so its cache survives between checks
+        if self._disk_monitor is None:
+            self._disk_monitor = DiskMonitor()
+        monitor = self._disk_monitor
         if not monitor.is_available:
             return
 
@@ -792,7 +875,22 @@ class SystemToolsPlugin(BasePlugin):
 
     # Tool detection
     def detect_tools(self) -> Dict[str, Tool]:
-        return self._detector.detect_all()
+        """Return the known tools without waiting for version probes."""
+        return self._tools.tools()
+
+    @property
+    def tools_ready(self) -> bool:
+        return self._tools.ready
+
+    def refresh_tools(self) -> None:
+        """Drop cached tool results and probe again in the background."""
+        self._tools.refresh()
+        if self._converter_widget:
+            self._converter_widget.refresh_tools()
+
+    def _on_tools_detected(self, _tools: Dict[str, Tool]) -> None:
+        if self._converter_widget:
+            self._converter_widget.tools_detected.emit()
 
     # Conversion orchestration
     def run_conversion(self, source: Path, target: Path, target_format: str) -> None:
@@ -814,7 +912,7 @@ class SystemToolsPlugin(BasePlugin):
             return
 
         # Check tool availability
-        tool_info = self._detector.detect(tool)
+        tool_info = self._tools.get(tool)
         if not tool_info.available:
             if self._converter_widget:
                 msg = f"{tool.capitalize()} ist nicht installiert. Bitte installiere es zuerst."
@@ -892,6 +990,9 @@ class SystemToolsPlugin(BasePlugin):
         self._temp_log.setMaximumBlockCount(1000)
         layout.addWidget(self._temp_log, stretch=1)
 
+        self._temp_scan_relay = _TempScanRelay(widget)
+        self._temp_scan_relay.category_scanned.connect(self._on_temp_category_scanned)
+
         return widget
 
     def _selected_temp_categories(self) -> List[str]:
@@ -904,9 +1005,13 @@ class SystemToolsPlugin(BasePlugin):
         self._temp_log.appendPlainText(f"🔍 Starte Scan für {len(cats)} Kategorien...")
         self._temp_scan_button.setEnabled(False)
 
+        relay = self._temp_scan_relay
+
         def do_scan():
-            result = self._temp_cleaner_backend.scan(selected_categories=cats)
-            return result
+            # Categories are scanned concurrently and reported as they finish
+            return self._temp_cleaner_backend.scan(
+                selected_categories=cats, on_category=relay.category_scanned.emit
+            )
 
         future = self._executor.submit(do_scan)
 
@@ -921,10 +1026,6 @@ class SystemToolsPlugin(BasePlugin):
                     self._temp_summary_label.setText(
                         f"{sr.total_files} Dateien, Gesamtgröße: {self._format_size(sr.total_size)} in {len(sr.categories)} Kategorien (Dauer {sr.duration_seconds:.2f}s)"
                     )
-                    for key, cat in sr.categories.items():
-                        self._temp_log.appendPlainText(
-                            f"[{cat.display}] {len(cat.files)} Dateien, {self._format_size(cat.total_size)}"
-                        )
                     self._temp_delete_button.setEnabled(sr.total_files > 0)
                     self._temp_delete_real_button.setEnabled(sr.total_files > 0)
                     # Persist summary
@@ -934,6 +1035,13 @@ class SystemToolsPlugin(BasePlugin):
 
         future.add_done_callback(lambda f: done(f))
 
+    def _on_temp_category_scanned(self, cat: TempCategoryResult) -> None:
+        self._temp_log.appendPlainText(
+            f"[{cat.display}] {len(cat.files)} Dateien, {self._format_size(cat.total_size)}"
+        )
+        if cat.errors:
+            self._temp_log.appendPlainText(f"  ⚠️ {len(cat.errors)} Einträge nicht lesbar")
+
     def _run_temp_delete(self, dry_run: bool) -> None:
         if not self._active or not self._temp_cleaner_last_scan:
             return
@@ -945,7 +1053,7 @@ class SystemToolsPlugin(BasePlugin):
         cats = self._selected_temp_categories()
 
         def do_delete():
-            return self._temp_cleaner_backend.delete(scan, dry_run=dry_run, categories=cats)
+            return self._temp_cleaner_backend.delete(scan, dry_run=dry_run, categories=cats, sample_limit=8)
 
         future = self._executor.submit(do_delete)
 
@@ -974,29 +1082,33 @@ class SystemToolsPlugin(BasePlugin):
                     deleted_dirs = stats.get('deleted_dirs', [])
                     removed_dirs = stats.get('dirs', 0)
                     
-                    # Show files
+                    # Show files (the report only carries a sample; counters are complete)
                     if deleted_files and removed_files > 0:
                         self._temp_log.appendPlainText(f"  [Dateien:]")
                         max_files_to_show = 8  # Avoid UI clutter by limiting the number of files shown
-                        if len(deleted_files) <= max_files_to_show:
+                        if removed_files <= max_files_to_show:
                             for path in deleted_files:
                                 self._temp_log.appendPlainText(f"  → {path}")
                         else:
                             for path in deleted_files[:max_files_to_show-1]:
                                 self._temp_log.appendPlainText(f"  → {path}")
-                            self._temp_log.appendPlainText(f"  → ... und {len(deleted_files) - (max_files_to_show-1)} weitere Dateien")
+                            self._temp_log.appendPlainText(f"  → ... und {removed_files - (max_files_to_show-1)} weitere Dateien")
                     
                     # Show directories
                     if deleted_dirs and removed_dirs > 0:
                         self._temp_log.appendPlainText(f"  [Ordner:]")
                         max_dirs_to_show = 5  # Fewer directories to show
-                        if len(deleted_dirs) <= max_dirs_to_show:
+                        if removed_dirs <= max_dirs_to_show:
                             for path in deleted_dirs:
                                 self._temp_log.appendPlainText(f"  → {path}")
                         else:
                             for path in deleted_dirs[:max_dirs_to_show-1]:
                                 self._temp_log.appendPlainText(f"  → {path}")
-                            self._temp_log.appendPlainText(f"  → ... und {len(deleted_dirs) - (max_dirs_to_show-1)} weitere Ordner")
+                            self._temp_log.appendPlainText(f"  → ... und {removed_dirs - (max_dirs_to_show-1)} weitere Ordner")
+                    if stats.get('skipped'):
+                        self._temp_log.appendPlainText(f"  ℹ️ {stats['skipped']} Ordner behalten (enthalten noch Dateien)")
+                    if stats.get('errors'):
+                        self._temp_log.appendPlainText(f"  ⚠️ {stats['errors']} Einträge konnten nicht gelöscht werden")
                     
                 total_dirs = sum(stats.get('dirs', 0) for stats in report.values())
                 self._temp_log.appendPlainText(
@@ -1058,7 +1170,11 @@ class SystemToolsPlugin(BasePlugin):
             pass
     
     def run_batch_queue(self, jobs: List[ConversionJob]) -> None:
-        """Process a batch queue of conversion jobs sequentially."""
+        """Process a batch queue of conversion jobs in parallel.
+
+        Jobs run on a :class:`ConversionScheduler`; per-item status and ffmpeg
+        percentages are reported through the batch widget's signals.
+        """
         if not self._active:
             if self._batch_widget:
                 self._batch_widget.queue_finished.emit(0, len(jobs))
@@ -1070,67 +1186,46 @@ class SystemToolsPlugin(BasePlugin):
             total=len(jobs)
         )
         self.services.logger.info(f"🔄 Starting batch conversion: {len(jobs)} files")
-        
-        def process_queue() -> None:
-            succeeded = 0
-            failed = 0
-            successful_conversions = []
-            
-            for index, job in enumerate(jobs):
-                # Resolve command path
-                tool_info = self._detector.detect(job.tool)
-                if tool_info.available and tool_info.path:
-                    job.command_path = Path(tool_info.path)
+        scheduler = ConversionScheduler(self._converter, self._tools)
+        self._batch_scheduler = scheduler
+        finished_lock = threading.Lock()
+        finished = [0]
+
+        def on_status(index: int, status: str, message: str) -> None:
+            job = jobs[index]
+            if status == STATUS_RUNNING:
+                text = f"⏳ {message}"
+            else:
+                with finished_lock:
+                    finished[0] += 1
+                    done = finished[0]
+                self.services.progress.update(
+                    task_id, done, len(jobs), f"{job.source.name} → {job.target_format.upper()}"
+                )
+                if status == STATUS_DONE:
+                    text = f"✅ {job.source.name}: Erfolg"
                 else:
-                    # Tool not available
-                    if self._batch_widget:
-                        self._batch_widget.queue_item_progress.emit(
-                            index, f"❌ {job.source.name}: {job.tool} nicht gefunden"
-                        )
-                    failed += 1
-                    continue
-                
-                # Progress callback
-                def item_progress(message: str) -> None:
-                    if self._batch_widget:
-                        self._batch_widget.queue_item_progress.emit(index, f"  {message}")
-                
-                # Update global progress
-                status = f"{job.source.name} → {job.target_format.upper()}"
-                self.services.progress.update(task_id, index, len(jobs), status)
-                
-                try:
-                    # Start conversion message
-                    if self._batch_widget:
-                        self._batch_widget.queue_item_progress.emit(
-                            index, f"⏳ {job.source.name} → {job.target.name}"
-                        )
-                    
-                    result = self._converter.convert(job, item_progress)
-                    
-                    if result.success:
-                        succeeded += 1
-                        successful_conversions.append({
-                            'source': str(job.source),
-                            'target': str(job.target),
-                            'format': job.target_format
-                        })
-                        if self._batch_widget:
-                            self._batch_widget.queue_item_progress.emit(
-                                index, f"✅ {job.source.name}: Erfolg"
-                            )
-                    else:
-                        failed += 1
-                        if self._batch_widget:
-                            self._batch_widget.queue_item_progress.emit(
-                                index, f"❌ {job.source.name}: {result.message}"
-                            )
-                except Exception as exc:
-                    failed += 1
-                    if self._batch_widget:
-                        self._batch_widget.queue_item_progress.emit(
-                            index, f"❌ {job.source.name}: {exc}"
-                        )
+                    text = f"❌ {job.source.name}: {message}"
+            if self._batch_widget:
+                self._batch_widget.queue_item_progress.emit(index, text)
+
+        def on_progress(index: int, update: ConversionProgress) -> None:
+            if self._batch_widget and update.percent is not None:
+                speed = f"{update.speed:.1f}x" if update.speed else ""
+                self._batch_widget.queue_item_percent.emit(index, float(update.percent), speed)
+
+        def process_queue() -> None:
+            results = scheduler.run(jobs, on_status, on_progress)
+            succeeded, failed = summarize(results)
+            successful_conversions = [
+                {
+                    'source': str(job.source),
+                    'target': str(job.target),
+                    'format': job.target_format
+                }
+                for job, result in zip(jobs, results)
+                if result.success
+            ]
             
             # Emit event for successful conversions
             if successful_conversions:
@@ -1142,6 +1237,8 @@ class SystemToolsPlugin(BasePlugin):
             # Complete global progress
             self.services.progress.complete(task_id, success=(failed == 0))
             self.services.logger.info(f"✅ Batch conversion finished: {succeeded} succeeded, {failed} failed")
+            if self._batch_scheduler is scheduler:
+                self._batch_scheduler = None
             
             # Signal completion
             if self._batch_widget:
@@ -1149,6 +1246,12 @@ class SystemToolsPlugin(BasePlugin):
         
         # Run in executor
         self._executor.submit(process_queue)
+
+    def cancel_batch_queue(self) -> None:
+        """Abort the running batch queue (running ffmpeg jobs are terminated)."""
+        scheduler = self._batch_scheduler
+        if scheduler is not None:
+            scheduler.cancel()
     
     def run_image_compression(
         self,
@@ -1237,5 +1340,68 @@ class SystemToolsPlugin(BasePlugin):
         # Run in executor
         self._executor.submit(compress)
 
+    def run_batch_image_compression(
+        self,
+        sources: List[Path],
+        settings: ImageCompressionSettings,
+        *,
+        output_dir: Optional[Path] = None,
+        base_dir: Optional[Path] = None,
+        on_result: Optional[Callable[[int, int, ImageCompressionResult], None]] = None,
+        on_finished: Optional[Callable[[Optional[BatchCompressionSummary]], None]] = None,
+    ) -> bool:
+        """Compress many images in a background job.
+
+        Args:
+            sources: Image files (expand folders with ``collect_images`` first)
+            settings: Format, quality and optional size/SSIM targets
+            output_dir: Destination folder; None replaces images in place
+            base_dir: Common root whose layout is mirrored below ``output_dir``
+            on_result: ``(done, total, result)`` per image, from worker threads
+            on_finished: Called with the summary (None on error)
+
+        Returns:
+            False if nothing was started (inactive, no ImageMagick, no images,
+            or another image batch is running)
+        """
+        if not self._active or not sources or self._image_batch is not None:
+            return False
+        tool = self._tools.get("imagemagick")
+        if not tool.available:
+            return False
+
+        compressor = ImageBatchCompressor(tool.path or tool.command, settings)
+        self._image_batch = compressor
+        task_id = self.services.progress.start_task(
+            title=f"Bild-Komprimierung ({len(sources)} Dateien)", total=len(sources)
+        )
+        self.services.logger.info(f"🗜️ Starting image compression: {len(sources)} files")
+
+        def _progress(done: int, total: int, result: ImageCompressionResult) -> None:
+            self.services.progress.update(task_id, done, total, f"Komprimiere: {result.source.name}")
+            if on_result is not None:
+                on_result(done, total, result)
+
+        def process() -> None:
+            summary: Optional[BatchCompressionSummary] = None
+            try:
+                summary = compressor.run(sources, output_dir=output_dir, base_dir=base_dir, on_result=_progress)
+                self.services.logger.info(f"✅ Image compression finished: {summary.describe()}")
+            except Exception as exc:
+                self.services.logger.error(f"Image compression failed: {exc}")
+            finally:
+                self.services.progress.complete(task_id, success=summary is not None and summary.failed == 0)
+                self._image_batch = None
+                if on_finished is not None:
+                    on_finished(summary)
+
+        self._executor.submit(process)
+        return True
+
+    def cancel_batch_image_compression(self) -> None:
+        compressor = self._image_batch
+        if compressor is not None:
+            compressor.cancel()
+
 
 Plugin = SystemToolsPlugin
@@ -0,0 +1,157 @@
+"""Parallel scheduler for batch conversion queues.
+
+Tools are resolved once per batch, then every job runs on a worker pool of
+its tool: ImageMagick conversions are mostly single threaded and get one
+slot per core, ffmpeg is multithreaded itself and gets fewer slots so
+parallel encodes do not oversubscribe the machine.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .converter import ConversionJob, ConversionProgress, ConversionResult, FileConverter
+from .tools import Tool, ToolDetector, ToolRegistry
+
+logger = logging.getLogger(__name__)
+
+# Status values passed to ``on_status``
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+def default_limits(cpu_count: Optional[int] = None) -> Dict[str, int]:
+    """Concurrent jobs per tool for a machine with ``cpu_count`` cores."""
+    cores = max(1, cpu_count or os.cpu_count() or 1)
+    return {"ffmpeg": max(1, cores // 4), "imagemagick": cores}
+
+
+class ConversionScheduler:
+    """Run a batch of :class:`ConversionJob` objects in parallel.
+
+    Callbacks are invoked from worker threads:
+
+    * ``on_status(index, status, message)`` when a job starts or finishes
+    * ``on_progress(index, progress)`` for ffmpeg percentage/speed updates
+    """
+
+    def __init__(
+        self,
+        converter: FileConverter,
+        detector: Union[ToolDetector, ToolRegistry],
+        limits: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self._converter = converter
+        self._detector = detector
+        self._limits = dict(default_limits())
+        if limits:
+            self._limits.update({tool: max(1, int(count)) for tool, count in limits.items()})
+        self._cancel = threading.Event()
+
+    @property
+    def limits(self) -> Dict[str, int]:
+        return dict(self._limits)
+
+    def cancel(self) -> None:
+        """Stop running conversions and skip jobs that have not started."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def run(
+        self,
+        jobs: Sequence[ConversionJob],
+        on_status: Optional[Callable[[int, str, str], None]] = None,
+        on_progress: Optional[Callable[[int, ConversionProgress], None]] = None,
+    ) -> List[ConversionResult]:
+        """Convert ``jobs`` and block until all are finished or cancelled.
+
+        Returns:
+            One result per job, in job order
+        """
+        tools = self._resolve_tools(jobs)
+        results: List[Optional[ConversionResult]] = [None] * len(jobs)
+        pools: Dict[str, concurrent.futures.ThreadPoolExecutor] = {}
+        futures: Dict[concurrent.futures.Future, int] = {}
+
+        def _notify(index: int, status: str, message: str) -> None:
+            if on_status is not None:
+                on_status(index, status, message)
+
+        try:
+            for index, job in enumerate(jobs):
+                tool = tools.get(job.tool)
+                if tool is None or not tool.available:
+                    results[index] = ConversionResult(
+                        success=False, source=job.source, target=job.target,
+                        message=f"{job.tool} nicht gefunden",
+                    )
+                    _notify(index, STATUS_FAILED, results[index].message)
+                    continue
+                if tool.path:
+                    job.command_path = Path(tool.path)
+                pool = pools.get(job.tool)
+                if pool is None:
+                    pool = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=self._limits.get(job.tool, 1), thread_name_prefix=f"convert-{job.tool}"
+                    )
+                    pools[job.tool] = pool
+                futures[pool.submit(self._run_job, index, job, _notify, on_progress)] = index
+
+            for future in concurrent.futures.as_completed(futures):
+                results[futures[future]] = future.result()
+        finally:
+            for pool in pools.values():
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        return [
+            result if result is not None else ConversionResult(
+                success=False, source=job.source, target=job.target, message="Abgebrochen"
+            )
+            for job, result in zip(jobs, results)
+        ]
+
+    def _resolve_tools(self, jobs: Sequence[ConversionJob]) -> Dict[str, Tool]:
+        return {name: self._detector.detect(name) for name in {job.tool for job in jobs}}
+
+    def _run_job(
+        self,
+        index: int,
+        job: ConversionJob,
+        notify: Callable[[int, str, str], None],
+        on_progress: Optional[Callable[[int, ConversionProgress], None]],
+    ) -> ConversionResult:
+        if self._cancel.is_set():
+            result = ConversionResult(success=False, source=job.source, target=job.target, message="Abgebrochen")
+            notify(index, STATUS_FAILED, result.message)
+            return result
+        notify(index, STATUS_RUNNING, f"{job.source.name} → {job.target.name}")
+
+        def _progress(update: ConversionProgress) -> None:
+            if on_progress is not None:
+                on_progress(index, update)
+
+        try:
+            result = self._converter.convert(
+                job,
+                on_progress=_progress if job.tool == "ffmpeg" else None,
+                cancel_event=self._cancel,
+            )
+        except Exception as exc:  # pragma: no cover - converter reports errors itself
+            logger.exception("Conversion failed: %s", job.source)
+            result = ConversionResult(success=False, source=job.source, target=job.target, message=str(exc))
+        notify(index, STATUS_DONE if result.success else STATUS_FAILED, result.message)
+        return result
+
+
+def summarize(results: Sequence[ConversionResult]) -> Tuple[int, int]:
+    """Return (succeeded, failed) counts."""
+    succeeded = sum(1 for result in results if result.success)
+    return succeeded, len(results) - succeeded
@@ -17,13 +17,19 @@ Key goals:
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+import concurrent.futures
+import errno
 import os
 import stat
 import time
 import shutil
 
+# Directories nested deeper than this below a root are not scanned
+_MAX_DEPTH = 12
+
 __all__ = [
+    "DeletionStats",
     "TempFileEntry",
     "TempCategoryResult",
     "ScanResult",
@@ -52,6 +58,11 @@ class TempCategoryResult:
     total_size: int = 0
     files: List[TempFileEntry] = field(default_factory=list)
     errors: List[str] = field(default_factory=list)
+    # Set when the file cap cut the scan short
+    truncated: bool = False
+    # Directories whose contents were not fully scanned (too deep, unreadable,
+    # skipped symlinks); they are never removed as a whole subtree
+    partial_dirs: Set[str] = field(default_factory=set)
 
     def add(self, entry: TempFileEntry) -> None:
         self.files.append(entry)
@@ -73,6 +84,55 @@ class ScanResult:
         }
 
 
+@dataclass
+class DeletionStats:
+    """Counters of one category's deletion plus a capped sample of paths."""
+
+    sample_limit: int = 100
+    files: int = 0
+    dirs: int = 0
+    size: int = 0
+    subtrees: int = 0
+    # Directories left in place because they still hold kept entries
+    skipped: int = 0
+    errors: int = 0
+    file_sample: List[str] = field(default_factory=list)
+    dir_sample: List[str] = field(default_factory=list)
+
+    def add_file(self, entry: TempFileEntry) -> None:
+        self.files += 1
+        self.size += entry.size
+        if len(self.file_sample) < self.sample_limit:
+            self.file_sample.append(str(entry.path))
+
+    def add_dir(self, entry: TempFileEntry) -> None:
+        self.dirs += 1
+        if len(self.dir_sample) < self.sample_limit:
+            self.dir_sample.append(str(entry.path))
+
+    def merge(self, other: "DeletionStats") -> None:
+        self.files += other.files
+        self.dirs += other.dirs
+        self.size += other.size
+        self.skipped += other.skipped
+        self.errors += other.errors
+        room = self.sample_limit - len(self.file_sample)
+        self.file_sample.extend(other.file_sample[:max(0, room)])
+
+    def as_dict(self, dry_run: bool) -> Dict:
+        return {
+            "files": self.files,
+            "dirs": self.dirs,
+            "size": self.size,
+            "subtrees": self.subtrees,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "dry_run": 1 if dry_run else 0,
+            "deleted_files": self.file_sample,
+            "deleted_dirs": self.dir_sample,
+        }
+
+
 class TempCleaner:
     """Core scanner & deletion helper for temporary files.
 
@@ -121,57 +181,37 @@ class TempCleaner:
         selected_categories: Optional[Iterable[str]] = None,
         max_files_per_category: int = 25_000,
         follow_symlinks: bool = False,
+        on_category: Optional[Callable[[TempCategoryResult], None]] = None,
+        max_workers: Optional[int] = None,
     ) -> ScanResult:
+        """Scan the selected categories concurrently (one thread per category).
+
+        Args:
+            selected_categories: Category ids; defaults to all
+            max_files_per_category: Cap on entries (files first, then dirs)
+            follow_symlinks: Include symlinked files/dirs (never descended)
+            on_category: Called from the scanning thread as soon as a category
+                is finished, so results can be shown before the whole scan ends
+            max_workers: Concurrent category scans (default: one per category)
+        """
         start = time.time()
-        cats: Dict[str, TempCategoryResult] = {}
         selected = set(selected_categories) if selected_categories else set(self._categories.keys())
-
-        for key in selected:
-            meta = self._categories.get(key)
-            if not meta:
-                continue
-            display, roots = meta
-            cat_res = TempCategoryResult(name=key, display=display)
-            seen = 0
-            for root in roots:
-                if not root.exists():
-                    continue
-                try:
-                    # First add files
-                    for path in self._iter_files(root, follow_symlinks=follow_symlinks):
-                        try:
-                            st = path.stat()
-                        except (FileNotFoundError, PermissionError, OSError) as exc:
-                            cat_res.errors.append(f"{path}: {exc}")
-                            continue
-                        # Basic filters: skip dirs (iter_files yields only files), sockets, etc.
-                        size = st.st_size
-                        entry = TempFileEntry(path=path, size=size, mtime=st.st_mtime, category=key)
-                        cat_res.add(entry)
-                        seen += 1
-                        if seen >= max_files_per_category:
-                            break
-                    
-                    # Then add directories (if we haven't hit the limit)
-                    if seen < max_files_per_category:
-                        for path in self._iter_dirs(root, follow_symlinks=follow_symlinks):
-                            try:
-                                st = path.stat()
-                                # Directories typically report their own size, not contents
-                                # We'll use 0 to avoid double-counting space
-                                size = 0
-                                entry = TempFileEntry(path=path, size=size, mtime=st.st_mtime, 
-                                                   category=key, is_directory=True)
-                                cat_res.add(entry)
-                                seen += 1
-                                if seen >= max_files_per_category:
-                                    break
-                            except (FileNotFoundError, PermissionError, OSError) as exc:
-                                cat_res.errors.append(f"{path}: {exc}")
-                                continue
-                except Exception as exc:  # broad: protect scanning loop
-                    cat_res.errors.append(f"Root {root} scan error: {exc}")
-            cats[key] = cat_res
+        keys = [key for key in self._categories if key in selected]
+        cats: Dict[str, TempCategoryResult] = {}
+        if keys:
+            workers = max(1, min(max_workers or len(keys), len(keys)))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="temp-scan") as pool:
+                futures = {
+                    pool.submit(self._scan_category, key, max_files_per_category, follow_symlinks): key
+                    for key in keys
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    cat_res = future.result()
+                    cats[cat_res.name] = cat_res
+                    if on_category is not None:
+                        on_category(cat_res)
+            # Keep the category order stable regardless of completion order
+            cats = {key: cats[key] for key in keys if key in cats}
 
         total_size = sum(c.total_size for c in cats.values())
         total_files = sum(len(c.files) for c in cats.values())
@@ -185,123 +225,299 @@ class TempCleaner:
         dry_run: bool = True,
         min_age_seconds: int = 0,
         categories: Optional[Iterable[str]] = None,
+        sample_limit: int = 100,
+        max_workers: int = 4,
     ) -> Dict[str, Dict]:
         """Delete files matching criteria.
 
-        Returns per-category dict with counts, size removed, and lists of deleted files and directories.
+        Directories whose whole scanned subtree qualifies (and did not change
+        since the scan) are removed at once with ``shutil.rmtree``; remaining
+        files are unlinked on a small thread pool, then leftover directories
+        are removed deepest first.
+
+        Args:
+            sample_limit: Paths kept per category in ``deleted_files`` and
+                ``deleted_dirs``; counters always cover everything
+            max_workers: Threads used for unlinking single files
+
+        Returns:
+            Per-category dict with ``files``, ``dirs``, ``size``, ``subtrees``,
+            ``skipped`` (directories that still hold kept entries), ``errors``,
+            ``dry_run`` and the capped ``deleted_files`` / ``deleted_dirs``
+            samples.
         """
         selected = set(categories) if categories else set(scan.categories.keys())
         report: Dict[str, Dict] = {}
         now = time.time()
-        for key in selected:
-            cat = scan.categories.get(key)
-            if not cat:
+        for key in scan.categories:
+            cat = scan.categories[key]
+            if key not in selected:
                 continue
-            removed_files = 0
-            removed_dirs = 0
-            removed_size = 0
-            deleted_files = []  # Track which files were deleted
-            deleted_dirs = []   # Track which directories were deleted
-            
-            # First process all entries - we need to track both files and directories
-            for entry in cat.files:
-                if not entry.removable:
-                    continue
-                if min_age_seconds and (now - entry.mtime) < min_age_seconds:
-                    continue
-                    
-                try:
-                    if not dry_run:
-                        if entry.is_directory:
-                            # For directories, we'll just track them for now
-                            # Since directories are sorted in reverse depth order
-                            # we can safely remove them after processing all files
-                            if entry.path.is_dir() and not entry.path.is_symlink():
-                                removed_dirs += 1
-                                deleted_dirs.append(str(entry.path))
-                        else:
-                            # For files, remove immediately
-                            if entry.path.is_file():
-                                entry.path.unlink(missing_ok=True)  # type: ignore[arg-type]
-                                removed_files += 1
-                                removed_size += entry.size
-                                deleted_files.append(str(entry.path))
-                    else:
-                        # In dry run, just track everything
-                        if entry.is_directory:
-                            removed_dirs += 1
-                            deleted_dirs.append(str(entry.path))
-                        else:
-                            removed_files += 1
-                            removed_size += entry.size
-                            deleted_files.append(str(entry.path))
-                except Exception:
-                    # best-effort; ignore individual delete failures
-                    pass
-            
-            # Now remove the directories if not in dry run mode
-            # We do this after processing all files to ensure directories are empty
-            if not dry_run:
-                for dir_path in deleted_dirs:
-                    try:
-                        Path(dir_path).rmdir()
-                    except (OSError, PermissionError):
-                        # Directory might not be empty or might be locked
-                        # We'll keep it in the list anyway to show the attempt
-                        pass
-                        
-            report[key] = {
-                "files": removed_files,
-                "dirs": removed_dirs,
-                "size": removed_size,
-                "dry_run": 1 if dry_run else 0,
-                "deleted_files": deleted_files,  # Files
-                "deleted_dirs": deleted_dirs     # Directories
-            }
+            report[key] = self._delete_category(
+                cat, dry_run=dry_run, min_age_seconds=min_age_seconds, now=now,
+                sample_limit=sample_limit, max_workers=max_workers,
+            ).as_dict(dry_run)
         return report
 
     # Internal helpers ---------------------------------------------------
-    def _iter_files(self, root: Path, follow_symlinks: bool = False) -> Iterator[Path]:
-        try:
-            for dirpath, dirnames, filenames in os.walk(root):
-                # Prune extremely deep trees defensively
-                if dirpath.count(os.sep) - str(root).count(os.sep) > 12:
-                    del dirnames[:]
-                    continue
-                for name in filenames:
-                    p = Path(dirpath) / name
+    def _scan_category(self, key: str, max_files: int, follow_symlinks: bool) -> TempCategoryResult:
+        display, roots = self._categories[key]
+        cat_res = TempCategoryResult(name=key, display=display)
+        seen = 0
+        for root in roots:
+            if seen >= max_files:
+                break
+            if not root.exists():
+                continue
+            try:
+                files, dirs, complete = self._scan_root(root, key, follow_symlinks, max_files - seen, cat_res)
+            except Exception as exc:  # broad: protect scanning loop
+                cat_res.errors.append(f"Root {root} scan error: {exc}")
+                continue
+            # Files first, then directories deepest first (deletion order)
+            dirs.sort(key=lambda entry: -str(entry.path).count(os.sep))
+            entries = files + dirs
+            if not complete or len(entries) > max_files - seen:
+                cat_res.truncated = True
+            for entry in entries[:max_files - seen]:
+                cat_res.add(entry)
+            seen += min(len(entries), max_files - seen)
+        return cat_res
+
+    def _scan_root(
+        self,
+        root: Path,
+        category: str,
+        follow_symlinks: bool,
+        max_files: int,
+        cat_res: TempCategoryResult,
+    ) -> Tuple[List[TempFileEntry], List[TempFileEntry], bool]:
+        """Collect files and directories below ``root`` in one ``os.scandir`` pass.
+
+        Sizes and mtimes come from the directory entries (no extra ``stat``
+        on Windows). Directories report size 0 to avoid double counting.
+
+        Returns:
+            Files, directories, and whether the walk finished before the cap
+        """
+        errors = cat_res.errors
+        partial = cat_res.partial_dirs
+        files: List[TempFileEntry] = []
+        dirs: List[TempFileEntry] = []
+        stack: List[Tuple[str, int]] = [(str(root), 0)]
+        while stack and len(files) < max_files:
+            current, depth = stack.pop()
+            # Prune extremely deep trees defensively
+            if depth > _MAX_DEPTH:
+                partial.add(current)
+                continue
+            try:
+                iterator = os.scandir(current)
+            except OSError as exc:
+                if depth == 0:
+                    raise
+                errors.append(f"{current}: {exc}")
+                partial.add(current)
+                continue
+            with iterator:
+                for entry in iterator:
                     try:
-                        if not follow_symlinks and p.is_symlink():
+                        is_link = entry.is_symlink()
+                        if is_link and not follow_symlinks:
+                            partial.add(current)
                             continue
-                    except OSError:
-                        continue
-                    yield p
-        except Exception:
-            return
-            
-    def _iter_dirs(self, root: Path, follow_symlinks: bool = False) -> Iterator[Path]:
-        """Similar to _iter_files but yields directories in reverse depth order (deepest first).
-        This ensures proper directory deletion (must delete contents before parent).
+                        if entry.is_dir(follow_symlinks=False) or (is_link and entry.is_dir()):
+                            st = entry.stat()
+                            dirs.append(TempFileEntry(
+                                path=Path(entry.path), size=0, mtime=st.st_mtime,
+                                category=category, is_directory=True,
+                            ))
+                            if is_link:
+                                partial.add(entry.path)
+                            else:
+                                stack.append((entry.path, depth + 1))
+                        else:
+                            st = entry.stat()
+                            files.append(TempFileEntry(
+                                path=Path(entry.path), size=st.st_size, mtime=st.st_mtime, category=category,
+                            ))
+                    except OSError as exc:
+                        errors.append(f"{entry.path}: {exc}")
+                        partial.add(current)
+        return files, dirs, not stack
+
+    def _delete_category(
+        self,
+        cat: TempCategoryResult,
+        *,
+        dry_run: bool,
+        min_age_seconds: int,
+        now: float,
+        sample_limit: int,
+        max_workers: int,
+    ) -> DeletionStats:
+        stats = DeletionStats(sample_limit=sample_limit)
+
+        def eligible(entry: TempFileEntry) -> bool:
+            return entry.removable and not (min_age_seconds and (now - entry.mtime) < min_age_seconds)
+
+        files = [entry for entry in cat.files if not entry.is_directory]
+        dirs = [entry for entry in cat.files if entry.is_directory]
+        subtrees = self._removable_subtrees(cat, files, dirs, eligible, check_unchanged=not dry_run)
+
+        # Assign every entry either to the subtree that contains it or to the
+        # single-entry lists
+        members: Dict[str, List[TempFileEntry]] = {root: [] for root in subtrees}
+        loose_files: List[TempFileEntry] = []
+        loose_dirs: List[TempFileEntry] = []
+        for entry in files + dirs:
+            if not eligible(entry):
+                continue
+            root = self._covering_subtree(str(entry.path), subtrees)
+            if root is not None:
+                members[root].append(entry)
+            elif entry.is_directory:
+                loose_dirs.append(entry)
+            else:
+                loose_files.append(entry)
+
+        for root, entries in members.items():
+            removed = entries
+            if not dry_run:
+                failures: List[str] = []
+                shutil.rmtree(root, onerror=lambda _func, path, exc_info: failures.append(path))
+                if failures:
+                    # Only count what is really gone; a lexists check is cheap
+                    # compared to the deletion and only needed on errors
+                    stats.errors += len(failures)
+                    removed = [entry for entry in entries if not os.path.lexists(entry.path)]
+            stats.subtrees += 1
+            for entry in removed:
+                if entry.is_directory:
+                    stats.add_dir(entry)
+                else:
+                    stats.add_file(entry)
+
+        if dry_run:
+            for entry in loose_files:
+                stats.add_file(entry)
+        elif loose_files:
+            workers = max(1, min(max_workers, len(loose_files) // 256 + 1))
+            chunk = (len(loose_files) + workers - 1) // workers
+            chunks = [loose_files[i:i + chunk] for i in range(0, len(loose_files), chunk)]
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="temp-unlink") as pool:
+                for partial in pool.map(lambda batch: self._unlink_files(batch, sample_limit), chunks):
+                    stats.merge(partial)
+
+        if dry_run and loose_dirs:
+            # Scanned entries per directory that the deletion would leave behind
+            remaining: Dict[str, int] = {}
+            for entry in cat.files:
+                parent = os.path.dirname(entry.path)
+                remaining[parent] = remaining.get(parent, 0) + 1
+            for entry in loose_files:
+                parent = os.path.dirname(entry.path)
+                remaining[parent] -= 1
+            for root in subtrees:
+                parent = os.path.dirname(root)
+                remaining[parent] -= 1
+
+        # Directories are already sorted deepest first
+        for entry in loose_dirs:
+            path = str(entry.path)
+            if dry_run:
+                # Only count directories the real run would find empty
+                if cat.truncated or path in cat.partial_dirs or remaining.get(path, 0):
+                    stats.skipped += 1
+                    continue
+                remaining[os.path.dirname(path)] -= 1
+            else:
+                try:
+                    entry.path.rmdir()
+                except FileNotFoundError:
+                    continue
+                except OSError as exc:
+                    # Still holds kept files: leaving it is intended
+                    if exc.errno in (errno.ENOTEMPTY, errno.EEXIST):
+                        stats.skipped += 1
+                    else:
+                        stats.errors += 1
+                    continue
+            stats.add_dir(entry)
+        return stats
+
+    @staticmethod
+    def _unlink_files(entries: List[TempFileEntry], sample_limit: int) -> DeletionStats:
+        stats = DeletionStats(sample_limit=sample_limit)
+        for entry in entries:
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                continue
+            except OSError:
+                stats.errors += 1
+                continue
+            stats.add_file(entry)
+        return stats
+
+    @staticmethod
+    def _removable_subtrees(
+        cat: TempCategoryResult,
+        files: List[TempFileEntry],
+        dirs: List[TempFileEntry],
+        eligible: Callable[[TempFileEntry], bool],
+        check_unchanged: bool,
+    ) -> Set[str]:
+        """Return the topmost directories that can be removed as a whole.
+
+        A directory qualifies when it and every scanned entry below it are
+        eligible, its contents were scanned completely and (for real
+        deletions) its mtime still matches the scan, so nothing was added
+        to it afterwards.
         """
+        if cat.truncated:
+            return set()
+        children: Dict[str, int] = {}
+        removable_children: Dict[str, int] = {}
+        for entry in files:
+            parent = os.path.dirname(entry.path)
+            children[parent] = children.get(parent, 0) + 1
+            if eligible(entry):
+                removable_children[parent] = removable_children.get(parent, 0) + 1
+
+        removable: Set[str] = set()
+        # Deepest first: all children of a directory are decided before it
+        for entry in sorted(dirs, key=lambda e: -str(e.path).count(os.sep)):
+            path = str(entry.path)
+            parent = os.path.dirname(path)
+            children[parent] = children.get(parent, 0) + 1
+            if (
+                eligible(entry)
+                and path not in cat.partial_dirs
+                and children.get(path, 0) == removable_children.get(path, 0)
+                and (not check_unchanged or TempCleaner._unchanged(entry))
+            ):
+                removable.add(path)
+                removable_children[parent] = removable_children.get(parent, 0) + 1
+        return {path for path in removable if os.path.dirname(path) not in removable}
+
+    @staticmethod
+    def _unchanged(entry: TempFileEntry) -> bool:
         try:
-            # First collect all directories
-            all_dirs = []
-            for dirpath, dirnames, _ in os.walk(root):
-                # Prune extremely deep trees defensively
-                if dirpath.count(os.sep) - str(root).count(os.sep) > 12:
-                    del dirnames[:]
-                    continue
-                for name in dirnames:
-                    p = Path(dirpath) / name
-                    try:
-                        if not follow_symlinks and p.is_symlink():
-                            continue
-                        all_dirs.append(p)
-                    except OSError:
-                        continue
-            
-            # Sort by depth (deepest first) for proper deletion order
-            all_dirs.sort(key=lambda p: -str(p).count(os.sep))
-            yield from all_dirs
-        except Exception:
-            return
+            st = os.lstat(entry.path)
+        except OSError:
+            return False
+        return stat.S_ISDIR(st.st_mode) and st.st_mtime == entry.mtime
+
+    @staticmethod
+    def _covering_subtree(path: str, subtrees: Set[str]) -> Optional[str]:
+        if not subtrees:
+            return None
+        current = path
+        while True:
+            if current in subtrees:
+                return current
+            parent = os.path.dirname(current)
+            if parent == current:
+                return None
+            current = parent
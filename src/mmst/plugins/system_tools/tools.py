@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import json
+import logging
 import os
 import platform
 import shutil
 import subprocess
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -27,7 +32,12 @@ class ConversionFormat:
 
 
 class ToolDetector:
-    """Detect available external tools for file conversion."""
+    """Detect available external tools for file conversion.
+
+    Results are memoised per instance. With a ``cache_file`` the version
+    strings are also persisted, keyed by executable path, mtime and size, so
+    a version probe only runs again after the tool was updated or moved.
+    """
 
     TOOLS = {
         "ffmpeg": ["ffmpeg", "-version"],
@@ -36,10 +46,32 @@ class ToolDetector:
         "powershell": ["powershell.exe", "-Command", "$PSVersionTable.PSVersion.ToString()"] if platform.system() == "Windows" else ["echo", "powershell-not-available"],
     }
 
-    def __init__(self) -> None:
+    def __init__(self, cache_file: Optional[Path] = None) -> None:
         self._cache: Dict[str, Tool] = {}
+        self._lock = threading.Lock()
+        self._cache_file = cache_file
+        self._persisted: Dict[str, Dict[str, Any]] = self._load_persisted() if cache_file else {}
 
-    def detect(self, tool_name: str) -> Tool:
+    def cached(self, tool_name: str) -> Optional[Tool]:
+        """Return the memoised result without probing anything."""
+        return self._cache.get(tool_name)
+
+    def clear(self) -> None:
+        """Forget all results, including the persisted versions."""
+        with self._lock:
+            self._cache.clear()
+            self._persisted.clear()
+        self._save_persisted()
+
+    def detect(self, tool_name: str, probe: bool = True) -> Tool:
+        """Locate ``tool_name`` and read its version.
+
+        Args:
+            tool_name: Key of :attr:`TOOLS`
+            probe: If False, never run the version command; tools whose
+                version is not cached yet are returned without one (and the
+                result is not memoised)
+        """
         if tool_name in self._cache:
             return self._cache[tool_name]
 
@@ -66,11 +98,54 @@ class ToolDetector:
             self._cache[tool_name] = result
             return result
 
-        version = self._get_version(command_parts)
+        signature = self._signature(path)
+        persisted = self._persisted.get(tool_name)
+        if persisted and signature and persisted.get("signature") == signature:
+            version = persisted.get("version")
+        elif not probe:
+            return Tool(name=tool_name, command=command, available=True, path=path)
+        else:
+            version = self._get_version(command_parts)
+            if signature:
+                with self._lock:
+                    self._persisted[tool_name] = {"signature": signature, "version": version}
+                self._save_persisted()
         result = Tool(name=tool_name, command=command, available=True, version=version, path=path)
         self._cache[tool_name] = result
         return result
 
+    @staticmethod
+    def _signature(path: str) -> Optional[List[Any]]:
+        try:
+            resolved = Path(path).resolve()
+            stat = resolved.stat()
+        except OSError:
+            return None
+        return [str(resolved), stat.st_mtime_ns, stat.st_size]
+
+    def _load_persisted(self) -> Dict[str, Dict[str, Any]]:
+        if self._cache_file is None or not self._cache_file.exists():
+            return {}
+        try:
+            data = json.loads(self._cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.debug("Tool cache %s unreadable: %s", self._cache_file, exc)
+            return {}
+        return {name: entry for name, entry in data.items() if isinstance(entry, dict)} if isinstance(data, dict) else {}
+
+    def _save_persisted(self) -> None:
+        if self._cache_file is None:
+            return
+        with self._lock:
+            payload = json.dumps(self._persisted, indent=2)
+        try:
+            self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._cache_file.with_suffix(".tmp")
+            tmp.write_text(payload, encoding="utf-8")
+            tmp.replace(self._cache_file)
+        except OSError as exc:
+            logger.debug("Tool cache %s not written: %s", self._cache_file, exc)
+
     def _find_imagemagick_windows(self) -> Optional[str]:
         candidates: List[Path] = []
         program_files = os.environ.get("PROGRAMFILES")
@@ -141,8 +216,116 @@ class ToolDetector:
             pass
         return None
 
-    def detect_all(self) -> Dict[str, Tool]:
-        return {name: self.detect(name) for name in self.TOOLS.keys()}
+    def detect_all(self, probe: bool = True) -> Dict[str, Tool]:
+        return {name: self.detect(name, probe) for name in self.TOOLS.keys()}
+
+
+class ToolRegistry:
+    """Tool lookups that never wait on a version probe.
+
+    :meth:`start` probes every tool once on a background thread. Until that
+    has finished, :meth:`get` answers from the persisted cache or a plain
+    ``PATH`` lookup (``version`` is None then), so opening a view or starting
+    a conversion does not block on ``ffmpeg -version``.
+    """
+
+    def __init__(self, detector: Optional[ToolDetector] = None) -> None:
+        self._detector = detector or ToolDetector()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._listeners: List[Callable[[Dict[str, Tool]], None]] = []
+
+    @property
+    def detector(self) -> ToolDetector:
+        return self._detector
+
+    def attach(self, cache_file: Path) -> None:
+        """Persist versions in ``cache_file`` (only before the first probe)."""
+        with self._lock:
+            if self._thread is None and self._detector._cache_file is None:
+                self._detector = ToolDetector(cache_file)
+
+    def add_listener(self, callback: Callable[[Dict[str, Tool]], None]) -> None:
+        """Call ``callback`` (on the probe thread) after each completed probe."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Dict[str, Tool]], None]) -> None:
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def start(self) -> None:
+        """Probe all tools in the background, once."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._probe, name="tool-probe", daemon=True)
+            self._thread.start()
+
+    def refresh(self) -> None:
+        """Forget cached results and probe again in the background."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._ready.clear()
+            self._detector.clear()
+            self._thread = threading.Thread(target=self._probe, name="tool-probe", daemon=True)
+            self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the background probe is done; for tests and shutdown."""
+        return self._ready.wait(timeout)
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def get(self, tool_name: str) -> Tool:
+        return self._detector.cached(tool_name) or self._detector.detect(tool_name, probe=False)
+
+    def detect(self, tool_name: str) -> Tool:
+        """Alias of :meth:`get` so the registry can stand in for a detector."""
+        return self.get(tool_name)
+
+    def tools(self) -> Dict[str, Tool]:
+        return {name: self.get(name) for name in ToolDetector.TOOLS}
+
+    def _probe(self) -> None:
+        try:
+            tools = self._detector.detect_all()
+        except Exception:  # pragma: no cover - defensive
+            logger.exception("Tool detection failed")
+            tools = self.tools()
+        finally:
+            self._ready.set()
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback(tools)
+            except Exception:  # pragma: no cover - listener errors must not kill the probe
+                logger.exception("Tool registry listener failed")
+
+
+_shared_registry: Optional[ToolRegistry] = None
+_shared_lock = threading.Lock()
+
+
+def shared_tool_registry(cache_file: Optional[Path] = None) -> ToolRegistry:
+    """Process-wide registry shared by System Tools, Audio Tools and Media Library.
+
+    Args:
+        cache_file: Optional file to persist versions in; attached on first use
+    """
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = ToolRegistry()
+    if cache_file is not None:
+        _shared_registry.attach(cache_file)
+    return _shared_registry
 
 
 # Supported conversion formats
@@ -0,0 +1,102 @@
+"""Tests for streaming recording encoders (ffmpeg is replaced by a stub)."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from mmst.plugins.audio_tools.encoder import EncoderError, StreamingEncoder
+from mmst.plugins.audio_tools.recording import RecordingController
+
+np = pytest.importorskip("numpy")
+
+# Stub encoder: copies stdin to the output file (last argument)
+COPY_SCRIPT = "import shutil, sys; shutil.copyfileobj(sys.stdin.buffer, open(sys.argv[-1], 'wb'))"
+
+
+class _StubEncoder(StreamingEncoder):
+    def __init__(self, *args, script: str = COPY_SCRIPT, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._script = script
+
+    def command(self):
+        return [sys.executable, "-c", self._script, str(self.output_path)]
+
+
+def test_command_describes_raw_pcm_input(tmp_path):
+    encoder = StreamingEncoder(
+        tmp_path / "take.flac", "flac", sample_rate=48000, channels=2, sample_width=4, ffmpeg="ff"
+    )
+    args = encoder.command()
+    assert args[0] == "ff"
+    assert args[args.index("-f") + 1] == "s32le"
+    assert args[args.index("-ar") + 1] == "48000"
+    assert args[args.index("-ac") + 1] == "2"
+    assert args[args.index("-i") + 1] == "pipe:0"
+    assert "-bits_per_raw_sample" in args
+    assert args[-1] == str(tmp_path / "take.flac")
+
+    opus = StreamingEncoder(tmp_path / "take.opus", "opus", sample_rate=48000, channels=1, sample_width=2)
+    assert "libopus" in opus.command() and "s16le" in opus.command()
+
+    with pytest.raises(ValueError):
+        StreamingEncoder(tmp_path / "take.mp3", "mp3", sample_rate=48000, channels=1, sample_width=2)
+
+
+def test_ring_is_streamed_into_encoder(tmp_path):
+    import threading
+
+    from mmst.plugins.audio_tools.recording import _RecordingSession
+    from mmst.plugins.audio_tools.ring_buffer import SampleRingBuffer
+
+    output = tmp_path / "take.flac"
+    encoder = _StubEncoder(output, "flac", sample_rate=8000, channels=2, sample_width=2)
+    encoder.start()
+
+    session = _RecordingSession(device_id="0", start_time=0.0, output_path=output, quality={}, sample_width=2)
+    session.ring = SampleRingBuffer(64, channels=2, dtype="int16")
+    session.stop_event = threading.Event()
+    samples = np.arange(200, dtype=np.int16).reshape(100, 2)
+    session.stop_event.set()
+    controller = RecordingController(force_placeholder=True)
+    # Two drains so the second batch wraps around the ring
+    session.ring.write(samples[:60])
+    controller._drain_ring(session, encoder.write, 8000)
+    session.ring.write(samples[60:])
+    controller._drain_ring(session, encoder.write, 8000)
+    encoder.close()
+
+    assert encoder.bytes_written == samples.nbytes
+    assert output.read_bytes() == samples.tobytes()
+    assert session.frames_captured == 100
+
+
+def test_encoder_failure_is_reported(tmp_path):
+    encoder = _StubEncoder(
+        tmp_path / "take.opus",
+        "opus",
+        sample_rate=48000,
+        channels=1,
+        sample_width=2,
+        script="import sys; sys.stdin.read(); sys.stderr.write('codec kaputt'); sys.exit(3)",
+    )
+    encoder.start()
+    encoder.write(b"\x00\x00" * 16)
+    with pytest.raises(EncoderError, match="codec kaputt"):
+        encoder.close()
+
+
+def test_write_without_start_raises(tmp_path):
+    encoder = StreamingEncoder(tmp_path / "x.flac", "flac", sample_rate=8000, channels=1, sample_width=2)
+    with pytest.raises(EncoderError):
+        encoder.write(b"\x00\x00")
+    encoder.abort()
+
+
+def test_placeholder_recordings_fall_back_to_wav(tmp_path):
+    controller = RecordingController(force_placeholder=True)
+    path = controller.start(tmp_path, "mic", {"sample_rate": 8000, "channels": 1}, output_format="flac")
+    assert path.suffix == ".wav"
+    info = controller.stop()
+    assert info["format"] == "wav" and Path(info["path"]).exists()
@@ -23,3 +23,62 @@ def test_convert_float_buffer_to_int32():
     pcm_array = np.frombuffer(pcm_bytes, dtype="<i4")
     assert pcm_array.max() > pcm_array.min()
     assert len(set(pcm_array.tolist())) > 1
+
+
+def _drained(session_dtype, sample_width, blocks):
+    import threading
+    import time
+    from pathlib import Path
+
+    from mmst.plugins.audio_tools.recording import _RecordingSession
+    from mmst.plugins.audio_tools.ring_buffer import SampleRingBuffer
+
+    controller = RecordingController(force_placeholder=True)
+    session = _RecordingSession(
+        device_id="0", start_time=0.0, output_path=Path("unused.wav"), quality={}, sample_width=sample_width
+    )
+    session.ring = SampleRingBuffer(8, channels=2, dtype=session_dtype)
+    session.stop_event = threading.Event()
+    written = []
+    writer = threading.Thread(
+        target=controller._drain_ring, args=(session, lambda data: written.append(bytes(data)), 16)
+    )
+    writer.start()
+    for block in blocks:
+        # The ring is tiny, so give the writer time instead of dropping frames
+        while session.ring.available + len(block) > session.ring.capacity:
+            time.sleep(0.001)
+        session.ring.write(block, overwrite=False)
+    session.stop_event.set()
+    writer.join(5.0)
+    return session, b"".join(written)
+
+
+def test_writer_converts_float_ring_in_batches():
+    blocks = [np.linspace(-1.2, 1.2, 12, dtype=np.float32).reshape(6, 2) * (i + 1) / 5 for i in range(5)]
+    session, data = _drained("float32", 2, blocks)
+    controller = RecordingController(force_placeholder=True)
+    expected = b"".join(controller._convert_float_buffer(block, 2) for block in blocks)
+    assert data == expected
+    assert session.frames_captured == 30 and session.dropped_frames == 0
+
+
+def test_writer_passes_integer_samples_through():
+    blocks = [np.arange(i * 10, i * 10 + 10, dtype=np.int16).reshape(5, 2) for i in range(4)]
+    session, data = _drained("int16", 2, blocks)
+    assert data == np.concatenate(blocks).astype("<i2").tobytes()
+    assert session.frames_captured == 20
+
+
+def test_ring_buffer_drops_instead_of_overwriting_unread_frames():
+    from mmst.plugins.audio_tools.ring_buffer import SampleRingBuffer
+
+    ring = SampleRingBuffer(4, channels=1, dtype="int16")
+    assert ring.write(np.arange(3, dtype=np.int16), overwrite=False) == 3
+    assert ring.write(np.arange(3, 6, dtype=np.int16), overwrite=False) == 1
+    assert ring.dropped_frames == 2
+    views = ring.peek()
+    assert [view[:, 0].tolist() for view in views] == [[0, 1, 2, 3]]
+    ring.consume(3)
+    ring.write(np.array([7, 8], dtype=np.int16), overwrite=False)
+    assert [view[:, 0].tolist() for view in ring.peek()] == [[3], [7, 8]]
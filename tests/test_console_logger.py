@@ -0,0 +1,99 @@
+"""Tests for the queue-based logging pipeline."""
+from __future__ import annotations
+
+import io
+import logging
+import time
+from datetime import datetime
+
+import pytest
+
+from mmst.core.console_logger import BatchedFileHandler, ConsoleLogger, ConsoleLogHandler
+
+
+@pytest.fixture
+def file_logger():
+    """Logger that only writes to the handlers attached by the test."""
+    logger = logging.getLogger("mmst.test.file")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    yield logger
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
+@pytest.fixture
+def console_logger(tmp_path, monkeypatch):
+    """A fresh ConsoleLogger writing below ``tmp_path``; root handlers are restored."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    instance = ConsoleLogger()
+    instance.handler.stream = io.StringIO()
+    yield instance
+    instance.shutdown()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def _today_file(log_dir, part: str = ""):
+    return log_dir / f"mmst-{datetime.now().strftime('%Y-%m-%d')}{part}.log"
+
+
+def test_console_buffer_is_a_ring(file_logger):
+    handler = ConsoleLogHandler(stream=io.StringIO(), use_colors=False, buffer_size=3)
+    file_logger.addHandler(handler)
+    for i in range(5):
+        file_logger.info("message %d", i)
+    assert [line.rsplit(" ", 1)[1] for line in handler.get_buffer()] == ["2", "3", "4"]
+
+
+def test_file_writes_are_batched_except_errors(tmp_path, file_logger):
+    handler = BatchedFileHandler(tmp_path, flush_interval=60)
+    file_logger.addHandler(handler)
+    path = _today_file(tmp_path)
+    size = path.stat().st_size
+
+    file_logger.debug("scan progress")
+    assert path.stat().st_size == size
+    file_logger.error("scan failed")
+    text = path.read_text(encoding="utf-8")
+    assert "scan progress" in text and "scan failed" in text
+
+
+def test_file_is_rotated_by_size(tmp_path, file_logger):
+    handler = BatchedFileHandler(tmp_path, max_bytes=400, backup_count=2)
+    file_logger.addHandler(handler)
+    for i in range(40):
+        file_logger.info("line %02d %s", i, "x" * 30)
+    handler.flush()
+
+    parts = sorted(p.name for p in tmp_path.iterdir())
+    assert parts == sorted(p.name for p in (_today_file(tmp_path), _today_file(tmp_path, ".1"), _today_file(tmp_path, ".2")))
+    assert all((tmp_path / name).stat().st_size <= 400 for name in parts)
+    assert "line 39" in _today_file(tmp_path).read_text(encoding="utf-8")
+
+
+def test_logging_does_not_wait_for_the_handlers(console_logger, tmp_path):
+    class SlowStream(io.StringIO):
+        def write(self, text):
+            time.sleep(0.05)
+            return super().write(text)
+
+    console_logger.handler.stream = SlowStream()
+    logger = console_logger.get_logger("MMST.Scan")
+    started = time.monotonic()
+    for i in range(20):
+        logger.info("hashed file %d", i)
+    assert time.monotonic() - started < 0.5
+
+    console_logger.flush()
+    assert len([line for line in console_logger.get_buffer() if "hashed file" in line]) == 20
+    log_text = _today_file(tmp_path / ".mmst" / "logs").read_text(encoding="utf-8")
+    # Every record reaches the daily file exactly once
+    assert log_text.count("hashed file 7") == 1
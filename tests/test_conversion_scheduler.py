@@ -0,0 +1,161 @@
+"""Tests for the parallel batch conversion scheduler and ffmpeg progress parsing."""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from mmst.plugins.system_tools.converter import (
+    ConversionJob,
+    ConversionResult,
+    FfmpegProgressParser,
+    FileConverter,
+    parse_duration,
+)
+from mmst.plugins.system_tools.scheduler import ConversionScheduler, default_limits, summarize
+from mmst.plugins.system_tools.tools import Tool
+
+FAKE_FFMPEG = """#!{python}
+import sys, time
+target = sys.argv[-1]
+sys.stderr.write("Input #0, wav, from 'in.wav':\\n  Duration: 00:00:10.00, bitrate: 1411 kb/s\\n")
+sys.stderr.flush()
+if "{mode}" == "hang":
+    time.sleep(30)
+for step in range(1, 5):
+    print(f"out_time_us={{step * 2_500_000}}")
+    print("speed=12.5x")
+    print("progress=" + ("end" if step == 4 else "continue"), flush=True)
+open(target, "wb").write(b"converted")
+"""
+
+
+def _fake_ffmpeg(tmp_path: Path, mode: str = "ok") -> Path:
+    script = tmp_path / f"ffmpeg-{mode}"
+    script.write_text(FAKE_FFMPEG.format(python=sys.executable, mode=mode))
+    script.chmod(0o755)
+    return script
+
+
+def _job(tmp_path: Path, name: str, tool: str = "ffmpeg", command: Path | None = None) -> ConversionJob:
+    source = tmp_path / f"{name}.wav"
+    source.write_bytes(b"data")
+    return ConversionJob(source, tmp_path / f"{name}.mp3", "wav", "mp3", tool, command)
+
+
+class _Detector:
+    def __init__(self, available: dict) -> None:
+        self.available = available
+        self.calls: list = []
+
+    def detect(self, name: str) -> Tool:
+        self.calls.append(name)
+        path = self.available.get(name)
+        return Tool(name=name, command=name, available=path is not None, path=path)
+
+
+def test_progress_parser_reports_percent_and_speed():
+    parser = FfmpegProgressParser(duration=10.0)
+    updates = [
+        parser.feed(line)
+        for line in ["frame=10", "out_time_us=2500000", "speed=3.5x", "progress=continue", "out_time_ms=N/A"]
+    ]
+    update = updates[3]
+    assert updates[:3] == [None, None, None] and updates[4] is None
+    assert (update.seconds, update.percent, update.speed, update.finished) == (2.5, 25.0, 3.5, False)
+    assert parser.feed("progress=end").percent == 100.0
+    assert parse_duration("  Duration: 01:02:03.50, start: 0.0") == pytest.approx(3723.5)
+    assert parse_duration("Duration: N/A") is None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shebang script as fake ffmpeg")
+def test_streaming_ffmpeg_conversion_reports_progress(tmp_path):
+    job = _job(tmp_path, "song", command=_fake_ffmpeg(tmp_path))
+    updates = []
+    result = FileConverter().convert(job, on_progress=updates.append)
+    assert result.success and job.target.read_bytes() == b"converted"
+    assert [update.percent for update in updates] == [25.0, 50.0, 75.0, 100.0]
+    assert updates[0].speed == 12.5
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shebang script as fake ffmpeg")
+def test_streaming_ffmpeg_conversion_can_be_cancelled(tmp_path):
+    job = _job(tmp_path, "song", command=_fake_ffmpeg(tmp_path, "hang"))
+    cancel = threading.Event()
+    threading.Timer(0.3, cancel.set).start()
+    started = time.monotonic()
+    result = FileConverter().convert(job, cancel_event=cancel)
+    assert not result.success and result.message == "Abgebrochen"
+    assert time.monotonic() - started < 10
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shebang script as fake ffmpeg")
+def test_cancel_after_ffmpeg_finished_keeps_the_output(tmp_path):
+    class _PressedTooLate(threading.Event):
+        # The watcher never sees the event before ffmpeg exits
+        def wait(self, timeout=None):
+            time.sleep(timeout or 0)
+            return False
+
+    job = _job(tmp_path, "song", command=_fake_ffmpeg(tmp_path))
+    cancel = _PressedTooLate()
+    result = FileConverter().convert(
+        job, on_progress=lambda update: update.finished and cancel.set(), cancel_event=cancel
+    )
+    assert cancel.is_set()
+    assert result.success and job.target.read_bytes() == b"converted"
+
+
+def test_scheduler_runs_jobs_in_parallel_within_tool_limits(tmp_path):
+    detector = _Detector({"ffmpeg": "/usr/bin/ffmpeg", "imagemagick": "/usr/bin/convert"})
+    converter = FileConverter()
+    lock = threading.Lock()
+    running = {"ffmpeg": 0, "imagemagick": 0}
+    peak = {"ffmpeg": 0, "imagemagick": 0}
+
+    def fake_convert(job, progress=None, **_kwargs):
+        with lock:
+            running[job.tool] += 1
+            peak[job.tool] = max(peak[job.tool], running[job.tool])
+        time.sleep(0.05)
+        with lock:
+            running[job.tool] -= 1
+        return ConversionResult(True, job.source, job.target, "ok")
+
+    converter.convert = fake_convert  # type: ignore[method-assign]
+    jobs = [_job(tmp_path, f"a{i}") for i in range(6)] + [_job(tmp_path, f"i{i}", "imagemagick") for i in range(6)]
+    jobs.append(_job(tmp_path, "missing", "unknown"))
+    statuses = []
+    scheduler = ConversionScheduler(converter, detector, limits={"ffmpeg": 2, "imagemagick": 3})
+    results = scheduler.run(jobs, on_status=lambda index, status, _msg: statuses.append((index, status)))
+
+    assert summarize(results) == (12, 1)
+    assert [result.source for result in results] == [job.source for job in jobs]
+    assert peak == {"ffmpeg": 2, "imagemagick": 3}
+    # Each tool is detected once per batch, not once per job
+    assert sorted(detector.calls) == ["ffmpeg", "imagemagick", "unknown"]
+    assert jobs[0].command_path == Path("/usr/bin/ffmpeg")
+    assert (12, "failed") in statuses
+
+
+def test_cancelled_scheduler_skips_pending_jobs(tmp_path):
+    detector = _Detector({"imagemagick": "/usr/bin/convert"})
+    converter = FileConverter()
+    scheduler = ConversionScheduler(converter, detector, limits={"imagemagick": 1})
+
+    def fake_convert(job, progress=None, **_kwargs):
+        scheduler.cancel()
+        return ConversionResult(True, job.source, job.target, "ok")
+
+    converter.convert = fake_convert  # type: ignore[method-assign]
+    results = scheduler.run([_job(tmp_path, f"i{i}", "imagemagick") for i in range(4)])
+    assert summarize(results) == (1, 3)
+    assert {result.message for result in results[1:]} == {"Abgebrochen"}
+
+
+def test_default_limits_keep_ffmpeg_below_core_count():
+    assert default_limits(16) == {"ffmpeg": 4, "imagemagick": 16}
+    assert default_limits(2) == {"ffmpeg": 1, "imagemagick": 2}
@@ -10,7 +10,8 @@ from PySide6.QtCore import QSize
 from PySide6.QtGui import QColor, QPixmap
 from PySide6.QtWidgets import QApplication
 
-from mmst.plugins.media_library.covers import CoverCache, load_cover_pixmap
+from mmst.plugins.media_library import covers
+from mmst.plugins.media_library.covers import CoverCache, SidecarIndex, load_cover_pixmap
 
 os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
 
@@ -75,3 +76,69 @@ def test_cover_cache_caches_and_invalidates(qt_app: QApplication, tmp_path: Path
     # Ensure cache can still serve after clear
     fourth = cache.get(image_file, "image")
     assert not fourth.isNull()
+
+
+def test_sidecar_index_lists_directory_once(qt_app: QApplication, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    album = tmp_path / "album"
+    album.mkdir()
+    _write_png(album / "Folder.jpg")
+    tracks = [album / f"{idx:02d}.mp3" for idx in range(10)]
+    for track in tracks:
+        track.write_bytes(b"")
+
+    calls: list[str] = []
+    real_scandir = covers.os.scandir
+
+    def counting_scandir(path):  # type: ignore[no-untyped-def]
+        calls.append(str(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(covers.os, "scandir", counting_scandir)
+    index = SidecarIndex(revalidate_interval=60.0)
+
+    for track in tracks:
+        assert index.find(track) == album / "Folder.jpg"
+    assert calls == [str(album)]
+
+
+def test_sidecar_index_prefers_per_file_art_and_invalidates(qt_app: QApplication, tmp_path: Path) -> None:
+    _write_png(tmp_path / "cover.jpg")
+    track = tmp_path / "track.mp3"
+    track.write_bytes(b"")
+    index = SidecarIndex(revalidate_interval=60.0)
+
+    assert index.find(track) == tmp_path / "cover.jpg"
+
+    _write_png(tmp_path / "track.cover.png")
+    # Still served from the memoised listing until invalidated
+    assert index.find(track) == tmp_path / "cover.jpg"
+    index.invalidate(tmp_path)
+    assert index.find(track) == tmp_path / "track.cover.png"
+
+
+def test_sidecar_index_revalidates_on_directory_mtime(qt_app: QApplication, tmp_path: Path) -> None:
+    video = tmp_path / "movie.mkv"
+    video.write_bytes(b"")
+    index = SidecarIndex(revalidate_interval=0.0)
+    assert index.find(video) is None
+
+    _write_png(tmp_path / "movie.poster.jpg")
+    stat = tmp_path.stat()
+    os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert index.find(video) == tmp_path / "movie.poster.jpg"
+
+
+def test_cover_cache_invalidate_sidecar_refreshes_siblings(qt_app: QApplication, tmp_path: Path) -> None:
+    track = tmp_path / "track.mp3"
+    track.write_bytes(b"")
+    cache = CoverCache(size=QSize(16, 16), sidecars=SidecarIndex(revalidate_interval=60.0))
+
+    placeholder = cache.get(track, "audio")
+    assert placeholder.toImage().pixelColor(0, 0) == QColor(37, 99, 235)
+
+    art = tmp_path / "folder.png"
+    _write_png(art)
+    cache.invalidate(art)
+
+    refreshed = cache.get(track, "audio")
+    assert refreshed.toImage().pixelColor(0, 0) == QColor("white")
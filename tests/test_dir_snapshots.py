@@ -0,0 +1,103 @@
+"""Tests for the shared directory snapshot cache."""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from mmst.core.dir_snapshots import DirectorySnapshotCache
+
+
+def _age(path: Path, seconds: float = 60.0) -> None:
+    """Move a directory's mtime into the past so its snapshot is not racy."""
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+@pytest.fixture
+def cache():
+    cache = DirectorySnapshotCache(max_directories=2, batch_size=2, revalidate_interval=0.0)
+    yield cache
+    cache.shutdown()
+
+
+@pytest.fixture
+def folder(tmp_path: Path) -> Path:
+    (tmp_path / "a.txt").write_text("hello")
+    (tmp_path / "b.bin").write_bytes(b"\x00" * 10)
+    (tmp_path / "sub").mkdir()
+    _age(tmp_path)
+    return tmp_path
+
+
+def test_snapshot_is_reused_until_directory_changes(cache, folder):
+    first = cache.snapshot(folder)
+    assert first is not None and first.complete
+    assert {entry.name for entry in first.entries} == {"a.txt", "b.bin", "sub"}
+    assert cache.snapshot(folder) is first
+
+    (folder / "c.txt").write_text("new")
+    second = cache.snapshot(folder)
+    assert second is not first
+    assert second.get("c.txt") is not None
+
+
+def test_lookup_returns_cached_stat(cache, folder):
+    assert cache.lookup(folder / "b.bin") is None  # nothing cached yet
+    cache.snapshot(folder)
+    entry = cache.lookup(folder / "b.bin")
+    assert entry is not None and entry.size == 10 and entry.is_file
+    assert cache.lookup(folder / "sub").is_dir
+    assert set(entry.file_times()) == {"created", "modified", "accessed"}
+
+
+def test_recently_modified_directory_is_rescanned(cache, tmp_path):
+    (tmp_path / "x").write_text("x")
+    first = cache.snapshot(tmp_path)
+    assert first.racy
+    assert cache.snapshot(tmp_path) is not first
+
+
+def test_lru_bound_and_invalidate(cache, tmp_path):
+    folders = []
+    for name in ("one", "two", "three"):
+        folder = tmp_path / name
+        folder.mkdir()
+        _age(folder)
+        folders.append(folder)
+        cache.snapshot(folder)
+    assert cache.get(folders[0]) is None
+    assert cache.get(folders[2]) is not None
+
+    cache.invalidate(folders[2])
+    assert cache.get(folders[2]) is None
+
+
+def test_async_listing_reports_partial_results(cache, tmp_path):
+    for index in range(5):
+        (tmp_path / f"f{index}").write_text("x")
+    _age(tmp_path)
+    partial_sizes = []
+    done = threading.Event()
+    results = []
+
+    def _on_done(snapshot):
+        results.append(snapshot)
+        done.set()
+
+    cache.snapshot_async(tmp_path, on_done=_on_done, on_partial=lambda s: partial_sizes.append(len(s.entries)))
+    assert done.wait(5.0)
+    assert partial_sizes == [2, 4]
+    assert len(results[0].entries) == 5 and results[0].complete
+
+    # Cached listings are delivered synchronously
+    delivered = []
+    cache.snapshot_async(tmp_path, on_done=delivered.append)
+    assert delivered == [results[0]]
+
+
+def test_unreadable_directory(cache, tmp_path):
+    assert cache.snapshot(tmp_path / "missing") is None
@@ -0,0 +1,108 @@
+"""Tests for the cached smartctl --json disk health service (smartctl is a stub)."""
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from mmst.plugins.system_tools.disk_health import DiskHealthService, SmartHistory, parse_smart_json
+from mmst.plugins.system_tools.disk_monitor import DiskMonitorLinux
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="uses a shebang script as fake smartctl")
+
+FAKE_SMARTCTL = """#!{python}
+import json, sys, time
+from pathlib import Path
+state = Path({state!r})
+with open(state / "calls.log", "a") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+if "--scan-open" in sys.argv:
+    devices = [{{"name": f"/dev/sd{{c}}", "type": "sat"}} for c in "abcd"]
+    print(json.dumps({{"devices": devices}}))
+    sys.exit(0)
+time.sleep(0.3)
+device = sys.argv[-1]
+reallocated = int((state / "reallocated").read_text())
+print(json.dumps({{
+    "device": {{"name": device, "protocol": "ATA"}},
+    "model_name": "Disk " + device[-1],
+    "serial_number": "SN-" + device[-1],
+    "user_capacity": {{"bytes": 4000787030016}},
+    "smart_status": {{"passed": True}},
+    "temperature": {{"current": 36}},
+    "ata_smart_attributes": {{"table": [
+        {{"id": 5, "name": "Reallocated_Sector_Ct", "value": 100, "worst": 100, "thresh": 10,
+          "when_failed": "", "raw": {{"value": reallocated, "string": str(reallocated)}}}},
+        {{"id": 9, "name": "Power_On_Hours", "value": 90, "worst": 90, "thresh": 0,
+          "when_failed": "", "raw": {{"value": 12000, "string": "12000"}}}}
+    ]}}
+}}))
+sys.exit(4)  # bit 2: some SMART data unreadable - output is still valid
+"""
+
+
+@pytest.fixture
+def smartctl(tmp_path: Path) -> Path:
+    script = tmp_path / "smartctl"
+    script.write_text(FAKE_SMARTCTL.format(python=sys.executable, state=str(tmp_path)))
+    script.chmod(0o755)
+    (tmp_path / "reallocated").write_text("0")
+    return script
+
+
+def _calls(tmp_path: Path) -> list:
+    return (tmp_path / "calls.log").read_text().splitlines()
+
+
+def test_refresh_queries_devices_concurrently_and_caches(tmp_path, smartctl):
+    service = DiskHealthService(str(smartctl), ttl_seconds=600)
+    started = time.monotonic()
+    snapshots = service.refresh()
+    elapsed = time.monotonic() - started
+
+    assert [s.info.model for s in snapshots] == ["Disk a", "Disk b", "Disk c", "Disk d"]
+    assert snapshots[0].info.size_gb == 4000.8 and snapshots[0].temperature == 36
+    # One scan plus one combined -i -H -A call per device, run in parallel
+    calls = _calls(tmp_path)
+    assert len(calls) == 5 and all("--json" in call for call in calls)
+    assert elapsed < 1.1
+
+    assert service.refresh() == snapshots
+    assert len(_calls(tmp_path)) == 5
+
+
+def test_monitor_reads_cached_snapshots(tmp_path, smartctl):
+    monitor = DiskMonitorLinux(DiskHealthService(str(smartctl)))
+    disks = monitor.get_disks()
+    assert disks[2].interface == "/dev/sdc" and disks[2].status == "PASSED"
+    calls = len(_calls(tmp_path))
+    assert [a.id for a in monitor.get_smart_attributes(1)] == [5, 9]
+    assert monitor.get_disk_temperature(1) == 36
+    assert monitor.get_health_summary(1)["status"] == "HEALTHY"
+    assert len(_calls(tmp_path)) == calls
+
+
+def test_growing_error_counter_is_reported_and_pushed(tmp_path, smartctl):
+    history = SmartHistory(tmp_path / "history.db")
+    service = DiskHealthService(str(smartctl), history=history)
+    pushed = []
+    service.add_listener(pushed.append)
+    service.refresh()
+    service.refresh(force=True)
+    assert len(pushed) == 1  # unchanged data is not pushed again
+
+    (tmp_path / "reallocated").write_text("8")
+    snapshot = service.refresh(force=True)[0]
+    assert len(pushed) == 2
+    summary = service.summary(snapshot)
+    assert summary["status"] == "WARNING"
+    assert summary["warnings"] == ["Reallocated_Sector_Ct: +8 in 30 Tagen"]
+    # Only changes are stored: 0 then 8 for attribute 5, power-on hours once
+    assert [raw for _ts, raw in history.series("SN-a", 5)] == [0, 8]
+    assert len(history.series("SN-a", 9)) == 1
+
+
+def test_unidentified_devices_are_skipped():
+    assert parse_smart_json("/dev/sdz", "sat", {"smartctl": {"messages": []}}, 0) is None
@@ -0,0 +1,101 @@
+"""Tests for the /proc/diskstats sampler (counters come from fake files)."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from mmst.plugins.system_tools.disk_io import DiskIOSampler, read_diskstats
+
+
+def _write_stats(root: Path, counters: dict) -> None:
+    """Write a diskstats file; ``counters`` maps device -> 11 counter values."""
+    lines = [
+        f"   8       {minor} {name} " + " ".join(str(v) for v in values)
+        for minor, (name, values) in enumerate(counters.items())
+    ]
+    (root / "diskstats").write_text("\n".join(lines) + "\n")
+
+
+def _stats(reads=0, read_sectors=0, writes=0, write_sectors=0, busy_ms=0, io_ms=0, weighted_ms=0):
+    return [reads, 0, read_sectors, busy_ms // 2, writes, 0, write_sectors, busy_ms - busy_ms // 2, 0, io_ms, weighted_ms]
+
+
+@pytest.fixture
+def stats_root(tmp_path: Path) -> Path:
+    for name in ("sda", "nvme0n1", "loop0"):
+        (tmp_path / "block" / name).mkdir(parents=True)
+    return tmp_path
+
+
+def _sampler(root: Path, **kwargs) -> DiskIOSampler:
+    return DiskIOSampler(proc_path=root / "diskstats", sys_block=root / "block", **kwargs)
+
+
+def test_only_whole_disks_are_read(stats_root):
+    _write_stats(stats_root, {"sda": _stats(reads=5), "sda1": _stats(reads=5), "nvme0n1": _stats(), "loop0": _stats()})
+    names, counters = read_diskstats(stats_root / "diskstats", stats_root / "block")
+    assert names == ["sda", "nvme0n1"]
+    assert counters.shape == (2, 11) and counters[0, 0] == 5
+
+
+def test_rates_are_computed_from_counter_deltas(stats_root):
+    sampler = _sampler(stats_root)
+    _write_stats(stats_root, {"sda": _stats(), "nvme0n1": _stats()})
+    assert sampler.sample(now=10.0) == {}
+
+    _write_stats(stats_root, {
+        "sda": _stats(reads=100, read_sectors=2048, writes=100, write_sectors=4096,
+                      busy_ms=400, io_ms=1000, weighted_ms=3000),
+        "nvme0n1": _stats(),
+    })
+    metrics = sampler.sample(now=12.0)["sda"]
+    assert metrics["iops"] == 100
+    assert metrics["read_bps"] == 2048 * 512 / 2
+    assert metrics["write_bps"] == 4096 * 512 / 2
+    assert metrics["utilization"] == pytest.approx(0.5)
+    assert metrics["queue_depth"] == pytest.approx(1.5)
+    assert metrics["latency_ms"] == pytest.approx(2.0)
+
+
+def test_ring_buffer_keeps_the_newest_samples(stats_root):
+    sampler = _sampler(stats_root, capacity=3)
+    for step in range(6):
+        _write_stats(stats_root, {"sda": _stats(reads=step * step)})
+        sampler.sample(now=float(step))
+    # Deltas were 1, 3, 5, 7, 9 - only the last three survive
+    assert sampler.series("sda", "iops").tolist() == [5, 7, 9]
+    assert sampler.latest("sda")["iops"] == 9
+    assert sampler.series("sdz", "iops").size == 0
+    iops, reads = sampler.series("sda", "iops", "read_bps")
+    assert iops.tolist() == [5, 7, 9] and reads.shape == iops.shape
+    assert sampler.series("sdz", "iops", "read_bps").shape == (2, 0)
+
+    # Counter reset after a device re-appears must not produce negative rates
+    _write_stats(stats_root, {"sda": _stats(reads=1)})
+    sampler.sample(now=6.0)
+    assert sampler.series("sda", "iops")[-1] == 0
+
+
+def test_samples_are_attributed_to_running_jobs(stats_root):
+    jobs = {"a": "Backup: /home → /mnt"}
+    sampler = _sampler(stats_root, job_source=lambda: jobs)
+    _write_stats(stats_root, {"sda": _stats(), "nvme0n1": _stats()})
+    sampler.sample(now=0.0)
+    for step in range(1, 4):
+        _write_stats(stats_root, {
+            "sda": _stats(write_sectors=step * 2048, io_ms=step * 900),
+            "nvme0n1": _stats(io_ms=step * 100),
+        })
+        sampler.sample(now=float(step))
+    jobs.clear()
+    jobs["b"] = "Duplikat-Scan: /data"
+    _write_stats(stats_root, {"sda": _stats(write_sectors=6144, io_ms=2700), "nvme0n1": _stats(io_ms=400)})
+    sampler.sample(now=4.0)
+
+    backup, scan = sampler.job_report()
+    assert backup.samples == 3 and not backup.running
+    assert backup.busiest_device == "sda" and backup.disk_bound
+    assert backup.throughput == 2048 * 512
+    assert "I/O-gebunden" in backup.describe()
+    assert scan.running and not scan.disk_bound
@@ -212,6 +212,83 @@ class TestEqualizerEngine:
             assert output.shape == (frames, 1)
             assert np.all(np.isfinite(output))
 
+    def test_sos_cascade_matches_per_band_filters(self):
+        """Test that the SOS cascade equals filtering band by band."""
+        from scipy import signal
+
+        engine = EqualizerEngine(channels=2)
+        gains = [6.0, -6.0, 3.0, 0.0, 2.0, -2.0, 1.0, 0.0, -4.0, 5.0]
+        engine.set_gains(gains)
+        engine.set_enabled(True)
+
+        rng = np.random.default_rng(1)
+        audio = (rng.standard_normal((512, 2)) * 0.1).astype(np.float32)
+        expected = audio.astype(np.float64)
+        for freq, gain in zip(engine.BANDS, gains):
+            if gain:
+                b, a = engine._design_peaking_filter(freq, gain)
+                expected = signal.lfilter(b, a, expected, axis=0)
+
+        output = engine.process(audio)
+        assert engine._zi.shape == (10, 2, 2)
+        np.testing.assert_allclose(output, expected, atol=1e-5)
+        # The input block is left untouched
+        assert not np.shares_memory(output, audio)
+
+    def test_block_processing_is_continuous(self):
+        """Test that splitting a signal into blocks gives the same output."""
+        rng = np.random.default_rng(2)
+        audio = (rng.standard_normal((1024, 2)) * 0.1).astype(np.float32)
+
+        whole = EqualizerEngine(channels=2)
+        blocks = EqualizerEngine(channels=2)
+        for engine in (whole, blocks):
+            engine.set_gains([4.0, -3.0] * 5)
+            engine.set_enabled(True)
+
+        expected = whole.process(audio)
+        output = np.concatenate([blocks.process(audio[i:i + 64]) for i in range(0, 1024, 64)])
+        np.testing.assert_allclose(output, expected, atol=1e-5)
+
+    def test_process_does_not_take_the_lock(self):
+        """Test that the audio path keeps running while a writer holds the lock."""
+        import threading
+
+        engine = EqualizerEngine(channels=2)
+        engine.set_gains([3.0] * 10)
+        engine.set_enabled(True)
+        audio = np.zeros((64, 2), dtype=np.float32)
+
+        done = threading.Event()
+        with engine._lock:
+            worker = threading.Thread(target=lambda: (engine.process(audio), done.set()))
+            worker.start()
+            assert done.wait(2.0)
+        worker.join()
+
+    def test_gain_change_is_crossfaded(self):
+        """Test that a gain change blends old and new cascades over one block."""
+        from scipy import signal
+
+        engine = EqualizerEngine(channels=2)
+        engine.set_gains([6.0] * 10)
+        engine.set_enabled(True)
+        rng = np.random.default_rng(3)
+        engine.process((rng.standard_normal((64, 2)) * 0.1).astype(np.float32))
+
+        state = engine._zi.copy()
+        old_sos = engine._coefficients.sos
+        engine.set_gains([-6.0] * 10)
+        block = (rng.standard_normal((64, 2)) * 0.1).astype(np.float32)
+        output = engine.process(block)
+
+        old, _ = signal.sosfilt(old_sos, block.T, axis=-1, zi=state)
+        new, new_state = signal.sosfilt(engine._coefficients.sos, block.T, axis=-1, zi=state)
+        np.testing.assert_allclose(output[-1], new[:, -1], atol=1e-5)
+        np.testing.assert_allclose(output[0], old[:, 0] + (new[:, 0] - old[:, 0]) / 64, atol=1e-5)
+        np.testing.assert_allclose(engine._zi, new_state)
+        assert engine._active is engine._coefficients
+
 
 class TestBandConfig:
     """Test the BandConfig dataclass."""
@@ -168,6 +168,99 @@ class TestFuzzyFilterProxyModel:
         mock_fs_manager.get_file_size.return_value = 100  # 100B
         assert not proxy._matches_advanced_filter(path)
 
+    def test_text_filter_uses_directory_index(self):
+        """Rows are scored in one batch per directory and pattern."""
+        from mmst.plugins.explorer import widgets
+        from mmst.plugins.explorer.widgets import FuzzyFilterProxyModel
+        
+        names = ["Report_2023.pdf", "notes.md", "raport.txt", "image.png"]
+        parent = MagicMock()
+        rows = [MagicMock(name=name) for name in names]
+        for row in rows:
+            row.parent.return_value = parent
+        model = MagicMock()
+        model.filePath.side_effect = lambda index: "/data" if index is parent else "/data/x"
+        model.rowCount.return_value = len(names)
+        model.index.side_effect = lambda row, column, parent_index: rows[row]
+        model.fileName.side_effect = lambda index: names[rows.index(index)]
+        
+        proxy = FuzzyFilterProxyModel()
+        proxy.set_search_pattern("report")
+        with patch.object(widgets, "FilenameIndex", wraps=widgets.FilenameIndex) as index_cls:
+            accepted = [proxy._matches_text_filter(model, row) for row in rows]
+            assert index_cls.call_count == 1
+        assert accepted == [widgets.fuzzy_match(name.lower(), "report", 0.42) for name in names]
+        assert accepted[0] and not accepted[3]
+        
+        # A row that appears later is scored on its own
+        names.append("report-final.doc")
+        rows.append(MagicMock(name="late"))
+        rows[-1].parent.return_value = parent
+        assert proxy._matches_text_filter(model, rows[-1])
+    
+    def test_row_filter_caches_file_stats(self, mock_filter_criteria, mock_fs_manager):
+        """Metadata is queried once per path until the directory changes."""
+        from mmst.plugins.explorer.widgets import FuzzyFilterProxyModel
+        from mmst.plugins.explorer.filter_panel import FilterCriteria
+        
+        proxy = FuzzyFilterProxyModel()
+        proxy.set_filesystem_manager(mock_fs_manager)
+        criteria = mock_filter_criteria
+        criteria.size_mode = FilterCriteria.SIZE_MODE_LARGER
+        criteria.min_size_bytes = 500
+        proxy.set_filter_criteria(criteria)
+        
+        model = MagicMock()
+        model.isDir.return_value = False
+        model.filePath.return_value = "/test/file.txt"
+        proxy.sourceModel = MagicMock(return_value=model)
+        
+        assert proxy.filterAcceptsRow(0, MagicMock())
+        assert proxy.filterAcceptsRow(0, MagicMock())
+        assert mock_fs_manager.get_file_size.call_count == 1
+        
+        mock_fs_manager.get_file_size.return_value = 100
+        proxy.set_current_directory(Path("/test"))
+        assert not proxy.filterAcceptsRow(0, MagicMock())
+        assert mock_fs_manager.get_file_size.call_count == 2
+    
+    def test_ancestors_of_current_directory_are_not_filtered(self):
+        from mmst.plugins.explorer.widgets import FuzzyFilterProxyModel
+        
+        proxy = FuzzyFilterProxyModel()
+        proxy.set_current_directory(Path("/data/music"))
+        proxy.set_search_pattern("zzz")
+        model = MagicMock()
+        model.isDir.return_value = True
+        model.fileName.return_value = "data"
+        model.filePath.return_value = "/data"
+        proxy.sourceModel = MagicMock(return_value=model)
+        assert proxy.filterAcceptsRow(0, MagicMock())
+        
+        model.fileName.return_value = "album"
+        model.filePath.return_value = "/data/music/album"
+        assert not proxy.filterAcceptsRow(0, MagicMock())
+
+
+class TestFilenameIndex:
+    def test_batched_match_equals_sequence_matcher(self):
+        import random
+        from mmst.plugins.explorer.name_index import FilenameIndex, fuzzy_match
+        
+        rng = random.Random(7)
+        alphabet = "abcdeäöü._- 0123"
+        names = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 18))) for _ in range(2000)]
+        index = FilenameIndex(names)
+        for pattern in ["abc", "a", "dcba", "ä.", "xyz", "e_0"]:
+            expected = [fuzzy_match(name.lower(), pattern, 0.42) for name in names]
+            assert index.match(pattern, 0.42).tolist() == expected
+    
+    def test_empty_index_and_pattern(self):
+        from mmst.plugins.explorer.name_index import FilenameIndex
+        
+        assert FilenameIndex([]).match("a", 0.42).tolist() == []
+        assert FilenameIndex(["a", "b"]).match("", 0.42).tolist() == [True, True]
+
 # Test the FilterPanel UI integration
 @pytest.fixture
 def filter_panel():
@@ -0,0 +1,112 @@
+"""Tests for background previews in the Explorer details panel."""
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import cast
+
+import pytest
+from PySide6.QtGui import QColor, QImage
+from PySide6.QtWidgets import QApplication
+
+from mmst.plugins.explorer.preview_loader import PreviewLoader, read_text_preview, render_preview
+from mmst.plugins.media_library.thumbnails import ThumbnailStore, load_image_thumbnail
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="module")
+def qt_app() -> QApplication:
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return cast(QApplication, app)
+
+
+def _write_image(path: Path, width: int, height: int) -> None:
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor("red"))
+    assert image.save(str(path))
+
+
+def test_image_is_decoded_at_preview_size_and_cached(qt_app, tmp_path):
+    photo = tmp_path / "photo.jpg"
+    _write_image(photo, 1600, 800)
+    store = ThumbnailStore(tmp_path / "thumbs")
+
+    image, dimensions = load_image_thumbnail(photo, 320, store)
+    assert dimensions == (1600, 800)
+    assert (image.width(), image.height()) == (320, 160)
+    cached = store.lookup(photo, "image-320")
+    assert cached is not None
+
+    # Second load is served from the shared store
+    cached.write_bytes(b"")
+    _write_image(cached, 10, 5)
+    image, dimensions = load_image_thumbnail(photo, 320, store)
+    assert dimensions == (1600, 800)
+    assert image.width() == 10
+
+
+def test_small_images_are_not_cached(qt_app, tmp_path):
+    icon = tmp_path / "icon.png"
+    _write_image(icon, 16, 16)
+    store = ThumbnailStore(tmp_path / "thumbs")
+    image, dimensions = load_image_thumbnail(icon, 320, store)
+    assert dimensions == (16, 16) and image.width() == 16
+    assert store.lookup(icon, "image-320") is None
+
+
+def test_render_preview_kinds(qt_app, tmp_path):
+    broken = tmp_path / "broken.png"
+    broken.write_bytes(b"not an image")
+    assert render_preview(broken, "image").error
+
+    notes = tmp_path / "notes.unknownext"
+    notes.write_text("plain text")
+    result = render_preview(notes, "sniff", generation=7)
+    assert (result.kind, result.text, result.generation) == ("text", "plain text", 7)
+
+    blob = tmp_path / "blob.unknownext"
+    blob.write_bytes(b"\x00\x01binary")
+    assert render_preview(blob, "sniff").kind == "none"
+
+    assert render_preview(notes, "sniff", cancelled=lambda: True) is None
+
+
+def test_large_text_files_are_read_partially(tmp_path):
+    big = tmp_path / "big.log"
+    big.write_text("".join(f"line {index}\n" for index in range(50_000)))
+    text, truncated, size = read_text_preview(big, max_bytes=4096, max_lines=10)
+    assert truncated and size == big.stat().st_size
+    assert text.splitlines() == [f"line {index}" for index in range(10)]
+
+    small = tmp_path / "small.txt"
+    small.write_text("a\nb")
+    assert read_text_preview(small) == ("a\nb", False, 3)
+
+
+def test_newer_request_supersedes_queued_one(qt_app, tmp_path):
+    first = tmp_path / "first.txt"
+    first.write_text("first")
+    second = tmp_path / "second.txt"
+    second.write_text("second")
+    loader = PreviewLoader()
+    try:
+        # Keep the worker busy so the first request is still queued
+        gate = threading.Event()
+        loader._executor.submit(gate.wait, 5.0)
+        loader.request(first, "text")
+        queued = loader._future
+        generation = loader.request(second, "text")
+        assert queued.cancelled()
+        gate.set()
+        result = loader._future.result(timeout=5.0)
+        assert result.generation == generation and loader.is_current(result)
+        assert result.text == "second"
+
+        loader.cancel()
+        assert not loader.is_current(result)
+    finally:
+        loader.shutdown()
@@ -10,7 +10,14 @@ from unittest.mock import MagicMock, patch
 # Skip if PySide6 not available
 pytest.importorskip("PySide6")
 
-from mmst.plugins.explorer.search_engine import SearchEngine, SearchMode, SearchResult, SearchMatch
+from mmst.plugins.explorer.search_engine import (
+    CancellationToken,
+    SearchEngine,
+    SearchMatch,
+    SearchMode,
+    SearchResult,
+)
+from mmst.plugins.explorer.search_index import TrigramIndex, literal_trigrams, required_literals
 
 
 class TestSearchEngine:
@@ -132,6 +139,317 @@ class TestSearchEngine:
         assert any("Line 2" in line for _, line in context)
 
 
+class TestStreamingSearch:
+    """Test the streaming search API and cancellation."""
+    
+    @pytest.fixture
+    def tree(self, tmp_path):
+        for i in range(60):
+            folder = tmp_path / f"dir{i % 6}"
+            folder.mkdir(exist_ok=True)
+            (folder / f"file{i}.txt").write_text(f"line one\nneedle {i}\n", encoding="utf-8")
+        return tmp_path
+    
+    def test_iter_search_yields_every_match(self, tree):
+        engine = SearchEngine()
+        results = list(engine.iter_search(tree, "needle"))
+        assert len(results) == 60
+        assert engine._current_search is None
+    
+    def test_max_results_stops_walk_early(self, tree, monkeypatch):
+        engine = SearchEngine()
+        searched = []
+        original = engine._search_file
+        monkeypatch.setattr(engine, "_search_file",
+                            lambda path, *args, **kwargs: searched.append(path) or original(path, *args, **kwargs))
+        results = engine.search_directory(tree, "needle", max_results=3)
+        assert len(results) == 3
+        assert len(searched) < 60
+    
+    def test_cancel_search_stops_running_search(self, tree):
+        engine = SearchEngine()
+        stream = engine.iter_search(tree, "needle")
+        first = next(stream)
+        assert first.matches
+        assert isinstance(engine._current_search, CancellationToken)
+        engine.cancel_search()
+        assert len(list(stream)) < 59
+    
+    def test_cancelled_token_yields_nothing(self, tree):
+        token = CancellationToken()
+        token.cancel()
+        assert SearchEngine().search_directory(tree, "needle", cancel_token=token) == []
+    
+    def test_progress_reports_discovered_files(self, tree):
+        updates = []
+        SearchEngine().search_directory(tree, "needle", progress_callback=lambda d, t: updates.append((d, t)))
+        assert updates[0] == (0, 0)
+        assert updates[-1] == (60, 60)
+
+
+class TestSearchIndex:
+    """Test the persistent trigram index used to prune searches."""
+    
+    @pytest.fixture
+    def tree(self, tmp_path):
+        """Create a small source tree to index."""
+        root = tmp_path / "tree"
+        (root / "pkg").mkdir(parents=True)
+        (root / "pkg" / "alpha.py").write_text("def alpha():\n    return 'Needle in a haystack'\n", encoding="utf-8")
+        (root / "pkg" / "beta.py").write_text("def beta():\n    return 42\n", encoding="utf-8")
+        (root / "notes.txt").write_text("Nothing to see here.\n", encoding="utf-8")
+        (root / "blob.bin").write_bytes(b"\x00\x01needle\x00")
+        return root
+    
+    @pytest.fixture
+    def engine(self, tmp_path):
+        engine = SearchEngine(index_dir=tmp_path / "index")
+        yield engine
+        for directory in list(engine._indexes):
+            engine.disable_index(Path(directory))
+    
+    def _count_searched(self, engine, monkeypatch):
+        searched = []
+        original = engine._search_file
+        
+        def _tracking(file_path, *args, **kwargs):
+            searched.append(file_path.name)
+            return original(file_path, *args, **kwargs)
+        
+        monkeypatch.setattr(engine, "_search_file", _tracking)
+        return searched
+    
+    def test_required_literals(self):
+        """Only guaranteed literal runs are extracted from regexes."""
+        assert required_literals(r"def\s+needle_\w+") == ["def", "needle_"]
+        assert required_literals(r"foo\.bar") == ["foo.bar"]
+        assert required_literals(r"colou?r") == ["colo"]
+        assert required_literals(r"abc|xyz") == []
+        assert required_literals(r"(?i)needle") == []
+        assert required_literals(r"[abc]def(ghi)?jkl") == ["def", "jkl"]
+        # {n}, {m,n} and {m,} quantifiers end the run; m == 0 drops the atom
+        assert required_literals(r"abc{2}def") == ["abc", "def"]
+        assert required_literals(r"foo{0,2}barbaz") == ["barbaz"]
+        assert required_literals(r"abcd{2,}xyz") == ["abcd", "xyz"]
+        assert required_literals(r"id [0-9]{2} here") == ["id ", " here"]
+        # Braces that are no quantifier are not treated as literal text either
+        assert required_literals(r"abcd{x}efg") == ["efg"]
+        # Multi-character escapes are consumed whole and end the run
+        assert required_literals(r"\x41bcdef") == ["bcdef"]
+        assert required_literals(r"\u0041bcdef") == ["bcdef"]
+        assert required_literals(r"\U00000041bcdef") == ["bcdef"]
+        assert required_literals(r"\N{LATIN CAPITAL LETTER A}bcdef") == ["bcdef"]
+        assert required_literals(r"\101bcdef") == ["bcdef"]
+        assert required_literals(r"\0bcdef") == ["bcdef"]
+        assert required_literals(r"(a)(b)(c)(d)(e)(f)(g)(h)(i)(j)(k)(l)\12xyz") == ["xyz"]
+        assert required_literals(r"[\x5d]abcd") == ["abcd"]
+    
+    def test_literal_trigrams_are_case_folded(self):
+        assert literal_trigrams(["ABCd"]) == literal_trigrams(["abcd"])
+        assert literal_trigrams(["ab"]) == set()
+    
+    def test_index_prunes_files_before_verification(self, tree, engine, monkeypatch):
+        """Indexed searches only open files containing the query trigrams."""
+        engine.enable_index(tree).result(timeout=10)
+        searched = self._count_searched(engine, monkeypatch)
+        
+        results = engine.search_directory(tree, "NEEDLE", SearchMode.PLAIN_TEXT)
+        
+        assert [r.file_path.name for r in results] == ["alpha.py"]
+        assert searched == ["alpha.py"]
+    
+    def test_index_prunes_regex_searches(self, tree, engine, monkeypatch):
+        engine.enable_index(tree).result(timeout=10)
+        searched = self._count_searched(engine, monkeypatch)
+        
+        results = engine.search_directory(tree, r"def\s+beta", SearchMode.REGEX)
+        
+        assert [r.file_path.name for r in results] == ["beta.py"]
+        assert searched == ["beta.py"]
+    
+    @pytest.mark.parametrize("indexed", [False, True])
+    @pytest.mark.parametrize("pattern", [r"abc{2}def", r"id [0-9]{2} here", r"x{0,2}yzzy{1,}"])
+    def test_quantified_regex_is_found(self, tree, engine, indexed, pattern):
+        """Brace quantifiers must not turn into literals for the prefilter or index."""
+        (tree / "quantified.txt").write_text("abccdef\nid 42 here\nyzzyyy\n", encoding="utf-8")
+        if indexed:
+            engine.enable_index(tree).result(timeout=10)
+        
+        results = list(engine.iter_search(tree, pattern, SearchMode.REGEX))
+        
+        assert [r.file_path.name for r in results] == ["quantified.txt"]
+    
+    @pytest.mark.parametrize("indexed", [False, True])
+    @pytest.mark.parametrize("mode", [SearchMode.REGEX, SearchMode.CASE_SENSITIVE])
+    def test_escaped_characters_are_found(self, tree, engine, indexed, mode):
+        """Character escapes must not leave digits behind as required literals."""
+        (tree / "escaped.txt").write_text("hello Abcdef world\n", encoding="utf-8")
+        if indexed:
+            engine.enable_index(tree).result(timeout=10)
+        
+        for pattern in (r"\x41bcdef", r"\101bcdef", r"\u0041bcdef"):
+            results = engine.search_directory(tree, pattern, mode)
+            assert [r.file_path.name for r in results] == ["escaped.txt"], pattern
+    
+    def test_changed_and_new_files_are_still_found(self, tree, engine):
+        """Files modified or added after indexing are verified, not skipped."""
+        engine.enable_index(tree).result(timeout=10)
+        notes = tree / "notes.txt"
+        notes.write_text("A needle appeared after indexing.\n", encoding="utf-8")
+        stat = notes.stat()
+        os.utime(notes, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        (tree / "pkg" / "gamma.py").write_text("needle = True\n", encoding="utf-8")
+        
+        results = engine.search_directory(tree, "needle", SearchMode.PLAIN_TEXT)
+        
+        assert sorted(r.file_path.name for r in results) == ["alpha.py", "gamma.py", "notes.txt"]
+    
+    def test_index_persists_and_updates_incrementally(self, tree, tmp_path):
+        db_path = tmp_path / "index" / TrigramIndex.db_name(tree)
+        index = TrigramIndex(tree, db_path)
+        assert index.update() == 4
+        index.close()
+        
+        reopened = TrigramIndex(tree, db_path)
+        try:
+            assert reopened.update() == 0
+            (tree / "notes.txt").unlink()
+            assert reopened.update() == 0
+            assert reopened.file_count == 3
+        finally:
+            reopened.close()
+    
+    def test_merge_drops_dead_postings(self, tree, tmp_path):
+        index = TrigramIndex(tree, tmp_path / "merge.sqlite")
+        try:
+            index.update()
+            alpha = tree / "pkg" / "alpha.py"
+            alpha.write_text("nothing special\n", encoding="utf-8")
+            stat = alpha.stat()
+            os.utime(alpha, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            index.update()
+            index.merge()
+            
+            query = index.query(literal_trigrams(["needle"]))
+            assert not query.may_match(alpha)
+            assert not query.may_match(tree / "pkg" / "beta.py")
+        finally:
+            index.close()
+
+
+class TestMappedSearch:
+    """Test the memory-mapped bytes-level search path."""
+    
+    def _search(self, path, term, mode=SearchMode.PLAIN_TEXT):
+        import re
+        pattern = None
+        if mode != SearchMode.PLAIN_TEXT:
+            pattern = re.compile(term, 0 if mode == SearchMode.CASE_SENSITIVE else re.IGNORECASE)
+        return SearchEngine()._search_file(path, term, mode, pattern)
+    
+    def test_line_numbers_and_text_match_text_mode(self, tmp_path):
+        path = tmp_path / "crlf.txt"
+        path.write_bytes(b"first\r\nsecond NEEDLE\r\n\r\nthird needle")
+        result = self._search(path, "needle")
+        assert [(m.line_number, m.line_text, m.start_pos) for m in result.matches] == [
+            (2, "second NEEDLE", 7),
+            (4, "third needle", 6),
+        ]
+    
+    def test_lone_carriage_returns_use_line_reader(self, tmp_path):
+        path = tmp_path / "mac.txt"
+        path.write_bytes(b"one\rtwo needle\rthree")
+        result = self._search(path, "needle")
+        assert result.matches[0].line_number == 2
+        assert result.matches[0].line_text == "two needle"
+    
+    def test_case_folding_beyond_ascii(self, tmp_path):
+        path = tmp_path / "kelvin.txt"
+        path.write_text("x\n\u212aelvin\n", encoding="utf-8")
+        assert self._search(path, "kelvin").matches[0].line_number == 2
+        assert self._search(path, r"kelvi\w", SearchMode.REGEX).matches[0].line_number == 2
+        assert self._search(path, "kelvin", SearchMode.CASE_SENSITIVE) is None
+    
+    def test_large_files_are_searched_when_mapped(self, tmp_path, monkeypatch):
+        from mmst.plugins.explorer import search_engine
+        monkeypatch.setattr(search_engine, "MAX_FILE_SIZE", 1024)
+        path = tmp_path / "large.log"
+        path.write_text("filler line\n" * 2000 + "the needle\n", encoding="utf-8")
+        result = self._search(path, "needle")
+        assert result.matches[0].line_number == 2001
+        # Patterns without a usable literal still honour the size limit
+        assert self._search(path, r"n\w+e", SearchMode.REGEX) is None
+
+
+class TestFileTypeCache:
+    """Test memoised text/binary sniffing."""
+    
+    def _counting(self, monkeypatch):
+        from mmst.plugins.explorer import file_types
+        calls = []
+        original = file_types.sniff_text
+        
+        def _sniff(data):
+            calls.append(data)
+            return original(data)
+        
+        monkeypatch.setattr(file_types, "sniff_text", _sniff)
+        return calls
+    
+    def test_verdicts_are_memoised_per_version(self, tmp_path, monkeypatch):
+        from mmst.plugins.explorer.file_types import FileTypeCache
+        calls = self._counting(monkeypatch)
+        path = tmp_path / "README"
+        path.write_text("plain text", encoding="utf-8")
+        cache = FileTypeCache()
+        
+        assert cache.is_text(path) and cache.is_text(path)
+        assert len(calls) == 1
+        
+        path.write_bytes(b"now\x00binary")
+        assert not cache.is_text(path)
+        assert len(calls) == 2
+    
+    def test_verdicts_persist(self, tmp_path, monkeypatch):
+        from mmst.plugins.explorer.file_types import FileTypeCache
+        calls = self._counting(monkeypatch)
+        path = tmp_path / "blob"
+        path.write_bytes(b"\x00\x01")
+        db = tmp_path / "types.sqlite3"
+        
+        first = FileTypeCache(db)
+        assert not first.is_text(path)
+        first.close()
+        
+        second = FileTypeCache(db)
+        assert not second.is_text(path)
+        assert len(calls) == 1
+        second.close()
+    
+    def test_search_sniffs_unknown_files_in_workers(self, tmp_path, monkeypatch):
+        import threading
+        from mmst.plugins.explorer.file_types import FileTypeCache
+        
+        (tmp_path / "notes.unknownext").write_text("needle", encoding="utf-8")
+        (tmp_path / "data.unknownext").write_bytes(b"needle\x00")
+        (tmp_path / "known.txt").write_text("needle", encoding="utf-8")
+        engine = SearchEngine()
+        engine._file_types = FileTypeCache()
+        sniff_threads = []
+        original = engine._file_types.is_text
+        
+        def _tracking(path, stat=None):
+            sniff_threads.append(threading.current_thread())
+            return original(path, stat)
+        
+        monkeypatch.setattr(engine._file_types, "is_text", _tracking)
+        results = engine.search_directory(tmp_path, "needle")
+        
+        assert sorted(r.file_path.name for r in results) == ["known.txt", "notes.unknownext"]
+        assert len(sniff_threads) == 2
+        assert threading.main_thread() not in sniff_threads
+
+
 # Add more test classes for SearchPanel if needed
 class TestSearchPanel:
     """Test the search panel UI functionality."""
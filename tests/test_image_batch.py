@@ -0,0 +1,142 @@
+"""Tests for batch image compression (ImageMagick is replaced by a stub)."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from mmst.plugins.system_tools.image_batch import (
+    STATUS_CANCELLED,
+    STATUS_COMPRESSED,
+    STATUS_SKIPPED,
+    ImageBatchCompressor,
+    ImageCompressionSettings,
+    bisect_quality,
+    collect_images,
+    parse_ssim,
+)
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="uses a shebang script as fake ImageMagick")
+
+# Encoded size is quality * 100 bytes; SSIM is quality / 100
+FAKE_MAGICK = """#!{python}
+import sys
+args = sys.argv[1:]
+if args[0] == "compare":
+    quality = len(open(args[-2], "rb").read()) // 100
+    sys.stderr.write(f"{{quality * 10}} ({{quality / 100}})")
+    sys.exit(1)
+quality = int(args[args.index("-quality") + 1])
+open(args[-1], "wb").write(b"x" * quality * 100)
+"""
+
+
+@pytest.fixture
+def magick(tmp_path: Path) -> str:
+    script = tmp_path / "bin" / "magick"
+    script.parent.mkdir()
+    script.write_text(FAKE_MAGICK.format(python=sys.executable))
+    script.chmod(0o755)
+    return str(script)
+
+
+def _image(folder: Path, name: str, size: int = 9000) -> Path:
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / name
+    path.write_bytes(b"i" * size)
+    return path
+
+
+def test_bisect_quality_finds_boundaries():
+    assert bisect_quality(lambda q: q <= 62, 30, 95, 7, prefer_high=True) == 62
+    assert bisect_quality(lambda q: q >= 71, 30, 95, 7, prefer_high=False) == 71
+    assert bisect_quality(lambda q: False, 30, 95, 7, prefer_high=True) is None
+    assert parse_ssim("0.9731") == pytest.approx(0.9731)
+    assert parse_ssim("2304.5 (0.9648)") == pytest.approx(0.9648)
+
+
+def test_size_target_uses_few_encoder_runs(tmp_path, magick):
+    source = _image(tmp_path / "photos", "a.jpg")
+    compressor = ImageBatchCompressor(magick, ImageCompressionSettings(max_bytes=5000))
+    result = compressor.compress(source, tmp_path / "out.jpg")
+
+    assert result.status == STATUS_COMPRESSED
+    assert (result.quality, result.compressed_size) == (50, 5000)
+    assert result.encodes <= 7
+    assert (tmp_path / "out.jpg").stat().st_size == 5000
+
+
+def test_ssim_target_combined_with_size_limit(tmp_path, magick):
+    source = _image(tmp_path, "a.jpg")
+    ssim_only = ImageBatchCompressor(magick, ImageCompressionSettings(min_ssim=0.8))
+    result = ssim_only.compress(source, tmp_path / "ssim.jpg")
+    assert (result.quality, result.ssim) == (80, 0.8)
+
+    capped = ImageBatchCompressor(magick, ImageCompressionSettings(min_ssim=0.8, max_bytes=6000))
+    assert capped.compress(source, tmp_path / "capped.jpg").quality == 60
+
+
+def test_cancel_during_quality_search_is_not_a_failure(tmp_path, magick):
+    source = _image(tmp_path, "a.jpg")
+    compressor = ImageBatchCompressor(magick, ImageCompressionSettings(max_bytes=5000))
+    encode = compressor._encode
+
+    def _encode_then_cancel(*args):
+        encode(*args)
+        compressor.cancel()
+
+    compressor._encode = _encode_then_cancel
+    progress = []
+    summary = compressor.run([source], on_result=lambda done, total, result: progress.append(result.status))
+
+    assert progress == [STATUS_CANCELLED]
+    assert (summary.cancelled, summary.failed) == (1, 0)
+    assert summary.results[0].encodes == 1
+
+
+def test_batch_skips_images_that_would_grow_and_reports_savings(tmp_path, magick):
+    root = tmp_path / "archive"
+    sources = [_image(root / f"album{i % 2}", f"p{i}.png") for i in range(6)]
+    sources.append(_image(root, "tiny.jpeg", size=500))
+    (root / "notes.txt").write_text("no image")
+    assert collect_images([root]) == sorted(sources)
+
+    done = []
+    compressor = ImageBatchCompressor(magick, ImageCompressionSettings(quality=40), max_workers=4)
+    summary = compressor.run(
+        collect_images([root]), output_dir=tmp_path / "out", base_dir=root,
+        on_result=lambda count, total, _r: done.append((count, total)),
+    )
+
+    assert (summary.compressed, summary.skipped, summary.failed) == (6, 1, 0)
+    assert summary.saved_bytes == 6 * (9000 - 4000)
+    assert summary.saved_percent == pytest.approx(100 * 5000 / 9000)
+    assert sorted(done) == [(n, 7) for n in range(1, 8)]
+    assert (tmp_path / "out" / "album1" / "p1.jpg").stat().st_size == 4000
+    assert not (tmp_path / "out" / "tiny.jpeg").exists()
+    assert [r.status for r in summary.results][-1] == STATUS_SKIPPED
+
+
+def test_in_place_replaces_original(tmp_path, magick):
+    source = _image(tmp_path, "a.jpeg")
+    summary = ImageBatchCompressor(magick, ImageCompressionSettings(quality=30)).run([source])
+    assert summary.compressed == 1
+    assert source.stat().st_size == 3000
+
+
+def test_in_place_format_change_removes_the_original(tmp_path, magick):
+    converted = _image(tmp_path, "a.png")
+    grows = _image(tmp_path, "tiny.png", size=500)
+    compressor = ImageBatchCompressor(magick, ImageCompressionSettings(target_format="webp", quality=30))
+    summary = compressor.run([converted, grows])
+
+    assert (summary.compressed, summary.skipped) == (1, 1)
+    assert not converted.exists() and (tmp_path / "a.webp").stat().st_size == 3000
+    # Nothing was written for the skipped image, so its original stays
+    assert grows.exists() and not (tmp_path / "tiny.webp").exists()
+
+    # With an output folder the originals are never touched
+    source = _image(tmp_path / "src", "b.png")
+    compressor.run([source], output_dir=tmp_path / "out", base_dir=tmp_path / "src")
+    assert source.exists() and (tmp_path / "out" / "b.webp").exists()
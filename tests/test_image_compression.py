@@ -281,3 +281,18 @@ def test_image_compression_without_imagemagick():
     time.sleep(0.1)
     
     # Callback should be called even on failure
+
+
+def test_replace_confirmation_mentions_deleted_originals():
+    """In-place batches that change the format say that originals are deleted."""
+    from PySide6.QtWidgets import QApplication
+    import sys
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    widget = DataCompressionWidget(Mock())
+    widget.format_combo.setCurrentText("webp")
+    text = widget.replace_confirmation([Path("a.png"), Path("b.webp"), Path("c.jpg")])
+    assert "3 Bilder" in text and "2 davon im Format .webp" in text
+
+    widget.format_combo.setCurrentText("jpg")
+    assert "gelöscht" not in widget.replace_confirmation([Path("a.jpeg")])
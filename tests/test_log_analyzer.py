@@ -0,0 +1,92 @@
+"""Tests for the log analyzer and its incremental file tailing."""
+from __future__ import annotations
+
+import os
+from datetime import datetime
+
+from mmst.core.log_analyzer import IncrementalLogAnalyzer, LogAnalyzer, parse_timestamp
+
+LINES = [
+    "2026-10-18 10:00:05 [INFO] MMST.Core: Loaded 12 plugins",
+    "2026-10-18 10:01:10 [ERROR] MMST.Backup: Copy of /home/user/a.txt failed",
+    "Traceback (most recent call last):",
+    "2026-10-18 10:03:59 [INFO] MMST.Core: Loaded 3 plugins",
+    "2026-10-18 10:06:00 [CRITICAL] MMST.Backup: Disk full",
+]
+
+
+def _append(path, lines):
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write("".join(line + "\n" for line in lines))
+
+
+def test_parse_logs_aggregates():
+    analyzer = LogAnalyzer()
+    entries = analyzer.parse_logs("\n".join(LINES))
+
+    assert len(entries) == 4
+    assert parse_timestamp("2026-10-18 10:01:10") == datetime(2026, 10, 18, 10, 1, 10)
+    assert analyzer.count_by_level() == {"INFO": 2, "ERROR": 1, "CRITICAL": 1}
+    assert analyzer.get_top_error_components() == [("MMST.Backup", 2)]
+    assert analyzer.get_common_patterns(1) == [("Loaded N plugins", 2)]
+    assert analyzer.get_time_distribution(5) == {
+        datetime(2026, 10, 18, 10, 0): 3,
+        datetime(2026, 10, 18, 10, 5): 1,
+    }
+    assert analyzer.get_error_rate(5) == {
+        datetime(2026, 10, 18, 10, 0): 1 / 3,
+        datetime(2026, 10, 18, 10, 5): 1.0,
+    }
+
+    # Parsing again replaces the previous results
+    analyzer.parse_logs(LINES[0])
+    assert analyzer.count_by_level() == {"INFO": 1}
+
+
+def test_refresh_only_parses_appended_lines(tmp_path):
+    log_file = tmp_path / "mmst-2026-10-18.log"
+    _append(log_file, LINES[:2])
+    analyzer = IncrementalLogAnalyzer(tmp_path)
+
+    assert analyzer.refresh() == 2
+    assert analyzer.refresh() == 0
+
+    # A line that is still being written is picked up once it is complete
+    with open(log_file, "a", encoding="utf-8") as handle:
+        handle.write(LINES[3][:20])
+    assert analyzer.refresh() == 0
+    with open(log_file, "a", encoding="utf-8") as handle:
+        handle.write(LINES[3][20:] + "\n")
+    _append(tmp_path / "mmst-2026-10-19.log", LINES[4:])
+    assert analyzer.refresh() == 2
+
+    assert analyzer.entry_count == 4
+    assert analyzer.count_by_component() == {"MMST.Core": 2, "MMST.Backup": 2}
+    assert [e.level for e in analyzer.get_error_entries()] == ["ERROR", "CRITICAL"]
+    assert analyzer.get_heatmap(days=2, today=datetime(2026, 10, 18))[10, 0] == 4
+
+
+def test_replaced_file_is_read_from_the_start(tmp_path):
+    log_file = tmp_path / "mmst-2026-10-18.log"
+    _append(log_file, LINES[:2])
+    analyzer = IncrementalLogAnalyzer(tmp_path)
+    analyzer.refresh()
+
+    replacement = tmp_path / "new.log"
+    _append(replacement, LINES[3:4])
+    os.replace(replacement, log_file)
+    assert analyzer.refresh() == 1
+    assert analyzer.entry_count == 3
+
+
+def test_rotated_file_is_not_read_twice(tmp_path):
+    log_file = tmp_path / "mmst-2026-10-18.log"
+    _append(log_file, LINES[:2])
+    analyzer = IncrementalLogAnalyzer(tmp_path)
+    analyzer.refresh()
+
+    _append(log_file, LINES[3:4])
+    os.replace(log_file, tmp_path / "mmst-2026-10-18.1.log")
+    _append(log_file, LINES[4:])
+    assert analyzer.refresh() == 2
+    assert analyzer.entry_count == 4
@@ -0,0 +1,67 @@
+"""Tests for the columnar log store."""
+from __future__ import annotations
+
+from datetime import datetime
+
+import numpy as np
+
+from mmst.core.log_store import LogStore, from_seconds, to_seconds
+
+
+def _store(rows, **kwargs) -> LogStore:
+    store = LogStore(**kwargs)
+    for timestamp, level, component, template in rows:
+        store.append(to_seconds(timestamp), level, component, template)
+    return store
+
+
+ROWS = [
+    (datetime(2026, 10, 18, 9, 59, 59), "INFO", "core", "Loaded N plugins"),
+    (datetime(2026, 10, 18, 10, 0, 1), "ERROR", "backup", "Copy failed"),
+    (datetime(2026, 10, 18, 10, 0, 30), "INFO", "core", "Loaded N plugins"),
+    (datetime(2026, 10, 17, 23, 10, 0), "DEBUG", "scan", "Hashing /PATH"),
+    (datetime(2026, 10, 18, 10, 12, 0), "CRITICAL", "backup", "Disk full"),
+]
+
+
+def test_seconds_round_trip():
+    timestamp = datetime(2026, 2, 28, 23, 59, 58)
+    assert from_seconds(to_seconds(timestamp)) == timestamp
+
+
+def test_counts_and_templates():
+    store = _store(ROWS)
+    assert len(store) == 5
+    assert store.level_counts() == {"DEBUG": 1, "INFO": 2, "ERROR": 1, "CRITICAL": 1}
+    assert store.component_counts(errors_only=True) == {"backup": 2}
+    assert store.top_templates(1) == [("Loaded N plugins", 2)]
+    assert store.level_counts(start=datetime(2026, 10, 18, 10, 0)) == {"INFO": 1, "ERROR": 1, "CRITICAL": 1}
+
+
+def test_histogram_error_rate_and_heatmap():
+    store = _store(ROWS[:3] + ROWS[4:])
+    starts, counts = store.histogram(600)
+    assert [from_seconds(s).strftime("%H:%M") for s in starts] == ["09:50", "10:00", "10:10"]
+    assert counts.tolist() == [1, 2, 1]
+    _starts, rates = store.error_rate(600)
+    assert rates.tolist() == [0.0, 0.5, 1.0]
+
+    heatmap = _store(ROWS).heatmap(days=2, today=datetime(2026, 10, 18, 12, 0))
+    assert heatmap.shape == (24, 2)
+    assert heatmap[10, 0] == 3 and heatmap[9, 0] == 1 and heatmap[23, 1] == 1
+    assert heatmap.sum() == 5
+
+    minutes = _store(ROWS).level_minutes()
+    assert [from_seconds(m).minute for m in minutes["INFO"]] == [59, 0]
+
+
+def test_columns_grow_past_capacity():
+    store = LogStore(capacity=16)
+    store.FLUSH_ROWS = 7
+    base = to_seconds(datetime(2026, 1, 1))
+    for i in range(100):
+        store.append(base + i * 60, "INFO" if i % 4 else "ERROR", f"c{i % 3}", "tick")
+    seconds, levels, components, templates = store.columns()
+    assert len(seconds) == 100 and np.all(np.diff(seconds) == 60)
+    assert store.level_counts() == {"INFO": 75, "ERROR": 25}
+    assert set(templates.tolist()) == {0} and set(components.tolist()) == {0, 1, 2}
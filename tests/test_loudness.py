@@ -0,0 +1,182 @@
+"""Tests for the offline EBU R128 loudness analysis."""
+from __future__ import annotations
+
+import os
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from mmst.plugins.audio_tools.loudness import (
+    LoudnessMeter,
+    LoudnessResult,
+    analyze_file,
+    k_weighting_sos,
+    run_loudness_batch,
+)
+from mmst.plugins.media_library.core import LibraryIndex
+from mmst.plugins.media_library.smart_playlists import Rule, SmartPlaylist, evaluate_smart_playlist
+
+RATE = 48000
+
+
+def _sine(amplitude: float, seconds: float = 5.0, freq: float = 997.0) -> np.ndarray:
+    t = np.arange(int(RATE * seconds)) / RATE
+    return amplitude * np.sin(2 * np.pi * freq * t)
+
+
+def _write_wav(path: Path, samples: np.ndarray, sample_width: int = 2) -> None:
+    scale = 2 ** (8 * sample_width - 1) - 1
+    pcm = np.round(samples * scale).astype("<i4")
+    if sample_width == 2:
+        raw = pcm.astype("<i2").tobytes()
+    else:
+        raw = pcm.view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(samples.shape[1])
+        wav_file.setsampwidth(sample_width)
+        wav_file.setframerate(RATE)
+        wav_file.writeframes(raw)
+
+
+def test_k_weighting_matches_reference_coefficients():
+    sos = k_weighting_sos(48000)
+    np.testing.assert_allclose(sos[0], [1.53512485958697, -2.69169618940638, 1.19839281085285,
+                                        1.0, -1.69065929318241, 0.73248077421585], rtol=1e-9)
+    np.testing.assert_allclose(sos[1][4:], [-1.99004745483398, 0.99007225036621], rtol=1e-9)
+
+
+def test_sine_loudness_is_independent_of_block_size():
+    stereo = np.stack([_sine(0.1), _sine(0.1)], axis=1)
+    whole = LoudnessMeter(RATE, 2)
+    whole.process(stereo)
+    chunked = LoudnessMeter(RATE, 2)
+    for start in range(0, stereo.shape[0], 3001):
+        chunked.process(stereo[start:start + 3001])
+
+    result = whole.result()
+    # -20 dBFS sine on both channels reads -20 LUFS
+    assert result.integrated_lufs == pytest.approx(-20.0, abs=0.05)
+    assert result.rms_dbfs == pytest.approx(-20.0, abs=0.05)
+    assert chunked.result() == result
+
+
+def test_true_peak_catches_inter_sample_peaks():
+    # fs/4 sine sampled at 45 degrees: samples reach only 0.707 of the true peak
+    n = np.arange(RATE)
+    meter = LoudnessMeter(RATE, 1)
+    meter.process(0.5 * np.sin(2 * np.pi * n / 4 + np.pi / 4))
+    assert 20 * np.log10(0.5 * np.sqrt(0.5)) == pytest.approx(-9.03, abs=0.01)
+    assert meter.result().true_peak_dbtp == pytest.approx(-6.02, abs=0.1)
+
+
+def test_quiet_blocks_stay_below_the_absolute_gate():
+    # 8 s at -76 LUFS are dropped by the -70 LUFS gate even though they are
+    # above the relative threshold derived from the loud part
+    quiet, loud = _sine(0.1 * 10 ** (-56 / 20), 8.0), _sine(0.1 * 10 ** (-49 / 20), 2.0)
+    mono = np.concatenate([quiet, loud])
+    meter = LoudnessMeter(RATE, 2)
+    meter.process(np.stack([mono, mono], axis=1))
+    assert meter.result().integrated_lufs == pytest.approx(-69.0, abs=0.1)
+
+
+def test_silence_and_gain_limits():
+    meter = LoudnessMeter(RATE, 2)
+    meter.process(np.zeros((RATE, 2)))
+    silent = meter.result()
+    assert silent.integrated_lufs is None and silent.true_peak_dbtp is None
+    assert silent.gain_to() is None
+
+    loud = LoudnessResult(integrated_lufs=-23.0, true_peak_dbtp=-3.0, rms_dbfs=-25.0, duration_seconds=1.0)
+    # +7 dB would reach +4 dBTP, so the true-peak ceiling wins
+    assert loud.gain_to(-16.0, max_true_peak=-1.0) == 2.0
+    assert loud.to_dict()["gain_db"] == 2.0
+
+
+def test_wav_files_are_decoded_in_blocks(tmp_path):
+    stereo = np.stack([_sine(0.1, 3.0), _sine(0.1, 3.0)], axis=1)
+    for width in (2, 3):
+        path = tmp_path / f"tone-{width}.wav"
+        _write_wav(path, stereo, width)
+        result = analyze_file(path, block_seconds=0.25)
+        assert result.integrated_lufs == pytest.approx(-20.0, abs=0.05)
+        assert result.duration_seconds == pytest.approx(3.0)
+
+
+def test_batch_stores_results_usable_in_smart_playlists(tmp_path):
+    source = tmp_path / "media"
+    source.mkdir()
+    quiet = source / "quiet.wav"
+    loud = source / "loud.wav"
+    _write_wav(quiet, np.stack([_sine(0.01, 2.0)] * 2, axis=1))
+    _write_wav(loud, np.stack([_sine(0.5, 2.0)] * 2, axis=1))
+    compressed = source / "episode.mp3"
+    compressed.write_bytes(b"not decodable without ffmpeg")
+
+    index = LibraryIndex(tmp_path / "library.db")
+    try:
+        index.add_source(source)
+        for path in (quiet, loud, compressed):
+            assert index.add_file_by_path(path)
+
+        def _store(path: Path, result: LoudnessResult) -> None:
+            index.set_loudness(path, result.integrated_lufs, result.true_peak_dbtp, result.rms_dbfs)
+
+        progress = []
+        analysed, failed = run_loudness_batch(
+            [quiet, loud, compressed], _store, progress=lambda done, total, _p: progress.append((done, total)),
+            max_workers=2,
+        )
+        assert (analysed, failed) == (2, 1)
+        assert sorted(progress) == [(1, 2), (2, 2)]
+
+        entries = index.list_files_with_sources()
+        by_name = {media.path: media for media, _ in entries}
+        assert by_name["loud.wav"].loudness_lufs == pytest.approx(-6.02, abs=0.05)
+        assert by_name["episode.mp3"].loudness_lufs is None
+
+        playlist = SmartPlaylist(name="Zu leise", rules=[Rule("loudness_lufs", "<", -30.0)])
+        matches = evaluate_smart_playlist(playlist, entries, lambda _p: None)
+        assert [media.path for media, _ in matches] == ["quiet.wav"]
+    finally:
+        index.close()
+
+
+def test_silent_and_undecodable_files_are_not_analysed_again(tmp_path):
+    source = tmp_path / "media"
+    source.mkdir()
+    silent = source / "silent.wav"
+    _write_wav(silent, np.zeros((RATE, 2)))
+    broken = source / "broken.wav"
+    broken.write_bytes(b"RIFF but not really")
+
+    index = LibraryIndex(tmp_path / "library.db")
+    try:
+        index.add_source(source)
+        for path in (silent, broken):
+            assert index.add_file_by_path(path)
+        assert sorted(path.name for path in index.list_loudness_targets()) == ["broken.wav", "silent.wav"]
+
+        errors = []
+        analysed, failed = run_loudness_batch(
+            index.list_loudness_targets(),
+            lambda path, result: index.set_loudness(
+                path, result.integrated_lufs, result.true_peak_dbtp, result.rms_dbfs
+            ),
+            on_error=lambda path, error: errors.append(path) or index.set_loudness(path, None, None, None),
+            max_workers=1,
+        )
+        assert (analysed, failed) == (1, 1) and errors == [broken]
+        assert index.list_loudness_targets() == []
+        by_name = {media.path: media for media, _ in index.list_files_with_sources()}
+        assert by_name["silent.wav"].loudness_lufs is None
+        assert by_name["silent.wav"].loudness_analyzed is not None
+
+        # A file changed after its analysis is measured again
+        later = by_name["silent.wav"].loudness_analyzed + 10
+        os.utime(silent, (later, later))
+        assert index.add_file_by_path(silent)
+        assert index.list_loudness_targets() == [silent]
+    finally:
+        index.close()
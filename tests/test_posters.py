@@ -0,0 +1,134 @@
+"""Tests for video poster extraction and the thumbnail store."""
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, cast
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice
+from PySide6.QtGui import QColor, QImage
+from PySide6.QtWidgets import QApplication
+
+from mmst.plugins.media_library.posters import POSTER_VARIANT, PosterExtractor, mean_luma, parse_duration
+from mmst.plugins.media_library.thumbnails import ThumbnailStore
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="module")
+def qt_app() -> QApplication:
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return cast(QApplication, app)
+
+
+def _jpeg(color: str) -> bytes:
+    image = QImage(32, 18, QImage.Format.Format_RGB32)
+    image.fill(QColor(color))
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "JPG")
+    buffer.close()
+    return bytes(data.data())
+
+
+class FakeFfmpegExtractor(PosterExtractor):
+    """PosterExtractor with the subprocess layer replaced by canned frames."""
+
+    def __init__(self, store: ThumbnailStore, frames: List[bytes], **kwargs) -> None:
+        super().__init__(store, ffmpeg="ffmpeg", **kwargs)
+        self.frames = list(frames)
+        self.commands: List[List[str]] = []
+
+    def _run(self, command: Sequence[str]) -> Optional[Tuple[int, bytes, bytes]]:
+        self.commands.append(list(command))
+        if "-frames:v" not in command:
+            return 1, b"", b"  Duration: 00:01:40.00, start: 0.000000, bitrate: 1000 kb/s\n"
+        if not self.frames:
+            return 1, b"", b"error"
+        return 0, self.frames.pop(0), b""
+
+
+def test_parse_duration() -> None:
+    assert parse_duration("  Duration: 01:02:03.50, start: 0.0") == pytest.approx(3723.5)
+    assert parse_duration("Duration: N/A, bitrate: N/A") is None
+
+
+def test_mean_luma_distinguishes_black_frames(qt_app: QApplication) -> None:
+    assert mean_luma(_jpeg("black")) < 5
+    assert mean_luma(_jpeg("white")) > 240
+    assert mean_luma(b"not an image") is None
+
+
+def test_thumbnail_store_keys_follow_source_mtime(tmp_path: Path) -> None:
+    source = tmp_path / "movie.mkv"
+    source.write_bytes(b"data")
+    store = ThumbnailStore(tmp_path / "thumbs")
+
+    assert store.lookup(source, POSTER_VARIANT) is None
+    stored = store.store(source, b"jpeg", POSTER_VARIANT)
+    assert stored is not None and stored.read_bytes() == b"jpeg"
+    assert store.lookup(source, POSTER_VARIANT) == stored
+    assert store.lookup(source, "other") is None
+
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert store.lookup(source, POSTER_VARIANT) is None
+
+
+def test_extract_skips_black_frames_and_seeks_to_ten_percent(qt_app: QApplication, tmp_path: Path) -> None:
+    source = tmp_path / "movie.mp4"
+    source.write_bytes(b"video")
+    store = ThumbnailStore(tmp_path / "thumbs")
+    extractor = FakeFfmpegExtractor(store, [_jpeg("black"), _jpeg("white")])
+    try:
+        poster = extractor.extract(source)
+    finally:
+        extractor.shutdown()
+
+    assert poster is not None
+    assert mean_luma(poster.read_bytes()) > 240
+    seeks = [cmd[cmd.index("-ss") + 1] for cmd in extractor.commands if "-ss" in cmd]
+    assert seeks == ["10.000", "25.000"]
+
+
+def test_request_runs_in_background_and_notifies(qt_app: QApplication, tmp_path: Path) -> None:
+    source = tmp_path / "clip.mkv"
+    source.write_bytes(b"video")
+    store = ThumbnailStore(tmp_path / "thumbs")
+    ready = threading.Event()
+    notified: List[Path] = []
+
+    def _on_ready(path: Path) -> None:
+        notified.append(path)
+        ready.set()
+
+    extractor = FakeFfmpegExtractor(store, [_jpeg("white")], on_ready=_on_ready, niceness=0)
+    try:
+        assert extractor.request(source) is None
+        assert ready.wait(5.0)
+        assert notified == [source]
+        assert extractor.request(source) == store.lookup(source, POSTER_VARIANT)
+    finally:
+        extractor.shutdown(wait=True)
+
+
+def test_failed_extraction_is_not_retried(qt_app: QApplication, tmp_path: Path) -> None:
+    source = tmp_path / "broken.avi"
+    source.write_bytes(b"video")
+    extractor = FakeFfmpegExtractor(ThumbnailStore(tmp_path / "thumbs"), [], niceness=0)
+    try:
+        extractor.request(source)
+        extractor.shutdown(wait=True)
+        calls = len(extractor.commands)
+        assert extractor.request(source) is None
+        assert len(extractor.commands) == calls
+    finally:
+        extractor.shutdown(wait=True)
@@ -0,0 +1,71 @@
+"""Tests for the spectrum analyzer engine and its sample ring buffer."""
+import numpy as np
+import pytest
+
+pytest.importorskip("PySide6")
+
+from mmst.plugins.audio_tools.ring_buffer import SampleRingBuffer
+from mmst.plugins.audio_tools.spectrum_analyzer import SpectrumAnalyzer
+
+BANDS = (31, 62, 125, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+
+def _reference_levels(samples, sample_rate):
+    """Band levels computed with per-band masks, as the widget used to."""
+    window = np.hanning(len(samples))
+    magnitude = np.abs(np.fft.rfft(samples * window / window.mean()))
+    freqs = np.fft.rfftfreq(len(samples), 1 / sample_rate)
+    levels = []
+    for band in BANDS:
+        mask = (freqs >= band / np.sqrt(2)) & (freqs <= band * np.sqrt(2))
+        if mask.any():
+            levels.append(min(1.0, np.log10(np.mean(magnitude[mask]) + 1) / 3.0))
+        else:
+            levels.append(0.0)
+    return np.array(levels)
+
+
+@pytest.mark.parametrize("sample_rate", [44100, 48000])
+def test_levels_match_masked_reference(sample_rate):
+    rng = np.random.default_rng(0)
+    samples = rng.standard_normal(2048)
+    analyzer = SpectrumAnalyzer(BANDS, sample_rate=sample_rate)
+    np.testing.assert_allclose(analyzer.analyze(samples), _reference_levels(samples, sample_rate))
+
+
+def test_sine_peaks_in_its_band():
+    t = np.arange(2048) / 48000
+    analyzer = SpectrumAnalyzer(BANDS, smoothing=0.0)
+    levels = analyzer.update(np.sin(2 * np.pi * 1000 * t))
+    assert int(np.argmax(levels)) == BANDS.index(1000)
+
+
+def test_bands_without_bins_stay_silent():
+    # 187.5 Hz resolution leaves no bin between 22 Hz and 44 Hz
+    analyzer = SpectrumAnalyzer(BANDS, sample_rate=48000, fft_size=256)
+    levels = analyzer.analyze(np.ones(256))
+    assert levels[0] == 0.0 and levels[1] == 0.0
+
+
+def test_configure_keeps_plan_for_same_parameters():
+    analyzer = SpectrumAnalyzer(BANDS, sample_rate=48000, fft_size=1024)
+    edges = analyzer._edges
+    analyzer.configure(1024, 48000)
+    assert analyzer._edges is edges
+    analyzer.configure(4096, 48000)
+    assert analyzer._edges is not edges and analyzer.fft_size == 4096
+
+
+def test_ring_buffer_returns_newest_frames_across_wraparound():
+    ring = SampleRingBuffer(8, channels=1)
+    assert ring.latest(4) is None
+    for start in range(0, 30, 3):
+        ring.write(np.arange(start, start + 3, dtype=np.float32))
+    np.testing.assert_array_equal(ring.latest(8)[:, 0], np.arange(22, 30))
+    out = np.empty((5, 1), dtype=np.float32)
+    assert ring.latest(5, out=out) is out
+    np.testing.assert_array_equal(out[:, 0], np.arange(25, 30))
+
+    # Oversized blocks keep their newest frames
+    ring.write(np.arange(100, 120, dtype=np.float32))
+    np.testing.assert_array_equal(ring.latest(8)[:, 0], np.arange(112, 120))
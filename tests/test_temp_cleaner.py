@@ -50,3 +50,29 @@ def test_temp_cleaner_scan_and_delete(tmp_path: Path):
     # Verify the files are actually deleted
     for f in files:
         assert not f.exists()
+
+
+def test_temp_cleaner_scans_categories_concurrently_and_streams(tmp_path: Path):
+    roots = {}
+    for name in ("a", "b", "c"):
+        root = tmp_path / name
+        (root / "sub" / "deeper").mkdir(parents=True)
+        (root / "top.bin").write_bytes(b"1" * 10)
+        (root / "sub" / "deeper" / "leaf.bin").write_bytes(b"2" * 5)
+        roots[name] = root
+    (tmp_path / "a" / "link").symlink_to(tmp_path / "b")
+    cleaner = TempCleaner(extra_categories={name: (name.upper(), [root]) for name, root in roots.items()})
+
+    streamed = []
+    result = cleaner.scan(selected_categories=["a", "b", "c"], on_category=lambda cat: streamed.append(cat.name))
+
+    assert sorted(streamed) == ["a", "b", "c"]
+    assert list(result.categories) == ["a", "b", "c"]
+    cat = result.categories["a"]
+    assert cat.total_size == 15 and result.total_files == 12
+    # Files first, then directories deepest first; symlinks are skipped
+    assert [e.path.name for e in cat.files if e.is_directory] == ["deeper", "sub"]
+    assert not any(e.path.name == "link" for e in cat.files)
+
+    capped = cleaner.scan(selected_categories=["a"], max_files_per_category=3)
+    assert len(capped.categories["a"].files) == 3
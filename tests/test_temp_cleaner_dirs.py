@@ -104,4 +104,49 @@ def test_temp_cleaner_directory_handling(tmp_path: Path):
     assert report["test_dirs"]["files"] == expected_file_count
     assert report["test_dirs"]["dirs"] == expected_dir_count
     assert len(report["test_dirs"]["deleted_files"]) == expected_file_count
-    assert len(report["test_dirs"]["deleted_dirs"]) == expected_dir_count
\ No newline at end of file
+    assert len(report["test_dirs"]["deleted_dirs"]) == expected_dir_count
+
+def test_temp_cleaner_removes_whole_subtrees_and_keeps_young_files(tmp_path: Path):
+    import os
+
+    root_dir = tmp_path / "cache"
+    old_tree = root_dir / "old" / "blobs"
+    old_tree.mkdir(parents=True)
+    for i in range(50):
+        (old_tree / f"blob{i}").write_bytes(b"x" * 10)
+    mixed = root_dir / "mixed"
+    mixed.mkdir()
+    (mixed / "stale.tmp").write_bytes(b"y" * 5)
+    (mixed / "fresh.tmp").write_bytes(b"z" * 5)
+    grown = root_dir / "grown"
+    grown.mkdir()
+    (grown / "a.tmp").write_bytes(b"a")
+
+    past = time.time() - 7200
+    for path in [*old_tree.iterdir(), old_tree, root_dir / "old", mixed / "stale.tmp", grown / "a.tmp", grown]:
+        os.utime(path, (past, past))
+    os.utime(mixed, (past, past))
+
+    cleaner = TempCleaner(extra_categories={"cache": ("Cache", [root_dir])})
+    result = cleaner.scan(selected_categories=["cache"])
+    # Created after the scan: "grown" must not be removed wholesale
+    (grown / "new.tmp").write_bytes(b"n")
+
+    preview = cleaner.delete(result, dry_run=True, categories=["cache"], min_age_seconds=3600)["cache"]
+    # "mixed" keeps its young file, so the dry run does not count it either
+    assert preview["dirs"] == 3 and preview["skipped"] == 1 and preview["errors"] == 0
+
+    report = cleaner.delete(
+        result, dry_run=False, categories=["cache"], min_age_seconds=3600, sample_limit=5
+    )["cache"]
+
+    assert not (root_dir / "old").exists()
+    assert report["subtrees"] == 1
+    assert report["files"] == 52 and report["size"] == 50 * 10 + 5 + 1
+    assert report["dirs"] == 2
+    assert len(report["deleted_files"]) == 5
+    assert (mixed / "fresh.tmp").exists() and not (mixed / "stale.tmp").exists()
+    assert (grown / "new.tmp").exists() and not (grown / "a.tmp").exists()
+    # "mixed" still holds a young file, "grown" a new one: they are kept, not errors
+    assert report["skipped"] == 2 and report["errors"] == 0
+    assert mixed.exists() and grown.exists()
@@ -0,0 +1,89 @@
+"""Tests for persisted tool versions and the non-blocking tool registry."""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from unittest.mock import Mock, patch
+
+from mmst.plugins.system_tools.tools import ToolDetector, ToolRegistry
+
+
+def _fake_tool(tmp_path):
+    executable = tmp_path / "ffmpeg"
+    executable.write_text("#!/bin/sh\n")
+    executable.chmod(0o755)
+    return executable
+
+
+def _version_output(text: str = "ffmpeg version 6.1 Copyright") -> Mock:
+    return Mock(returncode=0, stdout=text, stderr="")
+
+
+def test_versions_are_reused_from_disk_cache(tmp_path):
+    executable = _fake_tool(tmp_path)
+    cache_file = tmp_path / "cache" / "tools.json"
+
+    with patch("shutil.which", return_value=str(executable)), \
+         patch("subprocess.run", return_value=_version_output()) as run:
+        first = ToolDetector(cache_file).detect("ffmpeg")
+        assert run.call_count == 1
+        second = ToolDetector(cache_file).detect("ffmpeg")
+        assert run.call_count == 1
+
+    assert first.version == second.version == "ffmpeg version 6.1 Copyright"
+    assert json.loads(cache_file.read_text())["ffmpeg"]["version"] == first.version
+
+
+def test_updated_executable_is_probed_again(tmp_path):
+    executable = _fake_tool(tmp_path)
+    cache_file = tmp_path / "tools.json"
+
+    with patch("shutil.which", return_value=str(executable)), \
+         patch("subprocess.run", return_value=_version_output()) as run:
+        ToolDetector(cache_file).detect("ffmpeg")
+        stat = executable.stat()
+        os.utime(executable, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        run.return_value = _version_output("ffmpeg version 7.0")
+        tool = ToolDetector(cache_file).detect("ffmpeg")
+
+    assert run.call_count == 2
+    assert tool.version == "ffmpeg version 7.0"
+
+
+def test_registry_answers_before_the_probe_finishes(tmp_path):
+    executable = _fake_tool(tmp_path)
+    release = threading.Event()
+
+    def slow_run(*_args, **_kwargs):
+        release.wait(5)
+        return _version_output()
+
+    registry = ToolRegistry(ToolDetector(tmp_path / "tools.json"))
+    notified = []
+    registry.add_listener(notified.append)
+    with patch("shutil.which", return_value=str(executable)), patch("subprocess.run", side_effect=slow_run):
+        registry.start()
+        tool = registry.get("ffmpeg")
+        assert tool.available and tool.path == str(executable) and tool.version is None
+        assert not registry.ready
+        release.set()
+        assert registry.wait(5)
+
+    assert registry.get("ffmpeg").version == "ffmpeg version 6.1 Copyright"
+    assert notified and notified[0]["ffmpeg"].available
+
+
+def test_refresh_probes_again(tmp_path):
+    executable = _fake_tool(tmp_path)
+    registry = ToolRegistry(ToolDetector(tmp_path / "tools.json"))
+
+    with patch("shutil.which", return_value=str(executable)), \
+         patch("subprocess.run", return_value=_version_output()) as run:
+        registry.start()
+        assert registry.wait(5)
+        calls = run.call_count
+        registry.refresh()
+        assert registry.wait(5)
+
+    assert run.call_count == 2 * calls